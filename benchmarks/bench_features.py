@@ -0,0 +1,65 @@
+"""
+Benchmarks for computing signal features
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from skdh.features import (
+    Bank,
+    Mean,
+    StdDev,
+    Skewness,
+    Kurtosis,
+    Range,
+    IQR,
+    RMS,
+    DominantFrequency,
+    SpectralEntropy,
+    SignalEntropy,
+    JerkMetric,
+    Autocorrelation,
+)
+from skdh.utility import get_windowed_view
+
+from .common import DAYS, make_recording
+
+
+class BankCompute:
+    """
+    Compute a bank of features for non-overlapping 3 second windows of a
+    50Hz tri-axial acceleration signal.
+    """
+
+    params = DAYS
+    param_names = ["days"]
+    timeout = 1200
+
+    def setup(self, days):
+        data = make_recording(days)
+        # (windows, 3, samples) so that the features are computed on the last axis
+        self.windows = get_windowed_view(data["accel"], 150, 150).transpose([0, 2, 1])
+        self.fs = data["fs"]
+
+        self.bank = Bank()
+        self.bank.add(
+            [
+                Mean(),
+                StdDev(),
+                Skewness(),
+                Kurtosis(),
+                Range(),
+                IQR(),
+                RMS(),
+                DominantFrequency(low_cutoff=0.25, high_cutoff=5.0),
+                SpectralEntropy(low_cutoff=0.25, high_cutoff=5.0),
+                SignalEntropy(),
+                JerkMetric(),
+                Autocorrelation(lag=1, normalize=True),
+            ]
+        )
+
+    def time_compute(self, days):
+        self.bank.compute(self.windows, fs=self.fs, axis=-1)
+
+    def peakmem_compute(self, days):
+        self.bank.compute(self.windows, fs=self.fs, axis=-1)
@@ -0,0 +1,58 @@
+"""
+Benchmarks for decoding device files
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from pathlib import Path
+from time import perf_counter
+
+from skdh.io import ReadCwa, ReadBin
+
+from .common import DAYS, write_cwa, write_bin
+
+
+class ReadFiles:
+    """
+    Read synthetic 100Hz Axivity and 50Hz GeneActiv files with day windows.
+    """
+
+    params = DAYS
+    param_names = ["days"]
+    timeout = 600
+
+    def setup_cache(self):
+        files = {}
+        for days in DAYS:
+            files[("cwa", days)] = str(Path(f"recording_{days}d.cwa").resolve())
+            files[("bin", days)] = str(Path(f"recording_{days}d.bin").resolve())
+
+            write_cwa(files[("cwa", days)], days)
+            write_bin(files[("bin", days)], days)
+        return files
+
+    def time_read_cwa(self, files, days):
+        ReadCwa(bases=0, periods=24).predict(files[("cwa", days)])
+
+    def peakmem_read_cwa(self, files, days):
+        ReadCwa(bases=0, periods=24).predict(files[("cwa", days)])
+
+    def time_read_bin(self, files, days):
+        ReadBin(bases=0, periods=24).predict(files[("bin", days)])
+
+    def peakmem_read_bin(self, files, days):
+        ReadBin(bases=0, periods=24).predict(files[("bin", days)])
+
+    def track_cwa_samples_per_second(self, files, days):
+        t0 = perf_counter()
+        res = ReadCwa(bases=0, periods=24).predict(files[("cwa", days)])
+        return res["time"].size / (perf_counter() - t0)
+
+    track_cwa_samples_per_second.unit = "samples/s"
+
+    def track_bin_samples_per_second(self, files, days):
+        t0 = perf_counter()
+        res = ReadBin(bases=0, periods=24).predict(files[("bin", days)])
+        return res["time"].size / (perf_counter() - t0)
+
+    track_bin_samples_per_second.unit = "samples/s"
@@ -0,0 +1,76 @@
+"""
+Benchmarks for calibration and wear detection
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from skdh.preprocessing import (
+    CalibrateAccelerometer,
+    DETACH,
+    CountWearDetection,
+    CtaWearDetection,
+    AccelThresholdWearDetection,
+)
+
+from .common import DAYS, make_recording
+
+
+class Calibration:
+    params = DAYS
+    param_names = ["days"]
+    timeout = 600
+
+    def setup(self, days):
+        self.data = make_recording(days)
+        # allow calibrating the shorter recordings
+        self.proc = CalibrateAccelerometer(min_hours=12)
+
+    def time_calibrate(self, days):
+        self.proc.predict(
+            self.data["time"],
+            self.data["accel"],
+            fs=self.data["fs"],
+            temperature=self.data["temperature"],
+        )
+
+    def peakmem_calibrate(self, days):
+        self.proc.predict(
+            self.data["time"],
+            self.data["accel"],
+            fs=self.data["fs"],
+            temperature=self.data["temperature"],
+        )
+
+
+class WearDetection:
+    params = (
+        DAYS,
+        [
+            "DETACH",
+            "CountWearDetection",
+            "CtaWearDetection",
+            "AccelThresholdWearDetection",
+        ],
+    )
+    param_names = ["days", "detector"]
+    timeout = 600
+
+    def setup(self, days, detector):
+        self.data = make_recording(days)
+        self.proc = globals()[detector]()
+
+    def time_wear(self, days, detector):
+        self.proc.predict(
+            self.data["time"],
+            self.data["accel"],
+            temperature=self.data["temperature"],
+            fs=self.data["fs"],
+        )
+
+    def peakmem_wear(self, days, detector):
+        self.proc.predict(
+            self.data["time"],
+            self.data["accel"],
+            temperature=self.data["temperature"],
+            fs=self.data["fs"],
+        )
@@ -0,0 +1,116 @@
+"""
+Benchmarks for the activity, sleep, gait, and sit-to-stand processes
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from numpy import array
+
+from skdh.activity import ActivityLevelClassification
+from skdh.sleep import Sleep
+from skdh.gait import Gait
+from skdh.sit2stand import Sit2Stand
+
+from .common import DAYS, make_recording
+
+
+def _wear(data):
+    # worn for the whole recording
+    return array([[0, data["time"].size - 1]])
+
+
+class Activity:
+    params = DAYS
+    param_names = ["days"]
+    timeout = 600
+
+    def setup(self, days):
+        self.data = make_recording(days)
+        self.wear = _wear(self.data)
+
+    def _predict(self):
+        ActivityLevelClassification().predict(
+            self.data["time"],
+            self.data["accel"],
+            fs=self.data["fs"],
+            wear=self.wear,
+            day_ends=self.data["day_ends"],
+        )
+
+    def time_activity(self, days):
+        self._predict()
+
+    def peakmem_activity(self, days):
+        self._predict()
+
+
+class SleepProcess:
+    params = DAYS
+    param_names = ["days"]
+    timeout = 600
+
+    def setup(self, days):
+        self.data = make_recording(days)
+        self.wear = _wear(self.data)
+
+    def _predict(self):
+        Sleep().predict(
+            self.data["time"],
+            self.data["accel"],
+            temperature=self.data["temperature"],
+            fs=self.data["fs"],
+            wear=self.wear,
+            day_ends=self.data["day_ends"],
+        )
+
+    def time_sleep(self, days):
+        self._predict()
+
+    def peakmem_sleep(self, days):
+        self._predict()
+
+
+class GaitProcess:
+    params = DAYS
+    param_names = ["days"]
+    timeout = 1200
+
+    def setup(self, days):
+        self.data = make_recording(days)
+
+    def _predict(self):
+        Gait().predict(
+            self.data["time"],
+            self.data["accel"],
+            fs=self.data["fs"],
+            height=1.8,
+            day_ends=self.data["day_ends"],
+        )
+
+    def time_gait(self, days):
+        self._predict()
+
+    def peakmem_gait(self, days):
+        self._predict()
+
+
+class SitToStand:
+    params = DAYS
+    param_names = ["days"]
+    timeout = 1200
+
+    def setup(self, days):
+        self.data = make_recording(days)
+
+    def _predict(self):
+        Sit2Stand().predict(
+            self.data["time"],
+            self.data["accel"],
+            day_ends=self.data["day_ends"],
+        )
+
+    def time_sit2stand(self, days):
+        self._predict()
+
+    def peakmem_sit2stand(self, days):
+        self._predict()
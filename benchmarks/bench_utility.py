@@ -0,0 +1,61 @@
+"""
+Benchmarks for the moving window statistics
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from skdh.utility import math
+
+from .common import DAYS, make_recording
+
+
+class MovingStatistics:
+    """
+    Moving statistics of 5 second windows with 50% overlap of a 50Hz tri-axial
+    acceleration signal.
+    """
+
+    params = (
+        DAYS,
+        [
+            "moving_mean",
+            "moving_sd",
+            "moving_skewness",
+            "moving_kurtosis",
+            "moving_median",
+            "moving_max",
+            "moving_min",
+        ],
+    )
+    param_names = ["days", "function"]
+    timeout = 600
+
+    def setup(self, days, function):
+        self.accel = make_recording(days)["accel"]
+        self.fn = getattr(math, function)
+
+    def time_moving(self, days, function):
+        self.fn(self.accel, 250, 125, axis=0)
+
+    def peakmem_moving(self, days, function):
+        self.fn(self.accel, 250, 125, axis=0)
+
+
+class RollingMedian:
+    """
+    Rolling (skip of 1 sample) median of 5 minute windows of a 50Hz signal,
+    as used for the total sleep opportunity.
+    """
+
+    params = DAYS
+    param_names = ["days"]
+    timeout = 600
+
+    def setup(self, days):
+        self.accel = make_recording(days)["accel"]
+
+    def time_moving_median(self, days):
+        math.moving_median(self.accel, 15000, 1, axis=0)
+
+    def peakmem_moving_median(self, days):
+        math.moving_median(self.accel, 15000, 1, axis=0)
@@ -0,0 +1,238 @@
+"""
+Synthetic recordings for the benchmarks
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+import struct
+
+from numpy import (
+    arange,
+    zeros,
+    ones,
+    sin,
+    cos,
+    pi,
+    searchsorted,
+    array,
+    float64,
+)
+from numpy.random import default_rng
+
+
+# recording lengths to benchmark, in days
+DAYS = [1, 3, 7]
+
+# midnight UTC, so that day windows line up with whole hours of the recording
+START = datetime(2021, 1, 4, tzinfo=timezone.utc)
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "test" / "io" / "data"
+
+
+def get_day_ends(time, base, period):
+    """
+    Get the start and stop indices of the day windows of a recording.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        (N, ) array of unix timestamps, in seconds.
+    base : int
+        Base hour of the windows.
+    period : int
+        Number of hours in each window.
+
+    Returns
+    -------
+    day_ends : numpy.ndarray
+        (M, 2) array of start and stop indices of the windows.
+    """
+    day0 = time[0] - time[0] % 86400
+    starts = arange(day0 - 86400, time[-1], 86400) + base * 3600
+    stops = starts + period * 3600
+
+    mask = (stops > time[0]) & (starts < time[-1])
+    idx = array([searchsorted(time, starts[mask]), searchsorted(time, stops[mask])]).T
+    idx[idx == time.size] = time.size - 1
+
+    return idx
+
+
+@lru_cache(maxsize=1)
+def make_recording(days, fs=50.0, seed=5):
+    """
+    Create a synthetic wrist-worn accelerometer recording. Days (07:00 - 23:00)
+    have low intensity movement with 10 minute bouts of walking every 2 hours,
+    and 2 hours of non-wear in the afternoon. Nights are spent lying still,
+    with a change of position every 90 minutes. A small calibration error is
+    added to the acceleration.
+
+    Parameters
+    ----------
+    days : float
+        Length of the recording in days.
+    fs : float, optional
+        Sampling frequency in Hz. Default is 50Hz.
+    seed : int, optional
+        Random seed. Default is 5.
+
+    Returns
+    -------
+    data : dict
+        Recording with "time", "accel", "temperature", "fs", and "day_ends"
+        for the default day windows of the processes.
+    """
+    rng = default_rng(seed)
+    n = int(days * 86400 * fs)
+
+    time = START.timestamp() + arange(n) / fs
+    hour = (time % 86400) / 3600
+
+    day = (hour >= 7) & (hour < 23)
+    walk = day & ((hour % 2) < (1 / 6))
+    nonwear = (hour >= 13) & (hour < 15)
+
+    accel = zeros((n, 3), dtype=float64)
+    # upright during the day, with some movement
+    accel[day, 0] = 1.0
+    accel[day] += 0.02 * rng.standard_normal((day.sum(), 3))
+    # walking at ~1.8 steps per second
+    tw = time[walk]
+    accel[walk, 0] += 0.3 * sin(2 * pi * 1.8 * tw) + 0.1 * sin(2 * pi * 3.6 * tw)
+    accel[walk, 1] += 0.15 * cos(2 * pi * 0.9 * tw)
+    # lying at night, changing position every 90 minutes
+    night = ~day
+    angle = (((hour[night] + 1) % 24) // 1.5) * pi / 3
+    accel[night, 1] = sin(angle)
+    accel[night, 2] = cos(angle)
+    accel[night] += 0.005 * rng.standard_normal((night.sum(), 3))
+    # sitting on a table when not worn
+    accel[nonwear] = [0.0, 0.0, -1.0]
+    accel[nonwear] += 0.001 * rng.standard_normal((nonwear.sum(), 3))
+
+    # calibration error
+    accel = accel * [1.02, 0.98, 1.01] + [0.03, -0.02, 0.01]
+
+    temperature = 33.0 * ones(n)
+    temperature[nonwear] = 24.0
+    temperature += 0.1 * rng.standard_normal(n)
+
+    return {
+        "time": time,
+        "accel": accel,
+        "temperature": temperature,
+        "fs": fs,
+        "day_ends": {
+            (0, 24): get_day_ends(time, 0, 24),
+            (12, 24): get_day_ends(time, 12, 24),
+        },
+    }
+
+
+def _cwa_timestamp(dt):
+    return (
+        ((dt.year - 2000) << 26)
+        | (dt.month << 22)
+        | (dt.day << 17)
+        | (dt.hour << 12)
+        | (dt.minute << 6)
+        | dt.second
+    )
+
+
+def write_cwa(file, days, fs=100.0):
+    """
+    Write a synthetic Axivity CWA file, by repeating the data blocks of the
+    AX3 sample file with new sequence numbers and timestamps.
+
+    Parameters
+    ----------
+    file : {str, pathlib.Path}
+        File to write.
+    days : float
+        Length of the recording in days.
+    fs : {100.0, 200.0}, optional
+        Sampling frequency in Hz. Default is 100Hz.
+    """
+    rate = {100.0: 10, 200.0: 11}[fs]
+
+    with open(DATA_DIR / "ax3_sample.cwa", "rb") as f:
+        sample = f.read()
+
+    header = bytearray(sample[:1024])
+    header[36] = (header[36] & 0xF0) | rate
+    blocks = [bytearray(sample[i : i + 512]) for i in range(1024, len(sample), 512)]
+
+    n_samples = struct.unpack_from("<H", blocks[0], 28)[0]
+    n_blocks = int(days * 86400 * fs / n_samples)
+    block_time = n_samples / fs
+
+    with open(file, "wb") as f:
+        f.write(header)
+        for k in range(n_blocks):
+            block = blocks[k % len(blocks)]
+            block[24] = (block[24] & 0xF0) | rate
+
+            # the block timestamp is the whole second after the first sample
+            t0 = START + timedelta(seconds=k * block_time)
+            stamp = t0.replace(microsecond=0) + timedelta(seconds=1)
+            offset = round((stamp - t0).total_seconds() * fs)
+
+            struct.pack_into("<H", block, 4, 0)  # no fractional timestamp
+            struct.pack_into("<I", block, 10, k)
+            struct.pack_into("<I", block, 14, _cwa_timestamp(stamp))
+            struct.pack_into("<h", block, 26, offset)
+
+            # the 16 bit word sum of the block must be 0
+            struct.pack_into("<H", block, 510, 0)
+            check = sum(struct.unpack_from("<256H", block)) & 0xFFFF
+            struct.pack_into("<H", block, 510, (-check) & 0xFFFF)
+
+            f.write(block)
+
+
+def write_bin(file, days):
+    """
+    Write a synthetic GeneActiv BIN file, by repeating the data pages of the
+    GeneActiv sample file with new sequence numbers and page times.
+
+    Parameters
+    ----------
+    file : {str, pathlib.Path}
+        File to write.
+    days : float
+        Length of the recording in days.
+    """
+    with open(DATA_DIR / "gnactv_sample.bin", "rb") as f:
+        sample = f.read()
+
+    marker = b"Recorded Data"
+    i0 = sample.find(marker)
+    header = sample[:i0]
+    pages = [marker + p for p in sample[i0:].split(marker)[1:]]
+
+    # 50Hz, 300 samples per page
+    page_time = 6.0
+    n_pages = int(days * 86400 / page_time)
+
+    lines = header.split(b"\n")
+    for i, line in enumerate(lines):
+        if line.startswith(b"Number of Pages:"):
+            lines[i] = b"Number of Pages:%d" % n_pages
+
+    with open(file, "wb") as f:
+        f.write(b"\n".join(lines))
+        for k in range(n_pages):
+            page = pages[k % len(pages)].split(b"\n")
+            t = START + timedelta(seconds=k * page_time)
+            for i, line in enumerate(page):
+                if line.startswith(b"Sequence Number:"):
+                    page[i] = b"Sequence Number:%d" % k
+                elif line.startswith(b"Page Time:"):
+                    page[i] = (
+                        b"Page Time:" + t.strftime("%Y-%m-%d %H:%M:%S:000").encode()
+                    )
+            f.write(b"\n".join(page))
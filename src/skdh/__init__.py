@@ -13,6 +13,7 @@ Pipeline Processing
     Pipeline
 """
 from sys import version_info
+from importlib import import_module
 
 if version_info >= (3, 8):
     import importlib.metadata
@@ -25,20 +26,23 @@ else:  # pragma: no cover
 
 __minimum_version__ = "0.9.10"
 
-from skdh.pipeline import Pipeline
-from skdh.base import BaseProcess
-
-from skdh import utility
-from skdh import io
-from skdh import preprocessing
-from skdh import sleep
-from skdh import activity
-from skdh import gait
-from skdh import sit2stand
-from skdh import features
-
 __skdh_version__ = __version__
 
+# subpackages and classes are imported when first used (PEP 562), so that
+# importing skdh does not import every subpackage and its dependencies
+_submodules = [
+    "activity",
+    "base",
+    "features",
+    "gait",
+    "io",
+    "pipeline",
+    "preprocessing",
+    "sit2stand",
+    "sleep",
+    "utility",
+]
+_attributes = {"Pipeline": "skdh.pipeline", "BaseProcess": "skdh.base"}
 
 __all__ = [
     "Pipeline",
@@ -53,3 +57,22 @@ __all__ = [
     "utility",
     "__skdh_version__",
 ]
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return import_module(f"skdh.{name}")
+    if name in _attributes:
+        return getattr(import_module(_attributes[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | set(_attributes))
+
+
+if version_info < (3, 7):  # pragma: no cover :: no module __getattr__
+    from skdh.pipeline import Pipeline
+    from skdh.base import BaseProcess
+    from skdh import utility, io, preprocessing, sleep, activity, gait
+    from skdh import sit2stand, features
@@ -23,10 +23,6 @@ from numpy import (
     full,
     arange,
 )
-import matplotlib
-from matplotlib.backends.backend_pdf import PdfPages
-import matplotlib.lines as mlines
-import matplotlib.pyplot as plt
 
 from skdh.base import BaseProcess
 from skdh.utility.internal import get_day_index_intersection
@@ -95,6 +91,13 @@ class ActivityLevelClassification(BaseProcess):
         Two (2) element array-like of the base and period of the window to use for
         determining days. Default is (0, 24), which will look for days starting at
         midnight and lasting 24 hours. None removes any day-based windowing.
+    n_workers : int, optional
+        Number of workers to process days in parallel with. Default is 1, which
+        processes days serially. Days are always processed serially when plotting.
+    executor : {"process", "thread"}, optional
+        Type of pool to process days in parallel with. With "process", the data
+        arrays are shared with the workers through shared memory. Default is
+        "process".
 
     Notes
     -----
@@ -137,6 +140,11 @@ class ActivityLevelClassification(BaseProcess):
         Am J Epidemiol, vol. 179, no. 6, pp. 781–790, Mar. 2014, doi: 10.1093/aje/kwt330.
     """
 
+    _consumes = ("time", "accel", "fs", "wear", "sleep", "day_ends")
+    _produces = ()
+    _chunkable = True
+    _day_key = "Day N"
+
     act_levels = ["MVPA", "sed", "light", "mod", "vig"]
 
     def __init__(
@@ -150,6 +158,8 @@ class ActivityLevelClassification(BaseProcess):
         min_wear_time=10,
         cutpoints="migueles_wrist_adult",
         day_window=(0, 24),
+        n_workers=1,
+        executor="process",
     ):
         # make sure that the short_wlen is a factor of 60, and if not send it to
         # nearest factor
@@ -178,7 +188,10 @@ class ActivityLevelClassification(BaseProcess):
             min_wear_time=min_wear_time,
             cutpoints=cutpoints_,
             day_window=day_window,
+            n_workers=n_workers,
+            executor=executor,
         )
+        self._set_day_workers(n_workers, executor)
 
         self.wlen = short_wlen
         self.max_acc_lens = max_accel_lens
@@ -287,6 +300,9 @@ class ActivityLevelClassification(BaseProcess):
         if save_name is None:
             return
 
+        import matplotlib
+        import matplotlib.pyplot as plt
+
         # move this inside here so that it doesnt effect everything on load
         if gettrace() is None:  # only set if not debugging
             matplotlib.use("PDF")  # non-interactiv, dont want to spam plots
@@ -354,104 +370,164 @@ class ActivityLevelClassification(BaseProcess):
         # SETUP RESULTS KEYS/ENDPOINTS
         # ==============================================================================
         n_ = self.day_idx[0].size
+        res = self._initialize_results(n_)
+
+        # =============================================================================
+        # PROCESSING
+        # =============================================================================
+        day_results = self._map_days(
+            "_predict_day",
+            *self.day_idx,
+            {self._time: time, self._acc: accel},
+            fs=fs,
+            sleep_starts=sleep_starts,
+            sleep_stops=sleep_stops,
+            nwlen=nwlen,
+            nwlen_60=nwlen_60,
+            epm=epm,
+        )
+        # each day only fills out its own results
+        for iday, day_res in enumerate(day_results):
+            for k in res:
+                res[k][iday] = day_res[k][iday]
+
+        # finalize plots
+        self._finalize_plots()
+
+        kwargs.update({self._time: time, self._acc: accel, "fs": fs, "wear": wear})
+
+        return (kwargs, res) if self._in_pipeline else res
+
+    def _initialize_results(self, n_days):
+        """
+        Initialize the results dictionary.
+
+        Parameters
+        ----------
+        n_days : int
+            Number of days.
+
+        Returns
+        -------
+        results : dict
+            Dictionary of results values.
+        """
         res = {
-            "Date": full(n_, "", dtype="U11"),
-            "Weekday": full(n_, "", dtype="U11"),
-            "Day N": full(n_, -1, dtype="int"),
-            "N hours": full(n_, nan, dtype="float"),
-            "N wear hours": full(n_, nan, dtype="float"),
-            "N wear wake hours": full(n_, nan, dtype="float"),
+            "Date": full(n_days, "", dtype="U11"),
+            "Weekday": full(n_days, "", dtype="U11"),
+            "Day N": full(n_days, -1, dtype="int"),
+            "N hours": full(n_days, nan, dtype="float"),
+            "N wear hours": full(n_days, nan, dtype="float"),
+            "N wear wake hours": full(n_days, nan, dtype="float"),
         }
 
         for endpt in self.wake_endpoints + self.sleep_endpoints:
             if isinstance(endpt.name, (list, tuple)):
                 for name in endpt.name:
-                    res[name] = full(self.day_idx[0].size, nan, dtype="float")
+                    res[name] = full(n_days, nan, dtype="float")
             else:
-                res[endpt.name] = full(self.day_idx[0].size, nan, dtype="float")
+                res[endpt.name] = full(n_days, nan, dtype="float")
 
-        # =============================================================================
-        # PROCESSING
-        # =============================================================================
-        for iday, day_idx in enumerate(zip(*self.day_idx)):
-            day_start, day_stop = day_idx
-            # update the results dictionary with date strings, # of hours, etc
-            start_dt = _update_date_results(
-                res, time, iday, day_start, day_stop, self.day_key[0]
-            )
+        return res
 
-            # get the intersection of wear time and day
-            dwear_starts, dwear_stops = get_day_index_intersection(
-                *self.wear_idx, True, day_start, day_stop  # include wear time
-            )
+    def _predict_day(
+        self,
+        iday,
+        day_start,
+        day_stop,
+        *,
+        time,
+        accel,
+        fs,
+        sleep_starts,
+        sleep_stops,
+        nwlen,
+        nwlen_60,
+        epm,
+    ):
+        """
+        Compute the activity endpoints for a single day.
 
-            # PLOTTING. handle here before returning for minimal wear hours, etc
-            self._plot_day_accel(
-                iday,
-                fs,
-                accel[day_start:day_stop],
-                res["Date"][iday],
-                start_dt,
-            )
-            self._plot_day_wear(fs, dwear_starts, dwear_stops, start_dt, day_start)
-            # plotting sleep if it exists
-            self._plot_day_sleep(
-                fs, sleep_starts, sleep_stops, day_start, day_stop, start_dt
-            )
+        Returns
+        -------
+        results : dict
+            Dictionary of results values, where only the values for `iday` are
+            filled out.
+        """
+        res = self._initialize_results(self.day_idx[0].size)
 
-            # save wear time and check if there is less wear time than minimum
-            res["N wear hours"][iday] = around(
-                sum(dwear_stops - dwear_starts) / fs / 3600, 1
-            )
-            if res["N wear hours"][iday] < self.min_wear:
-                continue  # skip day if less than minimum specified hours of wear time
-
-            # if there is sleep data, add it to the intersection of indices
-            if sleep_starts is not None and sleep_stops is not None:
-                dwear_starts, dwear_stops = get_day_index_intersection(
-                    (self.wear_idx[0], sleep_starts),
-                    (self.wear_idx[1], sleep_stops),
-                    (True, False),  # include wear time, exclude sleeping time
-                    day_start,
-                    day_stop,
-                )
-                sleep_wear_starts, sleep_wear_stops = get_day_index_intersection(
-                    (self.wear_idx[0], sleep_starts),
-                    (self.wear_idx[1], sleep_stops),
-                    (True, True),  # now we want only sleep
-                    day_start,
-                    day_stop,
-                )
+        # update the results dictionary with date strings, # of hours, etc
+        start_dt = _update_date_results(
+            res, time, iday, day_start, day_stop, self.day_key[0]
+        )
 
-                res["N wear wake hours"][iday] = around(
-                    sum(dwear_stops - dwear_starts) / fs / 3600, 1
-                )
-            else:
-                sleep_wear_starts = sleep_wear_stops = None
+        # get the intersection of wear time and day
+        dwear_starts, dwear_stops = get_day_index_intersection(
+            *self.wear_idx, True, day_start, day_stop  # include wear time
+        )
+
+        # PLOTTING. handle here before returning for minimal wear hours, etc
+        self._plot_day_accel(
+            iday,
+            fs,
+            accel[day_start:day_stop],
+            res["Date"][iday],
+            start_dt,
+        )
+        self._plot_day_wear(fs, dwear_starts, dwear_stops, start_dt, day_start)
+        # plotting sleep if it exists
+        self._plot_day_sleep(
+            fs, sleep_starts, sleep_stops, day_start, day_stop, start_dt
+        )
+
+        # save wear time and check if there is less wear time than minimum
+        res["N wear hours"][iday] = around(
+            sum(dwear_stops - dwear_starts) / fs / 3600, 1
+        )
+        if res["N wear hours"][iday] < self.min_wear:
+            return res  # skip day if less than minimum specified hours of wear time
 
-            # compute waking hours activity endpoints
-            self._compute_awake_activity_endpoints(
-                res, accel, fs, iday, dwear_starts, dwear_stops, nwlen, nwlen_60, epm
+        # if there is sleep data, add it to the intersection of indices
+        if sleep_starts is not None and sleep_stops is not None:
+            dwear_starts, dwear_stops = get_day_index_intersection(
+                (self.wear_idx[0], sleep_starts),
+                (self.wear_idx[1], sleep_stops),
+                (True, False),  # include wear time, exclude sleeping time
+                day_start,
+                day_stop,
             )
-            # compute sleeping hours activity endpoints
-            self._compute_sleep_activity_endpoints(
-                res,
-                accel,
-                fs,
-                iday,
-                sleep_wear_starts,
-                sleep_wear_stops,
-                nwlen,
-                nwlen_60,
-                epm,
+            sleep_wear_starts, sleep_wear_stops = get_day_index_intersection(
+                (self.wear_idx[0], sleep_starts),
+                (self.wear_idx[1], sleep_stops),
+                (True, True),  # now we want only sleep
+                day_start,
+                day_stop,
             )
 
-        # finalize plots
-        self._finalize_plots()
+            res["N wear wake hours"][iday] = around(
+                sum(dwear_stops - dwear_starts) / fs / 3600, 1
+            )
+        else:
+            sleep_wear_starts = sleep_wear_stops = None
 
-        kwargs.update({self._time: time, self._acc: accel, "fs": fs, "wear": wear})
+        # compute waking hours activity endpoints
+        self._compute_awake_activity_endpoints(
+            res, accel, fs, iday, dwear_starts, dwear_stops, nwlen, nwlen_60, epm
+        )
+        # compute sleeping hours activity endpoints
+        self._compute_sleep_activity_endpoints(
+            res,
+            accel,
+            fs,
+            iday,
+            sleep_wear_starts,
+            sleep_wear_stops,
+            nwlen,
+            nwlen_60,
+            epm,
+        )
 
-        return (kwargs, res) if self._in_pipeline else res
+        return res
 
     def _initialize_awake_values(self, results, day_n):
         """
@@ -542,6 +618,9 @@ class ActivityLevelClassification(BaseProcess):
         if self.f is None:
             return
 
+        import matplotlib.lines as mlines
+        import matplotlib.pyplot as plt
+
         f, ax = plt.subplots(
             nrows=4,
             figsize=(12, 6),
@@ -683,6 +762,8 @@ class ActivityLevelClassification(BaseProcess):
         if self.f is None:
             return
 
+        from matplotlib.backends.backend_pdf import PdfPages
+
         date = datetime.today().strftime("%Y%m%d")
         form_fname = self.plot_fname.format(
             date=date, name=self._name, file=self._file_name
@@ -7,9 +7,271 @@ Copyright (c) 2021. Pfizer Inc. All rights reserved.
 from datetime import date as dt_date
 import logging
 from pathlib import Path
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import wraps
+from threading import local
+import weakref
 
-from pandas import DataFrame
-from numpy import array
+from numpy import array, ndarray, concatenate, full, dtype as np_dtype
+
+
+class SharedArray:
+    """
+    Handle to an array in shared memory (:mod:`multiprocessing.shared_memory`).
+    Handles are small when pickled, so they can be sent to other processes,
+    which attach to the same memory instead of receiving a copy of the array.
+    Processes accept handles in place of arrays, for example as the `time` and
+    `accel` of :meth:`BaseProcess.predict`. Requires Python 3.8 or later.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+    shape : tuple
+        Shape of the array.
+    dtype : {str, numpy.dtype}
+        Data type of the array.
+
+    Notes
+    -----
+    The process that creates the shared memory, with :meth:`from_array` or
+    :func:`share_arrays`, owns it and must call :meth:`unlink` (or
+    :func:`release_arrays`) when it is no longer needed. Arrays returned by
+    :meth:`asarray` stay valid after the memory is unlinked, until they are no
+    longer used.
+
+    Examples
+    --------
+    >>> data = share_arrays(ReadCwa().predict("example.cwa"))
+    >>> data["accel"]
+    SharedArray(name='psm_...', shape=(1000000, 3), dtype='<f8')
+    >>> with ProcessPoolExecutor(4) as pool:
+    >>>     results = list(pool.map(predict_subject, repeat(data, 4), processes))
+    >>> release_arrays(data)
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = np_dtype(dtype)
+
+        self._shm = None
+        self._array = None
+        self._owner = False
+
+    def __repr__(self):
+        return (
+            f"SharedArray(name={self.name!r}, shape={self.shape}, "
+            f"dtype={self.dtype.str!r})"
+        )
+
+    def __getstate__(self):
+        # only the description of the memory is sent to other processes
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __array__(self, dtype=None):
+        arr = self.asarray()
+        return arr if dtype is None else arr.astype(dtype, copy=False)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        n = 1
+        for s in self.shape:
+            n *= s
+        return n
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    @classmethod
+    def from_array(cls, value):
+        """
+        Copy an array into a new block of shared memory.
+
+        Parameters
+        ----------
+        value : numpy.ndarray
+            Array to copy. Must not be an object array.
+
+        Returns
+        -------
+        handle : SharedArray
+            Handle to the shared memory, owned by the calling process.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        if value.dtype.hasobject:
+            raise TypeError("Object arrays cannot be placed in shared memory.")
+
+        shm = SharedMemory(create=True, size=max(value.nbytes, 1))
+        handle = cls(shm.name, value.shape, value.dtype)
+        handle._shm = shm
+        handle._owner = True
+        handle.asarray()[...] = value
+
+        return handle
+
+    def asarray(self):
+        """
+        Get the shared array, attaching to the shared memory if necessary.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            Array using the shared memory. Changes are seen by all the
+            processes using the memory.
+        """
+        if self._array is None:
+            from multiprocessing.shared_memory import SharedMemory
+
+            shm = self._shm or SharedMemory(name=self.name)
+            self._array = ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+            # the memory is mapped until the array and its views are no longer used
+            weakref.finalize(self._array, shm.close)
+            self._shm = shm
+
+        return self._array
+
+    def close(self):
+        """
+        Stop using the shared memory from this handle. Arrays already returned
+        by :meth:`asarray` are still valid.
+        """
+        self._array = None
+        self._shm = None
+
+    def unlink(self):
+        """
+        Free the shared memory once all processes have stopped using it. Only
+        has an effect for the handle that created the memory.
+        """
+        if self._owner:
+            from multiprocessing.shared_memory import SharedMemory
+
+            if self._shm is not None:
+                self._shm.unlink()
+            else:
+                # reattach by name, as this handle was already closed
+                try:
+                    shm = SharedMemory(name=self.name)
+                except FileNotFoundError:
+                    pass
+                else:
+                    shm.unlink()
+                    shm.close()
+            self._owner = False
+        self.close()
+
+
+def share_arrays(data):
+    """
+    Place the arrays of a dictionary, for example the output of a reader, in
+    shared memory.
+
+    Parameters
+    ----------
+    data : dict
+        Data to share. Arrays, including arrays in nested dictionaries (eg the
+        `day_ends`), are placed in shared memory. Object arrays and other
+        values are not changed.
+
+    Returns
+    -------
+    shared : dict
+        Copy of `data` with :class:`SharedArray` handles in place of the arrays.
+        Must be passed to :func:`release_arrays` when no longer needed.
+    """
+    shared = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            shared[key] = share_arrays(value)
+        elif isinstance(value, ndarray) and not value.dtype.hasobject:
+            shared[key] = SharedArray.from_array(value)
+        else:
+            shared[key] = value
+    return shared
+
+
+def release_arrays(data):
+    """
+    Free the shared memory of the :class:`SharedArray` handles in a dictionary
+    created by :func:`share_arrays`.
+
+    Parameters
+    ----------
+    data : dict
+        Data with shared arrays.
+    """
+    for value in data.values():
+        if isinstance(value, dict):
+            release_arrays(value)
+        elif isinstance(value, SharedArray):
+            value.unlink()
+
+
+def _resolve_shared(value):
+    """
+    Get the arrays of :class:`SharedArray` handles, including in (nested)
+    dictionaries. Other values are returned unchanged.
+    """
+    if isinstance(value, SharedArray):
+        return value.asarray()
+    if isinstance(value, dict) and any(
+        isinstance(v, (SharedArray, dict)) for v in value.values()
+    ):
+        return {k: _resolve_shared(v) for k, v in value.items()}
+    return value
+
+
+def _accept_shared(predict):
+    """
+    Wrap a predict method so that it is passed arrays in place of
+    :class:`SharedArray` handles.
+    """
+
+    @wraps(predict)
+    def wrapper(self, *args, **kwargs):
+        args = [_resolve_shared(a) for a in args]
+        kwargs = {k: _resolve_shared(v) for k, v in kwargs.items()}
+        return predict(self, *args, **kwargs)
+
+    wrapper._accepts_shared = True
+    return wrapper
+
+
+# process copy and shared arrays for each worker of `BaseProcess._map_days`
+_day_worker = local()
+
+
+def _init_day_process_worker(process, shared):
+    _day_worker.process = process
+    _day_worker.arrays = {k: _resolve_shared(v) for k, v in shared.items()}
+
+
+def _run_process_day(method, iday, start, stop, kwargs):
+    fn = getattr(_day_worker.process, method)
+    return fn(iday, start, stop, **_day_worker.arrays, **kwargs)
+
+
+def _run_thread_day(process, method, iday, start, stop, shared, kwargs):
+    # each thread gets its own copy of the process, as the days modify its state
+    if getattr(_day_worker, "source", None) is not process:
+        _day_worker.source = process
+        _day_worker.process = deepcopy(process)
+    fn = getattr(_day_worker.process, method)
+    return fn(iday, start, stop, **shared, **kwargs)
 
 
 class BaseProcess:
@@ -28,6 +290,28 @@ class BaseProcess:
     _temp = "temperature"
     _days = "day_ends"
 
+    # keys of the data that predict uses, and that it creates or changes. Used
+    # by the Pipeline to order steps and to drop data no longer needed. None
+    # means the process may use or change any of the data.
+    _consumes = None
+    _produces = None
+    # if the output of predict can be loaded from the Pipeline cache instead of
+    # running the process
+    _cacheable = True
+    # if the process can be run on one day window of a recording at a time, with
+    # the results of the windows combined by `_stitch_results`. Used by
+    # `Pipeline.run_windowed`
+    _chunkable = False
+    # key of the day number in the results, renumbered when combining windows
+    _day_key = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # accept SharedArray handles in place of arrays
+        predict = cls.__dict__.get("predict", None)
+        if predict is not None and not getattr(predict, "_accepts_shared", False):
+            cls.predict = _accept_shared(predict)
+
     def __str__(self):
         return self._name
 
@@ -62,6 +346,7 @@ class BaseProcess:
         self._in_pipeline = False  # initialize to false.  Will be set by the pipeline
         self.pipe_save_file = None  # initialize to None, will be set/used by pipeline
         self.pip_plot_file = None  # will be set/used by Pipeline only
+        self._sink = None  # result sink, will be set by the pipeline
 
         self._kw = kwargs
 
@@ -77,6 +362,10 @@ class BaseProcess:
         # file name saving
         self._file_name = ""
 
+        # parallel processing of days
+        self.n_workers = 1
+        self.executor = "process"
+
         # for plotting
         self.f = self.ax = self.plot_fname = None
 
@@ -114,6 +403,124 @@ class BaseProcess:
 
         return start, stop
 
+    def _set_day_workers(self, n_workers, executor):
+        """
+        Set up processing days in parallel, for processes that compute days
+        using :meth:`_map_days`.
+
+        Parameters
+        ----------
+        n_workers : int
+            Number of workers to process days with. 1 processes days serially.
+        executor : {"process", "thread"}
+            Type of pool to process days with.
+        """
+        if executor not in ["process", "thread"]:
+            raise ValueError("`executor` must be one of 'process' or 'thread'.")
+        self.n_workers = max(int(n_workers), 1)
+        self.executor = executor
+
+    def _map_days(self, method, starts, stops, shared, **kwargs):
+        """
+        Compute each day with a per-day method of the process, in parallel if
+        set up with more than 1 worker. Days are always computed serially while
+        plotting, as the plots are built on the process.
+
+        Parameters
+        ----------
+        method : str
+            Name of the method to call for each day, as
+            `method(iday, start, stop, **shared, **kwargs)`. Must not depend on
+            changes it makes to the process state between days.
+        starts : numpy.ndarray
+            Day start indices.
+        stops : numpy.ndarray
+            Day stop indices.
+        shared : dict
+            Arrays (or None) used by all the days, eg `time` and `accel`. When
+            using a process pool these are placed in shared memory, and the
+            workers are passed views of the shared memory.
+        kwargs
+            Other (small) key-word arguments passed to each day.
+
+        Returns
+        -------
+        results : list
+            Results for each day, in day order.
+        """
+        days = [
+            (i, int(start), int(stop))
+            for i, (start, stop) in enumerate(zip(starts, stops))
+        ]
+        n_workers = min(self.n_workers, len(days))
+
+        if n_workers < 2 or self.f is not None:
+            fn = getattr(self, method)
+            return [fn(*day, **shared, **kwargs) for day in days]
+
+        if self.executor == "thread":
+            with ThreadPoolExecutor(n_workers) as pool:
+                futures = [
+                    pool.submit(_run_thread_day, self, method, *day, shared, kwargs)
+                    for day in days
+                ]
+                return [f.result() for f in futures]
+
+        shared = share_arrays(shared)
+        try:
+            with ProcessPoolExecutor(
+                n_workers, initializer=_init_day_process_worker, initargs=(self, shared)
+            ) as pool:
+                futures = [
+                    pool.submit(_run_process_day, method, *day, kwargs) for day in days
+                ]
+                return [f.result() for f in futures]
+        finally:
+            release_arrays(shared)
+
+    def _stitch_results(self, results):
+        """
+        Combine the results of running the process on consecutive day windows
+        of a recording, one window at a time.
+
+        Parameters
+        ----------
+        results : list
+            Results of each window, in order. None for windows that were not
+            processed.
+
+        Returns
+        -------
+        results : {None, dict}
+            Combined results. Arrays are concatenated, lists are joined, and
+            other values are gathered into a list with one value per window.
+        """
+        windows = [(i, r) for i, r in enumerate(results) if r is not None]
+        if not windows:
+            return None
+
+        stitched = {}
+        for key in windows[0][1]:
+            values = [r[key] for _, r in windows]
+            if all(isinstance(v, ndarray) and v.ndim > 0 for v in values):
+                stitched[key] = concatenate(values, axis=0)
+            elif all(isinstance(v, (list, tuple)) for v in values):
+                stitched[key] = [x for v in values for x in v]
+            else:
+                stitched[key] = values
+
+        # each window is 1 day, numbered from 1 in its own results
+        if self._day_key in stitched:
+            days = [full(len(r[self._day_key]), i + 1) for i, r in windows]
+            if isinstance(stitched[self._day_key], ndarray):
+                stitched[self._day_key] = concatenate(days).astype(
+                    stitched[self._day_key].dtype
+                )
+            else:
+                stitched[self._day_key] = concatenate(days).tolist()
+
+        return stitched
+
     def predict(self, expect_days, expect_wear, *args, **kwargs):
         """
         Intended to be overwritten in the subclass. Should still be called
@@ -161,6 +568,7 @@ class BaseProcess:
         """
         # avoid circular import
         from skdh import __skdh_version__ as skdh_version
+        from pandas import DataFrame
 
         date = dt_date.today().strftime("%Y%m%d")
         version = skdh_version.replace(".", "")
@@ -181,13 +589,39 @@ class BaseProcess:
             "\n",
         ]
 
-        with open(file_name, "w") as f:
-            f.writelines(lines)
-
-        DataFrame(results).to_csv(file_name, index=False, mode="a")
+        self._write_table(DataFrame(results), file_name, header=lines)
 
         return file_name
 
+    def _write_table(self, table, file_name, header=None, name=None):
+        """
+        Write a table of results to a CSV file, or with the result sink of the
+        pipeline if it has one.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame
+            Table of results.
+        file_name : str
+            File name.
+        header : {None, list}, optional
+            Lines to write to the file before the table.
+        name : {None, str}, optional
+            Name of the results for the sink. Default is None, which uses the
+            name of the process.
+        """
+        from skdh.io.sinks import CsvSink
+
+        # without a pipeline sink, write the CSV file directly
+        sink = CsvSink(background=False) if self._sink is None else self._sink
+        sink.write(
+            table,
+            file_name,
+            name=self._name if name is None else name,
+            source=self._file_name,
+            header=header,
+        )
+
     def _setup_plotting(self, save_name):
         """
         Setup plotting. If this needs to be available to the end user, it should be aliased as
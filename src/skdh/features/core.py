@@ -8,8 +8,8 @@ from abc import ABC, abstractmethod
 from collections.abc import Iterator, Sequence
 import json
 from warnings import warn
+from sys import modules
 
-from pandas import DataFrame
 from numpy import float_, asarray, zeros, sum, moveaxis
 
 
@@ -258,8 +258,10 @@ class Bank:
         feats : numpy.ndarray
             Computed features.
         """
-        # standardize the input signal
-        if isinstance(signal, DataFrame):
+        # standardize the input signal. A DataFrame can only be passed if pandas
+        # has been imported already, so avoid importing it here
+        pandas = modules.get("pandas", None)
+        if pandas is not None and isinstance(signal, pandas.DataFrame):
             columns = columns if columns is not None else signal.columns
             x = signal[columns].values.astype(float_)
         else:
@@ -10,11 +10,8 @@ from warnings import warn
 from pathlib import Path
 from datetime import date as dt_date
 
-import h5py
 from numpy import mean, diff, asarray, sum, ndarray
 from numpy.linalg import norm
-import matplotlib
-import matplotlib.pyplot as plt
 
 from skdh.base import BaseProcess
 from skdh.utility.internal import apply_downsample, rle
@@ -34,6 +31,11 @@ class LowFrequencyError(Exception):
     pass
 
 
+def _no_classifier_save(time, starts, stops):
+    # module level so that Gait can be pickled for processing days in parallel
+    pass
+
+
 class Gait(BaseProcess):
     """
     Process IMU data to extract endpoints of gait. Detect gait, extract gait events
@@ -89,6 +91,13 @@ class Gait(BaseProcess):
         Two (2) element array-like of the base and period of the window to use for determining
         days. Default is (0, 24), which will look for days starting at midnight and lasting 24
         hours. None removes any day-based windowing.
+    n_workers : int, optional
+        Number of workers to process days in parallel with. Default is 1, which
+        processes days serially. Days are always processed serially when plotting.
+    executor : {"process", "thread"}, optional
+        Type of pool to process days in parallel with. With "process", the data
+        arrays are shared with the workers through shared memory. Default is
+        "process".
 
     Notes
     -----
@@ -148,6 +157,11 @@ class Gait(BaseProcess):
         doi: 10.3389/fneur.2017.00135.
     """
 
+    _consumes = ("time", "accel", "gyro", "fs", "height", "gait_pred", "day_ends")
+    _produces = ()
+    _chunkable = True
+    _day_key = "Day N"
+
     # gait parameters
     _params = [
         # event level endpoints
@@ -191,6 +205,8 @@ class Gait(BaseProcess):
         filter_cutoff=20.0,
         downsample_aa_filter=True,
         day_window=(0, 24),
+        n_workers=1,
+        executor="process",
     ):
         super().__init__(
             # key-word arguments for storage
@@ -207,7 +223,10 @@ class Gait(BaseProcess):
             filter_cutoff=filter_cutoff,
             downsample_aa_filter=downsample_aa_filter,
             day_window=day_window,
+            n_workers=n_workers,
+            executor=executor,
         )
+        self._set_day_workers(n_workers, executor)
 
         self.corr_accel_orient = correct_accel_orient
         self.use_opt_scale = use_cwt_scale_relation
@@ -229,7 +248,7 @@ class Gait(BaseProcess):
         self.aa_filter = downsample_aa_filter
 
         # for saving gait predictions
-        self._save_classifier_fn = lambda time, starts, stops: None
+        self._save_classifier_fn = _no_classifier_save
 
         # is plotting available/valid
         self.valid_plot = False
@@ -242,6 +261,8 @@ class Gait(BaseProcess):
             self.day_key = tuple(day_window)
 
     def _save_classifier_predictions(self, fname):  # pragma: no cover
+        import h5py
+
         def fn(time, starts, stops):
             with h5py.File(fname, "w") as f:
                 f["time"] = time
@@ -386,6 +407,9 @@ class Gait(BaseProcess):
         if save_file is None:
             return
 
+        import matplotlib
+        import matplotlib.pyplot as plt
+
         if gettrace() is None and not debug:  # only set if not debugging
             matplotlib.use("PDF")
             # non-interactive, don't want to be displaying plots constantly
@@ -550,87 +574,26 @@ class Gait(BaseProcess):
         )
         self._save_classifier_fn(time_ds, gbout_starts, gbout_stops)
 
-        gait_i = 0  # keep track of where everything is in the loops
-
-        for iday, (start, stop) in enumerate(zip(day_starts_ds, day_stops_ds)):
-
-            # GET GAIT BOUTS
-            # ==============
-            gait_bouts = get_gait_bouts(
-                gbout_starts,
-                gbout_stops,
-                start,
-                stop,
-                time_ds,
-                self.max_bout_sep,
-                self.min_bout,
-            )
-
-            for ibout, bout in enumerate(gait_bouts):
-                # get the gait events, vertical acceleration, and vertical axis
-                ic, fc, vert_acc, v_axis = get_gait_events(
-                    accel_ds[bout],
-                    goal_fs,
-                    time_ds[bout],
-                    wavelet_scale,
-                    self.filt_ord,
-                    self.filt_cut,
-                    self.corr_accel_orient,
-                    self.use_opt_scale,
-                )
-
-                # get the strides
-                strides_in_bout = get_strides(
-                    gait,
-                    vert_acc,
-                    gait_i,
-                    ic,
-                    fc,
-                    time_ds[bout],
-                    goal_fs,
-                    self.max_stride_time,
-                    self.loading_factor,
-                )
-
-                # check if strides are during turns
-                get_turns(
-                    gait,
-                    accel_ds[bout],
-                    gyro_ds[bout] if gyro_ds is not None else None,
-                    goal_fs,
-                    strides_in_bout,
-                )
-
-                # plotting
-                self._plot(time_ds, accel_ds, bout, ic, fc, gait, strides_in_bout)
-
-                # add inertial data to the aux dict for use in gait endpoints calculation
-                gait_aux["accel"].append(accel_ds[bout, :])
-                # add the index for the corresponding accel/velocity/position
-                gait_aux["inertial data i"].extend(
-                    [len(gait_aux["accel"]) - 1] * strides_in_bout
-                )
-                gait_aux["vert axis"].extend([v_axis] * strides_in_bout)
-
-                # save some default per bout endpoints
-                gait["Bout N"].extend([ibout + 1] * strides_in_bout)
-                gait["Bout Starts"].extend([time_ds[bout.start]] * strides_in_bout)
-                gait["Bout Duration"].extend(
-                    [(bout.stop - bout.start) / goal_fs] * strides_in_bout
-                )
-
-                gait["Bout Steps"].extend([strides_in_bout] * strides_in_bout)
-                gait["Gait Cycles"].extend(
-                    [sum(asarray(gait["forward cycles"][gait_i:]) == 2)]
-                    * strides_in_bout
-                )
-
-                gait_i += strides_in_bout
-
-            # add the day number
-            gait["Day N"].extend(
-                [iday + 1] * (len(gait["Bout N"]) - len(gait["Day N"]))
+        day_results = self._map_days(
+            "_predict_day",
+            day_starts_ds,
+            day_stops_ds,
+            {self._time: time_ds, self._acc: accel_ds, self._gyro: gyro_ds},
+            gbout_starts=gbout_starts,
+            gbout_stops=gbout_stops,
+            goal_fs=goal_fs,
+            wavelet_scale=wavelet_scale,
+            keys=(list(gait), list(gait_aux)),
+        )
+        for day_gait, day_aux in day_results:
+            for key in gait:
+                gait[key].extend(day_gait[key])
+            # offset the inertial data index by the bouts of the previous days
+            gait_aux["inertial data i"].extend(
+                [i + len(gait_aux["accel"]) for i in day_aux["inertial data i"]]
             )
+            gait_aux["accel"].extend(day_aux["accel"])
+            gait_aux["vert axis"].extend(day_aux["vert axis"])
 
         # convert to arrays
         for key in gait:
@@ -665,11 +628,121 @@ class Gait(BaseProcess):
         )
         return (kwargs, gait) if self._in_pipeline else gait
 
+    def _predict_day(
+        self,
+        iday,
+        start,
+        stop,
+        *,
+        time,
+        accel,
+        gyro,
+        gbout_starts,
+        gbout_stops,
+        goal_fs,
+        wavelet_scale,
+        keys,
+    ):
+        """
+        Compute the gait events for the gait bouts of a single day.
+
+        Returns
+        -------
+        gait : dict
+            Gait events and per bout values for the day.
+        gait_aux : dict
+            Auxiliary values for computing gait endpoints, with the inertial
+            data index relative to the bouts of the day.
+        """
+        gait = {k: [] for k in keys[0]}
+        gait_aux = {k: [] for k in keys[1]}
+
+        gait_i = 0  # keep track of where everything is in the loops
+
+        # GET GAIT BOUTS
+        # ==============
+        gait_bouts = get_gait_bouts(
+            gbout_starts,
+            gbout_stops,
+            start,
+            stop,
+            time,
+            self.max_bout_sep,
+            self.min_bout,
+        )
+
+        for ibout, bout in enumerate(gait_bouts):
+            # get the gait events, vertical acceleration, and vertical axis
+            ic, fc, vert_acc, v_axis = get_gait_events(
+                accel[bout],
+                goal_fs,
+                time[bout],
+                wavelet_scale,
+                self.filt_ord,
+                self.filt_cut,
+                self.corr_accel_orient,
+                self.use_opt_scale,
+            )
+
+            # get the strides
+            strides_in_bout = get_strides(
+                gait,
+                vert_acc,
+                gait_i,
+                ic,
+                fc,
+                time[bout],
+                goal_fs,
+                self.max_stride_time,
+                self.loading_factor,
+            )
+
+            # check if strides are during turns
+            get_turns(
+                gait,
+                accel[bout],
+                gyro[bout] if gyro is not None else None,
+                goal_fs,
+                strides_in_bout,
+            )
+
+            # plotting
+            self._plot(time, accel, bout, ic, fc, gait, strides_in_bout)
+
+            # add inertial data to the aux dict for use in gait endpoints calculation
+            gait_aux["accel"].append(accel[bout, :])
+            # add the index for the corresponding accel/velocity/position
+            gait_aux["inertial data i"].extend(
+                [len(gait_aux["accel"]) - 1] * strides_in_bout
+            )
+            gait_aux["vert axis"].extend([v_axis] * strides_in_bout)
+
+            # save some default per bout endpoints
+            gait["Bout N"].extend([ibout + 1] * strides_in_bout)
+            gait["Bout Starts"].extend([time[bout.start]] * strides_in_bout)
+            gait["Bout Duration"].extend(
+                [(bout.stop - bout.start) / goal_fs] * strides_in_bout
+            )
+
+            gait["Bout Steps"].extend([strides_in_bout] * strides_in_bout)
+            gait["Gait Cycles"].extend(
+                [sum(asarray(gait["forward cycles"][gait_i:]) == 2)] * strides_in_bout
+            )
+
+            gait_i += strides_in_bout
+
+        # add the day number
+        gait["Day N"].extend([iday + 1] * (len(gait["Bout N"]) - len(gait["Day N"])))
+
+        return gait, gait_aux
+
     def _initialize_plot(self, file):  # pragma: no cover
         """
         Setup the plot
         """
         if self.valid_plot and self.plot_fname is not None:
+            import matplotlib.pyplot as plt
+
             fname = Path(file).name if file is not None else "file-None"
 
             self.f, self.ax = plt.subplots(figsize=(12, 5))
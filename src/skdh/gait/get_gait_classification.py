@@ -9,7 +9,6 @@ from sys import version_info
 from numpy import isclose, where, diff, insert, append, ascontiguousarray, int_
 from numpy.linalg import norm
 from scipy.signal import butter, sosfiltfilt
-import lightgbm as lgb
 
 from skdh.utility import get_windowed_view
 from skdh.utility.internal import rle
@@ -78,7 +77,9 @@ def get_gait_classification_lgbm(gait_starts, gait_stops, accel, fs):
         accel_feats = feat_bank.compute(accel_w, fs=fs, axis=1, index_axis=None)
         # output shape is (18, 99), need to transpose when passing to classifier
 
-        # load the classification model
+        # load the classification model, importing lightgbm only when used
+        import lightgbm as lgb
+
         lgb_file = str(
             _resolve_path(
                 "skdh.gait.model", f"lgbm_gait_classifier_no-stairs_{suffix}.lgbm"
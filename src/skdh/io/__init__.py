@@ -27,18 +27,61 @@ These processes are generic and not limited to a specific device/manufacturer's
 
     ReadNumpyFile
     ReadCSV
+    write_numpy_file
+
+Caching
+-------
+
+Data read from files can be cached, so that reading the same file again loads
+memory-mapped arrays instead of parsing the file.
+
+.. autosummary::
+    :toctree: generated/
+
+    FileCache
+
+Result Sinks
+------------
+Results of pipeline steps can be written on a background thread, and the
+results of many files can be appended to one dataset.
+
+.. autosummary::
+    :toctree: generated/
+
+    CsvSink
+    ParquetSink
+    ParquetDatasetSink
+    HDFSink
 """
-from skdh.io.axivity import ReadCwa
-from skdh.io import axivity
-from skdh.io.geneactiv import ReadBin
-from skdh.io import geneactiv
-from skdh.io.apdm import ReadApdmH5
-from skdh.io import apdm
-from skdh.io.numpy_compressed import ReadNumpyFile
-from skdh.io import numpy_compressed
-from skdh.io.csv import ReadCSV
-from skdh.io import csv
-from skdh.io.utility import FileSizeError
+from sys import version_info
+from importlib import import_module
+
+# readers are imported when first used (PEP 562), so that using the cache does
+# not import the dependencies of every reader
+_attributes = {
+    "ReadCwa": "axivity",
+    "ReadBin": "geneactiv",
+    "ReadApdmH5": "apdm",
+    "ReadNumpyFile": "numpy_compressed",
+    "write_numpy_file": "numpy_compressed",
+    "ReadCSV": "csv",
+    "FileCache": "cache",
+    "CsvSink": "sinks",
+    "ParquetSink": "sinks",
+    "ParquetDatasetSink": "sinks",
+    "HDFSink": "sinks",
+    "FileSizeError": "utility",
+}
+_submodules = [
+    "axivity",
+    "geneactiv",
+    "apdm",
+    "numpy_compressed",
+    "csv",
+    "cache",
+    "sinks",
+    "utility",
+]
 
 __all__ = (
     "ReadCwa",
@@ -46,9 +89,42 @@ __all__ = (
     "ReadApdmH5",
     "ReadNumpyFile",
     "ReadCSV",
+    "write_numpy_file",
+    "FileCache",
+    "CsvSink",
+    "ParquetSink",
+    "ParquetDatasetSink",
+    "HDFSink",
     "axivity",
     "geneactiv",
     "apdm",
     "numpy_compressed",
     "csv",
+    "cache",
+    "sinks",
 )
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return import_module(f"skdh.io.{name}")
+    if name in _attributes:
+        return getattr(import_module(f"skdh.io.{_attributes[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | set(_attributes))
+
+
+if version_info < (3, 7):  # pragma: no cover :: no module __getattr__
+    from skdh.io.axivity import ReadCwa
+    from skdh.io.geneactiv import ReadBin
+    from skdh.io.apdm import ReadApdmH5
+    from skdh.io.numpy_compressed import ReadNumpyFile, write_numpy_file
+    from skdh.io.csv import ReadCSV
+    from skdh.io.cache import FileCache
+    from skdh.io.sinks import CsvSink, ParquetSink, ParquetDatasetSink, HDFSink
+    from skdh.io.utility import FileSizeError
+    from skdh.io import axivity, geneactiv, apdm, numpy_compressed, csv, cache
+    from skdh.io import sinks
@@ -1,5 +1,19 @@
-from .read import read_axivity, read_geneactiv
+from .read import (
+    read_axivity,
+    read_axivity_header,
+    read_axivity_chunk,
+    read_axivity_into,
+    read_geneactiv,
+    MAX_DAYS,
+)
 
 # from .gt3x_convert import read_gt3x
 
-__all__ = ("read_axivity", "read_geneactiv")  # , "read_gt3x")
+__all__ = (
+    "read_axivity",
+    "read_axivity_header",
+    "read_axivity_chunk",
+    "read_axivity_into",
+    "read_geneactiv",
+    "MAX_DAYS",
+)  # , "read_gt3x")
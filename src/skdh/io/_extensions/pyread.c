@@ -26,6 +26,12 @@ void geneactiv_set_error_message(int ierr)
         case GN_READ_E_BLOCK_DATA_3600 :
             PyErr_SetString(PyExc_RuntimeError, "Data length is shorter than 3600");
             break;
+        case GN_READ_E_BLOCK_SEQUENCE :
+            PyErr_SetString(PyExc_RuntimeError, "Page sequence number is larger than the number of pages");
+            break;
+        case GN_READ_E_MEMORY :
+            PyErr_NoMemory();
+            break;
         default :
             PyErr_SetString(PyExc_RuntimeError, "Unknown error reading GeneActiv file");
     }
@@ -61,18 +67,55 @@ void axivity_set_error_message(int ierr)
     }
 }
 
+/* set the error message for a failed read of a memory mapped file, if not already set */
+static void set_read_error(int ierr)
+{
+    if (PyErr_Occurred())
+        return;
+    if (ierr == AX_READ_E_NONE)  /* only allocation failures do not set ierr */
+        PyErr_NoMemory();
+    else
+        axivity_set_error_message(ierr);
+}
+
+
+/* point the outputs into a combined (N, 3/6/9) [Gy]Ax[Mag] array */
+static void set_combined_output(AX_Out_t *out, AX_Info_t *info, double *imu, double *ts, double *temp)
+{
+    out->ts = ts;
+    out->temp = (char *)temp;
+    out->stride = info->axes;
+    out->acc_f32 = out->gyr_f32 = out->mag_f32 = out->temp_f32 = 0;
+    out->gyr = out->mag = NULL;
+
+    if (info->axes == 3)
+    {
+        out->acc = (char *)imu;
+    }
+    else
+    {
+        out->gyr = (char *)imu;
+        out->acc = (char *)(imu + 3);
+        if (info->axes == 9)
+            out->mag = (char *)(imu + 6);
+    }
+}
+
+
 static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
 {
     char *file;
     Py_ssize_t flen;
-    int ierr = AX_READ_E_NONE, fail = 0;
+    int ierr = AX_READ_E_NONE, fail = 0, n_threads = 1;
     PyObject *bases_, *periods_;
 
     AX_Info_t info;
+    Map_t map;
+    AX_Out_t out;
     Window_t winfo;
 
     /* READ INPUT ARGUMENTS */
-    if (!PyArg_ParseTuple(args, "sOO:read_axivity", &file, &bases_, &periods_))
+    if (!PyArg_ParseTuple(args, "sOO|i:read_axivity", &file, &bases_, &periods_, &n_threads))
         return NULL;
     flen = strlen(file);
     
@@ -110,13 +153,12 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
     info.max_days = MAX_DAYS;
     info.Nwin = winfo.n;
 
-    /* read the header */
+    /* read the header, data is read from the memory mapped file */
     axivity_read_header(&flen, file, &info, &ierr);
+    axivity_close(&info);
 
     if (ierr != AX_READ_E_NONE)
     {
-        axivity_close(&info);
-
         free(winfo.i_start);
         free(winfo.i_stop);
         Py_XDECREF(bases);
@@ -128,8 +170,6 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
 
     if ((info.nblocks == -1) || (info.axes == -1) || (info.count == -1))
     {
-        axivity_close(&info);
-
         free(winfo.i_start);
         free(winfo.i_stop);
         Py_XDECREF(bases);
@@ -138,6 +178,10 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
         return NULL;
     }
 
+    /* reading the whole file, all blocks are stored */
+    info.block_offset = 0;
+    info.nblocks_out = info.nblocks - 2;
+
     /* DIMENSIONS FOR RETURN VALUES */
     npy_intp dim3[2] = {(info.nblocks - 2) * info.count, info.axes};
     npy_intp dim1[1] = {(info.nblocks - 2) * info.count};
@@ -151,10 +195,10 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
     PyArrayObject *starts = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
     PyArrayObject *stops  = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
 
-    if (!imudata || !time || !temperature || !starts || !stops)
-    {   
-        axivity_close(&info);
+    out.filled = (uint8_t *)calloc(info.nblocks_out, sizeof(uint8_t));
 
+    if (!imudata || !time || !temperature || !starts || !stops || !out.filled)
+    {
         Py_XDECREF(bases);
         Py_XDECREF(periods);
 
@@ -166,45 +210,36 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
 
         free(winfo.i_start);
         free(winfo.i_stop);
+        free(out.filled);
 
+        if (!PyErr_Occurred())
+            PyErr_NoMemory();
         return NULL;
     }
 
     /* SET POINTERS */
-    double *imu_p   = (double *)PyArray_DATA(imudata);
-    double *ts_p    = (double *)PyArray_DATA(time);
-    double *temp_p = (double *)PyArray_DATA(temperature);
+    set_combined_output(&out, &info, (double *)PyArray_DATA(imudata),
+        (double *)PyArray_DATA(time), (double *)PyArray_DATA(temperature));
     long *starts_p = (long *)PyArray_DATA(starts);
     long *stops_p  = (long *)PyArray_DATA(stops);
 
     /* READ FILE */
-    long pos = 0;
-    for (int i=2; i < info.nblocks; ++i)
-    {
-        pos = 512 * i + 1;  /* +1 to account for fortran numbering */
-        axivity_read_block(&info, &pos, imu_p, ts_p, temp_p, winfo.bases, winfo.periods,
-            starts_p, winfo.i_start, stops_p, winfo.i_stop, &ierr);
-        
-        if (ierr != 0)
-        {
-            PyErr_SetString(PyExc_RuntimeError, "Error reading axivity data block.");
-            fail = 1;
-            break;
-        }
+    if (map_file(file, &map) != 0)
+    {
+        PyErr_SetString(PyExc_IOError, "Error memory mapping the file");
+        fail = 1;
     }
-
-    /* adjust timestamps if there were bad blocks */
-    if (info.n_bad_blocks > 0)
+    else
     {
-        adjust_timestamps(&info, ts_p, &ierr);
-        if (ierr != 0)
-        {
-            fail = 1;
-        }
+        Py_BEGIN_ALLOW_THREADS
+        fail = axivity_read_mapped(&info, map.data, 2, info.nblocks, &out, &winfo, starts_p,
+            stops_p, n_threads, &ierr);
+        Py_END_ALLOW_THREADS
+        unmap_file(&map);
     }
 
     /* set a warning for the number of bad blocks */
-    if (info.n_bad_blocks > 0)
+    if (!fail && (info.n_bad_blocks > 0))
     {
         fprintf(stdout, "WARNING: %li bad blocks\n", info.n_bad_blocks);
         int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Bad data blocks present", 1);
@@ -215,9 +250,9 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
         }
     }
 
-    axivity_close(&info);
     free(winfo.i_start);
     free(winfo.i_stop);
+    free(out.filled);
 
     /* decrease ref count if successful or failed */
     Py_XDECREF(bases);
@@ -231,7 +266,7 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
         Py_XDECREF(starts);
         Py_XDECREF(stops);
 
-        axivity_set_error_message(ierr);
+        set_read_error(ierr);
         return NULL;
     }
 
@@ -248,13 +283,483 @@ static PyObject *read_axivity(PyObject *NPY_UNUSED(self), PyObject *args)
 }
 
 
+static PyObject *read_axivity_header(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    char *file;
+    Py_ssize_t flen;
+    int ierr = AX_READ_E_NONE;
+
+    AX_Info_t info;
+
+    if (!PyArg_ParseTuple(args, "s:read_axivity_header", &file))
+        return NULL;
+    flen = strlen(file);
+
+    /* INITIALIZATION */
+    info.nblocks = -1;
+    info.axes = -1;
+    info.count = -1;
+    info.max_days = MAX_DAYS;
+    info.Nwin = 0;
+
+    axivity_read_header(&flen, file, &info, &ierr);
+    axivity_close(&info);
+
+    if (ierr != AX_READ_E_NONE)
+    {
+        axivity_set_error_message(ierr);
+        return NULL;
+    }
+    if ((info.nblocks == -1) || (info.axes == -1) || (info.count == -1))
+    {
+        PyErr_SetString(PyExc_IOError, "Bad read on number of blocks, axes, or samples");
+        return NULL;
+    }
+
+    return Py_BuildValue("diii", info.frequency, info.nblocks, (int)info.axes, (int)info.count);
+}
+
+
+/* check that an array can be used to carry windowing state between calls */
+static int check_window_state(PyArrayObject *arr, int ndim, npy_intp d0, npy_intp d1)
+{
+    if ((PyArray_TYPE(arr) != NPY_LONG) || !PyArray_ISCARRAY(arr) || (PyArray_NDIM(arr) != ndim))
+    {
+        PyErr_SetString(PyExc_ValueError, "Window state arrays must be writeable, C-contiguous, and of type long.");
+        return 0;
+    }
+    if ((PyArray_DIM(arr, 0) != d0) || ((ndim == 2) && (PyArray_DIM(arr, 1) != d1)))
+    {
+        PyErr_SetString(PyExc_ValueError, "Window state array has the wrong shape.");
+        return 0;
+    }
+    return 1;
+}
+
+
+static PyObject *read_axivity_chunk(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    char *file;
+    Py_ssize_t flen;
+    long block_start, block_stop;
+    double t_last;
+    int ierr = AX_READ_E_NONE, fail = 0, n_threads = 1;
+    PyObject *bases_, *periods_;
+    PyArrayObject *starts, *stops, *i_start, *i_stop;
+
+    AX_Info_t info;
+    Map_t map;
+    AX_Out_t out;
+    Window_t winfo;
+
+    /* READ INPUT ARGUMENTS */
+    if (!PyArg_ParseTuple(
+        args,
+        "sOOlldO!O!O!O!|i:read_axivity_chunk",
+        &file, &bases_, &periods_, &block_start, &block_stop, &t_last,
+        &PyArray_Type, &starts, &PyArray_Type, &stops, &PyArray_Type, &i_start, &PyArray_Type, &i_stop,
+        &n_threads
+    ))
+        return NULL;
+    flen = strlen(file);
+
+    /* GET NUMPY ARRAYS */
+    PyArrayObject *bases = (PyArrayObject *)NP_FROM_ANY(bases_);
+    PyArrayObject *periods = (PyArrayObject *)NP_FROM_ANY(periods_);
+
+    if (!bases || !periods)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        return NULL;
+    }
+
+    /* WINDOWING INFO INIT */
+    winfo.n = PyArray_Size(bases);
+    if (winfo.n != PyArray_Size(periods))
+    {
+        Py_XDECREF(bases); Py_XDECREF(periods);
+        PyErr_SetString(PyExc_ValueError, "Size mismatch between bases and periods.");
+        return NULL;
+    }
+    /* window indices are carried between calls by the caller */
+    if (!check_window_state(starts, 2, MAX_DAYS, winfo.n)
+        || !check_window_state(stops, 2, MAX_DAYS, winfo.n)
+        || !check_window_state(i_start, 1, winfo.n, 0)
+        || !check_window_state(i_stop, 1, winfo.n, 0))
+    {
+        Py_XDECREF(bases); Py_XDECREF(periods);
+        return NULL;
+    }
+    winfo.i_start = (long *)PyArray_DATA(i_start);
+    winfo.i_stop = (long *)PyArray_DATA(i_stop);
+    winfo.bases = (long *)PyArray_DATA(bases);
+    winfo.periods = (long *)PyArray_DATA(periods);
+
+    /* INITIALIZATION */
+    info.nblocks = -1;
+    info.axes = -1;
+    info.count = -1;
+    info.max_days = MAX_DAYS;
+    info.Nwin = winfo.n;
+
+    /* read the header, data is read from the memory mapped file */
+    axivity_read_header(&flen, file, &info, &ierr);
+    axivity_close(&info);
+
+    if (ierr != AX_READ_E_NONE)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+
+        axivity_set_error_message(ierr);
+        return NULL;
+    }
+
+    if ((info.nblocks == -1) || (info.axes == -1) || (info.count == -1))
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        PyErr_SetString(PyExc_IOError, "Bad read on number of blocks, axes, or samples");
+        return NULL;
+    }
+
+    /* first 2 blocks are the header */
+    if ((block_start < 2) || (block_stop > info.nblocks) || (block_stop <= block_start))
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        PyErr_SetString(PyExc_ValueError, "Invalid block range for the file.");
+        return NULL;
+    }
+
+    /* only the requested blocks are stored, and timestamps continue from the last chunk */
+    info.block_offset = block_start - 2;
+    info.nblocks_out = block_stop - block_start;
+    info.tLast = t_last;
+
+    /* DIMENSIONS FOR RETURN VALUES */
+    npy_intp dim3[2] = {info.nblocks_out * info.count, info.axes};
+    npy_intp dim1[1] = {info.nblocks_out * info.count};
+
+    /* DATA ARRAYS */
+    PyArrayObject *imudata = (PyArrayObject *)PyArray_ZEROS(2, dim3, NPY_DOUBLE, 0);
+    PyArrayObject *time  = (PyArrayObject *)PyArray_ZEROS(1, dim1, NPY_DOUBLE, 0);
+    PyArrayObject *temperature = (PyArrayObject *)PyArray_ZEROS(1, dim1, NPY_DOUBLE, 0);
+
+    out.filled = (uint8_t *)calloc(info.nblocks_out, sizeof(uint8_t));
+
+    if (!imudata || !time || !temperature || !out.filled)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+
+        Py_XDECREF(imudata);
+        Py_XDECREF(time);
+        Py_XDECREF(temperature);
+        free(out.filled);
+
+        if (!PyErr_Occurred())
+            PyErr_NoMemory();
+        return NULL;
+    }
+
+    /* SET POINTERS */
+    set_combined_output(&out, &info, (double *)PyArray_DATA(imudata),
+        (double *)PyArray_DATA(time), (double *)PyArray_DATA(temperature));
+    long *starts_p = (long *)PyArray_DATA(starts);
+    long *stops_p  = (long *)PyArray_DATA(stops);
+
+    /* READ FILE */
+    if (map_file(file, &map) != 0)
+    {
+        PyErr_SetString(PyExc_IOError, "Error memory mapping the file");
+        fail = 1;
+    }
+    else
+    {
+        Py_BEGIN_ALLOW_THREADS
+        fail = axivity_read_mapped(&info, map.data, block_start, block_stop, &out, &winfo,
+            starts_p, stops_p, n_threads, &ierr);
+        Py_END_ALLOW_THREADS
+        unmap_file(&map);
+    }
+    free(out.filled);
+
+    /* set a warning for the number of bad blocks */
+    if (!fail && (info.n_bad_blocks > 0))
+    {
+        int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Bad data blocks present", 1);
+
+        if (err_ret == -1)  /* warnings are being raised as exceptions */
+        {
+            fail = 1;
+        }
+    }
+
+    Py_XDECREF(bases);
+    Py_XDECREF(periods);
+
+    if (fail)
+    {
+        Py_XDECREF(imudata);
+        Py_XDECREF(time);
+        Py_XDECREF(temperature);
+
+        set_read_error(ierr);
+        return NULL;
+    }
+
+    return Py_BuildValue(
+        "dlNNNd",  /* need to use N to not increment reference counter */
+        info.frequency,
+        info.n_bad_blocks * info.count,
+        (PyObject *)imudata,
+        (PyObject *)time,
+        (PyObject *)temperature,
+        info.tLast
+    );
+}
+
+
+/*
+check a caller provided output array. Returns a pointer to the data, or NULL with an error set.
+`obj` can be None if `required` is 0, in which case NULL is returned without an error.
+*/
+static char *check_output_array(PyObject *obj, const char *name, npy_intp n, int ndim, int allow_f32, int *is_f32, int required)
+{
+    *is_f32 = 0;
+    if (obj == Py_None)
+    {
+        if (required)
+            PyErr_Format(PyExc_ValueError, "`%s` output array is required for this file.", name);
+        return NULL;
+    }
+    if (!required)
+    {
+        PyErr_Format(PyExc_ValueError, "`%s` is not in the file, output array must be None.", name);
+        return NULL;
+    }
+    if (!PyArray_Check(obj))
+    {
+        PyErr_Format(PyExc_TypeError, "`%s` output must be a numpy array.", name);
+        return NULL;
+    }
+    PyArrayObject *arr = (PyArrayObject *)obj;
+
+    if (PyArray_TYPE(arr) == NPY_FLOAT && allow_f32)
+        *is_f32 = 1;
+    else if (PyArray_TYPE(arr) != NPY_DOUBLE)
+    {
+        PyErr_Format(PyExc_ValueError, "`%s` output array must be of type %s.", name, allow_f32 ? "float64 or float32" : "float64");
+        return NULL;
+    }
+    if (!PyArray_ISCARRAY(arr))
+    {
+        PyErr_Format(PyExc_ValueError, "`%s` output array must be writeable, aligned, and C-contiguous.", name);
+        return NULL;
+    }
+    if ((PyArray_NDIM(arr) != ndim) || (PyArray_DIM(arr, 0) != n) || ((ndim == 2) && (PyArray_DIM(arr, 1) != 3)))
+    {
+        if (ndim == 2)
+            PyErr_Format(PyExc_ValueError, "`%s` output array must have shape (%zd, 3).", name, (Py_ssize_t)n);
+        else
+            PyErr_Format(PyExc_ValueError, "`%s` output array must have shape (%zd,).", name, (Py_ssize_t)n);
+        return NULL;
+    }
+    return (char *)PyArray_DATA(arr);
+}
+
+
+static PyObject *read_axivity_into(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    char *file;
+    Py_ssize_t flen;
+    int ierr = AX_READ_E_NONE, fail = 0, n_threads = 1;
+    PyObject *bases_, *periods_, *time_, *temp_, *acc_, *gyr_, *mag_;
+
+    AX_Info_t info;
+    Map_t map;
+    AX_Out_t out;
+    Window_t winfo;
+
+    /* READ INPUT ARGUMENTS */
+    if (!PyArg_ParseTuple(
+        args,
+        "sOOOOOOO|i:read_axivity_into",
+        &file, &bases_, &periods_, &time_, &temp_, &acc_, &gyr_, &mag_, &n_threads
+    ))
+        return NULL;
+    flen = strlen(file);
+
+    /* INITIALIZATION */
+    info.nblocks = -1;
+    info.axes = -1;
+    info.count = -1;
+    info.max_days = MAX_DAYS;
+    info.Nwin = 0;
+
+    /* read the header, data is read from the memory mapped file */
+    axivity_read_header(&flen, file, &info, &ierr);
+    axivity_close(&info);
+
+    if (ierr != AX_READ_E_NONE)
+    {
+        axivity_set_error_message(ierr);
+        return NULL;
+    }
+    if ((info.nblocks == -1) || (info.axes == -1) || (info.count == -1))
+    {
+        PyErr_SetString(PyExc_IOError, "Bad read on number of blocks, axes, or samples");
+        return NULL;
+    }
+
+    /* reading the whole file, all blocks are stored */
+    info.block_offset = 0;
+    info.nblocks_out = info.nblocks - 2;
+    npy_intp n = (npy_intp)info.nblocks_out * info.count;
+
+    /* CHECK OUTPUT ARRAYS */
+    int ts_f32;
+    out.ts = (double *)check_output_array(time_, "time", n, 1, 0, &ts_f32, 1);
+    if (!out.ts) return NULL;
+    out.temp = check_output_array(temp_, "temperature", n, 1, 1, &out.temp_f32, 1);
+    if (!out.temp) return NULL;
+    out.acc = check_output_array(acc_, "accel", n, 2, 1, &out.acc_f32, 1);
+    if (!out.acc) return NULL;
+    out.gyr = check_output_array(gyr_, "gyro", n, 2, 1, &out.gyr_f32, info.axes >= 6);
+    if (PyErr_Occurred()) return NULL;
+    out.mag = check_output_array(mag_, "magnet", n, 2, 1, &out.mag_f32, info.axes == 9);
+    if (PyErr_Occurred()) return NULL;
+    out.stride = 3;
+
+    /* GET NUMPY ARRAYS */
+    PyArrayObject *bases = (PyArrayObject *)NP_FROM_ANY(bases_);
+    PyArrayObject *periods = (PyArrayObject *)NP_FROM_ANY(periods_);
+
+    if (!bases || !periods)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        return NULL;
+    }
+
+    /* WINDOWING INFO INIT */
+    winfo.n = PyArray_Size(bases);
+    if (winfo.n != PyArray_Size(periods))
+    {
+        Py_XDECREF(bases); Py_XDECREF(periods);
+        PyErr_SetString(PyExc_ValueError, "Size mismatch between bases and periods.");
+        return NULL;
+    }
+    info.Nwin = winfo.n;
+
+    npy_intp dim_idx[2] = {MAX_DAYS, winfo.n};
+    PyArrayObject *starts = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
+    PyArrayObject *stops  = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
+
+    winfo.i_start = (long *)calloc(winfo.n, sizeof(long));
+    winfo.i_stop = (long *)calloc(winfo.n, sizeof(long));
+    winfo.bases = (long *)PyArray_DATA(bases);
+    winfo.periods = (long *)PyArray_DATA(periods);
+    out.filled = (uint8_t *)calloc(info.nblocks_out, sizeof(uint8_t));
+
+    if (!starts || !stops || !winfo.i_start || !winfo.i_stop || !out.filled)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        Py_XDECREF(starts);
+        Py_XDECREF(stops);
+        free(winfo.i_start);
+        free(winfo.i_stop);
+        free(out.filled);
+
+        if (!PyErr_Occurred())
+            PyErr_NoMemory();
+        return NULL;
+    }
+
+    /* MAP THE FILE */
+    if (map_file(file, &map) != 0)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        Py_XDECREF(starts);
+        Py_XDECREF(stops);
+        free(winfo.i_start);
+        free(winfo.i_stop);
+        free(out.filled);
+
+        PyErr_SetString(PyExc_IOError, "Error memory mapping the file");
+        return NULL;
+    }
+    if (map.size < 512 * (size_t)info.nblocks)
+    {
+        ierr = AX_READ_E_BAD_HEADER;
+        fail = 1;
+        PyErr_SetString(PyExc_IOError, "File is smaller than expected from the header");
+    }
+
+    /* READ FILE */
+    if (!fail)
+    {
+        long *starts_p = (long *)PyArray_DATA(starts);
+        long *stops_p  = (long *)PyArray_DATA(stops);
+
+        Py_BEGIN_ALLOW_THREADS
+        fail = axivity_read_mapped(&info, map.data, 2, info.nblocks, &out, &winfo, starts_p,
+            stops_p, n_threads, &ierr);
+        Py_END_ALLOW_THREADS
+    }
+
+    unmap_file(&map);
+    free(winfo.i_start);
+    free(winfo.i_stop);
+    free(out.filled);
+    Py_XDECREF(bases);
+    Py_XDECREF(periods);
+
+    /* set a warning for the number of bad blocks */
+    if (!fail && (info.n_bad_blocks > 0))
+    {
+        int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Bad data blocks present", 1);
+
+        if (err_ret == -1)  /* warnings are being raised as exceptions */
+        {
+            fail = 1;
+        }
+    }
+
+    if (fail)
+    {
+        Py_XDECREF(starts);
+        Py_XDECREF(stops);
+
+        set_read_error(ierr);
+        return NULL;
+    }
+
+    return Py_BuildValue(
+        "dlNN",  /* need to use N to not increment reference counter */
+        info.frequency,
+        info.n_bad_blocks * info.count,
+        (PyObject *)starts,
+        (PyObject *)stops
+    );
+}
+
+
 static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
 {
     char *file;
-    int ierr = GN_READ_E_NONE, fail = 0;
+    int ierr = GN_READ_E_NONE, fail = 0, n_threads = 1, fs_warn = 0, f32 = 0;
+    long hdr_end, n_found = 0, p1 = 0, p2 = 0;
+    double t_start = -HUGE_VAL, t_stop = HUGE_VAL;
+    size_t *offsets = NULL;
     PyObject *bases_, *periods_;
 
     FILE *fp;
+    Map_t map;
     GN_Info_t info;
     GN_Data_t data;
     Window_t winfo;
@@ -265,7 +770,7 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
     info.npages = -1;
 
     /* PYTHON ARGUMENTS */
-    if (!PyArg_ParseTuple(args, "sOO:read_geneactiv", &file, &bases_, &periods_))
+    if (!PyArg_ParseTuple(args, "sOO|iddp:read_geneactiv", &file, &bases_, &periods_, &n_threads, &t_start, &t_stop, &f32))
         return NULL;  /* error is set for us */
     
     /* GET NUMPY ARRAYS */
@@ -302,6 +807,8 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
     {
         Py_XDECREF(bases);
         Py_XDECREF(periods);
+        free(winfo.i_start);
+        free(winfo.i_stop);
         PyErr_SetString(PyExc_IOError, "Error opening file");
         return NULL;
     }
@@ -309,35 +816,78 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
     /* READ THE HEADER */
     DEBUG_PRINTF("Reading header\n");
     geneactiv_read_header(fp, &info);
+    /* pages are read from the memory mapped file */
+    hdr_end = ftell(fp);
+    fclose(fp);
 
-    if (info.npages == -1)
+    if ((info.npages == -1) || (hdr_end < 0))
     {
-        fclose(fp);
         Py_XDECREF(bases);
         Py_XDECREF(periods);
+        free(winfo.i_start);
+        free(winfo.i_stop);
         PyErr_SetString(PyExc_IOError, "Cannot read number of blocks");
         return NULL;
     }
 
+    /* FIND THE PAGES TO READ */
+    if (map_file(file, &map) != 0)
+    {
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        free(winfo.i_start);
+        free(winfo.i_stop);
+        PyErr_SetString(PyExc_IOError, "Error memory mapping the file");
+        return NULL;
+    }
+    offsets = (size_t *)malloc((info.npages > 0 ? info.npages : 1) * sizeof(size_t));
+    if (!offsets)
+    {
+        unmap_file(&map);
+        Py_XDECREF(bases);
+        Py_XDECREF(periods);
+        free(winfo.i_start);
+        free(winfo.i_stop);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    n_found = geneactiv_index_pages((const char *)map.data, map.size, (size_t)hdr_end, info.npages, offsets);
+    p2 = n_found;
+    /* only read the pages in the time range */
+    if ((t_start > -HUGE_VAL) || (t_stop < HUGE_VAL))
+        geneactiv_find_pages((const char *)map.data, map.size, offsets, n_found, t_start, t_stop, &p1, &p2);
+    Py_END_ALLOW_THREADS
+
+    info.page_start = 0;
+    info.npages_out = info.npages;
+    if ((p1 > 0) || (p2 < n_found))
+    {
+        long N;
+        double t0;
+        info.npages_out = p2 - p1;
+        if ((p2 > p1) && (geneactiv_page_info((const char *)map.data, map.size, offsets[p1], &N, &t0) == 0))
+            info.page_start = N;
+    }
+
     /* DIMENSIONS FOR RETURN VALUES */
-    npy_intp dim3[2] = {info.npages * GN_SAMPLES, 3};
-    npy_intp dim1[1] = {info.npages * GN_SAMPLES};
+    npy_intp dim3[2] = {info.npages_out * GN_SAMPLES, 3};
+    npy_intp dim1[1] = {info.npages_out * GN_SAMPLES};
 
     npy_intp dim_idx[2] = {MAX_DAYS, winfo.n};
 
     /* DATA ARRAYS */
-    PyArrayObject *accel = (PyArrayObject *)PyArray_ZEROS(2, dim3, NPY_DOUBLE, 0);
+    int dtype = f32 ? NPY_FLOAT : NPY_DOUBLE;
+    PyArrayObject *accel = (PyArrayObject *)PyArray_ZEROS(2, dim3, dtype, 0);
     PyArrayObject *time  = (PyArrayObject *)PyArray_ZEROS(1, dim1, NPY_DOUBLE, 0);
-    PyArrayObject *light = (PyArrayObject *)PyArray_ZEROS(1, dim1, NPY_DOUBLE, 0);
-    PyArrayObject *temp  = (PyArrayObject *)PyArray_ZEROS(1, dim1, NPY_DOUBLE, 0);
+    PyArrayObject *light = (PyArrayObject *)PyArray_ZEROS(1, dim1, dtype, 0);
+    PyArrayObject *temp  = (PyArrayObject *)PyArray_ZEROS(1, dim1, dtype, 0);
 
     PyArrayObject *starts = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
     PyArrayObject *stops  = (PyArrayObject *)PyArray_ZEROS(2, dim_idx, NPY_LONG, 0);
 
     if (!accel || !time || !light || !temp || !starts || !stops)
     {
-        fclose(fp);
-
         Py_XDECREF(bases);
         Py_XDECREF(periods);
 
@@ -350,54 +900,51 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
 
         free(winfo.i_start);
         free(winfo.i_stop);
+        free(offsets);
+        unmap_file(&map);
 
         return NULL;
     }
 
     /* SET POINTERS */
-    data.acc   = (double *)PyArray_DATA(accel);
+    data.acc   = (char *)PyArray_DATA(accel);
     data.ts    = (double *)PyArray_DATA(time);
-    data.light = (double *)PyArray_DATA(light);
-    data.temp  = (double *)PyArray_DATA(temp);
+    data.light = (char *)PyArray_DATA(light);
+    data.temp  = (char *)PyArray_DATA(temp);
     data.day_starts = (long *)PyArray_DATA(starts);
     data.day_stops  = (long *)PyArray_DATA(stops);
+    data.f32 = f32;
     
     /* READ FILE */
     DEBUG_PRINTF("Reading pages\n");
-    for (int i = 0; i < info.npages; ++i)
+    Py_BEGIN_ALLOW_THREADS
+    ierr = geneactiv_read_mapped((const char *)map.data, map.size, offsets, p1, p2, n_found, &info,
+        &data, &winfo, n_threads, &fs_warn);
+    Py_END_ALLOW_THREADS
+    free(offsets);
+    unmap_file(&map);
+
+    /* check output of ierr */
+    if (!fail && fs_warn)
     {
-        DEBUG_PRINTF("%i\n", i);
-        ierr = geneactiv_read_block(fp, &winfo, &info, &data);
+        int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Block fs is not the same as header fs. Setting to block fs.", 1);
 
-        /* check output of ierr */
-        if (ierr == GN_READ_E_NONE)  /* most common case */
-        {}
-        else if (ierr == GN_READ_E_BLOCK_FS_WARN)
-        {
-            int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Block fs is not the same as header fs. Setting to block fs.", 1);
-
-            if (err_ret == -1)  /* warnings are being raised as exceptions */
-            {
-                fail = 1;
-                break;
-            }
-        }
-        else if (ierr == GN_READ_E_BLOCK_MISSING_BLOCK_WARN)
-        {
-            int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Found an empty block, assuming end of recorded data.", 1);
-            /* break out of the loop, but dont fail, unless raising warnings */
-            if (err_ret == -1) fail = 1;
-
-            break;
-        }
-        else
-        {
+        if (err_ret == -1)  /* warnings are being raised as exceptions */
             fail = 1;
-            break;
-        }
+    }
+    if (fail || (ierr == GN_READ_E_NONE))  /* most common case */
+    {}
+    else if (ierr == GN_READ_E_BLOCK_MISSING_BLOCK_WARN)
+    {
+        int err_ret = PyErr_WarnEx(PyExc_RuntimeWarning, "Found an empty block, assuming end of recorded data.", 1);
+        /* dont fail, unless raising warnings */
+        if (err_ret == -1) fail = 1;
+    }
+    else
+    {
+        fail = 1;
     }
 
-    fclose(fp);
     free(winfo.i_start);
     free(winfo.i_stop);
 
@@ -414,13 +961,14 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
         Py_XDECREF(starts);
         Py_XDECREF(stops);
 
-        geneactiv_set_error_message(ierr);
+        if (!PyErr_Occurred())
+            geneactiv_set_error_message(ierr);
         return NULL;
     }
 
     return Py_BuildValue(
         "lfNNNNNN",  /* need to use N to not increment reference counter */
-        (info.max_n + 1) * GN_SAMPLES,
+        (p2 > p1) ? (info.max_n + 1) * GN_SAMPLES : 0,
         info.fs,
         (PyObject *)accel,
         (PyObject *)time,
@@ -432,7 +980,7 @@ static PyObject *read_geneactiv(PyObject *NPY_UNUSED(self), PyObject *args)
 }
 
 
-static const char read_axivity__doc__[] = "read_axivity(file, bases, periods)\n"
+static const char read_axivity__doc__[] = "read_axivity(file, bases, periods, n_threads=1)\n"
 "Read an Axivity binary file.\n\n"
 "Parameters\n"
 "----------\n"
@@ -441,7 +989,9 @@ static const char read_axivity__doc__[] = "read_axivity(file, bases, periods)\n"
 "bases : numpy.ndarray\n"
 "   Base times for providing windowing. Must be in [0, 23].\n"
 "periods : numpy.ndarray\n"
-"   Number of hours for each window. Must be in [1, 24] and the same size as bases.\n\n"
+"   Number of hours for each window. Must be in [1, 24] and the same size as bases.\n"
+"n_threads : int, optional\n"
+"   Number of threads to decode the data blocks with. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "fs : float\n"
@@ -454,7 +1004,101 @@ static const char read_axivity__doc__[] = "read_axivity(file, bases, periods)\n"
 "starts : numpy.ndarray\n"
 "stops : numpy.ndarray\n";
 
-static const char read_geneactiv__doc__[] = "read_geneactiv(file, bases, periods)\n"
+static const char read_axivity_header__doc__[] = "read_axivity_header(file)\n"
+"Read the header information of an Axivity binary file.\n\n"
+"Parameters\n"
+"----------\n"
+"file : str\n"
+"   File name to read from\n\n"
+"Returns\n"
+"-------\n"
+"fs : float\n"
+"   Sampling frequency\n"
+"nblocks : int\n"
+"   Number of 512 byte blocks in the file, including the 2 header blocks.\n"
+"axes : int\n"
+"   Number of IMU axes (3/6/9).\n"
+"count : int\n"
+"   Number of samples per data block.\n";
+
+static const char read_axivity_chunk__doc__[] = "read_axivity_chunk(file, bases, periods, block_start, block_stop, t_last, starts, stops, i_start, i_stop, n_threads=1)\n"
+"Read a range of data blocks from an Axivity binary file.\n\n"
+"Parameters\n"
+"----------\n"
+"file : str\n"
+"   File name to read from\n"
+"bases : numpy.ndarray\n"
+"   Base times for providing windowing. Must be in [0, 23].\n"
+"periods : numpy.ndarray\n"
+"   Number of hours for each window. Must be in [1, 24] and the same size as bases.\n"
+"block_start : int\n"
+"   First block to read. Must be at least 2 (first 2 blocks are the header).\n"
+"block_stop : int\n"
+"   Block to stop reading at (exclusive).\n"
+"t_last : float\n"
+"   End time of the last block of the previous chunk. Use -1000.0 for the first chunk.\n"
+"starts : numpy.ndarray\n"
+"   (MAX_DAYS, n) long array of window start indices. Updated in place.\n"
+"stops : numpy.ndarray\n"
+"   (MAX_DAYS, n) long array of window stop indices. Updated in place.\n"
+"i_start : numpy.ndarray\n"
+"   (n, ) long array tracking the number of window starts. Updated in place.\n"
+"i_stop : numpy.ndarray\n"
+"   (n, ) long array tracking the number of window stops. Updated in place.\n"
+"n_threads : int, optional\n"
+"   Number of threads to decode the data blocks with. Default is 1.\n\n"
+"Returns\n"
+"-------\n"
+"fs : float\n"
+"   Sampling frequency\n"
+"n_bad_samples : int\n"
+"   Number of samples in bad blocks.\n"
+"imudata : numpy.ndarray\n"
+"   IMU data for the blocks. Shape is (N, 3/6/9). Order of types is [Gy]Ax[Mag].\n"
+"time : numpy.ndarray\n"
+"temperature : numpy.ndarray\n"
+"t_last : float\n"
+"   End time of the last block read, to pass to the next call.\n";
+
+static const char read_axivity_into__doc__[] = "read_axivity_into(file, bases, periods, time, temperature, accel, gyro, magnet, n_threads=1)\n"
+"Read an Axivity binary file by memory mapping it, and decoding the data directly into the\n"
+"provided output arrays.\n\n"
+"Parameters\n"
+"----------\n"
+"file : str\n"
+"   File name to read from\n"
+"bases : numpy.ndarray\n"
+"   Base times for providing windowing. Must be in [0, 23].\n"
+"periods : numpy.ndarray\n"
+"   Number of hours for each window. Must be in [1, 24] and the same size as bases.\n"
+"time : numpy.ndarray\n"
+"   (N, ) float64 output array for the timestamps.\n"
+"temperature : numpy.ndarray\n"
+"   (N, ) float64 or float32 output array for the temperature.\n"
+"accel : numpy.ndarray\n"
+"   (N, 3) float64 or float32 output array for the acceleration.\n"
+"gyro : {None, numpy.ndarray}\n"
+"   (N, 3) float64 or float32 output array for the angular velocity. Must be None if the\n"
+"   file does not contain gyroscope data.\n"
+"magnet : {None, numpy.ndarray}\n"
+"   (N, 3) float64 or float32 output array for the magnetic field. Must be None if the\n"
+"   file does not contain magnetometer data.\n"
+"n_threads : int, optional\n"
+"   Number of threads to decode the data blocks with. Default is 1.\n\n"
+"Returns\n"
+"-------\n"
+"fs : float\n"
+"   Sampling frequency\n"
+"n_bad_samples : int\n"
+"   Number of samples in bad blocks.\n"
+"starts : numpy.ndarray\n"
+"stops : numpy.ndarray\n\n"
+"Notes\n"
+"-----\n"
+"All output arrays must be C-contiguous and writeable. N is `(nblocks - 2) * count` from\n"
+"`read_axivity_header`.\n";
+
+static const char read_geneactiv__doc__[] = "read_geneactiv(file, bases, periods, n_threads=1, t_start=-inf, t_stop=inf, float32=False)\n"
 "Read a Geneactiv File\n\n"
 "Parameters\n"
 "----------\n"
@@ -463,11 +1107,20 @@ static const char read_geneactiv__doc__[] = "read_geneactiv(file, bases, periods
 "bases : numpy.ndarray\n"
 "   Base times for providing windowing. Must be in [0, 23]\n"
 "periods : numpy.ndarray\n"
-"   Number of hours for each window. Must be in [1, 24]\n\n"
+"   Number of hours for each window. Must be in [1, 24]\n"
+"n_threads : int, optional\n"
+"   Number of threads to parse the data pages with. Default is 1.\n"
+"t_start : float, optional\n"
+"   Only read the pages containing data at or after this time, in unix seconds.\n"
+"t_stop : float, optional\n"
+"   Only read the pages containing data before this time, in unix seconds.\n"
+"float32 : bool, optional\n"
+"   Return the acceleration, light, and temperature as float32 instead of float64. Time\n"
+"   is always float64. Default is False.\n\n"
 "Returns\n"
 "-------\n"
 "N : int\n"
-"   Number of pages read.\n"
+"   Number of samples read.\n"
 "fs : float\n"
 "   Sampling frequency\n"
 "accel : numpy.ndarray\n"
@@ -480,6 +1133,9 @@ static const char read_geneactiv__doc__[] = "read_geneactiv(file, bases, periods
 static struct PyMethodDef methods[] = {
   {"read_geneactiv", read_geneactiv, 1, read_geneactiv__doc__},
   {"read_axivity", read_axivity, 1, read_axivity__doc__},
+  {"read_axivity_header", read_axivity_header, 1, read_axivity_header__doc__},
+  {"read_axivity_chunk", read_axivity_chunk, 1, read_axivity_chunk__doc__},
+  {"read_axivity_into", read_axivity_into, 1, read_axivity_into__doc__},
   {NULL, NULL, 0, NULL}  /* sentinel */
 };
 
@@ -508,6 +1164,7 @@ PyMODINIT_FUNC PyInit_read(void){
   import_array();
 
   /* add constants here */
+  PyModule_AddIntConstant(m, "MAX_DAYS", MAX_DAYS);
 
   return m;
 }
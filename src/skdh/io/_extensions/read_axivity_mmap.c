@@ -0,0 +1,344 @@
+// Copyright (c) 2021. Pfizer Inc. All rights reserved.
+#include "read_binary_imu.h"
+
+/* little endian reads from the mapped file, independent of host byte order */
+#define AX_U16(_p) ((uint16_t)((_p)[0] | ((_p)[1] << 8)))
+#define AX_U32(_p) ((uint32_t)(_p)[0] | ((uint32_t)(_p)[1] << 8) | ((uint32_t)(_p)[2] << 16) | ((uint32_t)(_p)[3] << 24))
+
+#define AX_HEADER_ACCEL 0x5841  /* "AX" */
+#define AX_PACKET_LENGTH 508
+#define AX_DATA_OFFSET 30
+#define AX_DATA_BYTES 480
+
+/* maximum number of raw values in a block, packed data is 120 samples x 3 axes */
+#define AX_MAX_RAW 360
+
+
+static inline void ax_store(char *arr, int f32, size_t i, double value)
+{
+    if (f32)
+        ((float *)arr)[i] = (float)value;
+    else
+        ((double *)arr)[i] = value;
+}
+
+
+/*
+Decode the sensor data of one data block into the output arrays. Only reads from `info`, so
+blocks can be decoded in any order. Returns 1 if the block was valid and stored, 0 if the block
+is bad or there was an error (`ierr` is set for errors).
+*/
+int axivity_decode_block(const AX_Info_t *info, const uint8_t *block, AX_Out_t *out, int *ierr)
+{
+    int16_t raw[AX_MAX_RAW];
+    uint16_t wordsum = 0;
+    long seq, n = info->count;
+    int axes = info->axes;
+
+    *ierr = AX_READ_E_NONE;
+
+    if ((AX_U16(block) != AX_HEADER_ACCEL) || (AX_U16(block + 2) != AX_PACKET_LENGTH))
+        return 0;
+
+    /* blocks outside the output range (ie corrupted sequence IDs) are bad blocks */
+    seq = (long)(int32_t)AX_U32(block + 10);
+    if ((seq < info->block_offset) || (seq >= (info->block_offset + info->nblocks_out)))
+        return 0;
+
+    /* light is LS 10 bits, accel scale 3 msb, gyro scale next 3 */
+    uint16_t light = AX_U16(block + 18);
+    double accel_scale = (double)(1L << (8 + ((light >> 13) & 0x07)));
+    double gyro_scale = 32768.0 / (double)(8000 / (1 << ((light >> 10) & 0x07)));
+    double mag_scale = 16.0;
+    /* constant matches the single precision value used in read_axivity.f95 */
+    double temp = ((double)(AX_U16(block + 20) & 0x3ff) - 171.0) / (double)3.142f;
+
+    int packing = block[25] & 0x0f;
+    if (packing == 0)
+    {
+        if (axes != 3)
+        {
+            *ierr = AX_READ_E_BAD_AXES_PACKED;
+            return 0;
+        }
+        if (n != 120)
+        {
+            *ierr = AX_READ_E_INVALID_BLOCK_SAMPLES;
+            return 0;
+        }
+    }
+    else if (packing == 2)
+    {
+        if ((n < 0) || (n * axes * 2 > AX_DATA_BYTES))
+        {
+            *ierr = AX_READ_E_INVALID_BLOCK_SAMPLES;
+            return 0;
+        }
+    }
+    else
+    {
+        *ierr = AX_READ_E_BAD_PACKING_CODE;
+        return 0;
+    }
+
+    /* the 16 bit word sum of the whole block, including the checksum, must be 0 */
+    for (int k = 0; k < 512; k += 2)
+        wordsum += AX_U16(block + k);
+    if (wordsum != 0)
+        return 0;
+
+    const uint8_t *data = block + AX_DATA_OFFSET;
+    if (packing == 0)
+    {
+        /* 3x 10 bit signed values + 2 bit exponent */
+        for (long k = 0; k < n; ++k)
+        {
+            uint32_t v = AX_U32(data + 4 * k);
+            int shift = 6 - (int)(v >> 30);
+
+            raw[3 * k]     = (int16_t)((v << 6) & 0xffc0) >> shift;
+            raw[3 * k + 1] = (int16_t)((v >> 4) & 0xffc0) >> shift;
+            raw[3 * k + 2] = (int16_t)((v >> 14) & 0xffc0) >> shift;
+        }
+    }
+    else
+    {
+        /* 16 bit signed values */
+        for (long k = 0; k < n * axes; ++k)
+            raw[k] = (int16_t)AX_U16(data + 2 * k);
+    }
+
+    size_t i1 = (size_t)(seq - info->block_offset) * (size_t)n;
+    size_t stride = (size_t)out->stride;
+    for (long j = 0; j < n; ++j)
+    {
+        size_t i = i1 + j;
+        const int16_t *r = &raw[j * axes];
+
+        ax_store(out->temp, out->temp_f32, i, temp);
+
+        if (axes == 3)
+        {
+            for (int c = 0; c < 3; ++c)
+                ax_store(out->acc, out->acc_f32, stride * i + c, r[c] / accel_scale);
+        }
+        else
+        {
+            for (int c = 0; c < 3; ++c)
+            {
+                ax_store(out->gyr, out->gyr_f32, stride * i + c, r[c] / gyro_scale);
+                ax_store(out->acc, out->acc_f32, stride * i + c, r[c + 3] / accel_scale);
+            }
+            if (axes == 9)
+            {
+                for (int c = 0; c < 3; ++c)
+                    ax_store(out->mag, out->mag_f32, stride * i + c, r[c + 6] / mag_scale);
+            }
+        }
+    }
+    out->filled[seq - info->block_offset] = 1;
+
+    return 1;
+}
+
+
+/*
+Zero the data of a block that was not filled by any valid block, as the output arrays are
+provided by the caller and might not be initialized.
+*/
+void axivity_zero_block(const AX_Info_t *info, long slot, AX_Out_t *out)
+{
+    size_t i1 = (size_t)slot * (size_t)info->count, stride = (size_t)out->stride;
+
+    memset(out->ts + i1, 0, info->count * sizeof(double));
+    for (size_t i = i1; i < i1 + info->count; ++i)
+    {
+        ax_store(out->temp, out->temp_f32, i, 0.0);
+        for (size_t c = 0; c < 3; ++c)
+        {
+            ax_store(out->acc, out->acc_f32, stride * i + c, 0.0);
+            if (out->gyr)
+                ax_store(out->gyr, out->gyr_f32, stride * i + c, 0.0);
+            if (out->mag)
+                ax_store(out->mag, out->mag_f32, stride * i + c, 0.0);
+        }
+    }
+}
+
+
+/*
+Create the timestamps for a valid block, and update the day indexing. Blocks have to be passed
+in file order, as the timestamps are adjusted using the end time of the previous block.
+Mirrors `get_time` in read_axivity.f95.
+*/
+void axivity_block_time(AX_Info_t *info, const uint8_t *block, double *ts, Window_t *winfo,
+    long *starts, long *stops)
+{
+    Time_t t;
+    int32_t stamp = (int32_t)AX_U32(block + 14);
+    long seq = (long)(int32_t)AX_U32(block + 10);
+    int16_t ts_offset = (int16_t)AX_U16(block + 26);
+    int16_t n_samples = (int16_t)AX_U16(block + 28);
+
+    long year  = ((stamp >> 26) & 0x3f) + 2000L;
+    long month = (stamp >> 22) & 0x0f;
+    long day   = (stamp >> 17) & 0x1f;
+    t.hour     = (stamp >> 12) & 0x1f;
+    t.min      = (stamp >> 6) & 0x3f;
+    t.sec      = stamp & 0x3f;
+    t.msec     = 0L;
+
+    /* days since 1970 */
+    long days = day - 32075L + 1461L * (year + 4800L + (month - 14L) / 12L) / 4L
+        + 367L * (month - 2L - (month - 14L) / 12L * 12L) / 12L
+        - 3L * ((year + 4900L + (month - 14L) / 12L) / 100L) / 4L;
+    days -= 2440588L;
+
+    double t0 = days * 86400.0;
+    t0 = t0 + (t.hour * 3600.0) + (t.min * 60.0) + (double)t.sec;
+
+    double freq = 3200.0 / (double)(1L << (15 - (block[24] & 0x0f)));
+    if (freq <= 0.0)
+        freq = 1.0;
+
+    t0 = t0 - ts_offset / freq;
+    double t1 = t0 + n_samples / freq;
+    /* for indexing. Can be negative, as it just gets added into the current timestamp */
+    t.msec = (long)(-ts_offset / freq * 1000);
+
+    if ((info->tLast > 0.0) && ((t0 - info->tLast) < 1.0))
+    {
+        t.msec -= (long)((t0 - info->tLast) * 1000);
+        t0 = info->tLast;
+    }
+    info->tLast = t1;
+
+    double dt = (t1 - t0) / n_samples;
+    double *time = ts + (size_t)(seq - info->block_offset) * (size_t)info->count;
+    for (long i = 0; i < info->count; ++i)
+        time[i] = t0 + i * dt;
+
+    /* subtract a little bit from the block duration so that no windows are missed */
+    double block_dt = t1 - t0 - 0.5 * dt;
+    long max_days = info->max_days;
+    long max_n = (long)info->nblocks - 2;
+    long count = (long)info->count;
+
+    get_day_indexing(&freq, &t, &block_dt, &max_days, &winfo->n, winfo->bases, winfo->periods,
+        &seq, &max_n, &count, starts, winfo->i_start, stops, winfo->i_stop);
+}
+
+
+/* a range of blocks to decode on one thread */
+typedef struct {
+    const AX_Info_t *info;
+    const uint8_t *data;
+    AX_Out_t *out;
+    uint8_t *valid;
+    long start;
+    long stop;
+    long n_bad_blocks;
+    int ierr;
+} AX_Decode_Job_t;
+
+
+static void *axivity_decode_range(void *arg)
+{
+    AX_Decode_Job_t *job = (AX_Decode_Job_t *)arg;
+
+    job->n_bad_blocks = 0;
+    job->ierr = AX_READ_E_NONE;
+    for (long i = job->start; i < job->stop; ++i)
+    {
+        job->valid[i] = (uint8_t)axivity_decode_block(job->info, job->data + 512 * i, job->out, &job->ierr);
+        if (job->ierr != AX_READ_E_NONE)
+            break;
+        if (!job->valid[i])
+            job->n_bad_blocks += 1;
+    }
+    return NULL;
+}
+
+
+/*
+Read the data blocks [block_start, block_stop) of a memory mapped file into the output arrays.
+Blocks are independent apart from their timestamps, so data is decoded in a first pass split
+across `n_threads` threads. Timestamps and day indices are created in a second pass in file
+order, followed by fixing the timestamps of any bad blocks. Does not touch any Python objects,
+so can be run without the GIL.
+*/
+int axivity_read_mapped(AX_Info_t *info, const uint8_t *data, long block_start, long block_stop,
+    AX_Out_t *out, Window_t *winfo, long *starts, long *stops, int n_threads, int *ierr)
+{
+    long n_blocks = block_stop - block_start;
+    uint8_t *valid = (uint8_t *)calloc(info->nblocks, sizeof(uint8_t));
+    *ierr = AX_READ_E_NONE;
+
+    if (!valid)
+        return 1;
+
+    if (n_threads > n_blocks)
+        n_threads = (int)n_blocks;
+    if (n_threads < 1)
+        n_threads = 1;
+
+    AX_Decode_Job_t *jobs = (AX_Decode_Job_t *)malloc(n_threads * sizeof(AX_Decode_Job_t));
+    if (!jobs)
+    {
+        free(valid);
+        return 1;
+    }
+    for (int k = 0; k < n_threads; ++k)
+    {
+        jobs[k].info = info;
+        jobs[k].data = data;
+        jobs[k].out = out;
+        jobs[k].valid = valid;
+        jobs[k].start = block_start + n_blocks * k / n_threads;
+        jobs[k].stop = block_start + n_blocks * (k + 1) / n_threads;
+    }
+
+    /* decode the data */
+    run_parallel(axivity_decode_range, jobs, sizeof(AX_Decode_Job_t), n_threads);
+
+    for (int k = 0; k < n_threads; ++k)
+    {
+        info->n_bad_blocks += jobs[k].n_bad_blocks;
+        if ((jobs[k].ierr != AX_READ_E_NONE) && (*ierr == AX_READ_E_NONE))
+            *ierr = jobs[k].ierr;
+    }
+    free(jobs);
+    if (*ierr != AX_READ_E_NONE)
+    {
+        free(valid);
+        return 1;
+    }
+
+    /* blocks that were not filled are left as zeros, timestamps are fixed later */
+    for (long k = 0; k < info->nblocks_out; ++k)
+    {
+        if (!out->filled[k])
+            axivity_zero_block(info, k, out);
+    }
+
+    /* timestamps */
+    for (long i = block_start; i < block_stop; ++i)
+    {
+        if (valid[i])
+            axivity_block_time(info, data + 512 * i, out->ts, winfo, starts, stops);
+        else
+            /* dont use the last time to adjust timestamps for the next block */
+            info->tLast = -1.0;
+    }
+    free(valid);
+
+    /* adjust timestamps if there were bad blocks */
+    if (info->n_bad_blocks > 0)
+    {
+        adjust_timestamps(info, out->ts, ierr);
+        if (*ierr != AX_READ_E_NONE)
+            return 1;
+    }
+
+    return 0;
+}
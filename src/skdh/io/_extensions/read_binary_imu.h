@@ -48,6 +48,16 @@ typedef struct {
     long msec;  /* NOTE that this is an integer! ex. 0.500 -> 500 */
 } Time_t;
 
+/* memory mapped file */
+typedef struct {
+    const uint8_t *data;
+    size_t size;
+} Map_t;
+
+int map_file(const char *file, Map_t *map);
+void unmap_file(Map_t *map);
+void run_parallel(void *(*fn)(void *), void *jobs, size_t job_size, int n_jobs);
+
 /* 
 get_day_indexing(fs, dtime, mxd, n, bases, periods, block_n, max_n, block_samples, starts, 
     i_starts, stops, i_stops)
@@ -72,6 +82,8 @@ typedef struct {
     long Nwin;  /* number of windows (bases/periods) */
     long max_days;  /* max days set for the size of the starts/stops array */
     long n_bad_blocks;  /* number of blocks with nonzero checksums */
+    long block_offset;  /* sequence ID of the first block stored in the data arrays */
+    long nblocks_out;  /* number of blocks the data arrays can hold */
 } AX_Info_t;
 
 typedef struct {
@@ -99,6 +111,28 @@ extern void axivity_read_block(AX_Info_t *, long *, double *, double *, double *
 extern void adjust_timestamps(AX_Info_t *, double *, int *);
 extern void axivity_close(AX_Info_t *);
 
+/* caller provided output arrays for reading memory mapped files */
+typedef struct {
+    char *acc;
+    char *gyr;  /* NULL if not in the file */
+    char *mag;  /* NULL if not in the file */
+    char *temp;
+    double *ts;
+    int acc_f32;  /* if the arrays are float32 instead of float64 */
+    int gyr_f32;
+    int mag_f32;
+    int temp_f32;
+    long stride;  /* number of values between samples in the sensor arrays */
+    uint8_t *filled;  /* per block flag if the block was filled with data */
+} AX_Out_t;
+
+int axivity_decode_block(const AX_Info_t *info, const uint8_t *block, AX_Out_t *out, int *ierr);
+void axivity_zero_block(const AX_Info_t *info, long slot, AX_Out_t *out);
+void axivity_block_time(AX_Info_t *info, const uint8_t *block, double *ts, Window_t *winfo,
+    long *starts, long *stops);
+int axivity_read_mapped(AX_Info_t *info, const uint8_t *data, long block_start, long block_stop,
+    AX_Out_t *out, Window_t *winfo, long *starts, long *stops, int n_threads, int *ierr);
+
 /*
 ======================================
 GENEACTIV
@@ -106,6 +140,7 @@ GENEACTIV
 */
 #define GN_SAMPLES 300
 #define GN_SAMPLESf 300.0f
+#define GN_PAGE_LINES 10
 
 #define GN_READLINE fgets(buff, 255, fp)
 
@@ -126,7 +161,9 @@ typedef enum {
     GN_READ_E_BLOCK_FS_WARN,  /* warning about FS */
     GN_READ_E_BLOCK_MISSING_BLOCK_WARN,  /* warn about a missing block of data */
     GN_READ_E_BLOCK_DATA,  /* error reading block data */
-    GN_READ_E_BLOCK_DATA_3600  /* data is less than 3600 characters */
+    GN_READ_E_BLOCK_DATA_3600,  /* data is less than 3600 characters */
+    GN_READ_E_BLOCK_SEQUENCE,  /* page sequence number is outside the number of pages */
+    GN_READ_E_MEMORY  /* error allocating memory */
 } Read_Bin_Error_t;
 
 
@@ -140,17 +177,36 @@ typedef struct {
     double lux;
     long npages;
     long max_n;
+    long page_start;  /* sequence number of the first page stored in the data arrays */
+    long npages_out;  /* number of pages the data arrays can hold */
 } GN_Info_t;
 
 typedef struct {
-    double *acc;
-    double *light;
-    double *temp;
+    char *acc;
+    char *light;
+    char *temp;
     double *ts;
     long *day_starts;
     long *day_stops;
+    int f32;  /* if the acc, light, and temp arrays are float32 instead of float64 */
 } GN_Data_t;
 
 
+/* page timing information, for creating timestamps after parsing */
+typedef struct {
+    long N;  /* page sequence number */
+    double t0;  /* page start time */
+    double fs;  /* page sampling frequency */
+    Time_t t;
+    int ierr;
+} GN_Page_t;
+
+
 int geneactiv_read_header(FILE *fp, GN_Info_t *info);
-int geneactiv_read_block(FILE *fp, Window_t *w_info, GN_Info_t *info, GN_Data_t *data);
+long geneactiv_index_pages(const char *data, size_t size, size_t start, long npages, size_t *offsets);
+void geneactiv_parse_page(const char *data, size_t size, size_t pos, GN_Info_t *info, GN_Data_t *gdata, GN_Page_t *page);
+int geneactiv_page_info(const char *data, size_t size, size_t pos, long *N, double *t0);
+void geneactiv_find_pages(const char *data, size_t size, const size_t *offsets, long n_found,
+    double t_start, double t_stop, long *p1, long *p2);
+int geneactiv_read_mapped(const char *data, size_t size, const size_t *offsets, long p1, long p2,
+    long n_found, GN_Info_t *info, GN_Data_t *gdata, Window_t *winfo, int n_threads, int *fs_warn);
@@ -64,125 +64,399 @@ int geneactiv_read_header(FILE *fp, GN_Info_t *info)
 }
 
 
-int get_timestamps(long *Nps, char time[40], GN_Info_t *info, GN_Data_t *data, Window_t *winfo)
+/* hex character values + 1, so that 0 marks a character that is not a hex digit */
+static const uint8_t GN_HEX[256] = {
+    ['0'] = 1, ['1'] = 2, ['2'] = 3, ['3'] = 4, ['4'] = 5,
+    ['5'] = 6, ['6'] = 7, ['7'] = 8, ['8'] = 9, ['9'] = 10,
+    ['A'] = 11, ['B'] = 12, ['C'] = 13, ['D'] = 14, ['E'] = 15, ['F'] = 16,
+    ['a'] = 11, ['b'] = 12, ['c'] = 13, ['d'] = 14, ['e'] = 15, ['f'] = 16,
+};
+
+
+/* decode a 3 character hex value, stopping at the first non-hex character like strtol */
+static inline long gn_hex3(const char *s)
+{
+    long v = 0;
+    for (int i = 0; i < 3; ++i)
+    {
+        uint8_t d = GN_HEX[(unsigned char)s[i]];
+        if (d == 0)
+            break;
+        v = (v << 4) | (d - 1);
+    }
+    return v;
+}
+
+
+static inline void gn_store(char *arr, int f32, size_t i, double value)
+{
+    if (f32)
+        ((float *)arr)[i] = (float)value;
+    else
+        ((double *)arr)[i] = value;
+}
+
+
+/*
+Get the next line from the mapped data, starting at `*pos`. The line is copied, including the
+newline, into `buff` with a null terminator, truncating to `n - 1` characters like fgets.
+Returns a pointer to the start of the line in the mapped data, or NULL at the end of the data.
+*/
+static const char *gn_next_line(const char *data, size_t size, size_t *pos, char *buff, size_t n, size_t *len)
+{
+    if (*pos >= size)
+        return NULL;
+
+    const char *line = data + *pos;
+    const char *end = (const char *)memchr(line, '\n', size - *pos);
+    *len = end ? (size_t)(end - line) + 1 : size - *pos;
+    *pos += *len;
+
+    if (buff)
+    {
+        size_t nc = (*len < n - 1) ? *len : n - 1;
+        memcpy(buff, line, nc);
+        buff[nc] = '\0';
+    }
+    return line;
+}
+
+
+/*
+Find the start of each page (10 lines) in the mapped data, starting at `start`. Returns the
+number of pages found, up to `npages`.
+*/
+long geneactiv_index_pages(const char *data, size_t size, size_t start, long npages, size_t *offsets)
+{
+    size_t pos = start, len;
+    long n = 0;
+
+    while ((n < npages) && (pos < size))
+    {
+        offsets[n++] = pos;
+        for (int i = 0; i < GN_PAGE_LINES; ++i)
+        {
+            if (!gn_next_line(data, size, &pos, NULL, 0, &len))
+                break;
+        }
+    }
+    return n;
+}
+
+
+/* page start time in seconds since the epoch, from the page time line */
+static double gn_page_t0(const char *time, Time_t *t)
 {
     struct tm tm0;
-    double t0;
-    Time_t t;
 
-    /* time */
-    t.hour = GN_DATE_HOUR(time);
-    t.min = GN_DATE_MIN(time);
-    t.sec = GN_DATE_SEC(time);
-    t.msec = GN_DATE_MSEC(time);
+    t->hour = GN_DATE_HOUR(time);
+    t->min = GN_DATE_MIN(time);
+    t->sec = GN_DATE_SEC(time);
+    t->msec = GN_DATE_MSEC(time);
 
     memset(&tm0, 0, sizeof(tm0));
     tm0.tm_year = GN_DATE_YEAR(time) - 1900;  /* need years since 1900 */
     tm0.tm_mon  = GN_DATE_MONTH(time) - 1;  /* 0 indexed */
     tm0.tm_mday = GN_DATE_DAY(time);
-    tm0.tm_hour = t.hour;
-    tm0.tm_min  = t.min;
-    tm0.tm_sec  = t.sec;
+    tm0.tm_hour = t->hour;
+    tm0.tm_min  = t->min;
+    tm0.tm_sec  = t->sec;
 
     /* convert to seconds since epoch */
-    t0 = (double)timegm(&tm0);
-    t0 += (double)t.msec / 1000.0f;  /* add microseconds */
+    double t0 = (double)timegm(&tm0);
+    t0 += (double)t->msec / 1000.0f;  /* add microseconds */
+    return t0;
+}
+
+
+/*
+Get the sequence number and start time of the page starting at `pos`, without parsing the page
+data. Returns 0 on success.
+*/
+int geneactiv_page_info(const char *data, size_t size, size_t pos, long *N, double *t0)
+{
+    char buff[255], time[40];
+    size_t len;
+    Time_t t;
+
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    if (!gn_next_line(data, size, &pos, buff, 255, &len))
+        return 1;
+    *N = strtol(&buff[16], NULL, 10);
+    if (!gn_next_line(data, size, &pos, time, 40, &len))
+        return 1;
+    *t0 = gn_page_t0(time, &t);
+    return 0;
+}
+
+
+/*
+Find the range of pages [p1, p2) that contain the data in [t_start, t_stop), using a binary
+search over the page start times.
+*/
+void geneactiv_find_pages(const char *data, size_t size, const size_t *offsets, long n_found,
+    double t_start, double t_stop, long *p1, long *p2)
+{
+    long lo, hi, mid, N;
+    double t0;
+
+    /* first page starting after t_start, the page before contains t_start */
+    lo = 0;
+    hi = n_found;
+    while (lo < hi)
+    {
+        mid = lo + (hi - lo) / 2;
+        if ((geneactiv_page_info(data, size, offsets[mid], &N, &t0) == 0) && (t0 <= t_start))
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    *p1 = (lo > 0) ? lo - 1 : 0;
+
+    /* first page starting at or after t_stop */
+    lo = *p1;
+    hi = n_found;
+    while (lo < hi)
+    {
+        mid = lo + (hi - lo) / 2;
+        if ((geneactiv_page_info(data, size, offsets[mid], &N, &t0) == 0) && (t0 < t_stop))
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    *p2 = lo;
+}
+
+
+/*
+Parse a page of data starting at `pos`. The sensor data, light and temperature are stored
+directly, while the page timing information is stored in `page` for creating the timestamps
+in order later.
+*/
+void geneactiv_parse_page(const char *data, size_t size, size_t pos, GN_Info_t *info, GN_Data_t *gdata, GN_Page_t *page)
+{
+    char buff[255], time[40];
+    const char *data_str;
+    size_t len;
+    long Nps, t_;
+
+    page->ierr = GN_READ_E_NONE;
+
+    /* first 2 lines are "Recorded Data" and the device serial number */
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    /* 3d line is sequence number */
+    if (!gn_next_line(data, size, &pos, buff, 255, &len))
+    {
+        page->ierr = GN_READ_E_BLOCK_DATA;
+        return;
+    }
+    /* pages are stored relative to the first page being read */
+    page->N = strtol(&buff[16], NULL, 10) - info->page_start;
+    if ((page->N < 0) || (page->N >= info->npages_out))
+    {
+        page->ierr = GN_READ_E_BLOCK_SEQUENCE;
+        return;
+    }
+    Nps = page->N * GN_SAMPLES;
+
+    /* the line containing the timestamp */
+    if (!gn_next_line(data, size, &pos, time, 40, &len))
+    {
+        page->ierr = GN_READ_E_BLOCK_TIMESTAMP;
+        return;
+    }
+
+    /* skip a line then read the line with the temperature */
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    if (!gn_next_line(data, size, &pos, buff, 255, &len))
+    {
+        page->ierr = GN_READ_E_BLOCK_DATA;
+        return;
+    }
+    double temp = strtod(&buff[12], NULL);
+    for (long i = Nps; i < (Nps + GN_SAMPLES); ++i)
+        gn_store(gdata->temp, gdata->f32, i, temp);
+
+    /* skip 2 more lines then read the sampling rate */
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    gn_next_line(data, size, &pos, buff, 255, &len);
+    if (!gn_next_line(data, size, &pos, buff, 255, &len))
+    {
+        page->ierr = GN_READ_E_BLOCK_DATA;
+        return;
+    }
+    page->fs = strtod(&buff[22], NULL);
+
+    /* the 3600 character data string */
+    data_str = gn_next_line(data, size, &pos, NULL, 0, &len);
+    if (!data_str)
+    {
+        page->ierr = GN_READ_E_BLOCK_DATA;
+        return;
+    }
+    if (len < 3601)
+    {
+        page->ierr = GN_READ_E_BLOCK_DATA_3600;
+        return;
+    }
+
+    /* put the page data into the appropiate location */
+    double light_scale = info->lux / info->volts;
+    for (int i = 0, j = 0; i < 3600; i += 12, ++j)
+    {
+        for (int k = 0; k < 3; ++k)  /* first 3 values are accel x, y, z */
+        {
+            t_ = gn_hex3(&data_str[i + k * 3]);
+            t_ = (t_ > 2047) ? -4096 + t_ : t_;
+            gn_store(gdata->acc, gdata->f32, (size_t)(Nps + j) * 3 + k,
+                ((double)t_ * 100.0f - info->offset[k]) / info->gain[k]);
+        }
+        t_ = gn_hex3(&data_str[i + 9]);  /* last value is light */
+        gn_store(gdata->light, gdata->f32, Nps + j, floor((double)(t_ >> 2) * light_scale));
+    }
+
+    /* page start time */
+    page->t0 = gn_page_t0(time, &page->t);
+}
+
+
+/* a range of pages to parse on one thread */
+typedef struct {
+    const char *data;
+    size_t size;
+    const size_t *offsets;
+    GN_Info_t *info;
+    GN_Data_t *gdata;
+    GN_Page_t *pages;
+    long start;
+    long stop;
+} GN_Parse_Job_t;
+
+
+static void *geneactiv_parse_range(void *arg)
+{
+    GN_Parse_Job_t *job = (GN_Parse_Job_t *)arg;
+
+    for (long i = job->start; i < job->stop; ++i)
+    {
+        geneactiv_parse_page(job->data, job->size, job->offsets[i], job->info, job->gdata, &job->pages[i]);
+        if (job->pages[i].ierr != GN_READ_E_NONE)
+            break;  /* reading stops at the first bad page */
+    }
+    return NULL;
+}
+
+
+/*
+Create the timestamps for a parsed page, and update the day indexing. Pages have to be passed
+in file order, as the sampling frequency can change.
+*/
+static int geneactiv_page_time(GN_Page_t *page, GN_Info_t *info, GN_Data_t *gdata, Window_t *winfo, int *fs_warn)
+{
+    int ier = GN_READ_E_NONE;
+    long Nps = page->N * GN_SAMPLES;
+
+    info->max_n = (page->N > info->max_n) ? page->N : info->max_n;  /* max N found so far */
+
+    if ((page->fs != info->fs) && (info->fs_err < 1)){
+        info->fs_err ++;  /* increment the error counter, this error should only happen once */
+        /* set the sampling frequency to that of the block */
+        info->fs = page->fs;
+
+        *fs_warn = 1;  /* set so that the warning message can be printed after reading */
+    } else if ((page->fs != info->fs) && (info->fs_err >= 1))
+        return GN_READ_E_BLOCK_FS;
 
     /* create the full timestamp array for the block */
     for (int j = 0; j < GN_SAMPLES; ++j)
-        data->ts[*Nps + j] = t0 + (double)j / info->fs;
-    
+        gdata->ts[Nps + j] = page->t0 + (double)j / info->fs;
+
     /* INDEXING */
     long mdays = MAX_DAYS;
     long gns = GN_SAMPLES;
     double block_t_delta = GN_SAMPLESf / info->fs;
     get_day_indexing(
         &(info->fs),  /* sampling frequency */
-        &t,  /* struc containing HMS & msec time info */
+        &(page->t),  /* struc containing HMS & msec time info */
         &block_t_delta,  /* block time delta */
         &mdays,  /* max possible days */
         &(winfo->n),  /* number of different window definitions */
         winfo->bases,  /* starts of windows */
         winfo->periods,  /* window durations */
         &(info->max_n),  /* the number of the block currently on */
-        &(info->npages),  /* number of blocks/pages */
+        &(info->npages_out),  /* number of blocks/pages */
         &gns,  /* the number of data samples per block */
-        data->day_starts,  /* storage for start indices of windows */
+        gdata->day_starts,  /* storage for start indices of windows */
         winfo->i_start,  /* to keep track of where we are in starts */
-        data->day_stops,  /* storage for stop indices of windows */
+        gdata->day_stops,  /* storage for stop indices of windows */
         winfo->i_stop  /* to keep track of where we are in stops */
     );
-    // fs, dtime, p, n, bases, periods, block_n, max_n, block_samples, starts, i_starts, stops, i_stops
-    // int idx_err = get_day_indexing(Nps, &hour, &min, &sec, &msec, winfo, info, data);
 
-    return GN_READ_E_NONE;
+    return ier;
 }
 
 
-int geneactiv_read_block(FILE *fp, Window_t *w_info, GN_Info_t *info, GN_Data_t *data)
+/*
+Read the pages [p1, p2) of a memory mapped file, out of the `n_found` pages at `offsets` (from
+`geneactiv_index_pages`). Pages are parsed across `n_threads` threads. Timestamps and day indices
+are created in a second pass in file order. Does not touch any Python objects, so can be run
+without the GIL. `fs_warn` is set if the page sampling frequency changed from the header.
+*/
+int geneactiv_read_mapped(const char *data, size_t size, const size_t *offsets, long p1, long p2,
+    long n_found, GN_Info_t *info, GN_Data_t *gdata, Window_t *winfo, int n_threads, int *fs_warn)
 {
-    char buff[255], data_str[3610], p[4], time[40];
-    long N = 0, Nps = 0, t_ = 0;
-    double fs, temp;
-    int ier = GN_READ_E_NONE;
+    int ierr = GN_READ_E_NONE;
+    long n_read = p2 - p1;
+    GN_Page_t *pages = (GN_Page_t *)calloc(n_read > 0 ? n_read : 1, sizeof(GN_Page_t));
+    GN_Parse_Job_t *jobs = NULL;
 
-    /* read/skip first 2 lines */
-    if (GN_READLINE == NULL)  /* make sure that the first line is actually a "Recorded Data" block */
-        return GN_READ_E_BLOCK_MISSING_BLOCK_WARN;
-    GN_READLINE;
-    GN_READLINE;  /* 3d line is sequence number */
-    N = strtol(&buff[16], NULL, 10);
-    Nps = N * GN_SAMPLES;
-    info->max_n = (N > info->max_n) ? N : info->max_n;  /* max N found so far */
-
-    /* read the line containing the timestamp */
-    if (fgets(time, 40, fp) == NULL)
-        return GN_READ_E_BLOCK_TIMESTAMP;
-    
-    /* skip a line then read the line with the temperature */
-    GN_READLINE; GN_READLINE;
-    temp = strtod(&buff[12], NULL);
-    for (int i = Nps; i < (Nps + GN_SAMPLES); ++i)
-        data->temp[i] = temp;
-    
-    /* skip 2 more lines then read the sampling rate */
-    GN_READLINE; GN_READLINE; GN_READLINE;
-    fs = strtod(&buff[22], NULL);
-    if ((fs != info->fs) && (info->fs_err < 1)){
-        info->fs_err ++;  /* increment the error counter, this error should only happen once */
-        /* set the sampling frequency to that of the block */
-        info->fs = fs;
+    *fs_warn = 0;
+    if (!pages)
+        return GN_READ_E_MEMORY;
 
-        ier = GN_READ_E_BLOCK_FS_WARN;  /* set so that the warning message can be printed after function */
-    } else if ((fs != info->fs) && (info->fs_err >= 1))
-        return GN_READ_E_BLOCK_FS;
+    if (n_threads > n_read)
+        n_threads = (int)n_read;
+    if (n_threads < 1)
+        n_threads = 1;
 
-    /* read the 3600 character data string */
-    if (fgets(data_str, 3610, fp) == NULL)
-        return GN_READ_E_BLOCK_DATA;
-    /* check the length */
-    if (strlen(data_str) < 3601)
-        return GN_READ_E_BLOCK_DATA_3600;
+    jobs = (GN_Parse_Job_t *)malloc(n_threads * sizeof(GN_Parse_Job_t));
+    if (!jobs)
+    {
+        free(pages);
+        return GN_READ_E_MEMORY;
+    }
+    for (int k = 0; k < n_threads; ++k)
+    {
+        jobs[k].data = data;
+        jobs[k].size = size;
+        jobs[k].offsets = offsets + p1;
+        jobs[k].info = info;
+        jobs[k].gdata = gdata;
+        jobs[k].pages = pages;
+        jobs[k].start = n_read * k / n_threads;
+        jobs[k].stop = n_read * (k + 1) / n_threads;
+    }
+
+    /* parse the pages */
+    run_parallel(geneactiv_parse_range, jobs, sizeof(GN_Parse_Job_t), n_threads);
+    free(jobs);
 
-    /* put the block data into the appropiate location */
-    int j = 0, jj = 0;
-    for (int i = 0; i < 3600; i += 12)
+    /* timestamps, stopping at the first error */
+    for (long i = 0; i < n_read; ++i)
     {
-        for (int k = 0; k < 3; ++k)  /* first 3 values are accel x, y, z */
-        {
-            memcpy(p, &data_str[i + k * 3], 3);
-            t_ = strtol(p, NULL, 16);
-            t_ = (t_ > 2047) ? -4096 + t_ : t_;
-            data->acc[Nps * 3 + j] = ((double)t_ * 100.0f - info->offset[k]) / info->gain[k];
-            ++j;
-        }
-        memcpy(p, &data_str[i + 9], 3);  /* last value is light */
-        t_ = strtol(p, NULL, 16);
-        data->light[Nps + jj] = floor((double)(t_ >> 2) * (info->lux / info->volts));
-        ++jj;
+        ierr = pages[i].ierr;
+        if (ierr == GN_READ_E_NONE)
+            ierr = geneactiv_page_time(&pages[i], info, gdata, winfo, fs_warn);
+        if (ierr != GN_READ_E_NONE)
+            break;
     }
 
-    get_timestamps(&Nps, time, info, data, w_info);
+    /* the file ended before the number of pages in the header */
+    if ((ierr == GN_READ_E_NONE) && (p2 == n_found) && (n_found < info->npages))
+        ierr = GN_READ_E_BLOCK_MISSING_BLOCK_WARN;
 
-    return ier;
+    free(pages);
+    return ierr;
 }
@@ -0,0 +1,125 @@
+// Copyright (c) 2021. Pfizer Inc. All rights reserved.
+#include "read_binary_imu.h"
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <unistd.h>
+#include <pthread.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#define READ_THREADS
+#endif
+
+
+int map_file(const char *file, Map_t *map)
+{
+    map->data = NULL;
+    map->size = 0;
+#ifdef _WIN32
+    HANDLE hfile = CreateFileA(file, GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING,
+        FILE_ATTRIBUTE_NORMAL | FILE_FLAG_SEQUENTIAL_SCAN, NULL);
+    if (hfile == INVALID_HANDLE_VALUE)
+        return 1;
+
+    LARGE_INTEGER size;
+    if (!GetFileSizeEx(hfile, &size) || (size.QuadPart == 0))
+    {
+        CloseHandle(hfile);
+        return 1;
+    }
+
+    HANDLE hmap = CreateFileMappingA(hfile, NULL, PAGE_READONLY, 0, 0, NULL);
+    if (hmap == NULL)
+    {
+        CloseHandle(hfile);
+        return 1;
+    }
+    map->data = (const uint8_t *)MapViewOfFile(hmap, FILE_MAP_READ, 0, 0, 0);
+    /* the view keeps a reference to the mapping, handles are not needed anymore */
+    CloseHandle(hmap);
+    CloseHandle(hfile);
+
+    if (map->data == NULL)
+        return 1;
+    map->size = (size_t)size.QuadPart;
+#else
+    int fd = open(file, O_RDONLY);
+    if (fd == -1)
+        return 1;
+
+    struct stat st;
+    if ((fstat(fd, &st) != 0) || (st.st_size == 0))
+    {
+        close(fd);
+        return 1;
+    }
+
+    void *data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    /* the mapping stays valid after closing the file descriptor */
+    close(fd);
+
+    if (data == MAP_FAILED)
+        return 1;
+#ifdef MADV_SEQUENTIAL
+    madvise(data, (size_t)st.st_size, MADV_SEQUENTIAL);
+#endif
+    map->data = (const uint8_t *)data;
+    map->size = (size_t)st.st_size;
+#endif
+    return 0;
+}
+
+
+void unmap_file(Map_t *map)
+{
+    if (map->data == NULL)
+        return;
+#ifdef _WIN32
+    UnmapViewOfFile((LPCVOID)map->data);
+#else
+    munmap((void *)map->data, map->size);
+#endif
+    map->data = NULL;
+    map->size = 0;
+}
+
+
+/*
+Run `fn` on each of the `n_jobs` jobs, each on its own thread. `jobs` is an array of job
+structures of `job_size` bytes. The last job runs on the calling thread, as do any jobs that a
+thread could not be started for. Jobs run serially on platforms without pthreads.
+*/
+void run_parallel(void *(*fn)(void *), void *jobs, size_t job_size, int n_jobs)
+{
+    char *job = (char *)jobs;
+
+    if (n_jobs < 1)
+        return;
+#ifdef READ_THREADS
+    pthread_t *threads = (pthread_t *)malloc(n_jobs * sizeof(pthread_t));
+    int *started = (int *)calloc(n_jobs, sizeof(int));
+    if (threads && started)
+    {
+        for (int k = 0; k < n_jobs - 1; ++k)
+            started[k] = pthread_create(&threads[k], NULL, fn, job + k * job_size) == 0;
+    }
+    for (int k = 0; k < n_jobs - 1; ++k)
+    {
+        if (!threads || !started || !started[k])
+            fn(job + k * job_size);
+    }
+    fn(job + (n_jobs - 1) * job_size);
+    for (int k = 0; k < n_jobs - 1; ++k)
+    {
+        if (threads && started && started[k])
+            pthread_join(threads[k], NULL);
+    }
+    free(threads);
+    free(started);
+#else
+    for (int k = 0; k < n_jobs; ++k)
+        fn(job + k * job_size);
+#endif
+}
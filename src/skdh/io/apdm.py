@@ -4,16 +4,137 @@ GeneActiv reading process
 Lukas Adamowicz
 Copyright (c) 2021. Pfizer Inc. All rights reserved.
 """
+from operator import index
+
+from numpy import zeros
 import h5py
 
 from skdh.base import BaseProcess
 from skdh.io.base import check_input_file
+from skdh.io.cache import get_cache
+from skdh.io.utility import get_float_dtype
 
 
 class SensorNotFoundError(Exception):
     pass
 
 
+def _search_sorted(dataset, value):
+    """
+    Find the first index of a sorted 1D dataset that is not less than `value`,
+    reading only the elements needed for a binary search.
+    """
+    lo, hi = 0, dataset.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if dataset[mid] < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class LazyDataset:
+    """
+    Array-like view of part of an HDF5 dataset, which is only read from the file
+    when indexed or converted to an array. Each read opens the file, so that the
+    view is valid independent of any open file handles.
+
+    Parameters
+    ----------
+    file : str
+        Path to the HDF5 file.
+    name : str
+        Name of the dataset in the file.
+    start : int
+        First index along the first axis of the dataset.
+    stop : int
+        Stop index along the first axis of the dataset.
+    scale : float, optional
+        Values are divided by `scale` when read. Default is None, which returns
+        values as stored in the file.
+    dtype : {None, numpy.dtype}, optional
+        Type to convert the values to when read. Default is None, which keeps
+        the type of the (scaled) values.
+
+    Examples
+    --------
+    >>> data = ReadApdmH5("Lumbar", lazy=True).predict("example.h5")
+    >>> data["accel"].shape
+    (360000, 3)
+    >>> data["accel"][1000:2000]  # reads only these samples
+    """
+
+    def __init__(self, file, name, start, stop, scale=None, dtype=None):
+        self.file = file
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.scale = scale
+        self._cast = dtype
+
+        with h5py.File(file, "r") as f:
+            ds = f[name]
+            self.shape = (stop - start,) + ds.shape[1:]
+            if dtype is not None:
+                self.dtype = dtype
+            elif scale is None:
+                self.dtype = ds.dtype
+            else:
+                self.dtype = (zeros(1, ds.dtype) / scale).dtype
+
+    def __repr__(self):
+        return (
+            f"LazyDataset(file={self.file!r}, name={self.name!r}, shape={self.shape})"
+        )
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __array__(self, dtype=None):
+        arr = self[:]
+        return arr if dtype is None else arr.astype(dtype)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        k0, rest = (key[0], key[1:]) if len(key) > 0 else (slice(None), ())
+
+        post = None
+        if isinstance(k0, slice):
+            i1, i2, step = k0.indices(len(self))
+            if step > 0:
+                sel = slice(self.start + i1, self.start + max(i1, i2), step)
+            else:
+                # hyperslabs must be increasing, read and then reverse
+                sel = slice(self.start, self.stop)
+                post = k0
+        else:
+            try:
+                i = index(k0)
+            except TypeError:
+                # fancy indexing, read the selection and then index
+                sel = slice(self.start, self.stop)
+                post = k0
+            else:
+                if not -len(self) <= i < len(self):
+                    raise IndexError(f"index {i} is out of bounds for size {len(self)}")
+                sel = self.start + (i % len(self))
+
+        with h5py.File(self.file, "r") as f:
+            data = f[self.name][(sel,) + rest]
+
+        if post is not None:
+            data = data[post]
+        if self.scale is not None:
+            data = data / self.scale
+        return data if self._cast is None else data.astype(self._cast, copy=False)
+
+
 class ReadApdmH5(BaseProcess):
     """
     Read a H5 file produced by the APDM software into memory. Acceleration values
@@ -21,9 +142,12 @@ class ReadApdmH5(BaseProcess):
 
     Parameters
     ----------
-    sensor_location : str
+    sensor_location : {str, list-like}
         Sensor location to get data from. Looks at the `Label 0` key to find the
-        desired sensor.
+        desired sensor. If multiple locations are provided, all are read from
+        one pass through the file. The data of every sensor is returned under the
+        `sensors` key, and the data of the first location is also returned as the
+        usual `accel`, `time`, etc. keys.
     gravity_acceleration : float, optional
         Acceleration due to gravity. Used to convert values to units of `g`.
         Default is 9.81 m/s^2.
@@ -31,6 +155,26 @@ class ReadApdmH5(BaseProcess):
         What to do if the file extension does not match the expected extension (.h5).
         Default is "warn". "raise" raises a ValueError. "skip" skips the file
         reading altogether and attempts to continue with the pipeline.
+    cache : {None, str, pathlib.Path, FileCache}, optional
+        Cache for the data read from files. Either a :class:`skdh.io.FileCache`,
+        or a directory to create one in. Files that have been read before with
+        the same parameters are loaded from the cache as memory-mapped arrays
+        instead of being read again. Default is None, which does not cache data.
+    start : {None, float}, optional
+        Start of the time range to read, in unix seconds. Only the data at or
+        after `start` is read from the file. Default is None, which reads from the
+        beginning of the recording.
+    stop : {None, float}, optional
+        End of the time range to read, in unix seconds. Only the data before
+        `stop` is read from the file. Default is None, which reads to the end of
+        the recording.
+    lazy : bool, optional
+        Return :class:`skdh.io.apdm.LazyDataset` arrays instead of reading the
+        data into memory. Data is then only read from the file when it is indexed
+        or converted to an array. Default is False.
+    dtype : {"float64", "float32"}, optional
+        Floating point type of the acceleration, angular velocity, and temperature
+        arrays. Time is always float64. Default is "float64".
 
     Notes
     -----
@@ -46,12 +190,29 @@ class ReadApdmH5(BaseProcess):
     - Sternum
     """
 
-    def __init__(self, sensor_location, gravity_acceleration=9.81, ext_error="warn"):
+    def __init__(
+        self,
+        sensor_location,
+        gravity_acceleration=9.81,
+        ext_error="warn",
+        cache=None,
+        start=None,
+        stop=None,
+        lazy=False,
+        dtype="float64",
+    ):
+        self.dtype = get_float_dtype(dtype)
+
         super().__init__(
             # kwargs
             sensor_location=sensor_location,
             gravity_acceleration=gravity_acceleration,
             ext_error=ext_error,
+            cache=None if cache is None else str(cache),
+            start=start,
+            stop=stop,
+            lazy=lazy,
+            dtype=self.dtype.name,
         )
 
         if ext_error.lower() in ["warn", "raise", "skip"]:
@@ -60,7 +221,11 @@ class ReadApdmH5(BaseProcess):
             raise ValueError("`ext_error` must be one of 'raise', 'warn', 'skip'.")
 
         self.sens = sensor_location
+        self.start = start
+        self.stop = stop
+        self.lazy = lazy
         self.g = gravity_acceleration
+        self.cache = get_cache(cache)
 
     @check_input_file(".h5", check_size=False)
     def predict(self, file=None, **kwargs):
@@ -89,28 +254,67 @@ class ReadApdmH5(BaseProcess):
             If the file does not exist.
         skdh.io.SensorNotFoundError
             If the specified sensor name was not found.
+
+        Notes
+        -----
+        If reading multiple sensor locations, the `sensors` key contains a
+        dictionary of the data for each location.
         """
         super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
 
-        res = {}
+        single = isinstance(self.sens, str)
+        locations = [self.sens] if single else list(self.sens)
+
+        # scale and type for each dataset, and the key it is returned as
+        datasets = {
+            "Accelerometer": (self._acc, self.g, self.dtype),
+            "Time": (self._time, 1e6, None),  # to seconds
+            "Gyroscope": (self._gyro, None, self.dtype),
+            "Temperature": (self._temp, None, self.dtype),
+        }
+
+        sensors = {}
         # read the file
         with h5py.File(file, "r") as f:
-            sid = None  # sensor id
+            # get the sensor ids for all the labels in one pass
+            ids = {}
             for sens in f["Sensors"]:
                 try:
                     sname = f["Sensors"][sens]["Configuration"].attrs["Label 0"]
                 except (RuntimeError, KeyError):
                     # if the sensor has issues, still try to find in other sensors
                     continue
-                if sname.decode("utf-8") == self.sens:
-                    sid = sens
-            if sid is None:
-                raise SensorNotFoundError(f"Sensor {self.sens} was not found.")
-
-            res[self._acc] = f["Sensors"][sid]["Accelerometer"][()] / self.g
-            res[self._time] = f["Sensors"][sid]["Time"][()] / 1e6  # to seconds
-            res[self._gyro] = f["Sensors"][sid]["Gyroscope"][()]
-            res[self._temp] = f["Sensors"][sid]["Temperature"][()]
+                ids[sname.decode("utf-8")] = sens
+
+            for loc in locations:
+                if loc not in ids:
+                    raise SensorNotFoundError(f"Sensor {loc} was not found.")
+                group = f["Sensors"][ids[loc]]
+
+                # get the time range, without reading the entire time dataset
+                i1, i2 = 0, group["Time"].shape[0]
+                if self.start is not None:
+                    i1 = _search_sorted(group["Time"], self.start * 1e6)
+                if self.stop is not None:
+                    i2 = max(_search_sorted(group["Time"], self.stop * 1e6), i1)
+
+                sensors[loc] = {}
+                for name, (key, scale, dtype) in datasets.items():
+                    if self.lazy:
+                        value = LazyDataset(
+                            file, group[name].name, i1, i2, scale=scale, dtype=dtype
+                        )
+                    else:
+                        value = group[name][i1:i2]
+                        if scale is not None:
+                            value = value / scale
+                        if dtype is not None:
+                            value = value.astype(dtype, copy=False)
+                    sensors[loc][key] = value
+
+        res = sensors[locations[0]].copy()
+        if not single:
+            res["sensors"] = sensors
 
         res["file"] = file
         kwargs.update(res)
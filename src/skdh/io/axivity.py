@@ -5,18 +5,161 @@ Lukas Adamowicz
 Copyright (c) 2021. Pfizer Inc. All rights reserved.
 """
 from warnings import warn
+from pathlib import Path
+from mmap import mmap, ACCESS_READ
+from calendar import timegm
 
-from numpy import vstack, asarray, ascontiguousarray, minimum, int_
+from numpy import (
+    vstack,
+    asarray,
+    ascontiguousarray,
+    minimum,
+    maximum,
+    zeros,
+    empty,
+    ceil,
+    int_,
+    searchsorted,
+    concatenate,
+    float64,
+)
 
 from skdh.base import BaseProcess
 from skdh.io.base import check_input_file
-from skdh.io._extensions import read_axivity
+from skdh.io.cache import get_cache
+from skdh.io.utility import (
+    FileSizeError,
+    get_read_ranges,
+    get_time_windows,
+    get_float_dtype,
+)
+from skdh.io._extensions import (
+    read_axivity,
+    read_axivity_header,
+    read_axivity_chunk,
+    read_axivity_into,
+    MAX_DAYS,
+)
 
 
 class UnexpectedAxesError(Exception):
     pass
 
 
+def get_axes_slices(num_axes):
+    """
+    Get the slices of the IMU data corresponding to each sensor.
+
+    Parameters
+    ----------
+    num_axes : int
+        Number of axes in the IMU data. Must be 3, 6, or 9.
+
+    Returns
+    -------
+    acc_axes : slice
+        Accelerometer axes.
+    gyr_axes : {None, slice}
+        Gyroscope axes, if present.
+    mag_axes : {None, slice}
+        Magnetometer axes, if present.
+    """
+    gyr_axes = mag_axes = None
+    if num_axes == 3:
+        acc_axes = slice(None)
+    elif num_axes == 6:
+        gyr_axes = slice(3)
+        acc_axes = slice(3, 6)
+    elif num_axes == 9:  # pragma: no cover :: don't have data to test this
+        gyr_axes = slice(3)
+        acc_axes = slice(3, 6)
+        mag_axes = slice(6, 9)
+    else:  # pragma: no cover :: not expected to reach here only if file is corrupt
+        raise UnexpectedAxesError("Unexpected number of axes in the IMU data")
+
+    return acc_axes, gyr_axes, mag_axes
+
+
+def _get_block_time(buf, i):
+    """
+    Get the (whole second) timestamp of a data block from its header, in unix
+    seconds. Returns None for invalid blocks.
+    """
+    block = buf[512 * i : 512 * i + 18]
+    if block[:4] != b"AX\xfc\x01":  # header and packet length (508)
+        return None
+
+    stamp = int.from_bytes(block[14:18], "little")
+    try:
+        return timegm(
+            (
+                ((stamp >> 26) & 0x3F) + 2000,
+                (stamp >> 22) & 0x0F,
+                (stamp >> 17) & 0x1F,
+                (stamp >> 12) & 0x1F,
+                (stamp >> 6) & 0x3F,
+                stamp & 0x3F,
+            )
+        )
+    except ValueError:
+        return None
+
+
+def _search_blocks(buf, lo, hi, t):
+    """
+    Find the first data block in [lo, hi) with a timestamp not before `t`, using a
+    binary search over the block timestamps. Invalid blocks are skipped.
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        j, tj = mid, None
+        while j < hi and tj is None:
+            tj = _get_block_time(buf, j)
+            j += 1
+        if tj is None:
+            hi = mid
+        elif tj < t:
+            lo = j
+        else:
+            hi = mid
+    return lo
+
+
+def _get_recording_bounds(buf, nblocks):
+    """
+    Get the approximate start and end times of a recording from the timestamps
+    of its first and last valid data blocks, in unix seconds.
+    """
+    t_first = t_last = None
+    for i in range(2, nblocks):
+        t_first = _get_block_time(buf, i)
+        if t_first is not None:
+            break
+    for i in range(nblocks - 1, 1, -1):
+        t_last = _get_block_time(buf, i)
+        if t_last is not None:
+            break
+    if t_first is None:
+        return 0.0, 0.0
+    return t_first, t_last
+
+
+def _check_file(file):
+    """
+    Check that a file exists and has data, for methods that are not wrapped by
+    `check_input_file`.
+    """
+    if file is None:
+        raise ValueError("`file` must not be None.")
+    pfile = Path(file)
+    if not pfile.exists():
+        raise FileNotFoundError(f"File {file} does not exist.")
+    if pfile.stat().st_size < 1000:
+        raise FileSizeError("File is less than 1kb, nothing to read.")
+
+    return str(file)
+
+
 class ReadCwa(BaseProcess):
     """
     Read a binary CWA file from an axivity sensor into memory. Acceleration is return in units of
@@ -38,6 +181,36 @@ class ReadCwa(BaseProcess):
         What to do if the file extension does not match the expected extension (.cwa).
         Default is "warn". "raise" raises a ValueError. "skip" skips the file
         reading altogether and attempts to continue with the pipeline.
+    use_mmap : bool, optional
+        Memory map the file and decode the data directly into separate
+        C-contiguous arrays for each sensor, instead of reading into a combined
+        array and copying out each sensor. Uses less memory for long recordings.
+        Default is False.
+    n_threads : int, optional
+        Number of threads to use to decode the data blocks of the file. Default
+        is 1.
+    start : {None, float}, optional
+        Only read the data at or after this time, in unix seconds. The data
+        blocks to decode are found from the block timestamps, so the rest of the
+        file is not decoded. Default is None, which reads from the start of the
+        recording.
+    stop : {None, float}, optional
+        Only read the data before this time, in unix seconds. Default is None,
+        which reads to the end of the recording.
+    windows_only : bool, optional
+        Only read the data inside the windows defined by `bases` and `periods`,
+        skipping the data blocks between windows. The data of all the windows
+        is concatenated, and `day_ends` indexes the windows in the concatenated
+        data. Default is False.
+    cache : {None, str, pathlib.Path, FileCache}, optional
+        Cache for the data read from files. Either a :class:`skdh.io.FileCache`,
+        or a directory to create one in. Files that have been read before with
+        the same parameters are loaded from the cache as memory-mapped arrays
+        instead of being read again. Default is None, which does not cache data.
+    dtype : {"float64", "float32"}, optional
+        Floating point type of the acceleration, angular velocity, magnetic field,
+        and temperature arrays. Time is always float64. With "float32" the data
+        is decoded directly into float32 arrays. Default is "float64".
 
     Examples
     --------
@@ -54,14 +227,45 @@ class ReadCwa(BaseProcess):
     {'accel': ..., 'time': ..., 'day_ends': [130, 13951, ...], ...}
     """
 
-    def __init__(self, bases=None, periods=None, ext_error="warn"):
+    # can read a time range with `start` and `stop`
+    _chunkable = True
+
+    def __init__(
+        self,
+        bases=None,
+        periods=None,
+        ext_error="warn",
+        use_mmap=False,
+        n_threads=1,
+        cache=None,
+        start=None,
+        stop=None,
+        windows_only=False,
+        dtype="float64",
+    ):
+        self.dtype = get_float_dtype(dtype)
+
         super().__init__(
             # kwargs
             bases=bases,
             periods=periods,
             ext_error=ext_error,
+            use_mmap=use_mmap,
+            n_threads=n_threads,
+            cache=None if cache is None else str(cache),
+            start=start,
+            stop=stop,
+            windows_only=windows_only,
+            dtype=self.dtype.name,
         )
 
+        self.use_mmap = use_mmap
+        self.n_threads = max(int(n_threads), 1)
+        self.cache = get_cache(cache)
+        self.start = start
+        self.stop = stop
+        self.windows_only = windows_only
+
         if ext_error.lower() in ["warn", "raise", "skip"]:
             self.ext_error = ext_error.lower()
         else:
@@ -129,30 +333,42 @@ class ReadCwa(BaseProcess):
         - `magnet`: magnetic field readings [uT]
         - `time`: timestamps [s]
         - `day_ends`: window indices
+
+        If reading a time range (`start`/`stop`) or only the windows
+        (`windows_only`), `day_ends` is found from the timestamps of the data
+        that was read, and `use_mmap` is not used.
         """
         super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
 
+        if (
+            self.start is not None
+            or self.stop is not None
+            or (self.windows_only and self.window)
+        ):
+            kwargs.update(self._read_ranges(file))
+
+            return (kwargs, None) if self._in_pipeline else kwargs
+
+        if self.use_mmap or self.dtype != float64:
+            out = {
+                key: empty(shape, dtype=self.dtype)
+                for key, shape in self.get_output_shapes(file).items()
+            }
+            out[self._time] = empty(out[self._time].shape)  # time is always float64
+            results = self.read_into(file, out)
+            kwargs.update(results)
+
+            return (kwargs, None) if self._in_pipeline else kwargs
+
         # read the file
         fs, n_bad_samples, imudata, ts, temperature, starts, stops = read_axivity(
-            file, self.bases, self.periods
+            file, self.bases, self.periods, self.n_threads
         )
 
         # end = None if n_bad_samples == 0 else -n_bad_samples
         end = None
 
-        num_axes = imudata.shape[1]
-        gyr_axes = mag_axes = None
-        if num_axes == 3:
-            acc_axes = slice(None)
-        elif num_axes == 6:
-            gyr_axes = slice(3)
-            acc_axes = slice(3, 6)
-        elif num_axes == 9:  # pragma: no cover :: don't have data to test this
-            gyr_axes = slice(3)
-            acc_axes = slice(3, 6)
-            mag_axes = slice(6, 9)
-        else:  # pragma: no cover :: not expected to reach here only if file is corrupt
-            raise UnexpectedAxesError("Unexpected number of axes in the IMU data")
+        acc_axes, gyr_axes, mag_axes = get_axes_slices(imudata.shape[1])
 
         results = {
             self._time: ts[:end],
@@ -168,15 +384,437 @@ class ReadCwa(BaseProcess):
             results[self._mag] = ascontiguousarray(imudata[:end, mag_axes])
 
         if self.window:
-            results[self._days] = {}
-            for i, data in enumerate(zip(self.bases, self.periods)):
-                strt = starts[stops[:, i] != 0, i]
-                stp = stops[stops[:, i] != 0, i]
-
-                results[self._days][(data[0], data[1])] = minimum(
-                    vstack((strt, stp)).T, results[self._time].size - 1
-                )
+            results[self._days] = self._get_day_ends(
+                starts, stops, results[self._time].size
+            )
 
         kwargs.update(results)
 
         return (kwargs, None) if self._in_pipeline else kwargs
+
+    def _get_time_range(self, file):
+        """
+        Get a time range that contains all of the data in a file, from the
+        timestamps of the first and last data blocks.
+
+        Parameters
+        ----------
+        file : {str, Path}
+            File to get the time range of.
+
+        Returns
+        -------
+        t_first : float
+            Time before the first sample, in unix seconds.
+        t_last : float
+            Time after the last sample, in unix seconds.
+        """
+        file = _check_file(file)
+        _, nblocks, _, _ = read_axivity_header(file)
+
+        with open(file, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as buf:
+            t_first, t_last = _get_recording_bounds(buf, min(nblocks, len(buf) // 512))
+
+        # block timestamps are whole seconds and can be offset from the first
+        # sample of the block, and blocks are shorter than a minute
+        return t_first - 60.0, t_last + 60.0
+
+    def _read_ranges(self, file):
+        """
+        Read only the data blocks covering the time ranges to read.
+
+        Parameters
+        ----------
+        file : str
+            File to read.
+
+        Returns
+        -------
+        data : dict
+            Dictionary of the data in the time ranges.
+        """
+        fs, nblocks, num_axes, count = read_axivity_header(file)
+        acc_axes, gyr_axes, mag_axes = get_axes_slices(num_axes)
+
+        blocks = []
+        with open(file, "rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as buf:
+            nblocks = min(nblocks, len(buf) // 512)
+
+            # approximate recording bounds, for finding the windows
+            t_first, t_last = _get_recording_bounds(buf, nblocks)
+
+            # block timestamps are whole seconds and can be offset from the first
+            # sample, and the first decoded block is not adjusted to the end of
+            # the block before it. Search from a block duration earlier, decode
+            # an extra 2 blocks on each side, and trim by time
+            margin = count / fs + 1.0
+            for t1, t2 in get_read_ranges(
+                t_first,
+                t_last + 60.0,
+                self.start,
+                self.stop,
+                self.bases,
+                self.periods,
+                self.windows_only and self.window,
+            ):
+                b1 = max(_search_blocks(buf, 2, nblocks, t1 - margin) - 2, 2)
+                b2 = min(_search_blocks(buf, b1, nblocks, t2) + 2, nblocks)
+                if b2 > b1:
+                    blocks.append((b1, b2, t1, t2))
+
+        parts = []
+        for b1, b2, t1, t2 in blocks:
+            # windows are found from the timestamps after reading
+            starts = zeros((MAX_DAYS, self.bases.size), dtype="l")
+            stops = zeros((MAX_DAYS, self.bases.size), dtype="l")
+            i_start = zeros(self.bases.size, dtype="l")
+            i_stop = zeros(self.bases.size, dtype="l")
+
+            fs, _, imudata, ts, temperature, _ = read_axivity_chunk(
+                file,
+                self.bases,
+                self.periods,
+                b1,
+                b2,
+                -1000.0,
+                starts,
+                stops,
+                i_start,
+                i_stop,
+                self.n_threads,
+            )
+            i1, i2 = searchsorted(ts, [t1, t2])
+            parts.append(
+                (
+                    ts[i1:i2],
+                    imudata[i1:i2].astype(self.dtype, copy=False),
+                    temperature[i1:i2].astype(self.dtype, copy=False),
+                )
+            )
+
+        if parts:
+            ts = concatenate([p[0] for p in parts])
+            imudata = concatenate([p[1] for p in parts])
+            temperature = concatenate([p[2] for p in parts])
+        else:
+            ts = empty(0)
+            imudata = empty((0, num_axes), dtype=self.dtype)
+            temperature = empty(0, dtype=self.dtype)
+
+        results = {
+            self._time: ts,
+            "file": file,
+            "fs": fs,
+            self._temp: temperature,
+        }
+        if acc_axes is not None:
+            results[self._acc] = ascontiguousarray(imudata[:, acc_axes])
+        if gyr_axes is not None:
+            results[self._gyro] = ascontiguousarray(imudata[:, gyr_axes])
+        if mag_axes is not None:  # pragma: no cover :: don't have data to test this
+            results[self._mag] = ascontiguousarray(imudata[:, mag_axes])
+
+        if self.window:
+            results[self._days] = get_time_windows(ts, self.bases, self.periods)
+
+        return results
+
+    def _get_day_ends(self, starts, stops, n):
+        """
+        Get the window start and stop indices from the extension outputs.
+
+        Parameters
+        ----------
+        starts : numpy.ndarray
+            Window start indices.
+        stops : numpy.ndarray
+            Window stop indices.
+        n : int
+            Number of samples in the recording.
+
+        Returns
+        -------
+        day_ends : dict
+            Window start and stop indices for each base and period.
+        """
+        days = {}
+        for i, data in enumerate(zip(self.bases, self.periods)):
+            strt = starts[stops[:, i] != 0, i]
+            stp = stops[stops[:, i] != 0, i]
+
+            days[(data[0], data[1])] = minimum(vstack((strt, stp)).T, n - 1)
+
+        return days
+
+    def get_output_shapes(self, file):
+        """
+        get_output_shapes(file)
+
+        Get the shapes of the arrays needed to read a file with
+        :meth:`ReadCwa.read_into`.
+
+        Parameters
+        ----------
+        file : {str, Path}
+            Path to the file to read.
+
+        Returns
+        -------
+        shapes : dict
+            Shape of the array for each of the data keys in the file.
+        """
+        fs, nblocks, num_axes, count = read_axivity_header(str(file))
+        _, gyr_axes, mag_axes = get_axes_slices(num_axes)
+
+        n = (nblocks - 2) * count
+
+        shapes = {self._time: (n,), self._temp: (n,), self._acc: (n, 3)}
+        if gyr_axes is not None:
+            shapes[self._gyro] = (n, 3)
+        if mag_axes is not None:  # pragma: no cover :: don't have data to test this
+            shapes[self._mag] = (n, 3)
+
+        return shapes
+
+    def read_into(self, file, out):
+        """
+        read_into(file, out)
+
+        Read the data from the axivity file directly into pre-allocated arrays.
+        The file is memory mapped and decoded straight into the arrays, without
+        any intermediate copies.
+
+        Parameters
+        ----------
+        file : {str, Path}
+            Path to the file to read.
+        out : dict
+            Output arrays for each of the keys from
+            :meth:`ReadCwa.get_output_shapes`, with the matching shapes. Arrays
+            must be writeable and C-contiguous. The time array must be float64,
+            all others can be either float64 or float32.
+
+        Returns
+        -------
+        data : dict
+            Dictionary of the data contained in the file, with the arrays from
+            `out`. Keys are the same as for :meth:`ReadCwa.predict`.
+
+        Raises
+        ------
+        ValueError
+            If the file name is not provided, or the output arrays do not match
+            the file.
+
+        Examples
+        --------
+        >>> reader = ReadCwa()
+        >>> shapes = reader.get_output_shapes('example.cwa')
+        >>> out = {k: numpy.empty(s, dtype="float32") for k, s in shapes.items()}
+        >>> out['time'] = numpy.empty(shapes['time'])  # time must be float64
+        >>> data = reader.read_into('example.cwa', out)
+        """
+        file = _check_file(file)
+
+        fs, n_bad_samples, starts, stops = read_axivity_into(
+            file,
+            self.bases,
+            self.periods,
+            out[self._time],
+            out[self._temp],
+            out[self._acc],
+            out.get(self._gyro, None),
+            out.get(self._mag, None),
+            self.n_threads,
+        )
+
+        results = {
+            self._time: out[self._time],
+            "file": file,
+            "fs": fs,
+            self._temp: out[self._temp],
+            self._acc: out[self._acc],
+        }
+        for key in [self._gyro, self._mag]:
+            if out.get(key, None) is not None:
+                results[key] = out[key]
+
+        if self.window:
+            results[self._days] = self._get_day_ends(
+                starts, stops, results[self._time].size
+            )
+
+        return results
+
+    def iter_chunks(self, file=None, chunk_seconds=3600):
+        """
+        iter_chunks(file, chunk_seconds=3600)
+
+        Read the data from the axivity file in chunks, only holding one chunk
+        of data in memory at a time.
+
+        Parameters
+        ----------
+        file : {str, Path}
+            Path to the file to read. Must either be a string, or be able to be converted by
+            `str(file)`
+        chunk_seconds : float, optional
+            Approximate duration of each chunk in seconds. Chunks are made of
+            whole data blocks, so the actual duration will be slightly longer.
+            Default is 3600 (1 hour).
+
+        Yields
+        ------
+        data : dict
+            Dictionary of the data contained in the chunk. Keys are the same as
+            for :meth:`ReadCwa.predict`, with the addition of `chunk_start`, the
+            index of the first sample of the chunk in the full recording.
+
+        Raises
+        ------
+        ValueError
+            If the file name is not provided
+        UnexpectedAxesError
+            If the number of axes returned is not 3, 6 or 9
+
+        Notes
+        -----
+        Timestamps are continued across chunk boundaries in the same way as
+        :meth:`ReadCwa.predict`, so that concatenating all the chunks gives the
+        same result as reading the whole file at once. The only exception is
+        the interpolation of timestamps for bad data blocks at the edges of a
+        chunk, which can only use data from inside that chunk.
+
+        Windows in `day_ends` are indices into the chunk's data, and are
+        clipped to the chunk boundaries. Windows that continue into the next
+        chunk end at the last sample of the chunk.
+
+        Examples
+        --------
+        >>> reader = ReadCwa(bases=8, periods=12)
+        >>> for chunk in reader.iter_chunks('example.cwa', chunk_seconds=3600):
+        >>>     process(chunk['accel'], chunk['time'], chunk['day_ends'][(8, 12)])
+        """
+        if chunk_seconds <= 0:
+            raise ValueError("`chunk_seconds` must be greater than 0.")
+        file = _check_file(file)
+
+        fs, nblocks, num_axes, count = read_axivity_header(file)
+        acc_axes, gyr_axes, mag_axes = get_axes_slices(num_axes)
+
+        n_total = (nblocks - 2) * count
+        n_chunk_blocks = max(int(ceil(chunk_seconds * fs / count)), 1)
+
+        # windowing state, carried from chunk to chunk
+        starts = zeros((MAX_DAYS, self.bases.size), dtype="l")
+        stops = zeros((MAX_DAYS, self.bases.size), dtype="l")
+        i_start = zeros(self.bases.size, dtype="l")
+        i_stop = zeros(self.bases.size, dtype="l")
+        t_last = -1000.0
+
+        for block_start in range(2, nblocks, n_chunk_blocks):
+            block_stop = min(block_start + n_chunk_blocks, nblocks)
+
+            fs, _, imudata, ts, temperature, t_last = read_axivity_chunk(
+                file,
+                self.bases,
+                self.periods,
+                block_start,
+                block_stop,
+                t_last,
+                starts,
+                stops,
+                i_start,
+                i_stop,
+                self.n_threads,
+            )
+
+            chunk_start = (block_start - 2) * count
+
+            results = {
+                self._time: ts,
+                "file": file,
+                "fs": fs,
+                self._temp: temperature.astype(self.dtype, copy=False),
+                "chunk_start": chunk_start,
+            }
+            if acc_axes is not None:
+                results[self._acc] = ascontiguousarray(
+                    imudata[:, acc_axes], dtype=self.dtype
+                )
+            if gyr_axes is not None:
+                results[self._gyro] = ascontiguousarray(
+                    imudata[:, gyr_axes], dtype=self.dtype
+                )
+            if mag_axes is not None:  # pragma: no cover :: don't have data to test this
+                results[self._mag] = ascontiguousarray(
+                    imudata[:, mag_axes], dtype=self.dtype
+                )
+
+            if self.window:
+                results[self._days] = self._get_chunk_windows(
+                    starts,
+                    stops,
+                    i_start,
+                    chunk_start,
+                    chunk_start + ts.size,
+                    n_total,
+                    block_stop == nblocks,
+                )
+
+            yield results
+
+    def _get_chunk_windows(
+        self, starts, stops, i_start, chunk_start, chunk_stop, n_total, last_chunk
+    ):
+        """
+        Get the windows that overlap a chunk of data, in chunk indices.
+
+        Parameters
+        ----------
+        starts : numpy.ndarray
+            Window start indices found so far, in recording indices.
+        stops : numpy.ndarray
+            Window stop indices found so far, in recording indices.
+        i_start : numpy.ndarray
+            Number of window starts found so far for each window definition.
+        chunk_start : int
+            Index of the first sample of the chunk.
+        chunk_stop : int
+            Index of the sample after the last sample of the chunk.
+        n_total : int
+            Number of samples in the full recording.
+        last_chunk : bool
+            If this is the last chunk of the recording. Windows that have not
+            been closed by the last chunk are dropped, as in `predict`.
+
+        Returns
+        -------
+        day_ends : dict
+            Window start and stop indices into the chunk.
+        """
+        days = {}
+        for i, data in enumerate(zip(self.bases, self.periods)):
+            # windows that have ended, and windows that are still open
+            n = max(i_start[i], (stops[:, i] != 0).nonzero()[0].max(initial=-1) + 1)
+            strt = starts[:n, i]
+            stp = stops[:n, i]
+            if last_chunk:
+                strt, stp = strt[stp != 0], stp[stp != 0]
+            else:
+                stp = stp.copy()
+                stp[stp == 0] = chunk_stop - 1
+            stp = minimum(stp, n_total - 1)
+
+            mask = (strt < chunk_stop) & (stp >= chunk_start)
+            days[(data[0], data[1])] = (
+                vstack(
+                    (
+                        maximum(strt[mask], chunk_start),
+                        minimum(stp[mask], chunk_stop - 1),
+                    )
+                ).T
+                - chunk_start
+            )
+
+        return days
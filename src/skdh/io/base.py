@@ -62,7 +62,32 @@ def check_input_file(
             # cast to a string
             file = str(file)
 
-            return func(self, file=file, **kwargs)
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return func(self, file=file, **kwargs)
+
+            key = cache.get_key(file, self)
+            data = cache.load(key)
+            if data is not None:
+                self.logger.info(f"Loaded {file} from the cache [{cache}]")
+                data["file"] = file
+                kwargs.update(data)
+                return (kwargs, None) if self._in_pipeline else kwargs
+
+            inputs = kwargs.copy()
+            res = func(self, file=file, **kwargs)
+            results = res[0] if self._in_pipeline else res
+            # only store the data that was read from the file
+            cache.store(
+                key,
+                {
+                    k: v
+                    for k, v in results.items()
+                    if k not in inputs or v is not inputs[k]
+                },
+            )
+
+            return res
 
         return wrapper_check_input_file
 
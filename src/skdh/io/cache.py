@@ -0,0 +1,346 @@
+"""
+Persistent cache of data read from files
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from pathlib import Path
+from hashlib import blake2b
+from uuid import uuid4
+import json
+import os
+import shutil
+
+from numpy import ndarray, generic, save as np_save, load as np_load
+
+
+# process parameters that do not change the output
+_IGNORED_PARAMETERS = (
+    "cache",
+    "ext_error",
+    "n_threads",
+    "use_mmap",
+    "n_workers",
+    "executor",
+)
+
+
+def get_cache(cache):
+    """
+    Get a cache from a reader `cache` parameter.
+
+    Parameters
+    ----------
+    cache : {None, str, pathlib.Path, FileCache}
+        Cache, or directory for a cache.
+
+    Returns
+    -------
+    cache : {None, FileCache}
+        File cache, or None if not caching.
+    """
+    if cache is None or isinstance(cache, FileCache):
+        return cache
+    return FileCache(cache)
+
+
+class FileCache:
+    """
+    Persistent cache of the data read from device files. Data is stored as
+    uncompressed numpy `.npy` files, and returned memory-mapped on a cache hit.
+    Entries are keyed by the content of the file being read, the reader and its
+    parameters, and the version of scikit-digital-health. The least recently
+    used entries are removed when the cache grows larger than `max_size`.
+
+    Parameters
+    ----------
+    directory : {str, pathlib.Path}
+        Directory to store the cache in. Will be created if it does not exist.
+    max_size : int, optional
+        Maximum size of the cache in bytes. Default is 10 GB.
+
+    Examples
+    --------
+    Cache the data read from a file. The second read is loaded from the cache
+
+    >>> reader = ReadCwa(cache=FileCache("/tmp/skdh_cache", max_size=2**30))
+    >>> data = reader.predict("example.cwa")
+    >>> data = reader.predict("example.cwa")
+
+    Readers also accept a directory, which uses the default cache size
+
+    >>> reader = ReadBin(cache="/tmp/skdh_cache")
+    """
+
+    _manifest = "manifest.json"
+
+    def __init__(self, directory, max_size=10 * 2**30):
+        self.directory = Path(directory)
+        self.max_size = int(max_size)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "hashes").mkdir(exist_ok=True)
+
+    def __repr__(self):
+        return f"FileCache(directory={str(self.directory)!r}, max_size={self.max_size})"
+
+    def __str__(self):
+        return str(self.directory)
+
+    def file_hash(self, file):
+        """
+        Get the hash of the contents of a file. Hashes are remembered using the
+        file path, size, and modification time so that unchanged files are only
+        read once.
+
+        Parameters
+        ----------
+        file : {str, pathlib.Path}
+            File to get the hash of.
+
+        Returns
+        -------
+        hash : str
+            Hash of the file contents.
+        """
+        pfile = Path(file).resolve()
+        stat = pfile.stat()
+        memo = (
+            self.directory
+            / "hashes"
+            / f"{blake2b(str(pfile).encode(), digest_size=16).hexdigest()}.json"
+        )
+
+        try:
+            with open(memo, "r") as f:
+                info = json.load(f)
+            if info["size"] == stat.st_size and info["mtime"] == stat.st_mtime_ns:
+                return info["hash"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        h = blake2b(digest_size=32)
+        with open(pfile, "rb") as f:
+            for block in iter(lambda: f.read(2**22), b""):
+                h.update(block)
+        fhash = h.hexdigest()
+
+        self._write_json(
+            memo, {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": fhash}
+        )
+        return fhash
+
+    def get_key(self, file, reader):
+        """
+        Get the cache key for reading a file with a reader.
+
+        Parameters
+        ----------
+        file : {str, pathlib.Path}
+            File being read.
+        reader : skdh.BaseProcess
+            Reader used to read the file.
+
+        Returns
+        -------
+        key : str
+            Cache key.
+        """
+        import skdh
+
+        params = {k: v for k, v in reader._kw.items() if k not in _IGNORED_PARAMETERS}
+        info = json.dumps(
+            {
+                "file": self.file_hash(file),
+                "reader": reader._name,
+                "parameters": params,
+                "version": skdh.__version__,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+
+        return blake2b(info.encode(), digest_size=20).hexdigest()
+
+    def load(self, key):
+        """
+        Load data from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`FileCache.get_key`.
+
+        Returns
+        -------
+        data : {None, dict}
+            Cached data, with arrays memory-mapped. None if the key is not in the
+            cache.
+        """
+        entry = self.directory / key
+        try:
+            with open(entry / self._manifest, "r") as f:
+                manifest = json.load(f)
+
+            data = {
+                name: self._load_item(entry, item) for name, item in manifest.items()
+            }
+        except (OSError, ValueError, KeyError):
+            # missing, or removed by another process while loading
+            return None
+
+        # mark as recently used
+        try:
+            os.utime(entry / self._manifest)
+        except OSError:  # pragma: no cover
+            pass
+
+        return data
+
+    def store(self, key, data):
+        """
+        Store data in the cache. Data that cannot be stored (ie object arrays,
+        or values that cannot be serialized) is not cached.
+
+        Parameters
+        ----------
+        key : str
+            Cache key from :meth:`FileCache.get_key`.
+        data : dict
+            Data to store.
+
+        Returns
+        -------
+        stored : bool
+            If the data was stored in the cache.
+        """
+        entry = self.directory / key
+        if (entry / self._manifest).exists():
+            return True
+
+        tmp = self.directory / f".{key}.{uuid4().hex}.tmp"
+        tmp.mkdir()
+        try:
+            manifest = {}
+            for i, (name, value) in enumerate(data.items()):
+                manifest[name] = self._store_item(tmp, str(i), value)
+            self._write_json(tmp / self._manifest, manifest)
+        except (TypeError, ValueError):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+        if self._entry_size(tmp) > self.max_size:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+        try:
+            # atomic, so that other processes never see a partial entry
+            os.replace(tmp, entry)
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used entries until the cache is smaller than
+        `max_size`.
+
+        Parameters
+        ----------
+        keep : {None, str}, optional
+            Key of an entry that should not be removed.
+        """
+        entries = []
+        for entry in self.directory.iterdir():
+            manifest = entry / self._manifest
+            if entry.name.startswith(".") or not manifest.is_file():
+                continue
+            try:
+                entries.append(
+                    (manifest.stat().st_mtime, self._entry_size(entry), entry)
+                )
+            except OSError:  # pragma: no cover :: removed by another process
+                continue
+
+        total = sum(e[1] for e in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_size:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "hashes").mkdir(exist_ok=True)
+
+    def _load_item(self, entry, item):
+        if item["kind"] == "array":
+            return self._load_array(entry / item["file"])
+        elif item["kind"] == "windows":
+            return {
+                (base, period): self._load_array(entry / fname)
+                for base, period, fname in item["windows"]
+            }
+        elif item["kind"] == "dict":
+            return {k: self._load_item(entry, v) for k, v in item["items"].items()}
+        else:
+            return item["value"]
+
+    @staticmethod
+    def _load_array(file):
+        # copy-on-write, so that arrays can be modified without changing the cache
+        return np_load(file, mmap_mode="c", allow_pickle=False)
+
+    @staticmethod
+    def _save_array(file, value):
+        if value.dtype.hasobject:
+            raise TypeError("Object arrays cannot be cached.")
+        np_save(file, value, allow_pickle=False)
+
+    def _store_item(self, directory, i, value):
+        if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+            # nested data, eg for multiple sensors
+            return {
+                "kind": "dict",
+                "items": {
+                    k: self._store_item(directory, f"{i}_{j}", v)
+                    for j, (k, v) in enumerate(value.items())
+                },
+            }
+        elif isinstance(value, ndarray):
+            self._save_array(directory / f"{i}.npy", value)
+            return {"kind": "array", "file": f"{i}.npy"}
+        elif isinstance(value, dict) and all(
+            isinstance(k, tuple) and len(k) == 2 for k in value
+        ):
+            windows = []
+            for j, ((base, period), arr) in enumerate(value.items()):
+                self._save_array(directory / f"{i}_{j}.npy", arr)
+                windows.append([int(base), int(period), f"{i}_{j}.npy"])
+            return {"kind": "windows", "windows": windows}
+        else:
+            if isinstance(value, generic):
+                value = value.item()
+            # make sure the value can be stored
+            json.dumps(value)
+            return {"kind": "value", "value": value}
+
+    @staticmethod
+    def _entry_size(entry):
+        return sum(f.stat().st_size for f in entry.iterdir())
+
+    @staticmethod
+    def _write_json(file, data):
+        tmp = file.with_name(f".{file.name}.{uuid4().hex}")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, file)
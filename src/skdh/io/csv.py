@@ -18,11 +18,19 @@ from numpy import (
     unique,
     all as npall,
     int_,
+    int64,
+    float64,
+    empty,
+    concatenate,
+    flatnonzero,
 )
-from pandas import read_csv, to_datetime, to_timedelta, Timedelta
+from pandas import read_csv, to_datetime, to_timedelta, Timedelta, Series
+from pandas.tseries.frequencies import to_offset
 
 from skdh.base import BaseProcess
 from skdh.io.base import check_input_file
+from skdh.io.cache import get_cache
+from skdh.io.utility import get_float_dtype
 
 
 def handle_timestamp_inconsistency(df, fill_gaps, accel_col_names, accel_in_g, g):
@@ -113,6 +121,213 @@ def handle_timestamp_inconsistency(df, fill_gaps, accel_col_names, accel_in_g, g
     return df_full, float(n_samples)
 
 
+class _ChunkedOutput:
+    """
+    Time and acceleration output arrays that chunks of data are written into.
+    Arrays are preallocated, and grown in place if more samples are written than
+    expected.
+    """
+
+    def __init__(self, n, dtype=float64):
+        self.time = empty(n, dtype=int64)
+        self.accel = empty((n, 3), dtype=dtype)
+        self.n = 0
+
+    def reserve(self, n):
+        if n > self.time.size:
+            size = max(n, int(self.time.size * 1.5))
+            self.time.resize(size, refcheck=False)
+            self.accel.resize((size, 3), refcheck=False)
+
+    def trim(self):
+        self.time.resize(self.n, refcheck=False)
+        self.accel.resize((self.n, 3), refcheck=False)
+
+
+def _count_lines(file):
+    n = 0
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(2**24), b""):
+            n += block.count(b"\n")
+    return n
+
+
+def read_csv_chunked(
+    file,
+    time_col_name,
+    accel_col_names,
+    fill_gaps,
+    to_datetime_kwargs,
+    accel_in_g,
+    g,
+    read_csv_kwargs,
+    chunksize,
+    dtype=float64,
+):
+    """
+    Read timestamps and acceleration from a CSV file in chunks, handling blocks
+    of non-unique timestamps and data gaps for each chunk, and writing directly into
+    the output arrays. Results match reading the entire file and calling
+    :func:`handle_timestamp_inconsistency`.
+
+    Parameters
+    ----------
+    file : str
+        CSV file to read.
+    time_col_name : str
+        The name of the column containing timestamps.
+    accel_col_names : array-like
+        Array-like (size 3) of the acceleration column names in XYZ order.
+    fill_gaps : bool
+        Fill data gaps with the vector [0, 0, 1] or [0, 0, `g`] depending on
+        accel units.
+    to_datetime_kwargs : dict
+        Key-word arguments for :py:class:`pandas.to_datetime`. Providing the
+        timestamp `format` is recommended for fast parsing.
+    accel_in_g : bool
+        If acceleration values are already in units of "g".
+    g : float
+        Gravitational acceleration in m/s^2.
+    read_csv_kwargs : dict
+        Additional key-word arguments for :py:class:`pandas.read_csv`.
+    chunksize : int
+        Number of rows to read at a time.
+    dtype : numpy.dtype, optional
+        Floating point type of the acceleration array. Default is float64.
+
+    Returns
+    -------
+    time : numpy.ndarray
+        Timestamps in nanoseconds since the epoch.
+    accel : numpy.ndarray
+        (N, 3) array of acceleration values in units of "g".
+    fs : float
+        Number of samples per second.
+    """
+    kw = {"usecols": [time_col_name, *accel_col_names]}
+    kw.update(read_csv_kwargs)
+    kw["chunksize"] = chunksize
+
+    # number of lines is a good estimate of the number of output samples
+    out = _ChunkedOutput(max(_count_lines(file), 1), dtype)
+
+    # state carried between chunks
+    n_samples = None
+    t_delta = None  # block timestamp offsets
+    step = None  # sampling period for gap filling, ns
+    t_first = t_prev = None
+    t_buf = empty(0, dtype=int64)
+    a_buf = empty((0, 3), dtype=float64)
+
+    with read_csv(file, **kw) as chunks:
+        while True:
+            chunk = next(chunks, None)
+            eof = chunk is None
+
+            if not eof:
+                t_buf = concatenate(
+                    (
+                        t_buf,
+                        to_datetime(chunk[time_col_name], **to_datetime_kwargs)
+                        .astype(int64)
+                        .values,
+                    )
+                )
+                a_buf = concatenate((a_buf, chunk[accel_col_names].values))
+
+            if n_samples is None:
+                if t_buf.size < 2:
+                    if eof:
+                        raise ValueError("Not enough data in the file to read.")
+                    continue
+                if t_buf[1] == t_buf[0]:
+                    # need the entire first block to get the block size
+                    change = flatnonzero(t_buf[1:] != t_buf[:-1])
+                    if change.size == 0 and not eof:
+                        continue
+                    n_samples = change[0] + 1 if change.size > 0 else t_buf.size
+                    t_delta = to_timedelta(
+                        arange(0, 1, 1 / n_samples), unit="s"
+                    ).values.astype(int64)
+                else:
+                    # same estimate of the sampling rate as for reading in one go
+                    if t_buf.size < 2500 and not eof:
+                        continue
+                    n_samples = mean(1 / diff(t_buf[:2500]).astype(int)) * 1e9
+
+                if fill_gaps:
+                    step = to_offset(f"{1 / n_samples}S").nanos
+
+            if t_delta is not None:
+                # blocks of non-unique timestamps. Leave the last (possibly partial)
+                # block for the next chunk
+                bounds = concatenate(
+                    ([0], flatnonzero(t_buf[1:] != t_buf[:-1]) + 1, [t_buf.size])
+                )
+                sizes = diff(bounds)
+                if not eof:
+                    sizes = sizes[:-1]
+                elif sizes.size > 0 and sizes[-1] != n_samples:
+                    warn(
+                        "Non integer number of blocks. Trimming partial block.",
+                        UserWarning,
+                    )
+                    sizes = sizes[:-1]
+                if not npall(sizes == n_samples):
+                    raise ValueError(
+                        "Blocks of non-unique timestamps are not all equal size. "
+                        "Unable to continue reading data."
+                    )
+
+                i = sizes.size * n_samples
+                ts = t_buf[:i] + tile(t_delta, sizes.size)
+                acc = a_buf[:i] if accel_in_g else a_buf[:i] / g
+                if eof:
+                    t_buf, a_buf = t_buf[:0], a_buf[:0]
+                else:
+                    t_buf, a_buf = t_buf[i:], a_buf[i:]
+            else:
+                ts, acc = t_buf, a_buf if accel_in_g else a_buf / g
+                t_buf, a_buf = t_buf[:0], a_buf[:0]
+
+            if ts.size > 0:
+                if fill_gaps:
+                    # place samples on the regular grid of sample times, matching
+                    # upsampling to the sampling frequency
+                    if t_first is None:
+                        t_first = ts[0]
+                    offset = ts - t_first
+                    k = offset // step
+                    n_new = k[-1] + 1
+
+                    out.reserve(n_new)
+                    out.time[out.n : n_new] = t_first + arange(out.n, n_new) * step
+                    out.accel[out.n : n_new] = [0.0, 0.0, 1.0]
+                    on_grid = (offset % step) == 0
+                    out.accel[k[on_grid]] = acc[on_grid]
+                    out.n = n_new
+                else:
+                    t_check = ts if t_prev is None else concatenate(([t_prev], ts))
+                    time_deltas = diff(t_check).astype(int) / 1e9  # convert to seconds
+                    if (abs(time_deltas) > (1.5 / n_samples)).any():
+                        raise ValueError(
+                            "There are data gaps in the data, which could potentially result in garbage outputs from downstream algorithms."
+                        )
+
+                    out.reserve(out.n + ts.size)
+                    out.time[out.n : out.n + ts.size] = ts
+                    out.accel[out.n : out.n + ts.size] = acc
+                    out.n += ts.size
+                t_prev = ts[-1]
+
+            if eof:
+                break
+
+    out.trim()
+
+    return out.time, out.accel, float(n_samples)
+
+
 def handle_windows(time_dt, bases, periods, run_windowing):
     """
     Handle computation of the indices for day windows.
@@ -238,6 +453,20 @@ class ReadCSV(BaseProcess):
         What to do if the file extension does not match the expected extension (.bin).
         Default is "warn". "raise" raises a ValueError. "skip" skips the file
         reading altogether and attempts to continue with the pipeline.
+    cache : {None, str, pathlib.Path, FileCache}, optional
+        Cache for the data read from files. Either a :class:`skdh.io.FileCache`,
+        or a directory to create one in. Files that have been read before with
+        the same parameters are loaded from the cache as memory-mapped arrays
+        instead of being read again. Default is None, which does not cache data.
+    chunksize : {None, int}, optional
+        Number of rows to read at a time. If provided, the file is read in chunks,
+        and timestamp blocks and data gaps are handled for each chunk, writing
+        directly into the output arrays. This uses much less memory for long
+        recordings. Default is None, which reads the entire file at once.
+    dtype : {"float64", "float32"}, optional
+        Floating point type of the acceleration array. Time is always float64.
+        When reading in chunks, chunks are written directly into a float32
+        array. Default is "float64".
 
     Notes
     -----
@@ -247,6 +476,11 @@ class ReadCSV(BaseProcess):
     :py:class:`pandas.to_datetime`. To make sure this conversion applies correctly,
     specify whatever key-word arguments to `to_datetime_kwargs`. This includes specifying
     the unit (e.g. `s`, `ms`, `us`, `ns`, etc) if a unix timestamp integer is provided.
+
+    When reading in chunks, providing the timestamp `format` in `to_datetime_kwargs`
+    (e.g. `{"format": "%Y-%m-%d %H:%M:%S.%f"}`) avoids inferring the format for
+    every chunk. Only the time and acceleration columns are read, unless `usecols`
+    is provided in `read_csv_kwargs`.
     """
 
     def __init__(
@@ -261,7 +495,12 @@ class ReadCSV(BaseProcess):
         bases=None,
         periods=None,
         ext_error="warn",
+        cache=None,
+        chunksize=None,
+        dtype="float64",
     ):
+        self.dtype = get_float_dtype(dtype)
+
         if to_datetime_kwargs is None:
             to_datetime_kwargs = {}
         if read_csv_kwargs is None:
@@ -278,6 +517,9 @@ class ReadCSV(BaseProcess):
             bases=bases,
             periods=periods,
             ext_error=ext_error,
+            cache=None if cache is None else str(cache),
+            chunksize=chunksize,
+            dtype=self.dtype.name,
         )
 
         self.time_col_name = time_col_name
@@ -287,6 +529,8 @@ class ReadCSV(BaseProcess):
         self.accel_in_g = accel_in_g
         self.g_value = g_value
         self.read_csv_kwargs = read_csv_kwargs
+        self.cache = get_cache(cache)
+        self.chunksize = chunksize
 
         if ext_error.lower() in ["warn", "raise", "skip"]:
             self.ext_error = ext_error.lower()
@@ -347,6 +591,45 @@ class ReadCSV(BaseProcess):
 
         super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
 
+        if self.chunksize is not None:
+            time, accel, fs = read_csv_chunked(
+                file,
+                self.time_col_name,
+                self.acc_col_names,
+                self.fill_gaps,
+                self.to_datetime_kw,
+                self.accel_in_g,
+                self.g_value,
+                self.read_csv_kwargs,
+                self.chunksize,
+                self.dtype,
+            )
+
+            # view as datetimes for windowing, without copying
+            day_windows = handle_windows(
+                Series(time.view("datetime64[ns]"), copy=False),
+                self.bases,
+                self.periods,
+                self.window,
+            )
+
+            # convert to seconds in place, in blocks to limit memory use
+            time_s = time.view(float64)
+            for i in range(0, time.size, 2**20):
+                time_s[i : i + 2**20] = time[i : i + 2**20] / 1e9
+
+            kwargs.update(
+                {
+                    "file": file,
+                    self._time: time_s,
+                    self._acc: accel,
+                    self._days: day_windows,
+                    "fs": fs,
+                }
+            )
+
+            return (kwargs, None) if self._in_pipeline else kwargs
+
         # load the file with pandas
         raw = read_csv(file, **self.read_csv_kwargs)
 
@@ -368,6 +651,7 @@ class ReadCSV(BaseProcess):
 
         # get the acceleration values and convert if necessary
         accel = handle_accel(raw, self.acc_col_names, self.accel_in_g, self.g_value)
+        accel = accel.astype(self.dtype, copy=False)
 
         kwargs.update(
             {
@@ -5,14 +5,55 @@ Lukas Adamowicz
 Copyright (c) 2021. Pfizer Inc. All rights reserved.
 """
 from warnings import warn
+from calendar import timegm
+from os import SEEK_END
 
-from numpy import vstack, asarray, int_
+from numpy import vstack, asarray, int_, searchsorted, concatenate, empty, float32, inf
 
 from skdh.base import BaseProcess
 from skdh.io.base import check_input_file
+from skdh.io.cache import get_cache
+from skdh.io.utility import get_read_ranges, get_time_windows, get_float_dtype
 from skdh.io._extensions import read_geneactiv
 
 
+def _get_page_times(file):
+    """
+    Get the start times of the first and last pages of a file, in unix seconds,
+    from the beginning and end of the file.
+    """
+
+    def parse(line):
+        # Page Time:YYYY-MM-DD hh:mm:ss:mmm
+        v = line[10:].strip()
+        return (
+            timegm(
+                (
+                    int(v[0:4]),
+                    int(v[5:7]),
+                    int(v[8:10]),
+                    int(v[11:13]),
+                    int(v[14:16]),
+                    int(v[17:19]),
+                )
+            )
+            + int(v[20:23]) / 1000
+        )
+
+    with open(file, "rb") as f:
+        head = f.read(2**16).split(b"\n")
+        f.seek(0, SEEK_END)
+        f.seek(max(f.tell() - 2**14, 0))
+        tail = f.read().split(b"\n")
+
+    first = [parse(line.decode()) for line in head if line.startswith(b"Page Time:")]
+    last = [parse(line.decode()) for line in tail if line.startswith(b"Page Time:")]
+    if not first or not last:
+        return 0.0, 0.0
+
+    return first[0], last[-1]
+
+
 class ReadBin(BaseProcess):
     """
     Read a binary .bin file from a GeneActiv sensor into memory. Acceleration values are returned
@@ -35,6 +76,29 @@ class ReadBin(BaseProcess):
         What to do if the file extension does not match the expected extension (.bin).
         Default is "warn". "raise" raises a ValueError. "skip" skips the file
         reading altogether and attempts to continue with the pipeline.
+    n_threads : int, optional
+        Number of threads to use to parse the data pages of the file. Default
+        is 1.
+    start : {None, float}, optional
+        Only read the data at or after this time, in unix seconds. The pages to
+        parse are found from the page timestamps, so the rest of the file is not
+        parsed. Default is None, which reads from the start of the recording.
+    stop : {None, float}, optional
+        Only read the data before this time, in unix seconds. Default is None,
+        which reads to the end of the recording.
+    windows_only : bool, optional
+        Only read the data inside the windows defined by `bases` and `periods`,
+        skipping the pages between windows. The data of all the windows is
+        concatenated, and `day_ends` indexes the windows in the concatenated
+        data. Default is False.
+    cache : {None, str, pathlib.Path, FileCache}, optional
+        Cache for the data read from files. Either a :class:`skdh.io.FileCache`,
+        or a directory to create one in. Files that have been read before with
+        the same parameters are loaded from the cache as memory-mapped arrays
+        instead of being read again. Default is None, which does not cache data.
+    dtype : {"float64", "float32"}, optional
+        Floating point type of the acceleration, light, and temperature arrays.
+        Time is always float64. Default is "float64".
 
     Examples
     ========
@@ -51,14 +115,42 @@ class ReadBin(BaseProcess):
     {'accel': ..., 'time': ..., 'day_ends': [130, 13951, ...]}
     """
 
-    def __init__(self, bases=None, periods=None, ext_error="warn"):
+    # can read a time range with `start` and `stop`
+    _chunkable = True
+
+    def __init__(
+        self,
+        bases=None,
+        periods=None,
+        ext_error="warn",
+        n_threads=1,
+        cache=None,
+        start=None,
+        stop=None,
+        windows_only=False,
+        dtype="float64",
+    ):
+        self.dtype = get_float_dtype(dtype)
+
         super().__init__(
             # kwargs
             bases=bases,
             periods=periods,
             ext_error=ext_error,
+            n_threads=n_threads,
+            cache=None if cache is None else str(cache),
+            start=start,
+            stop=stop,
+            windows_only=windows_only,
+            dtype=self.dtype.name,
         )
 
+        self.n_threads = max(int(n_threads), 1)
+        self.cache = get_cache(cache)
+        self.start = start
+        self.stop = stop
+        self.windows_only = windows_only
+
         if ext_error.lower() in ["warn", "raise", "skip"]:
             self.ext_error = ext_error.lower()
         else:
@@ -127,9 +219,24 @@ class ReadBin(BaseProcess):
         """
         super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
 
+        if (
+            self.start is not None
+            or self.stop is not None
+            or (self.windows_only and self.window)
+        ):
+            kwargs.update(self._read_ranges(file))
+
+            return (kwargs, None) if self._in_pipeline else kwargs
+
         # read the file
         n_max, fs, acc, time, light, temp, starts, stops = read_geneactiv(
-            file, self.bases, self.periods
+            file,
+            self.bases,
+            self.periods,
+            self.n_threads,
+            -inf,
+            inf,
+            self.dtype == float32,
         )
 
         results = {
@@ -152,3 +259,85 @@ class ReadBin(BaseProcess):
         kwargs.update(results)
 
         return (kwargs, None) if self._in_pipeline else kwargs
+
+    def _get_time_range(self, file):
+        """
+        Get a time range that contains all of the data in a file, from the
+        times of the first and last data pages.
+
+        Parameters
+        ----------
+        file : {str, Path}
+            File to get the time range of.
+
+        Returns
+        -------
+        t_first : float
+            Time of the first sample, in unix seconds.
+        t_last : float
+            Time after the last sample, in unix seconds.
+        """
+        t_first, t_last = _get_page_times(file)
+        # pages are much shorter than an hour
+        return t_first, t_last + 3600.0
+
+    def _read_ranges(self, file):
+        """
+        Read only the pages covering the time ranges to read.
+
+        Parameters
+        ----------
+        file : str
+            File to read.
+
+        Returns
+        -------
+        data : dict
+            Dictionary of the data in the time ranges.
+        """
+        t_first, t_last = _get_page_times(file)
+        ranges = get_read_ranges(
+            t_first,
+            t_last + 3600.0,  # pages are much shorter than an hour
+            self.start,
+            self.stop,
+            self.bases,
+            self.periods,
+            self.windows_only and self.window,
+        )
+
+        parts = []
+        fs = None
+        for t1, t2 in ranges:
+            n_max, fs, acc, time, light, temp, _, _ = read_geneactiv(
+                file,
+                self.bases,
+                self.periods,
+                self.n_threads,
+                t1,
+                t2,
+                self.dtype == float32,
+            )
+            i1, i2 = searchsorted(time[:n_max], [t1, t2])
+            parts.append((time[i1:i2], acc[i1:i2], light[i1:i2], temp[i1:i2]))
+
+        if parts:
+            time, acc, light, temp = (concatenate(p) for p in zip(*parts))
+        else:
+            time = empty(0)
+            acc = empty((0, 3), dtype=self.dtype)
+            light, temp = empty(0, dtype=self.dtype), empty(0, dtype=self.dtype)
+
+        results = {
+            self._time: time,
+            self._acc: acc,
+            self._temp: temp,
+            "light": light,
+            "fs": fs,
+            "file": file,
+        }
+
+        if self.window:
+            results[self._days] = get_time_windows(time, self.bases, self.periods)
+
+        return results
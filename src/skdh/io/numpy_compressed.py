@@ -4,16 +4,122 @@ Read from a numpy compressed file.
 Lukas Adamowicz
 Copyright (c) 2021. Pfizer Inc. All rights reserved.
 """
-from numpy import load as np_load
+import struct
+from zipfile import ZipFile, ZipInfo, ZIP_STORED
+
+from numpy import load as np_load, asanyarray, memmap
+from numpy.lib import format as npformat
 
 from skdh.base import BaseProcess
 from skdh.io.base import check_input_file
+from skdh.io.utility import get_float_dtype
+
+# alignment of the array data in files written by `write_numpy_file`
+_ALIGN = 64
+
+
+def write_numpy_file(file, data, keys=None):
+    """
+    Write arrays to an uncompressed numpy `.npz` file that can be read with
+    memory-mapped arrays by :class:`skdh.io.ReadNumpyFile`. The file is a
+    standard `.npz` file and can also be read with :py:meth:`numpy.load`. The
+    data of each array is aligned in the file so that memory-mapped arrays
+    are aligned.
+
+    Parameters
+    ----------
+    file : {str, pathlib.Path}
+        File to write. Should have a `.npz` suffix.
+    data : dict
+        Dictionary of the arrays to write, e.g. the results of a reader.
+    keys : {None, list-like}, optional
+        Keys in `data` to write. Default is None, which writes all keys.
+
+    Raises
+    ------
+    ValueError
+        If any values are not numeric arrays or scalars.
+
+    Examples
+    --------
+    >>> data = ReadCwa().predict("example.cwa")
+    >>> write_numpy_file("example.npz", data, keys=["time", "accel", "fs"])
+    >>> data = ReadNumpyFile(mmap_mode="r").predict("example.npz")
+    """
+    keys = data.keys() if keys is None else keys
+
+    arrays = {}
+    for key in keys:
+        arr = asanyarray(data[key])
+        if arr.dtype.hasobject:
+            raise ValueError(f"`{key}` cannot be written to an uncompressed file.")
+        arrays[key] = arr
+
+    with ZipFile(file, "w", compression=ZIP_STORED, allowZip64=True) as zf:
+        for key, arr in arrays.items():
+            name = f"{key}.npy"
+            zinfo = ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            zinfo.compress_type = ZIP_STORED
+
+            # the local header is followed by the name, the extra field, and the
+            # zip64 extra field (20 bytes). Pad the extra field so that the member
+            # starts aligned. The npy header is padded to a multiple of 64 bytes
+            offset = zf.fp.tell() + 30 + len(name.encode("utf-8")) + 20 + 4
+            pad = -offset % _ALIGN
+            zinfo.extra = struct.pack("<HH", 0xD935, pad) + b"\x00" * pad
+
+            with zf.open(zinfo, "w", force_zip64=True) as member:
+                npformat.write_array(member, arr, allow_pickle=False)
+
+
+def _load_npz_mmap(file, mmap_mode, allow_pickle):
+    """
+    Load the arrays from an npz file, memory-mapping the members that are stored
+    uncompressed.
+    """
+    data = {}
+    with ZipFile(file, "r") as zf, open(file, "rb") as fp:
+        for zinfo in zf.infolist():
+            if not zinfo.filename.endswith(".npy"):
+                continue
+            key = zinfo.filename[:-4]
+
+            # start of the member data, after the local header
+            fp.seek(zinfo.header_offset)
+            header = fp.read(30)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            fp.seek(zinfo.header_offset + 30 + name_len + extra_len)
+
+            if zinfo.compress_type == ZIP_STORED:
+                version = npformat.read_magic(fp)
+                if version == (1, 0):
+                    shape, fortran, dtype = npformat.read_array_header_1_0(fp)
+                else:
+                    shape, fortran, dtype = npformat.read_array_header_2_0(fp)
+
+                if shape != () and not dtype.hasobject:
+                    data[key] = memmap(
+                        file,
+                        dtype=dtype,
+                        mode=mmap_mode,
+                        offset=fp.tell(),
+                        shape=shape,
+                        order="F" if fortran else "C",
+                    )
+                    continue
+
+            # compressed, object, and 0-d arrays are read in
+            with zf.open(zinfo, "r") as member:
+                data[key] = npformat.read_array(member, allow_pickle=allow_pickle)
+
+    return data
 
 
 class ReadNumpyFile(BaseProcess):
     """
     Read a Numpy compressed file into memory. The file should have been
-    created by `numpy.savez`. The data contained is read in
+    created by `numpy.savez`, `numpy.savez_compressed`, or
+    :func:`skdh.io.write_numpy_file`. The data contained is read in
     unprocessed - ie acceleration is already assumed to be in units of
     'g' and time in units of seconds. No day windowing is performed. Expected
     keys are `time` and `accel`. If `fs` is present, it is used as well.
@@ -27,15 +133,37 @@ class ReadNumpyFile(BaseProcess):
         What to do if the file extension does not match the expected extension (.npz).
         Default is "warn". "raise" raises a ValueError. "skip" skips the file
         reading altogether and attempts to continue with the pipeline.
+    mmap_mode : {None, "r", "r+", "c"}, optional
+        Memory-map the arrays stored uncompressed in the file, instead of reading
+        them into memory. See :py:class:`numpy.memmap` for the modes. Files written
+        by :func:`skdh.io.write_numpy_file` or `numpy.savez` are
+        uncompressed, while compressed arrays are still read into memory. Default
+        is None, which reads all the arrays into memory.
+    dtype : {None, "float64", "float32"}, optional
+        Floating point type to convert the acceleration, angular velocity,
+        magnetic field, and temperature arrays to. Time is not converted. Arrays
+        already stored with this type are not copied, and stay memory-mapped if
+        using `mmap_mode`. Default is None, which returns the arrays as stored.
     """
 
-    def __init__(self, allow_pickle=False, ext_error="warn"):
+    def __init__(
+        self, allow_pickle=False, ext_error="warn", mmap_mode=None, dtype=None
+    ):
+        self.dtype = None if dtype is None else get_float_dtype(dtype)
+
         super(ReadNumpyFile, self).__init__(
-            allow_pickle=allow_pickle, ext_error=ext_error
+            allow_pickle=allow_pickle,
+            ext_error=ext_error,
+            mmap_mode=mmap_mode,
+            dtype=None if dtype is None else self.dtype.name,
         )
 
         self.allow_pickle = allow_pickle
 
+        if mmap_mode not in [None, "r", "r+", "c"]:
+            raise ValueError("`mmap_mode` must be one of None, 'r', 'r+', 'c'.")
+        self.mmap_mode = mmap_mode
+
         if ext_error.lower() in ["warn", "raise", "skip"]:
             self.ext_error = ext_error.lower()
         else:
@@ -74,11 +202,17 @@ class ReadNumpyFile(BaseProcess):
         """
         super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
 
-        with np_load(file, allow_pickle=self.allow_pickle) as data:
-            kwargs.update(data)  # pull everything in
-            # make sure that fs is saved properly
+        if self.mmap_mode is not None:
+            data = _load_npz_mmap(file, self.mmap_mode, self.allow_pickle)
+            kwargs.update(data)
             if "fs" in data:
                 kwargs["fs"] = data["fs"][()]
+        else:
+            with np_load(file, allow_pickle=self.allow_pickle) as data:
+                kwargs.update(data)  # pull everything in
+                # make sure that fs is saved properly
+                if "fs" in data:
+                    kwargs["fs"] = data["fs"][()]
 
         # check that time and accel are in the correct names
         if self._time not in kwargs or self._acc not in kwargs:
@@ -86,6 +220,11 @@ class ReadNumpyFile(BaseProcess):
                 f"Missing `{self._time}` or `{self._acc}` arrays in the file"
             )
 
+        if self.dtype is not None:
+            for key in [self._acc, self._gyro, self._mag, self._temp]:
+                if key in kwargs:
+                    kwargs[key] = kwargs[key].astype(self.dtype, copy=False)
+
         # make sure we return the file
         kwargs.update({"file": file})
 
@@ -0,0 +1,344 @@
+"""
+Result sinks for writing the results of pipeline steps
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from pathlib import Path
+from importlib.util import find_spec
+from threading import Thread, Lock
+from queue import Queue
+from uuid import uuid4
+import re
+
+
+class ResultSink:
+    """
+    Base class for writing tables of results. Tables are written in the order
+    they are given, on a background thread so that processing can continue
+    while the results are written.
+
+    Parameters
+    ----------
+    background : bool, optional
+        Write tables on a background thread. Default is True. If False, tables
+        are written when they are given.
+    max_queue : int, optional
+        Maximum number of tables waiting to be written. Giving more tables
+        waits for earlier tables to be written, which limits the memory used
+        by tables waiting to be written. Default is 16.
+
+    Notes
+    -----
+    Errors while writing are raised by the next call to :meth:`write`,
+    :meth:`flush`, or :meth:`close`, and tables given after an error are not
+    written. :meth:`flush` or :meth:`close` must be called to make sure all
+    of the tables have been written. :meth:`skdh.Pipeline.run` flushes its
+    sink before returning.
+
+    Copies of a sink, for example in copies of a pipeline, write with the
+    original sink. Sinks sent to other processes write on their own thread.
+    """
+
+    # if several processes can write with copies of the sink at the same time.
+    # Checked by `Pipeline.run_many` with the "process" executor
+    _process_safe = True
+
+    def __init__(self, background=True, max_queue=16):
+        self.background = background
+        self.max_queue = max(int(max_queue), 1)
+
+        self._reset()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(background={self.background})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __deepcopy__(self, memo):
+        # shared by copies, so that all of the results go to the same place
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ["_queue", "_thread", "_lock", "_error"]:
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def _reset(self):
+        self._queue = None
+        self._thread = None
+        self._lock = Lock()
+        self._error = None
+
+    def write(self, table, file_name, name="", source="", header=None):
+        """
+        Write a table of results.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame
+            Table of results to write. Must not be modified after being given
+            to the sink.
+        file_name : str
+            Name of the file for the table.
+        name : str, optional
+            Name of the results, for example the name of the process that
+            created them.
+        source : str, optional
+            Name of the file the results were computed from.
+        header : {None, list}, optional
+            Lines of information about the results to write before the table,
+            for formats that support them.
+        """
+        self._raise_error()
+
+        if not self.background:
+            self._write(table, file_name, name, source, header)
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._queue = Queue(self.max_queue)
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        self._queue.put((table, file_name, name, source, header))
+
+    def flush(self):
+        """
+        Wait for all of the tables given to the sink to be written.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """
+        Write all of the tables given to the sink, and stop the background
+        thread.
+        """
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._queue = self._thread = None
+        self._raise_error()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._write(*item)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    def _write(self, table, file_name, name, source, header):
+        raise NotImplementedError
+
+
+class CsvSink(ResultSink):
+    """
+    Write each table of results to its own CSV file, in the same format as
+    :meth:`skdh.BaseProcess.save_results`.
+
+    Parameters
+    ----------
+    background : bool, optional
+        Write tables on a background thread. Default is True.
+    max_queue : int, optional
+        Maximum number of tables waiting to be written. Default is 16.
+
+    Examples
+    --------
+    >>> pipe = Pipeline(sink=CsvSink())
+    >>> pipe.add(ReadCwa(bases=0, periods=24))
+    >>> pipe.add(Sleep(save_per_minute_results=True), save_file="{file}_sleep.csv")
+    """
+
+    def _write(self, table, file_name, name, source, header):
+        with open(file_name, "w") as f:
+            if header is not None:
+                f.writelines(header)
+        table.to_csv(file_name, index=False, mode="a")
+
+
+class ParquetSink(ResultSink):
+    """
+    Write each table of results to its own Parquet file. The suffix of the file
+    names is changed to ".parquet". Requires `pyarrow` or `fastparquet`.
+
+    Parameters
+    ----------
+    background : bool, optional
+        Write tables on a background thread. Default is True.
+    max_queue : int, optional
+        Maximum number of tables waiting to be written. Default is 16.
+    """
+
+    def __init__(self, background=True, max_queue=16):
+        _check_parquet()
+        super().__init__(background=background, max_queue=max_queue)
+
+    def _write(self, table, file_name, name, source, header):
+        table.to_parquet(Path(file_name).with_suffix(".parquet"), index=False)
+
+
+class ParquetDatasetSink(ResultSink):
+    """
+    Append the results of many files to one Parquet dataset. Each table is
+    written as a new file in the dataset directory, in a sub-directory for each
+    results name (`name=<name>`), with a "file" column of the file the results
+    were computed from. File names given to the sink are not used. Requires
+    `pyarrow` or `fastparquet`.
+
+    Parameters
+    ----------
+    path : {str, pathlib.Path}
+        Directory of the dataset. Will be created if it does not exist.
+    background : bool, optional
+        Write tables on a background thread. Default is True.
+    max_queue : int, optional
+        Maximum number of tables waiting to be written. Default is 16.
+
+    Notes
+    -----
+    Every table is written to a file with a unique name, so several processes
+    can append to the same dataset at the same time, for example the workers of
+    :meth:`skdh.Pipeline.run_many`.
+
+    Examples
+    --------
+    >>> pipe = Pipeline(sink=ParquetDatasetSink("/data/study_results"))
+    >>> pipe.add(ReadCwa(bases=0, periods=24))
+    >>> pipe.add(ActivityLevelClassification(), save_file="activity")
+    >>> for file, res, err in pipe.run_many(files):
+    >>>     pass
+    >>> activity = pandas.read_parquet("/data/study_results/name=ActivityLevelClassification")
+    """
+
+    def __init__(self, path, background=True, max_queue=16):
+        _check_parquet()
+        super().__init__(background=background, max_queue=max_queue)
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(path={str(self.path)!r}, "
+            f"background={self.background})"
+        )
+
+    def _write(self, table, file_name, name, source, header):
+        directory = self.path / f"name={_clean_name(name)}"
+        directory.mkdir(exist_ok=True)
+
+        table = table.copy(deep=False)
+        table.insert(0, "file", source)
+        table.to_parquet(directory / f"part-{uuid4().hex}.parquet", index=False)
+
+
+class HDFSink(ResultSink):
+    """
+    Append the results of many files to one HDF5 file, with a table for each
+    results name and a "file" column of the file the results were computed
+    from. File names given to the sink are not used. Requires `tables`
+    (PyTables).
+
+    Parameters
+    ----------
+    path : {str, pathlib.Path}
+        HDF5 file to append to. Will be created if it does not exist.
+    min_itemsize : int, optional
+        Minimum storage size of text columns. Text longer than the size of the
+        column when the table was first written cannot be appended. Default is
+        256.
+    background : bool, optional
+        Write tables on a background thread. Default is True.
+    max_queue : int, optional
+        Maximum number of tables waiting to be written. Default is 16.
+
+    Notes
+    -----
+    HDF5 files cannot be written by more than one process at a time, so
+    :meth:`skdh.Pipeline.run_many` raises an error with the "process" executor.
+    Use the "thread" executor of :meth:`skdh.Pipeline.run_many`, or a
+    :class:`ParquetDatasetSink` with the "process" executor.
+
+    Examples
+    --------
+    >>> with HDFSink("study_results.h5") as sink:
+    >>>     pipe = Pipeline(sink=sink)
+    >>>     pipe.add(ReadCwa(bases=0, periods=24))
+    >>>     pipe.add(ActivityLevelClassification(), save_file="activity")
+    >>>     for file, res, err in pipe.run_many(files, executor="thread"):
+    >>>         pass
+    >>> activity = pandas.read_hdf("study_results.h5", "ActivityLevelClassification")
+    """
+
+    _process_safe = False
+
+    def __init__(self, path, min_itemsize=256, background=True, max_queue=16):
+        if find_spec("tables") is None:
+            raise ImportError(
+                "Optional dependency `tables` not found. Install using `pip install tables`."
+            )
+        super().__init__(background=background, max_queue=max_queue)
+
+        self.path = Path(path)
+        self.min_itemsize = int(min_itemsize)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(path={str(self.path)!r}, "
+            f"background={self.background})"
+        )
+
+    def _write(self, table, file_name, name, source, header):
+        from pandas import HDFStore
+
+        table = table.copy(deep=False)
+        table.insert(0, "file", source)
+
+        text = {c: self.min_itemsize for c in table.columns if table[c].dtype == object}
+        with HDFStore(self.path, mode="a") as store:
+            store.append(
+                _clean_name(name),
+                table,
+                format="table",
+                index=False,
+                min_itemsize=text,
+            )
+
+
+def _clean_name(name):
+    """
+    Get a name that can be used as a directory or HDF5 table name.
+    """
+    return re.sub(r"\W", "_", str(name)) or "results"
+
+
+def _check_parquet():
+    if find_spec("pyarrow") is None and find_spec("fastparquet") is None:
+        raise ImportError(
+            "Optional dependency `pyarrow` not found. Install using `pip install pyarrow`."
+        )
@@ -1,2 +1,136 @@
+"""
+IO utility functions
+
+Lukas Adamowicz
+Copyright (c) 2021. Pfizer Inc. All rights reserved.
+"""
+from math import floor
+
+from numpy import searchsorted, array, int_, inf, dtype as np_dtype, float32, float64
+
+
 class FileSizeError(Exception):
     pass
+
+
+def get_float_dtype(dtype):
+    """
+    Get the floating point type for the sensor data returned by a reader.
+
+    Parameters
+    ----------
+    dtype : {str, numpy.dtype, type}
+        Data type. Must be either float64 or float32.
+
+    Returns
+    -------
+    dtype : numpy.dtype
+        Data type.
+
+    Raises
+    ------
+    ValueError
+        If `dtype` is not float64 or float32.
+    """
+    try:
+        dt = np_dtype(dtype)
+    except TypeError:
+        dt = None
+    if dt not in (float64, float32):
+        raise ValueError("`dtype` must be either 'float64' or 'float32'.")
+
+    return dt
+
+
+def get_read_ranges(t_first, t_last, start, stop, bases, periods, windows_only):
+    """
+    Get the time ranges of a recording to read.
+
+    Parameters
+    ----------
+    t_first : float
+        Approximate start time of the recording, in unix seconds. Only used if
+        `windows_only` is True.
+    t_last : float
+        Approximate end time of the recording, in unix seconds. Only used if
+        `windows_only` is True.
+    start : {None, float}
+        Time to start reading at, in unix seconds.
+    stop : {None, float}
+        Time to stop reading at, in unix seconds.
+    bases : numpy.ndarray
+        Base hours of the windows.
+    periods : numpy.ndarray
+        Durations of the windows in hours.
+    windows_only : bool
+        Only read the data in the windows defined by `bases` and `periods`.
+
+    Returns
+    -------
+    ranges : list
+        List of non-overlapping (start, stop) time ranges to read, in order.
+    """
+    t1 = -inf if start is None else start
+    t2 = inf if stop is None else stop
+    if not windows_only:
+        return [(t1, t2)]
+
+    t1, t2 = max(t1, t_first), min(t2, t_last)
+    if t1 >= t2:
+        return []
+
+    windows = []
+    day0 = floor(t1 / 86400) * 86400 - 86400
+    for base, period in zip(bases, periods):
+        ws = day0 + base * 3600
+        while ws < t2:
+            we = ws + period * 3600
+            if we > t1:
+                windows.append((max(ws, t1), min(we, t2)))
+            ws += 86400
+
+    # merge overlapping windows
+    ranges = []
+    for ws, we in sorted(windows):
+        if ranges and ws <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], we))
+        else:
+            ranges.append((ws, we))
+
+    return ranges
+
+
+def get_time_windows(time, bases, periods):
+    """
+    Get the indices of day windows from timestamps, for data that is not a
+    continuous full recording.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        Timestamps in unix seconds. Must be increasing.
+    bases : numpy.ndarray
+        Base hours of the windows.
+    periods : numpy.ndarray
+        Durations of the windows in hours.
+
+    Returns
+    -------
+    day_ends : dict
+        Window start and stop indices for each base and period. Windows that
+        are only partially in the data are clipped to the data.
+    """
+    days = {}
+    for base, period in zip(bases, periods):
+        rows = []
+        if time.size > 0:
+            ws = floor(time[0] / 86400) * 86400 - 86400 + base * 3600
+            while ws <= time[-1]:
+                we = ws + period * 3600
+                i1, i2 = searchsorted(time, [ws, we])
+                if i2 > i1:
+                    rows.append([i1, min(i2, time.size - 1)])
+                ws += 86400
+        days[(base, period)] = array(rows, dtype=int_).reshape((-1, 2))
+
+    return days
@@ -10,11 +10,43 @@ from importlib import import_module
 from warnings import warn
 import logging
 from packaging import version
-from copy import copy
+from copy import copy, deepcopy
 from pathlib import Path
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from threading import local
+from traceback import format_exc
+from hashlib import blake2b
+from datetime import datetime, date as dt_date
+from time import perf_counter, process_time
+from math import floor
+import sys
+import os
+
+try:
+    import resource
+except ImportError:  # pragma: no cover :: not available on Windows
+    resource = None
 
 import yaml
-from skdh.base import BaseProcess as Process
+from numpy import (
+    ndarray,
+    ascontiguousarray,
+    array,
+    concatenate,
+    searchsorted,
+    integer,
+    issubdtype,
+    clip,
+    int_,
+)
+from skdh.base import BaseProcess as Process, _resolve_shared
+from skdh.io.cache import get_cache, _IGNORED_PARAMETERS
 
 
 class NotAProcessError(Exception):
@@ -48,6 +80,197 @@ def warn_or_raise(msg, err, err_raise):
         warn(msg, UserWarning)
 
 
+# pipeline for each worker of `Pipeline.run_many`
+_worker = local()
+
+
+def _init_process_worker(yaml_str, sink):
+    _worker.pipeline = Pipeline(load_kwargs={"yaml_str": yaml_str}, sink=sink)
+
+
+def _init_thread_worker(pipeline):
+    _worker.pipeline = deepcopy(pipeline)
+
+
+def _run_file(file, kwargs):
+    """
+    Run the pipeline of the current worker on a file, returning the results
+    or the formatted traceback if the pipeline failed.
+    """
+    try:
+        return _worker.pipeline.run(file=file, **kwargs), None
+    except Exception:
+        return None, format_exc()
+
+
+def _read_completed(resume_file):
+    """
+    Get the files that were successfully processed from a resume file.
+    """
+    done = set()
+    if resume_file is None or not Path(resume_file).exists():
+        return done
+
+    with open(resume_file, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # partially written line if the batch was stopped while writing
+                continue
+            if entry.get("error") is None:
+                done.add(entry["file"])
+            else:
+                done.discard(entry["file"])
+    return done
+
+
+def _hash_value(h, value):
+    """
+    Update a hash with a value passed to the pipeline.
+    """
+    if isinstance(value, ndarray) and not value.dtype.hasobject:
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(ascontiguousarray(value).data)
+    elif isinstance(value, dict):
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode())
+            _hash_value(h, value[k])
+    elif isinstance(value, (list, tuple)):
+        h.update(repr(type(value)).encode())
+        for v in value:
+            _hash_value(h, v)
+    else:
+        h.update(repr(value).encode())
+
+
+def _peak_rss():
+    """
+    Get the peak resident set size of the process in bytes, or None if it is
+    not available.
+    """
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _n_samples(data, time_key, acc_key):
+    """
+    Get the number of samples in the data passed to or returned from a step.
+    """
+    for key in (time_key, acc_key):
+        value = data.get(key, None) if data is not None else None
+        if isinstance(value, ndarray) and value.ndim > 0:
+            return value.shape[0]
+    return None
+
+
+def _get_day_windows(t_first, t_last, base, period):
+    """
+    Get the (start, stop) times of the day windows in [t_first, t_last), clipped
+    to the recording.
+    """
+    windows = []
+    ws = floor(t_first / 86400) * 86400 - 86400 + base * 3600
+    while ws < t_last:
+        we = ws + period * 3600
+        if we > t_first:
+            windows.append((max(ws, t_first), min(we, t_last)))
+        ws += 86400
+    return windows
+
+
+def _is_index_ranges(value, n):
+    """
+    Check if a value is an array of (start, stop) sample indices, such as wear
+    or sleep periods, for data with `n` samples.
+    """
+    return (
+        isinstance(value, ndarray)
+        and value.ndim == 2
+        and value.shape[1] == 2
+        and value.shape[0] != n
+        and issubdtype(value.dtype, integer)
+    )
+
+
+def _slice_data(data, n, i1, i2):
+    """
+    Get the samples [i1, i2) of the data passed between pipeline steps. Arrays
+    of sample indices are shifted and clipped to the slice.
+    """
+    sliced = {}
+    for key, value in data.items():
+        if isinstance(value, ndarray) and value.ndim > 0 and value.shape[0] == n:
+            sliced[key] = value[i1:i2]
+        elif _is_index_ranges(value, n):
+            idx = clip(value, i1, i2) - i1
+            sliced[key] = idx[idx[:, 1] > idx[:, 0]]
+        else:
+            sliced[key] = value
+    return sliced
+
+
+def _stitch_data(chunks, time_key, days_key, window):
+    """
+    Join the data of consecutive day windows. Arrays of sample indices are
+    shifted to the joined data.
+    """
+    sizes = [chunk[time_key].size for chunk in chunks]
+    offsets = [sum(sizes[:i]) for i in range(len(sizes))]
+
+    data = {}
+    for key, value in chunks[0].items():
+        values = [chunk.get(key, None) for chunk in chunks]
+        if all(
+            isinstance(v, ndarray) and v.ndim > 0 and v.shape[0] == n
+            for v, n in zip(values, sizes)
+        ):
+            data[key] = concatenate(values, axis=0)
+        elif all(_is_index_ranges(v, n) for v, n in zip(values, sizes)):
+            data[key] = concatenate([v + i for v, i in zip(values, offsets)], axis=0)
+        else:
+            data[key] = value
+
+    days = array([[i, i + n] for i, n in zip(offsets, sizes)], dtype=int_)
+    # the last window ends at the last sample, as for windows found by the readers
+    days[-1, 1] -= 1
+    data[days_key] = {window: days}
+    return data
+
+
+def _combine_reports(reports):
+    """
+    Combine the reports of a step run on several day windows.
+    """
+    report = dict(reports[0])
+    for key in ["wall time", "cpu time", "samples"]:
+        values = [r[key] for r in reports]
+        report[key] = None if None in values else sum(values)
+    rss = [r["peak rss increase"] for r in reports]
+    report["peak rss increase"] = None if None in rss else max(rss)
+    report["cached"] = False
+    report["samples per second"] = (
+        None
+        if not report["samples"] or report["wall time"] <= 0
+        else report["samples"] / report["wall time"]
+    )
+    return report
+
+
+def _get_step_io(step):
+    """
+    Get the keys a step uses and creates, or None for steps that do not declare
+    them.
+    """
+    if step._consumes is None or step._produces is None:
+        return None, None
+    # file is used by every step for naming results files
+    return set(step._consumes) | {"file"}, set(step._produces)
+
+
 class Pipeline:
     """
     Pipeline class that can have multiple steps that are processed sequentially.
@@ -60,6 +283,74 @@ class Pipeline:
     load_kwargs : {None, dict}, optional
         Dictionary of key-word arguments that will get directly passed to the
         `Pipeline.load()` function. If None, no pipeline will be loaded (default).
+    n_workers : int, optional
+        Number of threads to run steps that do not depend on each other
+        concurrently with. Default is 1, which runs the steps one at a time in
+        the order they were added.
+    cache : {None, str, pathlib.Path, skdh.io.FileCache}, optional
+        Cache for the output of each step. Either a :class:`skdh.io.FileCache`,
+        or a directory to create one in. Default is None, which does not cache
+        step outputs.
+    report_file : {None, str}, optional
+        Optionally formattable path to save the run report of each run to, as
+        JSON. Uses the same format variables as the `save_file` of the steps
+        (see :meth:`Pipeline.add`), with the name "Pipeline". Default is None,
+        which does not save the report.
+    report_hook : {None, callable}, optional
+        Function called with the report of each step as it finishes. Default is
+        None.
+    sink : {None, skdh.io.sinks.ResultSink}, optional
+        Sink to write the results of steps with a `save_file` with, for example
+        to write on a background thread or to append the results of many files
+        to one dataset. Default is None, which writes each step's results to a
+        CSV file when the step finishes.
+
+    Attributes
+    ----------
+    report : {None, dict}
+        Run report of the last call to :meth:`Pipeline.run`. Contains the input
+        file, the total wall time, and under "steps" the following for each step:
+
+        - process: name of the process.
+        - cached: if the step was loaded from the cache.
+        - wall time: time in `predict` (or loading from the cache) [s].
+        - cpu time: CPU time of the whole process during the step [s].
+        - peak rss increase: increase of the peak resident memory of the
+          process during the step [bytes], or None if not available.
+        - samples: number of samples of the data given to the step, or created
+          by the step for file readers, or None if there is no time or
+          acceleration data.
+        - samples per second: `samples` divided by `wall time`.
+
+    Notes
+    -----
+    Processes can declare the keys of the data they use (`_consumes`) and the keys
+    they create or change (`_produces`). Each step of the pipeline is given the
+    data it uses from the latest previous step that produces it, and steps only
+    wait for the steps they use data from. Data is dropped from memory once no
+    later step uses it. Steps that do not declare their keys, such as the file
+    readers, wait for all previous steps and are given all of the data, and
+    their output replaces all of the data passed to later steps.
+
+    With a `cache`, the output and results of each step are stored under a key
+    of the step's process and parameters, the version of skdh, and the keys of
+    the data it is given: the keys of the steps the data came from, or the
+    content of files and arrays passed to :meth:`Pipeline.run`. Steps with the
+    same key are loaded from the cache instead of being run, so changing the
+    parameters of a late step only runs that step and the steps after it
+    again. Steps that plot, and processes that set `_cacheable` to False, are
+    always run. Process settings that are not parameters, such as endpoints
+    added after creating a process, are not part of the key.
+
+    With a `sink`, results are written while the next steps run, and
+    :meth:`Pipeline.run` waits for all of the results to be written before
+    returning.
+
+    The peak resident memory only increases when a step uses more memory than
+    the process used at any earlier point, so `peak rss increase` is a lower
+    bound of the memory a step uses. CPU and memory use are measured for the
+    whole process, so they include other steps running at the same time when
+    `n_workers` is more than 1, and do not include work done in child processes.
 
     Examples
     --------
@@ -68,6 +359,35 @@ class Pipeline:
 
     >>> pipe = Pipeline(
     >>>     load_kwargs={"file": "example_pipeline.skdh", "process_raise": False})
+
+    Cache the output of the steps, so that running the pipeline again after
+    changing the activity cutpoints only runs the activity step:
+
+    >>> pipe = Pipeline(cache="/tmp/skdh_cache")
+    >>> pipe.add(ReadCwa(bases=0, periods=24))
+    >>> pipe.add(CalibrateAccelerometer())
+    >>> pipe.add(AccelThresholdWearDetection())
+    >>> pipe.add(ActivityLevelClassification(cutpoints="migueles_wrist_adult"))
+    >>> res = pipe.run(file="example.cwa")
+
+    Save a report of the time and memory each step uses next to the results:
+
+    >>> pipe = Pipeline(report_file="{file}_skdh_report.json")
+    >>> pipe.add(ReadCwa(bases=0, periods=24))
+    >>> pipe.add(Gait(), save_file="{file}_gait.csv")
+    >>> res = pipe.run(file="example.cwa")
+    >>> pipe.report["steps"][1]["samples per second"]
+
+    Append the results of many files to one HDF5 file, writing on a background
+    thread:
+
+    >>> from skdh.io import HDFSink
+    >>> with HDFSink("study_results.h5") as sink:
+    >>>     pipe = Pipeline(sink=sink)
+    >>>     pipe.add(ReadCwa(bases=0, periods=24))
+    >>>     pipe.add(Gait(), save_file="gait")
+    >>>     for file, res, err in pipe.run_many(files, executor="thread"):
+    >>>         pass
     """
 
     def __str__(self):
@@ -80,11 +400,26 @@ class Pipeline:
         ret += "]"
         return ret
 
-    def __init__(self, load_kwargs=None):
+    def __init__(
+        self,
+        load_kwargs=None,
+        n_workers=1,
+        cache=None,
+        report_file=None,
+        report_hook=None,
+        sink=None,
+    ):
         self._steps = []
         self._save = []
         self._current = -1  # iteration tracking
 
+        self.n_workers = max(int(n_workers), 1)
+        self.cache = get_cache(cache)
+        self.report_file = report_file
+        self.report_hook = report_hook
+        self.report = None
+        self.sink = sink
+
         self.logger = logging.getLogger(__name__)
 
         self._min_vers = None
@@ -101,6 +436,21 @@ class Pipeline:
         file : {str, path-like}
             File path to save the pipeline structure to
         """
+        if Path(file).suffix != ".skdh":
+            file += ".skdh"
+
+        with open(file, "w") as f:
+            yaml.dump(self._get_spec(), f)
+
+    def _get_spec(self):
+        """
+        Get the specification of the pipeline that is saved to files.
+
+        Returns
+        -------
+        spec : dict
+            Pipeline specification.
+        """
         # avoid circular import
         from skdh import __skdh_version__ as skdh_version
 
@@ -119,11 +469,7 @@ class Pipeline:
                 }
             )
 
-        if Path(file).suffix != ".skdh":
-            file += ".skdh"
-
-        with open(file, "w") as f:
-            yaml.dump(pipe, f)
+        return pipe
 
     @staticmethod
     def _handle_load_input(yaml_str, json_str, file):
@@ -354,6 +700,7 @@ class Pipeline:
         proc._in_pipeline = True
         proc.pipe_save_file = save_file
         proc.pipe_plot_file = plot_file
+        proc._sink = self.sink
 
         # setup plotting
         proc._setup_plotting(plot_file)
@@ -376,15 +723,17 @@ class Pipeline:
 
     def run(self, **kwargs):
         """
-        Run through the pipeline, sequentially processing steps. Inputs must be
-        provided as key-word arguments.
+        Run through the pipeline, processing steps in order, or concurrently where
+        steps do not depend on each other. Inputs must be provided as key-word
+        arguments.
 
         Parameters
         ----------
         kwargs
             Any key-word arguments. Will get passed to the first step of the pipeline,
             and therefore they must contain at least what the first process is
-            expecting.
+            expecting. Arrays can be given as :class:`skdh.base.SharedArray`
+            handles.
 
         Returns
         -------
@@ -393,16 +742,661 @@ class Pipeline:
         """
         # set self._current to restart processing
         self._current = -1
+        kwargs = {k: _resolve_shared(v) for k, v in kwargs.items()}
+        t_start = perf_counter()
+
+        plan = self._get_plan()
+        if self.cache is not None:
+            cache_keys = self._get_cache_keys(plan, kwargs)
+        else:
+            cache_keys = [None] * len(plan)
+        # outputs of each step. -1 is the input to the pipeline
+        outputs = {-1: dict(kwargs)}
+        step_results = {}
+        step_reports = {}
+        # number of steps that may still read each key of each output
+        readers = {-1: {}}
+        readers_all = {-1: 0}
+        for i in range(len(plan)):
+            readers[i], readers_all[i] = {}, 0
+        for deps, reads in plan:
+            for i, keys in reads.items():
+                if keys is None:
+                    readers_all[i] += 1
+                else:
+                    for key in keys:
+                        readers[i][key] = readers[i].get(key, 0) + 1
+
+        def drop_unused(i):
+            if readers_all[i] == 0:
+                for key in [k for k in outputs[i] if readers[i].get(k, 0) == 0]:
+                    del outputs[i][key]
+
+        def finish(j, out):
+            kwargs_j, outputs[j], step_results[j], step_reports[j] = out
+            if self.report_hook is not None:
+                self.report_hook(step_reports[j])
+            if kwargs_j is not None:
+                # undeclared step, which replaces all of the data
+                outputs[j] = kwargs_j
+            drop_unused(j)
+            for i, keys in plan[j][1].items():
+                if keys is None:
+                    readers_all[i] -= 1
+                else:
+                    for key in keys:
+                        readers[i][key] -= 1
+                drop_unused(i)
+
+        if self.n_workers == 1:
+            for j, proc in enumerate(self._steps):
+                inputs = self._get_inputs(plan, j, outputs)
+                finish(j, self._run_step(proc, inputs, cache_keys[j]))
+        else:
+            self._run_concurrent(plan, cache_keys, outputs, finish)
+
         results = {}
+        for j, proc in enumerate(self._steps):
+            if step_results[j] is not None:
+                results[proc._name] = step_results[j]
+
+        self.report = {
+            "file": None if kwargs.get("file") is None else str(kwargs["file"]),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "n_workers": self.n_workers,
+            "wall time": perf_counter() - t_start,
+            "steps": [step_reports[j] for j in range(len(self._steps))],
+        }
+        if self.report_file is not None:
+            self._save_report(kwargs.get("file", None))
+        if self.sink is not None:
+            self.sink.flush()
 
-        for proc in self:
-            kwargs, step_result = proc.predict(**kwargs)
-            if proc.pipe_save_file is not None:
-                proc.save_results(
-                    step_result if step_result is not None else kwargs,
-                    proc.pipe_save_file,
-                )
+        return results
+
+    def run_windowed(self, base=0, period=24, padding=0.0, **kwargs):
+        """
+        Run the pipeline on one day window of a recording at a time, so that only
+        one window of data is in memory at once. Inputs must be provided as
+        key-word arguments.
+
+        Parameters
+        ----------
+        base : int, optional
+            Base hour [0, 23] in which the day windows start. Default is 0.
+        period : int, optional
+            Duration of the day windows in hours [1, 24]. Default is 24.
+        padding : float, optional
+            Seconds of data before and after each window to also give to the
+            steps, to avoid edge effects of filters and windowed algorithms.
+            Default is 0.
+        kwargs
+            Any key-word arguments. Will get passed to the first step of the
+            pipeline.
+
+        Returns
+        -------
+        results : dict
+            Dictionary of the results of any steps of the pipeline that return
+            results, combined over all of the windows.
+
+        Raises
+        ------
+        ValueError
+            If the first step of the pipeline cannot be run on windows of data,
+            or if `base`, `period`, or `padding` are not valid.
+
+        Notes
+        -----
+        The steps at the start of the pipeline that can be run on windows of
+        data (processes with `_chunkable` set to True) are run on each window
+        separately, and their results are combined by the process. Each window
+        is passed to the steps as a single day in `day_ends` under the key
+        `(base, period)`, so the day windows of the processes should match
+        `base` and `period`. File readers that can read a time range only read
+        the data for each window (plus `padding`) from the file. Otherwise, the
+        windows are taken from the arrays passed to this method.
+
+        Any steps after the first step that cannot be run on windows are run
+        once, on the data of all the windows joined together without the
+        padding. Arrays of (start, stop) sample indices, such as wear periods,
+        are shifted to the joined data.
+
+        Steps are run in order, and are not loaded from or stored in the
+        `cache`. The results of each step are saved to its `save_file` after
+        combining the windows.
+
+        Examples
+        --------
+        Compute activity for a multi-week recording one day at a time:
+
+        >>> pipe = Pipeline()
+        >>> pipe.add(ReadCwa())
+        >>> pipe.add(AccelThresholdWearDetection())
+        >>> pipe.add(ActivityLevelClassification(day_window=(0, 24)))
+        >>> res = pipe.run_windowed(base=0, period=24, padding=900, file="example.cwa")
+        """
+        if not (0 <= base <= 23 and 1 <= period <= 24):
+            raise ValueError("`base` must be in [0, 23] and `period` in [1, 24].")
+        if padding < 0:
+            raise ValueError("`padding` must not be negative.")
+
+        n_windowed = 0
+        for proc in self._steps:
+            if not proc._chunkable:
+                break
+            n_windowed += 1
+        if n_windowed == 0:
+            raise ValueError(
+                "The first step of the pipeline cannot be run on windows of data."
+            )
+
+        self._current = -1
+        t_start = perf_counter()
+
+        first = self._steps[0]
+        # file readers that read only the data of each window
+        reads_file = hasattr(first, "_get_time_range")
+        if reads_file:
+            t_first, t_last = first._get_time_range(kwargs.get("file", None))
+        else:
+            time = kwargs[first._time]
+            t_first, t_last = (time[0], time[-1] + 1.0) if time.size > 0 else (0, 0)
+
+        windows = _get_day_windows(t_first, t_last, base, period)
+
+        chunks = []
+        chunk_results = []
+        chunk_reports = []
+        for ws, we in windows:
+            out = self._run_window(
+                kwargs, n_windowed, reads_file, ws, we, padding, (base, period)
+            )
+            if out is None:
+                continue
+            chunks.append(out[0])
+            chunk_results.append(out[1])
+            chunk_reports.append(out[2])
+
+        results = {}
+        step_reports = []
+        for j, proc in enumerate(self._steps[:n_windowed]):
+            # the file name is used for naming results files
+            proc._file_name = Path(kwargs.get("file", None) or "").stem
+            step_result = proc._stitch_results([r[j] for r in chunk_results])
             if step_result is not None:
                 results[proc._name] = step_result
+                if proc.pipe_save_file is not None:
+                    proc.save_results(step_result, proc.pipe_save_file)
+            if chunk_reports:
+                step_reports.append(_combine_reports([r[j] for r in chunk_reports]))
+
+        if n_windowed < len(self._steps):
+            if not chunks:
+                raise ValueError("There is no data in any of the windows.")
+            data = _stitch_data(chunks, first._time, first._days, (base, period))
+            for proc in self._steps[n_windowed:]:
+                kwargs_j, produced, step_result, report = self._run_step(proc, data)
+                data = kwargs_j if kwargs_j is not None else {**data, **produced}
+                if step_result is not None:
+                    results[proc._name] = step_result
+                step_reports.append(report)
+                if self.report_hook is not None:
+                    self.report_hook(report)
+
+        self.report = {
+            "file": None if kwargs.get("file") is None else str(kwargs["file"]),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "n_workers": self.n_workers,
+            "windows": len(chunks),
+            "wall time": perf_counter() - t_start,
+            "steps": step_reports,
+        }
+        if self.report_file is not None:
+            self._save_report(kwargs.get("file", None))
+        if self.sink is not None:
+            self.sink.flush()
 
         return results
+
+    def _run_window(self, kwargs, n_windowed, reads_file, ws, we, padding, window):
+        """
+        Run the first `n_windowed` steps on the data of one day window.
+
+        Returns
+        -------
+        data : dict
+            Output data of the last step, without the padding.
+        results : list
+            Results of each step.
+        reports : list
+            Report of each step.
+
+        None if there is no data in the window.
+        """
+        steps = [copy(proc) for proc in self._steps[:n_windowed]]
+        for proc in steps:
+            # results are saved after combining the windows
+            proc.pipe_save_file = None
+            proc.pipe_plot_file = None
+
+        # window stops are only clipped to the last sample at the end of the
+        # recording, so always read a little past the end of the window
+        t1, t2 = ws - padding, we + padding + 1.0
+
+        first = steps[0]
+        if reads_file:
+            first.start, first.stop = t1, t2
+            first.windows_only = False
+            # the parameters are part of the reader's cache key, so that each
+            # window is cached separately
+            first._kw = {**first._kw, "start": t1, "stop": t2, "windows_only": False}
+            data = dict(kwargs)
+        else:
+            time = kwargs[first._time]
+            i1, i2 = searchsorted(time, [t1, t2])
+            data = _slice_data(kwargs, time.size, i1, i2)
+
+        results, reports = [], []
+        for j, proc in enumerate(steps):
+            if j > 0 or not reads_file:
+                time = data[first._time]
+                i1, i2 = searchsorted(time, [ws, we])
+                # windows are found from approximate recording bounds, and can
+                # be empty apart from the padding
+                if i2 <= i1:
+                    return None
+                data[first._days] = {
+                    window: array([[i1, min(i2, time.size - 1)]], dtype=int_)
+                }
+
+            kwargs_j, produced, step_result, report = self._run_step(proc, data)
+            data = kwargs_j if kwargs_j is not None else {**data, **produced}
+            results.append(step_result)
+            reports.append(report)
+            if self.report_hook is not None:
+                self.report_hook(report)
+
+        time = data[first._time]
+        i1, i2 = searchsorted(time, [ws, we])
+        if i2 <= i1:
+            return None
+        data.pop(first._days, None)
+
+        return _slice_data(data, time.size, i1, i2), results, reports
+
+    def _save_report(self, file):
+        """
+        Save the report of the last run to `report_file`.
+
+        Parameters
+        ----------
+        file : {None, str, path-like}
+            File passed to the pipeline, used for formatting the file name.
+
+        Returns
+        -------
+        file_name : str
+            Name of the file the report was saved to.
+        """
+        # avoid circular import
+        from skdh import __skdh_version__ as skdh_version
+
+        file_name = self.report_file.format(
+            date=dt_date.today().strftime("%Y%m%d"),
+            name="Pipeline",
+            file=Path(file or "").stem,
+            version=skdh_version.replace(".", ""),
+        )
+
+        with open(file_name, "w") as f:
+            json.dump(self.report, f, indent=2)
+
+        return file_name
+
+    def _get_plan(self):
+        """
+        Get the steps each step depends on, and the outputs of previous steps it
+        reads data from.
+
+        Returns
+        -------
+        plan : list
+            For each step, the set of steps it depends on, and a dictionary of the
+            keys it reads from the output of previous steps (-1 is the input to the
+            pipeline), with None for reading all the keys.
+        """
+        plan = []
+        barrier = -1  # latest step that did not declare its keys
+        declared = []  # declared steps since `barrier`, with the keys they create
+        for j, proc in enumerate(self._steps):
+            consumes, produces = _get_step_io(proc)
+
+            if consumes is None:
+                reads = {i: None for i, _ in declared}
+                reads[barrier] = None
+                plan.append((set(range(j)), reads))
+                barrier, declared = j, []
+                continue
+
+            reads = {}
+            for key in consumes:
+                for i, prod in reversed(declared):
+                    if key in prod:
+                        reads.setdefault(i, set()).add(key)
+                # the undeclared step (or pipeline input) has all the keys
+                reads.setdefault(barrier, set()).add(key)
+            plan.append(({i for i in reads if i >= 0}, reads))
+            declared.append((j, produces))
+
+        return plan
+
+    def _get_inputs(self, plan, j, outputs):
+        """
+        Get the input data for a step from the outputs of the previous steps.
+        """
+        reads = plan[j][1]
+        # the undeclared step (or pipeline input) that the step reads from
+        barrier = min(reads)
+        if reads[barrier] is None:
+            inputs = dict(outputs[barrier])
+            for i in sorted(reads):
+                if i != barrier:
+                    inputs.update(outputs[i])
+            return inputs
+
+        inputs = {}
+        for key in reads[barrier]:
+            # latest step that created the key
+            for i in sorted(reads, reverse=True):
+                if key in reads[i] and key in outputs[i]:
+                    inputs[key] = outputs[i][key]
+                    break
+        return inputs
+
+    def _get_cache_keys(self, plan, kwargs):
+        """
+        Get the cache key of each step from its process and parameters, and the
+        keys of the data it reads.
+
+        Returns
+        -------
+        keys : list
+            Cache key of each step.
+        """
+        import skdh
+
+        def input_key(name):
+            if name not in kwargs:
+                return None
+            value = kwargs[name]
+            if name == "file" and value is not None and Path(value).is_file():
+                return self.cache.file_hash(value)
+            h = blake2b(digest_size=20)
+            _hash_value(h, value)
+            return h.hexdigest()
+
+        keys = []
+        for proc, (_, reads) in zip(self._steps, plan):
+            inputs = []
+            for i in sorted(reads):
+                names = sorted(kwargs) if reads[i] is None else sorted(reads[i])
+                if i == -1:
+                    inputs.append([(name, input_key(name)) for name in names])
+                else:
+                    inputs.append([keys[i], None if reads[i] is None else names])
+
+            info = json.dumps(
+                {
+                    "process": f"{proc.__class__.__module__}.{proc._name}",
+                    "parameters": {
+                        k: v
+                        for k, v in proc._kw.items()
+                        if k not in _IGNORED_PARAMETERS
+                    },
+                    "version": skdh.__version__,
+                    "inputs": inputs,
+                },
+                sort_keys=True,
+                default=repr,
+            )
+            keys.append(blake2b(info.encode(), digest_size=20).hexdigest())
+
+        return keys
+
+    def _run_step(self, proc, inputs, key=None):
+        """
+        Run a step of the pipeline, or load it from the cache, and save its
+        results.
+
+        Returns
+        -------
+        kwargs : {None, dict}
+            The output of the step if it did not declare the keys it creates,
+            otherwise None.
+        produced : dict
+            The keys the step declared it creates.
+        step_result : {None, dict}
+            The results of the step.
+        report : dict
+            Time, memory, and throughput of the step.
+        """
+        _, produces = _get_step_io(proc)
+        use_cache = key is not None and proc._cacheable and proc.pipe_plot_file is None
+
+        rss0 = _peak_rss()
+        cpu0 = process_time()
+        t0 = perf_counter()
+
+        cached = self.cache.load(key) if use_cache else None
+        if cached is not None:
+            self.logger.info(f"Loaded {proc!r} from the cache [{key}]")
+            # the file name is used for naming results files
+            proc._file_name = Path(inputs.get("file", None) or "").stem
+            kwargs, produced = cached["kwargs"], cached["produced"]
+            step_result = cached["result"]
+        else:
+            kwargs, step_result = proc.predict(**inputs)
+        wall_time = perf_counter() - t0
+        cpu_time = process_time() - cpu0
+        rss1 = _peak_rss()
+
+        if cached is None:
+            if produces is None:
+                produced = {}
+            else:
+                produced = {k: kwargs[k] for k in produces if k in kwargs}
+                kwargs = None
+
+            if use_cache:
+                self.cache.store(
+                    key, {"kwargs": kwargs, "produced": produced, "result": step_result}
+                )
+
+        if proc.pipe_save_file is not None:
+            proc.save_results(
+                step_result if step_result is not None else (kwargs or produced),
+                proc.pipe_save_file,
+            )
+
+        n = _n_samples(inputs, proc._time, proc._acc)
+        if n is None:
+            # file readers
+            n = _n_samples(kwargs or produced, proc._time, proc._acc)
+
+        report = {
+            "process": proc._name,
+            "cached": cached is not None,
+            "wall time": wall_time,
+            "cpu time": cpu_time,
+            "peak rss increase": None if rss0 is None else rss1 - rss0,
+            "samples": n,
+            "samples per second": None if not n or wall_time <= 0 else n / wall_time,
+        }
+
+        return kwargs, produced, step_result, report
+
+    def _run_concurrent(self, plan, cache_keys, outputs, finish):
+        """
+        Run steps on a pool of threads, starting each step once the steps it
+        depends on are finished.
+        """
+        done = set()
+        todo = list(range(len(plan)))
+        with ThreadPoolExecutor(self.n_workers) as pool:
+            running = {}
+            try:
+                while todo or running:
+                    for j in [j for j in todo if plan[j][0] <= done]:
+                        todo.remove(j)
+                        inputs = self._get_inputs(plan, j, outputs)
+                        fut = pool.submit(
+                            self._run_step, self._steps[j], inputs, cache_keys[j]
+                        )
+                        running[fut] = j
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        j = running.pop(fut)
+                        finish(j, fut.result())
+                        done.add(j)
+            finally:
+                for fut in running:
+                    fut.cancel()
+
+    def run_many(
+        self, files, n_workers=None, executor="process", resume_file=None, **kwargs
+    ):
+        """
+        Run the pipeline on many files in parallel, returning the results of each
+        file as it finishes.
+
+        Parameters
+        ----------
+        files : iterable
+            Files to run the pipeline on. Each file is passed to the pipeline as
+            the `file` key-word argument.
+        n_workers : {None, int}, optional
+            Number of worker processes or threads. Default is None, which uses the
+            number of CPUs.
+        executor : {"process", "thread"}, optional
+            Run the files on a pool of processes or threads. Each process loads its
+            own pipeline once from the saved pipeline specification, so every
+            process in the pipeline must be importable. Each thread uses its own copy
+            of the pipeline. Default is "process".
+        resume_file : {None, str, path-like}, optional
+            File to record the status of each file in. Files recorded as having
+            finished successfully are skipped, so that an interrupted batch can be
+            resumed by running again with the same `resume_file`. Failed files are
+            run again. Default is None, which does not record or skip files.
+        kwargs
+            Additional key-word arguments passed to the pipeline for every file.
+
+        Returns
+        -------
+        results : generator
+            Generator of `(file, results, error)` for each file, in the order the
+            files finish. `results` is the dictionary returned by
+            :meth:`Pipeline.run`, or None if the pipeline failed. `error` is the
+            formatted traceback if the pipeline failed, otherwise None.
+
+        Notes
+        -----
+        Sinks that cannot be written by more than one process at a time, for
+        example :class:`skdh.io.HDFSink`, can only be used with the "thread"
+        executor.
+
+        Errors for one file do not stop the rest of the batch. If a worker process
+        crashes, the files that were running are reported as failed, and the pool
+        is restarted for the remaining files.
+
+        Examples
+        --------
+        >>> pipe = Pipeline()
+        >>> pipe.add(ReadCwa(bases=0, periods=24))
+        >>> pipe.add(ActivityLevelClassification(), save_file="{file}_activity.csv")
+        >>> for file, res, err in pipe.run_many(files, n_workers=8, resume_file="batch.log"):
+        >>>     if err is not None:
+        >>>         print(f"{file} failed:\n{err}")
+        """
+        if executor == "process":
+            if self.sink is not None and not self.sink._process_safe:
+                raise ValueError(
+                    f"{self.sink!r} cannot be written by more than one process. "
+                    "Use `executor='thread'` instead."
+                )
+            yaml_str = yaml.dump(self._get_spec())
+            # make sure the pipeline can be loaded before starting any workers
+            Pipeline(load_kwargs={"yaml_str": yaml_str, "process_raise": True})
+
+            def get_pool():
+                return ProcessPoolExecutor(
+                    n_workers,
+                    initializer=_init_process_worker,
+                    initargs=(yaml_str, self.sink),
+                )
+
+        elif executor == "thread":
+
+            def get_pool():
+                return ThreadPoolExecutor(
+                    n_workers or os.cpu_count(),
+                    initializer=_init_thread_worker,
+                    initargs=(self,),
+                )
+
+        else:
+            raise ValueError("`executor` must be one of 'process' or 'thread'.")
+
+        return self._run_pool(get_pool, files, n_workers, resume_file, kwargs)
+
+    @staticmethod
+    def _run_pool(get_pool, files, n_workers, resume_file, kwargs):
+        """
+        Run files on a pool of workers, yielding the results as they finish.
+        """
+        done = _read_completed(resume_file)
+        todo = (f for f in files if str(f) not in done)
+        max_running = 2 * (n_workers or os.cpu_count())
+
+        pool = get_pool()
+        running = {}
+        broken = False
+        try:
+            while True:
+                # keep a limited number of files submitted, so that results are not
+                # held in memory waiting to be returned
+                if not broken:
+                    for file in todo:
+                        running[pool.submit(_run_file, file, kwargs)] = file
+                        if len(running) >= max_running:
+                            break
+                if not running:
+                    if not broken:
+                        break
+                    # restart the pool for the remaining files
+                    pool.shutdown(wait=True)
+                    pool = get_pool()
+                    broken = False
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    file = running.pop(fut)
+                    try:
+                        res, err = fut.result()
+                    except BrokenProcessPool:
+                        res, err = None, "Worker process terminated unexpectedly."
+                        broken = True
+
+                    if resume_file is not None:
+                        with open(resume_file, "a") as f:
+                            f.write(
+                                json.dumps({"file": str(file), "error": err}) + "\n"
+                            )
+
+                    yield file, res, err
+        finally:
+            for fut in running:
+                fut.cancel()
+            pool.shutdown(wait=True)
@@ -20,7 +20,6 @@ from numpy import (
     concatenate,
 )
 from numpy.linalg import norm
-from sklearn.linear_model import LinearRegression
 
 from skdh.base import BaseProcess
 from skdh.utility import moving_mean, moving_sd
@@ -75,6 +74,9 @@ class CalibrateAccelerometer(BaseProcess):
         doi: 10.1152/japplphysiol.00421.2014.
     """
 
+    _consumes = ("time", "accel", "fs", "apply", "temperature")
+    _produces = ("accel", "offset", "scale", "temperature scale")
+
     def __init__(
         self, sphere_crit=0.3, min_hours=72, sd_criteria=0.013, max_iter=1000, tol=1e-10
     ):
@@ -277,6 +279,9 @@ class CalibrateAccelerometer(BaseProcess):
         tmp_mean = mean(tmp_rm)
         tmp_rm = (tmp_rm - tmp_mean).reshape((-1, 1))
 
+        # avoid importing scikit-learn unless calibrating
+        from sklearn.linear_model import LinearRegression
+
         weights = ones(acc_rm.shape[0]) * 100
         res = [Inf]
         LR = LinearRegression()
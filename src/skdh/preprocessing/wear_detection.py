@@ -30,7 +30,7 @@ from numpy.linalg import norm
 from scipy.signal import butter, sosfiltfilt
 
 from skdh.base import BaseProcess
-from skdh.utility import moving_mean, moving_sd, moving_max, moving_min
+from skdh.utility import moving_mean, moving_sd, moving_stats
 from skdh.utility.internal import rle, invert_indices
 from skdh.utility.activity_counts import get_activity_counts
 
@@ -83,6 +83,10 @@ class DETACH(BaseProcess):
     `GitHub <https://github.com/nimbal/vertdetach>`.
     """
 
+    _consumes = ("time", "accel", "temperature", "fs")
+    _produces = ("wear",)
+    _chunkable = True
+
     def __init__(
         self,
         sd_thresh=0.008,
@@ -259,8 +263,9 @@ class DETACH(BaseProcess):
         perc_under_sd_range_5min_bwd = perc_under_sd_range_5min_bwd[: temp_ds.size]
 
         # Get the maximum & minimum temperature in 5 minute windows
-        max_temp_5min = moving_max(temp_f, wlen_ds_5min, 1, trim=False)
-        min_temp_5min = moving_min(temp_f, wlen_ds_5min, 1, trim=False)
+        max_temp_5min, min_temp_5min = moving_stats(
+            temp_f, wlen_ds_5min, 1, stats=("max", "min"), trim=False
+        )
 
         # get the average temperature change in the next 5 minutes
         avg_temp_delta_5min = moving_mean(delta_temp_f, wlen_ds_5min, 1, trim=False)
@@ -402,6 +407,10 @@ class CountWearDetection(BaseProcess):
         Feb. 2011, doi: 10.1249/MSS.0b013e3181ed61a3.
     """
 
+    _consumes = ("time", "accel", "fs")
+    _produces = ("wear",)
+    _chunkable = True
+
     def __init__(
         self, nonwear_window_min=90, epoch_seconds=60, use_actigraph_package=False
     ):
@@ -566,6 +575,10 @@ class CtaWearDetection(BaseProcess):
     into wear times.
     """
 
+    _consumes = ("time", "accel", "temperature", "fs")
+    _produces = ("wear",)
+    _chunkable = True
+
     def __init__(
         self, temp_threshold=26.0, sd_crit=0.003, window_length=1, window_skip=1
     ):
@@ -762,6 +775,10 @@ class AccelThresholdWearDetection(BaseProcess):
     are re-classified as non-wear.
     """
 
+    _consumes = ("time", "accel", "fs")
+    _produces = ("wear",)
+    _chunkable = True
+
     def __init__(
         self,
         sd_crit=0.013,
@@ -835,12 +852,12 @@ class AccelThresholdWearDetection(BaseProcess):
         # note that while this block starts at 0, the method uses centered blocks, which
         # means that the first block actually corresponds to a block starting
         # 22.5 minutes into the recording
-        acc_rsd = moving_sd(accel, n_wlen, n_wskip, axis=0, return_previous=False)
+        acc_rsd, acc_max, acc_min = moving_stats(
+            accel, n_wlen, n_wskip, stats=("sd", "max", "min"), axis=0
+        )
 
         # get the accelerometer range in each 60min window
-        acc_w_range = moving_max(accel, n_wlen, n_wskip, axis=0) - moving_min(
-            accel, n_wlen, n_wskip, axis=0
-        )
+        acc_w_range = acc_max - acc_min
 
         nonwear = (
             sum((acc_rsd < self.sd_crit) & (acc_w_range < self.range_crit), axis=1) >= 2
@@ -81,6 +81,13 @@ class Sit2Stand(BaseProcess):
         Two (2) element array-like of the base and period of the window to use for
         determining days. Default is (0, 24), which will look for days starting at
         midnight and lasting 24 hours. None removes any day-based windowing.
+    n_workers : int, optional
+        Number of workers to process days in parallel with. Default is 1, which
+        processes days serially. Days are always processed serially when plotting.
+    executor : {"process", "thread"}, optional
+        Type of pool to process days in parallel with. With "process", the data
+        arrays are shared with the workers through shared memory. Default is
+        "process".
 
     Notes
     -----
@@ -112,6 +119,11 @@ class Sit2Stand(BaseProcess):
         Art. no. 22, Jan. 2020, doi: 10.3390/s20226618.
     """
 
+    _consumes = ("time", "accel", "day_ends")
+    _produces = ()
+    _chunkable = True
+    _day_key = "Day Number"
+
     def __init__(
         self,
         *,
@@ -131,6 +143,8 @@ class Sit2Stand(BaseProcess):
         lowpass_cutoff=5,
         reconstruction_window=0.25,
         day_window=(0, 24),
+        n_workers=1,
+        executor="process",
     ):
         super().__init__(
             # kwarg saving
@@ -150,7 +164,10 @@ class Sit2Stand(BaseProcess):
             lowpass_cutoff=lowpass_cutoff,
             reconstruction_window=reconstruction_window,
             day_window=day_window,
+            n_workers=n_workers,
+            executor=executor,
         )
+        self._set_day_workers(n_workers, executor)
 
         # FILTER PARAMETERS
         self.cwave = continuous_wavelet
@@ -237,59 +254,78 @@ class Sit2Stand(BaseProcess):
             "Partial": [],
         }
 
-        for iday, day_idx in enumerate(zip(*self.day_idx)):
-            start, stop = day_idx
+        day_results = self._map_days(
+            "_predict_day",
+            *self.day_idx,
+            {self._time: time, self._acc: accel},
+            dt=dt,
+            sos=sos,
+            keys=list(sts),
+        )
+        for day_sts in day_results:
+            for k in sts:
+                sts[k].extend(day_sts[k])
 
-            # compute the magnitude of the acceleration
-            m_acc = norm(accel[start:stop, :], axis=1)
-            # filtered acceleration
-            f_acc = ascontiguousarray(
-                sosfiltfilt(sos, m_acc, padtype="odd", padlen=None)
-            )
+        # get rid of the partial transitions
+        partial = array(sts["Partial"])
 
-            # reconstructed acceleration
-            n_window = int(around(self.rwindow / dt))
-            r_acc, *_ = pad_moving_sd(f_acc, n_window, 1)
+        for k in [i for i in sts if i != "Partial"]:
+            sts[k] = array(sts[k])[~partial] if partial.size > 0 else array([])
 
-            # get the frequencies first to limit computation necessary
-            freqs = scale2frequency(self.cwave, arange(1, 65)) / dt
-            f_mask = (
-                nonzero((freqs <= self.power_end_f) & (freqs >= self.power_start_f))[0]
-                + 1
-            )
+        sts.pop("Partial")
 
-            # CWT power peak detection
-            coefs, freq = cwt(r_acc, f_mask, self.cwave, sampling_period=dt)
+        kwargs.update({self._time: time, self._acc: accel})
 
-            # sum coefficients over the frequencies in the power band
-            power = sum(coefs, axis=0)
+        return (kwargs, sts) if self._in_pipeline else sts
 
-            # find the peaks in the power data
-            if self.std_height:
-                trim = int(self.std_trim / dt)
-                self.power_peak_kw["height"] = std(
-                    power[trim:-trim] if trim != 0 else power, ddof=1
-                )
+    def _predict_day(self, iday, start, stop, *, time, accel, dt, sos, keys):
+        """
+        Detect the sit-to-stand transfers for a single day.
 
-            power_peaks, _ = find_peaks(power, **self.power_peak_kw)
+        Returns
+        -------
+        sts : dict
+            Sit-to-stand transfers of the day.
+        """
+        sts = {k: [] for k in keys}
 
-            self.detector.predict(
-                sts, dt, time[start:stop], accel[start:stop, :], f_acc, power_peaks
-            )
+        # compute the magnitude of the acceleration
+        m_acc = norm(accel[start:stop, :], axis=1)
+        # filtered acceleration
+        f_acc = ascontiguousarray(sosfiltfilt(sos, m_acc, padtype="odd", padlen=None))
 
-            # fill out the day information
-            sts["Day Number"].extend(
-                [iday + 1] * (len(sts["Date"]) - len(sts["Day Number"]))
-            )
+        # reconstructed acceleration
+        n_window = int(around(self.rwindow / dt))
+        r_acc, *_ = pad_moving_sd(f_acc, n_window, 1)
 
-        # get rid of the partial transitions
-        partial = array(sts["Partial"])
+        # get the frequencies first to limit computation necessary
+        freqs = scale2frequency(self.cwave, arange(1, 65)) / dt
+        f_mask = (
+            nonzero((freqs <= self.power_end_f) & (freqs >= self.power_start_f))[0] + 1
+        )
 
-        for k in [i for i in sts if i != "Partial"]:
-            sts[k] = array(sts[k])[~partial] if partial != array([]) else array([])
+        # CWT power peak detection
+        coefs, freq = cwt(r_acc, f_mask, self.cwave, sampling_period=dt)
 
-        sts.pop("Partial")
+        # sum coefficients over the frequencies in the power band
+        power = sum(coefs, axis=0)
 
-        kwargs.update({self._time: time, self._acc: accel})
+        # find the peaks in the power data
+        if self.std_height:
+            trim = int(self.std_trim / dt)
+            self.power_peak_kw["height"] = std(
+                power[trim:-trim] if trim != 0 else power, ddof=1
+            )
 
-        return (kwargs, sts) if self._in_pipeline else sts
+        power_peaks, _ = find_peaks(power, **self.power_peak_kw)
+
+        self.detector.predict(
+            sts, dt, time[start:stop], accel[start:stop, :], f_acc, power_peaks
+        )
+
+        # fill out the day information
+        sts["Day Number"].extend(
+            [iday + 1] * (len(sts["Date"]) - len(sts["Day Number"]))
+        )
+
+        return sts
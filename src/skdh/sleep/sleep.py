@@ -13,11 +13,6 @@ from datetime import date as dt_date
 
 from numpy import mean, diff, array, nan, sum, arange, full, int_
 from numpy.ma import masked_where
-from pandas import DataFrame, date_range
-import matplotlib
-from matplotlib.backends.backend_pdf import PdfPages
-import matplotlib.lines as mlines
-import matplotlib.pyplot as plt
 
 from skdh.base import BaseProcess  # import the base process class
 from skdh.utility.internal import get_day_index_intersection, apply_downsample, rle
@@ -125,6 +120,13 @@ class Sleep(BaseProcess):
         hours [5]. Default is 0.0 for no added data.
     save_per_minute_results : bool, optional
         Save minute-by-minute predictions of rest for each day. Default is False.
+    n_workers : int, optional
+        Number of workers to process days in parallel with. Default is 1, which
+        processes days serially. Days are always processed serially when plotting.
+    executor : {"process", "thread"}, optional
+        Type of pool to process days in parallel with. With "process", the data
+        arrays are shared with the workers through shared memory. Default is
+        "process".
 
     Notes
     -----
@@ -158,6 +160,11 @@ class Sleep(BaseProcess):
 
     """
 
+    _consumes = ("time", "accel", "temperature", "fs", "wear", "day_ends")
+    _produces = ("sleep",)
+    _chunkable = True
+    _day_key = "Day N"
+
     _params = [
         # normal metrics
         endpoints.TotalSleepTime,
@@ -199,6 +206,8 @@ class Sleep(BaseProcess):
         day_window=(12, 24),
         save_per_minute_results=False,
         add_active_time=0.0,
+        n_workers=1,
+        executor="process",
     ):
         super().__init__(
             start_buffer=start_buffer,
@@ -220,7 +229,10 @@ class Sleep(BaseProcess):
             day_window=day_window,
             save_per_minute_results=save_per_minute_results,
             add_active_time=add_active_time,
+            n_workers=n_workers,
+            executor=executor,
         )
+        self._set_day_workers(n_workers, executor)
 
         self.window_size = 60
         self.hp_cut = 0.25
@@ -241,6 +253,8 @@ class Sleep(BaseProcess):
         self.downsample = downsample
         self.aa_filter = downsample_aa_filter
         self.save_pm = save_per_minute_results
+        # per minute results are saved from the state of the last predict call
+        self._cacheable = not save_per_minute_results
         self.add_time = add_active_time
 
         # for storing sleep auxiliary data
@@ -275,6 +289,10 @@ class Sleep(BaseProcess):
         """
         if save_file is None:
             return
+
+        import matplotlib
+        import matplotlib.pyplot as plt
+
         # move this inside here so that it doesnt effect everything on load
         if gettrace() is None:  # only set if not debugging
             matplotlib.use(
@@ -344,6 +362,8 @@ class Sleep(BaseProcess):
         file_name = super().save_results(results, file_name)
 
         if self.save_pm:
+            from pandas import DataFrame, date_range
+
             file_name = Path(file_name)
 
             for i, start in enumerate(self.sleep_aux["start time"]):
@@ -360,7 +380,9 @@ class Sleep(BaseProcess):
                 df["TSO"] = False
                 df.loc[tso[0] : tso[1], "TSO"] = True
 
-                df.to_csv(rest_file, index=False)
+                self._write_table(
+                    df, str(rest_file), name=f"{self._name}_per_minute_predictions"
+                )
 
     def predict(
         self, time=None, accel=None, *, temperature=None, fs=None, wear=None, **kwargs
@@ -471,140 +493,191 @@ class Sleep(BaseProcess):
         sleep_idx = full((day_starts_ds.size, 2), -1, dtype=int_)
 
         # iterate over the days
-        for iday, (start, stop) in enumerate(zip(day_starts_ds, day_stops_ds)):
-            if ((stop - start) / (3600 * goal_fs)) < self.min_day_hrs:
-                self.logger.info(
-                    f"Day {iday} has less than {self.min_day_hrs} hours. Skipping"
-                )
+        day_results = self._map_days(
+            "_predict_day",
+            day_starts_ds,
+            day_stops_ds,
+            {self._time: time_ds, self._acc: accel_ds, self._temp: temp_ds},
+            fs=fs,
+            goal_fs=goal_fs,
+            wear_starts=wear_starts_ds,
+            wear_stops=wear_stops_ds,
+            init_params=init_params,
+            keys=list(sleep),
+            source_file=kwargs.get("file", self.plot_fname),
+        )
+        for iday, day_res in enumerate(day_results):
+            if day_res is None:
                 continue
+            day, day_sleep_idx, aux = day_res
 
-            # initialize all the sleep values for the day
             for k in sleep:
-                sleep[k].append(nan)
-            # fill out Day number and date
-            sleep["Day N"][-1] = iday + 1
+                sleep[k].extend(day[k])
+            if day_sleep_idx is not None:
+                sleep_idx[iday] = day_sleep_idx
+            if aux is not None:
+                self._store_sleep_aux(*aux)
 
-            # get the start timestamp and make sure its in the correct hour due to indexing
-            start_datetime, sleep["Date"][-1] = _get_date(
-                time_ds[start], self.day_key[0]
-            )
-
-            # plotting
-            source_f = kwargs.get("file", self.plot_fname)
-            self._setup_day_plot(iday + 1, source_f, sleep["Date"][-1], start_datetime)
-            self._plot_accel(goal_fs, accel_ds[start:stop])
+        # finalize plotting
+        self._finalize_plots()
 
-            # get the starts and stops of wear during the day
-            dw_starts, dw_stops = get_day_index_intersection(
-                wear_starts_ds, wear_stops_ds, True, start, stop
-            )
+        kwargs.update(
+            {
+                self._acc: accel,
+                self._time: time,
+                "fs": fs,
+                "wear": wear,
+                "temperature": temperature,
+                "sleep": sleep_idx,
+            }
+        )
 
-            if (sum(dw_stops - dw_starts) / (3600 * goal_fs)) < self.min_wear_time:
-                self.logger.info(
-                    f"Day {iday} has less than {self.min_wear_time} externally calculated wear "
-                    f"hours. Skipping"
-                )
-                continue
+        return (kwargs, sleep) if self._in_pipeline else sleep
 
-            # start time, end time, start index, end index
-            tso = get_total_sleep_opportunity(
-                goal_fs,
-                time_ds[start:stop],
-                accel_ds[start:stop],
-                temp_ds[start:stop] if temp_ds is not None else None,
-                dw_starts,
-                dw_stops,
-                self.min_rest_block,
-                self.max_act_break,
-                self.tso_min_thresh,
-                self.tso_max_thresh,
-                self.tso_perc,
-                self.tso_factor,
-                self.int_w_temp,
-                self.int_w_move,
-                self._plot_arm_angle,
-                idx_start=start,
-                add_active_time=self.add_time,
+    def _predict_day(
+        self,
+        iday,
+        start,
+        stop,
+        *,
+        time,
+        accel,
+        temperature,
+        fs,
+        goal_fs,
+        wear_starts,
+        wear_stops,
+        init_params,
+        keys,
+        source_file,
+    ):
+        """
+        Compute the sleep endpoints for a single day.
+
+        Returns
+        -------
+        day_results : {None, tuple}
+            None if the day is too short. Otherwise the sleep endpoints for the
+            day, the sleep (TSO) indices of the day, and the per-minute sleep
+            predictions to store.
+        """
+        if ((stop - start) / (3600 * goal_fs)) < self.min_day_hrs:
+            self.logger.info(
+                f"Day {iday} has less than {self.min_day_hrs} hours. Skipping"
             )
+            return None
 
-            # calculate activity index
-            act_index = compute_activity_index(goal_fs, accel_ds[start:stop])
+        # initialize all the sleep values for the day
+        sleep = {k: [nan] for k in keys}
+        # fill out Day number and date
+        sleep["Day N"][-1] = iday + 1
 
-            self._plot_activity_index(act_index)
+        # get the start timestamp and make sure its in the correct hour due to indexing
+        start_datetime, sleep["Date"][-1] = _get_date(time[start], self.day_key[0])
 
-            # move this after activity index calculation so that activity index
-            # gets plotted always
-            if tso[0] is None:
-                self._plot_sleep_wear_predictions(
-                    goal_fs, None, None, None, dw_starts - start, dw_stops - start
-                )
-                continue
+        # plotting
+        self._setup_day_plot(iday + 1, source_file, sleep["Date"][-1], start_datetime)
+        self._plot_accel(goal_fs, accel[start:stop])
 
-            # sleep wake predictions
-            predictions = compute_sleep_predictions(act_index, sf=0.243)
-            # tso indices are already relative to day start
-            tso_start = int(tso[2] / int(60 * goal_fs))  # convert to minute indexing
-            tso_stop = int(tso[3] / int(60 * goal_fs))
-            pred_during_tso = predictions[tso_start:tso_stop]
+        # get the starts and stops of wear during the day
+        dw_starts, dw_stops = get_day_index_intersection(
+            wear_starts, wear_stops, True, start, stop
+        )
 
-            # save the sleep per minute results if desired
-            self._store_sleep_aux(
-                start_datetime, iday, predictions, tso_start, tso_stop
+        if (sum(dw_stops - dw_starts) / (3600 * goal_fs)) < self.min_wear_time:
+            self.logger.info(
+                f"Day {iday} has less than {self.min_wear_time} externally calculated wear "
+                f"hours. Skipping"
             )
+            return sleep, None, None
+
+        # start time, end time, start index, end index
+        tso = get_total_sleep_opportunity(
+            goal_fs,
+            time[start:stop],
+            accel[start:stop],
+            temperature[start:stop] if temperature is not None else None,
+            dw_starts,
+            dw_stops,
+            self.min_rest_block,
+            self.max_act_break,
+            self.tso_min_thresh,
+            self.tso_max_thresh,
+            self.tso_perc,
+            self.tso_factor,
+            self.int_w_temp,
+            self.int_w_move,
+            self._plot_arm_angle,
+            idx_start=start,
+            add_active_time=self.add_time,
+        )
 
-            # set the sleep start and end values as the TSO (essentially time in bed)
-            sleep_idx[iday, 0] = int((tso[2] + start) * fs / goal_fs)
-            sleep_idx[iday, 1] = int((tso[3] + start) * fs / goal_fs)
+        # calculate activity index
+        act_index = compute_activity_index(goal_fs, accel[start:stop])
 
-            # plotting
+        self._plot_activity_index(act_index)
+
+        # move this after activity index calculation so that activity index
+        # gets plotted always
+        if tso[0] is None:
             self._plot_sleep_wear_predictions(
-                goal_fs,
-                predictions,
-                tso_start,
-                tso_stop,
-                dw_starts - start,
-                dw_stops - start,
+                goal_fs, None, None, None, dw_starts - start, dw_stops - start
             )
+            return sleep, None, None
+
+        # sleep wake predictions
+        predictions = compute_sleep_predictions(act_index, sf=0.243)
+        # tso indices are already relative to day start
+        tso_start = int(tso[2] / int(60 * goal_fs))  # convert to minute indexing
+        tso_stop = int(tso[3] / int(60 * goal_fs))
+        pred_during_tso = predictions[tso_start:tso_stop]
+
+        # save the sleep per minute results if desired
+        aux = (start_datetime, iday, predictions, tso_start, tso_stop)
+
+        # set the sleep start and end values as the TSO (essentially time in bed)
+        sleep_idx = (
+            int((tso[2] + start) * fs / goal_fs),
+            int((tso[3] + start) * fs / goal_fs),
+        )
 
-            # results fill out
-            tso_start_dt = datetime.utcfromtimestamp(tso[0])
-            sleep["TSO Start Timestamp"][-1] = tso[0]
-            sleep["TSO Start"][-1] = tso_start_dt.strftime("%Y-%m-%d %H:%M:%S.%f")
-            sleep["TSO Duration"][-1] = (tso[3] - tso[2]) / (goal_fs * 60)  # in minutes
-
-            # run length encoding for sleep metrics
-            if tso_start == tso_stop:
-                continue
-            sw_lengths, sw_starts, sw_vals = rle(pred_during_tso)
-
-            for param in init_params:
-                sleep[param.name][-1] = param.predict(
-                    sleep_predictions=pred_during_tso,
-                    lengths=sw_lengths,
-                    starts=sw_starts,
-                    values=sw_vals,
-                )
-
-            self._tabulate_results(sleep)
+        # plotting
+        self._plot_sleep_wear_predictions(
+            goal_fs,
+            predictions,
+            tso_start,
+            tso_stop,
+            dw_starts - start,
+            dw_stops - start,
+        )
 
-        # finalize plotting
-        self._finalize_plots()
+        # results fill out
+        tso_start_dt = datetime.utcfromtimestamp(tso[0])
+        sleep["TSO Start Timestamp"][-1] = tso[0]
+        sleep["TSO Start"][-1] = tso_start_dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+        sleep["TSO Duration"][-1] = (tso[3] - tso[2]) / (goal_fs * 60)  # in minutes
+
+        # run length encoding for sleep metrics
+        if tso_start == tso_stop:
+            return sleep, sleep_idx, aux
+        sw_lengths, sw_starts, sw_vals = rle(pred_during_tso)
+
+        for param in init_params:
+            sleep[param.name][-1] = param.predict(
+                sleep_predictions=pred_during_tso,
+                lengths=sw_lengths,
+                starts=sw_starts,
+                values=sw_vals,
+            )
 
-        kwargs.update(
-            {
-                self._acc: accel,
-                self._time: time,
-                "fs": fs,
-                "wear": wear,
-                "temperature": temperature,
-                "sleep": sleep_idx,
-            }
-        )
+        self._tabulate_results(sleep)
 
-        return (kwargs, sleep) if self._in_pipeline else sleep
+        return sleep, sleep_idx, aux
 
     def _setup_day_plot(self, iday, source_file, date_str, start_dt):
         if self.f is not None:
+            import matplotlib.pyplot as plt
+
             f, ax = plt.subplots(
                 nrows=4,
                 figsize=(12, 6),
@@ -654,6 +727,8 @@ class Sleep(BaseProcess):
         accel : numpy.ndarray
         """
         if self.f is not None:
+            import matplotlib.lines as mlines
+
             acc = accel[:: int(fs * 60)]
 
             self.ax[-1][0].plot(self.t60[: acc.shape[0]], acc, lw=0.5)
@@ -719,6 +794,8 @@ class Sleep(BaseProcess):
             Indices for wear ends. Indexed to `fs`.
         """
         if self.f is not None:
+            import matplotlib.lines as mlines
+
             # wear
             h1 = mlines.Line2D(
                 [],
@@ -809,6 +886,8 @@ class Sleep(BaseProcess):
         Finalize and save the plots for sleep
         """
         if self.f is not None:
+            from matplotlib.backends.backend_pdf import PdfPages
+
             date = dt_date.today().strftime("%Y%m%d")
             form_fname = self.plot_fname.format(
                 date=date, name=self._name, file=self._file_name
@@ -7,7 +7,7 @@ Copyright (c) 2021. Pfizer Inc. All rights reserved.
 from numpy import min, max, percentile, zeros, bool_, pad, sin, arange, pi, concatenate
 from numpy.random import default_rng
 
-from skdh.utility import moving_mean, moving_median, moving_sd
+from skdh.utility import moving_median, moving_sd, moving_median_block_mean
 from skdh.sleep.utility import (
     compute_z_angle,
     compute_absolute_difference,
@@ -102,14 +102,12 @@ def get_total_sleep_opportunity(
     # samples in 5 seconds. GGIR makes this always odd, which is a function
     # of the library (zoo) they are using for rollmedian
     n5 = int(5 * fs)
-    # compute the rolling median for 5s windows
-    acc_rmd = moving_median(accel, n5, skip=1, axis=0)
-
-    # compute the z-angle
-    z = compute_z_angle(acc_rmd)
-
-    # rolling 5s mean with non-overlapping windows for the z-angle
-    _z_rm = moving_mean(z, n5, n5)
+    # rolling 5s mean with non-overlapping windows of the z-angle and acceleration,
+    # from the rolling median for 5s windows. The full resolution rolling median
+    # is not needed, and is only computed a few blocks at a time
+    _z_rm, acc_rmean_5s = moving_median_block_mean(
+        accel, n5, n5, fns=(compute_z_angle, None)
+    )
     # plot arm angle
     plot_fn(_z_rm)
 
@@ -152,8 +150,7 @@ def get_total_sleep_opportunity(
 
     # check if we can compute wear internally
     if temperature is not None and int_wear_temp > 0.0:
-        t_rmed_5s = moving_median(temperature, n5, 1)
-        t_rmean_5s = moving_mean(t_rmed_5s, n5, n5)
+        t_rmean_5s = moving_median_block_mean(temperature, n5, n5)
         t_rmed_5m = moving_median(t_rmean_5s, 60, 1)  # 5 min rolling median
 
         temp_nonwear = t_rmed_5m < int_wear_temp
@@ -161,7 +158,6 @@ def get_total_sleep_opportunity(
         tso[temp_nonwear] = False  # non-wear -> not a TSO opportunity
 
     if int_wear_move > 0.0:
-        acc_rmean_5s = moving_mean(acc_rmd, n5, n5, axis=0)
         acc_rsd_30m = moving_sd(acc_rmean_5s, 360, 1, axis=0, return_previous=False)
 
         move_nonwear = pad(
@@ -26,6 +26,7 @@ from scipy.signal import butter, sosfiltfilt
 
 from skdh.utility import get_windowed_view
 from skdh.utility import moving_mean, moving_sd, moving_median
+from skdh.utility import moving_median_block_mean
 from skdh.utility.internal import rle
 
 __all__ = [
@@ -69,10 +70,8 @@ def get_weartime(acc_rmed, temp, fs, move_thresh, temp_thresh):
     # this is likely going to be an issue for all wear time algorithms due to long
     # windows, however.
 
-    # rolling 5s median of temperature
-    rmd = moving_median(temp, n5, skip=1)
-    # rolling 5s mean (non-overlapping)
-    mn = moving_mean(rmd, n5, n5)
+    # rolling 5s mean (non-overlapping) of the rolling 5s median of temperature
+    mn = moving_median_block_mean(temp, n5, n5)
     # rolling 5m median
     temp_rmd = moving_median(mn, 12 * 5, skip=1)
 
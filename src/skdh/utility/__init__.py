@@ -19,6 +19,9 @@ Binary State Fragmentation Endpoints
 Misc. Math Functions
 --------------------
 
+The moving statistics keep float32 input as float32. Each lane of the data is
+computed in double precision, and the results are returned as float32.
+
 .. autosummary::
     :toctree: generated/
 
@@ -27,6 +30,11 @@ Misc. Math Functions
     math.moving_skewness
     math.moving_kurtosis
     math.moving_median
+    math.moving_max
+    math.moving_min
+    math.moving_stats
+    math.moving_median_block_mean
+    math.MovingStats
 
 Orientation Functions
 ---------------------
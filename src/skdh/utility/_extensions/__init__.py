@@ -6,6 +6,8 @@ from .moving_statistics import (
     moving_median,
     moving_max,
     moving_min,
+    moving_stats,
+    moving_moments_update,
 )
 
 __all__ = [
@@ -16,4 +18,6 @@ __all__ = [
     "moving_median",
     "moving_max",
     "moving_min",
+    "moving_stats",
+    "moving_moments_update",
 ]
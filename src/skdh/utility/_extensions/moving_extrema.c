@@ -61,10 +61,10 @@ Queue *newQueue(int n_items)
  */
 void freeQueue(Queue *q)
 {
-    free(q->dqStack);
-    free(q->dqStack_ext);
-    free(q->eqStack);
-    free(q->eqStack_ext);
+    freeStack(q->dqStack);
+    freeStack(q->dqStack_ext);
+    freeStack(q->eqStack);
+    freeStack(q->eqStack_ext);
     free(q);
 }
 
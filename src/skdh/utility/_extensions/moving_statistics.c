@@ -10,6 +10,8 @@
 
 /* moving max/min */
 #include "moving_extrema.h"
+/* running jobs on threads */
+#include "parallel.h"
 
 /* moving moments */
 extern void mov_moments_1(long *, double *, long *, long *, double *);
@@ -18,472 +20,466 @@ extern void mov_moments_2(long *, double *, long *, long *, double *, double *);
 extern void moving_moments_2(long *, double *, long *, long *, double *, double *);
 extern void moving_moments_3(long *, double *, long *, long *, double *, double *, double *);
 extern void moving_moments_4(long *, double *, long *, long *, double *, double *, double *, double *);
+extern void stream_moments(long *, double *, long *, long *, long *, long *, long *, long *, double *, double *);
 /* moving median */
 extern void fmoving_median(long *, double *, long *, long *, double *);
 
 
-PyObject * moving_mean(PyObject *NPY_UNUSED(self), PyObject *args){
-    PyObject *x_;
-    long wlen, skip;
-    int trim;
+/* moving statistic kernel, computing one lane of data into `nout` result arrays */
+typedef void (*moving_kernel_t)(long *, double *, long *, long *, double **);
 
-    if (!PyArg_ParseTuple(args, "Ollp:moving_mean", &x_, &wlen, &skip, &trim))
-        return NULL;
+static void kernel_mean(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    mov_moments_1(n, x, wlen, skip, res[0]);
+}
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-        x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
-        1,
-        0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-        NULL
-    );
-    if (!data)
-        return NULL;
+static void kernel_sd(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    mov_moments_2(n, x, wlen, skip, res[0], res[1]);
+}
 
-    // get the number of dimensions, and the shape
-    int ndim = PyArray_NDIM(data);
-    const npy_intp *ddims = PyArray_DIMS(data);
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(npy_intp));
-    if (!rdims)
-    {
-        Py_XDECREF(data);
-        return NULL;
-    }
-    // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
-    {
-        rdims[i] = ddims[i];
-    }
-    // dimension of the roll
-    if (trim)
-    {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
-    }
+static void kernel_skewness(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    moving_moments_3(n, x, wlen, skip, res[0], res[1], res[2]);
+}
 
-    PyArrayObject *rmean = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    free(rdims);
+static void kernel_kurtosis(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    moving_moments_4(n, x, wlen, skip, res[0], res[1], res[2], res[3]);
+}
 
-    if (!rmean)
-    {
-        Py_XDECREF(data);
-        Py_XDECREF(rmean);
+static void kernel_median(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    fmoving_median(n, x, wlen, skip, res[0]);
+}
+
+static void kernel_max(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    moving_max_c(n, x, wlen, skip, res[0]);
+}
+
+static void kernel_min(long *n, double *x, long *wlen, long *skip, double **res)
+{
+    moving_min_c(n, x, wlen, skip, res[0]);
+}
+
+
+/* maximum number of results of a moving statistic computation */
+#define MOVING_MAX_OUT 7
+
+/* arrays and sizes shared by all the threads computing a moving statistic */
+typedef struct {
+    int nkernels;
+    moving_kernel_t kernels[MOVING_MAX_OUT];
+    int offsets[MOVING_MAX_OUT];  // first result slot of each kernel
+    int nout;  // number of result slots, some of which can be unused
+    int type;
+    int ndim;
+    int axis;
+    const npy_intp *ddims;
+    const npy_intp *dstrides;
+    const npy_intp *rstrides;
+    const char *data;
+    char *res[MOVING_MAX_OUT];  // NULL for unused slots
+    long npts;  // samples per lane
+    long wlen;
+    long skip;
+    long trim_pts;  // results per lane that can be computed
+    long nres;  // results per lane, including NaN values if not trimming
+    long nseg;  // segments per lane
+    int direct_in;  // lanes can be used in place
+    int direct_out;  // results can be written in place
+} moving_info_t;
+
+/* a range of work units (segments of lanes) to compute on one thread */
+typedef struct {
+    const moving_info_t *info;
+    npy_intp start;
+    npy_intp stop;
+    int fail;
+} moving_job_t;
+
+
+/*
+Compute the segments of lanes [start, stop) of a job. Each lane is split into `nseg` segments of
+consecutive results. A segment of results [r0, r1) uses the input samples
+[r0 * skip, (r1 - 1) * skip + wlen), so segments overlap by the window length.
+*/
+static void *moving_statistic_range(void *arg)
+{
+    moving_job_t *job = (moving_job_t *)arg;
+    const moving_info_t *info = job->info;
+    const int nout = info->nout, axis = info->axis;
+    const npy_intp dstep = info->dstrides[axis], rstep = info->rstrides[axis];
+
+    // double precision workspaces for strided or float32 data
+    double *xbuf = NULL, *rbuf = NULL;
+    if (!info->direct_in)
+        xbuf = (double *)malloc(info->npts * sizeof(double));
+    if (!info->direct_out)
+        rbuf = (double *)malloc(nout * info->nres * sizeof(double));
+    if ((!info->direct_in && !xbuf) || (!info->direct_out && !rbuf))
+    {
+        free(xbuf);
+        free(rbuf);
+        job->fail = 1;
         return NULL;
     }
 
-    // data pointers
-    double *dptr = (double *)PyArray_DATA(data);
-    double *rmean_ptr = (double *)PyArray_DATA(rmean);
-    // for iterating over the data
-    long res_stride = PyArray_DIM(rmean, ndim - 1);  // stride to get to the next results "column"
-    int nrepeats = PyArray_SIZE(data) / npts;  // number of repetitions to cover all the data
+    double *rptr[MOVING_MAX_OUT];
+    double *x;
 
-    for (int i = 0; i < nrepeats; ++i)
+    for (npy_intp u = job->start; u < job->stop; ++u)
     {
-        for (int j = trim_pts; j < res_stride; ++j)
+        npy_intp lane = u / info->nseg;
+        long seg = (long)(u % info->nseg);
+        long r0 = info->trim_pts * seg / info->nseg;
+        long r1 = info->trim_pts * (seg + 1) / info->nseg;
+        int last = seg == (info->nseg - 1);
+        long s0 = r0 * info->skip;
+        long n = (r1 - 1) * info->skip + info->wlen - s0;
+
+        // offsets of the lane, from its index over the non-computation axes
+        npy_intp doff = 0, roff = 0, rem = lane;
+        for (int d = info->ndim - 1; d >= 0; --d)
         {
-            rmean_ptr[j] = NPY_NAN;
+            if (d == axis)
+                continue;
+            npy_intp i = rem % info->ddims[d];
+            rem /= info->ddims[d];
+            doff += i * info->dstrides[d];
+            roff += i * info->rstrides[d];
+        }
+        const char *src = info->data + doff + s0 * dstep;
+
+        if (info->direct_in)
+        {
+            x = (double *)src;
+        } else if (info->type == NPY_FLOAT) {
+            for (long j = 0; j < n; ++j)
+                xbuf[j] = (double)*(const float *)(src + j * dstep);
+            x = xbuf;
+        } else {
+            for (long j = 0; j < n; ++j)
+                xbuf[j] = *(const double *)(src + j * dstep);
+            x = xbuf;
         }
-        mov_moments_1(&npts, dptr, &wlen, &skip, rmean_ptr);
-        dptr += npts;  // increment by number of points in last dimension
-        rmean_ptr += res_stride;
-    }
 
-    Py_XDECREF(data);
+        for (int k = 0; k < nout; ++k)
+        {
+            if (!info->res[k])
+                continue;
+            if (info->direct_out)
+                rptr[k] = (double *)(info->res[k] + roff);
+            else
+                rptr[k] = rbuf + k * info->nres;
+
+            if (last)
+            {
+                for (long j = info->trim_pts; j < info->nres; ++j)
+                    rptr[k][j] = NPY_NAN;
+            }
+            rptr[k] += r0;
+        }
+
+        // all the kernels use the same lane of data
+        for (int i = 0; i < info->nkernels; ++i)
+            info->kernels[i](&n, x, (long *)&info->wlen, (long *)&info->skip, rptr + info->offsets[i]);
 
-    return (PyObject *)rmean;
+        if (!info->direct_out)
+        {
+            long r_stop = last ? info->nres : r1;
+            for (int k = 0; k < nout; ++k)
+            {
+                if (!info->res[k])
+                    continue;
+                const double *r = rbuf + k * info->nres;
+                char *dst = info->res[k] + roff;
+                if (info->type == NPY_FLOAT)
+                {
+                    for (long j = r0; j < r_stop; ++j)
+                        *(float *)(dst + j * rstep) = (float)r[j];
+                } else {
+                    for (long j = r0; j < r_stop; ++j)
+                        *(double *)(dst + j * rstep) = r[j];
+                }
+            }
+        }
+    }
+
+    free(xbuf);
+    free(rbuf);
+    return NULL;
 }
 
 
-PyObject * moving_sd(PyObject *NPY_UNUSED(self), PyObject *args){
-    PyObject *x_;
-    long wlen, skip;
-    int trim, return_others;
+/*
+Compute moving statistics along `axis` of `x_`. Each of the `nkernels` kernels computes
+`kouts[i]` results into the result slots starting at `offsets[i]`, and `res` (of length
+MOVING_MAX_OUT) is set to the result arrays, with NULL for unused slots. Returns 0 on success,
+or -1 with an exception set.
+
+The input is not copied or transposed. Each lane (the 1D data along `axis`) is used in place
+if it is contiguous float64 data, and otherwise is gathered from its strides into a double
+precision workspace of one lane, which is shared by all the kernels. Results are C-contiguous
+arrays with the same axis order as the input, with lanes written directly if `axis` is the last
+axis, and otherwise scattered from a workspace along the result strides. float32 data is
+returned as float32.
+
+Lanes are split across `n_threads` threads, without the GIL. If there are fewer lanes than
+threads and the kernel results for a window do not depend on the previous windows
+(`exact`), lanes are also split into overlapping segments.
+*/
+static int moving_compute(PyObject *x_, long wlen, long skip, int trim, int axis, int n_threads,
+    int nkernels, const moving_kernel_t *kernels, const int *offsets, const int *kouts, int exact,
+    PyArrayObject **res)
+{
+    int type = NPY_DOUBLE;
+    if (PyArray_Check(x_) && (PyArray_TYPE((PyArrayObject *)x_) == NPY_FLOAT))
+        type = NPY_FLOAT;
 
-    if (!PyArg_ParseTuple(args, "Ollpp:moving_sd", &x_, &wlen, &skip, &trim, &return_others))
-        return NULL;
+    for (int k = 0; k < MOVING_MAX_OUT; ++k)
+        res[k] = NULL;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
+    PyArrayObject *data_ = (PyArrayObject *)PyArray_FromAny(
         x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
+        PyArray_DescrFromType(type),
         1,
         0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
+        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_ALIGNED,
         NULL
     );
+    if (!data_)
+        return -1;
+
+    // normalize the axis, raising an AxisError if out of range
+    PyArrayObject *data = (PyArrayObject *)PyArray_CheckAxis(data_, &axis, 0);
+    Py_DECREF(data_);
     if (!data)
-        return NULL;
+        return -1;
 
     // get the number of dimensions, and the shape
     int ndim = PyArray_NDIM(data);
-    npy_intp *ddims = PyArray_DIMS(data);
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(ddims));
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    if (!rdims)
+    const npy_intp *ddims = PyArray_DIMS(data);
+    long npts = ddims[axis];
+    if (wlen > npts)
     {
-        Py_XDECREF(data);
-        return NULL;
+        Py_DECREF(data);
+        PyErr_SetString(PyExc_ValueError, "Window length is larger than the computation axis.");
+        return -1;
     }
+    long trim_pts = (npts - wlen) / skip + 1;
+    npy_intp rdims[NPY_MAXDIMS];
     // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
+    for (int i = 0; i < ndim; ++i)
     {
         rdims[i] = ddims[i];
     }
     // dimension of the roll
     if (trim)
     {
-        rdims[ndim - 1] = trim_pts;
+        rdims[axis] = trim_pts;
     } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
+        rdims[axis] = (npts - 1) / skip + 1;
     }
 
-    PyArrayObject *rsd   = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rmean = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-
-    if ((!rmean) || (!rsd))
+    moving_info_t info;
+    info.nkernels = nkernels;
+    info.nout = 0;
+    int fail = 0;
+    for (int i = 0; i < nkernels; ++i)
     {
-        free(rdims);  /* make sure it gets freed */
-        Py_XDECREF(data);
-        Py_XDECREF(rmean);
-        Py_XDECREF(rsd);
-        return NULL;
-    }
-
-    // data pointers
-    double *dptr      = (double *)PyArray_DATA(data);
-    double *rmean_ptr = (double *)PyArray_DATA(rmean);
-    double *rsd_ptr   = (double *)PyArray_DATA(rsd);
-    // for iterating over the data
-    long stride = ddims[ndim-1];  // stride to get to the next computation "column"
-    long res_stride = rdims[ndim-1];  // stride to get to the next results "column"
-    int nrepeats = PyArray_SIZE(data) / stride;  // number of repetitions to cover all the data
-    // has to be freed down here since its used by res_stride
-    free(rdims);
-
-    for (int i = 0; i < nrepeats; ++i)
-    {
-        for (int j = trim_pts; j < res_stride; ++j)
+        info.kernels[i] = kernels[i];
+        info.offsets[i] = offsets[i];
+        for (int k = offsets[i]; k < (offsets[i] + kouts[i]); ++k)
         {
-            rmean_ptr[j] = NPY_NAN;
+            res[k] = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, type, 0);
+            fail |= !res[k];
         }
-        for (int j = trim_pts; j < res_stride; ++j)
+        if ((offsets[i] + kouts[i]) > info.nout)
+            info.nout = offsets[i] + kouts[i];
+    }
+    if (fail)
+    {
+        Py_DECREF(data);
+        for (int k = 0; k < MOVING_MAX_OUT; ++k)
+            Py_CLEAR(res[k]);
+        return -1;
+    }
+
+    info.type = type;
+    info.ndim = ndim;
+    info.axis = axis;
+    info.ddims = ddims;
+    info.dstrides = PyArray_STRIDES(data);
+    info.rstrides = NULL;
+    info.data = PyArray_BYTES(data);
+    for (int k = 0; k < MOVING_MAX_OUT; ++k)
+    {
+        info.res[k] = res[k] ? PyArray_BYTES(res[k]) : NULL;
+        // all the results have the same (C-contiguous) strides
+        if (res[k])
+            info.rstrides = PyArray_STRIDES(res[k]);
+    }
+    info.npts = npts;
+    info.wlen = wlen;
+    info.skip = skip;
+    info.trim_pts = trim_pts;
+    info.nres = rdims[axis];
+    info.direct_in = (type == NPY_DOUBLE) && (info.dstrides[axis] == PyArray_ITEMSIZE(data));
+    info.direct_out = (type == NPY_DOUBLE) && (axis == (ndim - 1));
+
+    npy_intp nlanes = PyArray_SIZE(data) / npts;
+    if (n_threads < 1)
+        n_threads = 1;
+    // segments per lane, keeping each segment at least 2 windows long
+    info.nseg = 1;
+    if (exact && (nlanes < n_threads))
+    {
+        info.nseg = (long)((n_threads + nlanes - 1) / nlanes);
+        if (info.nseg > npts / (2 * wlen))
+            info.nseg = npts / (2 * wlen);
+        if (info.nseg > trim_pts)
+            info.nseg = trim_pts;
+        if (info.nseg < 1)
+            info.nseg = 1;
+    }
+    npy_intp nunits = nlanes * info.nseg;
+    if (n_threads > nunits)
+        n_threads = (int)nunits;
+
+    if (nunits > 0)
+    {
+        moving_job_t *jobs = (moving_job_t *)malloc(n_threads * sizeof(moving_job_t));
+        if (!jobs)
         {
-            rsd_ptr[j] = NPY_NAN;
+            fail = 1;
+        } else {
+            for (int k = 0; k < n_threads; ++k)
+            {
+                jobs[k].info = &info;
+                jobs[k].start = nunits * k / n_threads;
+                jobs[k].stop = nunits * (k + 1) / n_threads;
+                jobs[k].fail = 0;
+            }
+
+            Py_BEGIN_ALLOW_THREADS
+            run_parallel(moving_statistic_range, jobs, sizeof(moving_job_t), n_threads);
+            Py_END_ALLOW_THREADS
+
+            for (int k = 0; k < n_threads; ++k)
+                fail |= jobs[k].fail;
+            free(jobs);
         }
-        mov_moments_2(&stride, dptr, &wlen, &skip, rmean_ptr, rsd_ptr);
-        dptr += stride;
-        rmean_ptr += res_stride;
-        rsd_ptr += res_stride;
     }
-    
-    Py_XDECREF(data);
 
-    if (return_others)
-    {
-        return Py_BuildValue(
-            "NN",  /* dont want to increase ref count */
-            (PyObject *)rsd,
-            (PyObject *)rmean
-        );
-    }
-    else
+    Py_DECREF(data);
+
+    if (fail)
     {
-        Py_XDECREF(rmean);
-        return (PyObject *)rsd;
+        for (int k = 0; k < MOVING_MAX_OUT; ++k)
+            Py_CLEAR(res[k]);
+        PyErr_NoMemory();
+        return -1;
     }
-}
 
+    return 0;
+}
 
-PyObject * moving_skewness(PyObject *NPY_UNUSED(self), PyObject *args){
-    PyObject *x_;
-    long wlen, skip;
-    int trim, return_others;
 
-    if (!PyArg_ParseTuple(args, "Ollpp:moving_skewness", &x_, &wlen, &skip, &trim, &return_others))
-        return NULL;
+/*
+Compute a moving statistic along `axis` of `x_`. The kernel computes `nout` results, in order
+of the lower moments first (ie mean, sd, skewness). The last result is returned, along with
+the others in reverse order if `return_others`.
+*/
+static PyObject *moving_statistic(PyObject *x_, long wlen, long skip, int trim, int axis,
+    int n_threads, int nout, int return_others, int exact, moving_kernel_t kernel)
+{
+    PyArrayObject *res[MOVING_MAX_OUT];
+    const int offset = 0;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-        x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
-        1,
-        0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-        NULL
-    );
-    if (!data)
+    if (moving_compute(x_, wlen, skip, trim, axis, n_threads, 1, &kernel, &offset, &nout, exact, res))
         return NULL;
 
-    // get the number of dimensions, and the shape
-    int ndim = PyArray_NDIM(data);
-    npy_intp *ddims = PyArray_DIMS(data);
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(ddims));
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    if (!rdims)
-    {
-        Py_XDECREF(data);
-        return NULL;
-    }
-    // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
-    {
-        rdims[i] = ddims[i];
-    }
-    // dimension of the roll
-    if (trim)
+    if ((nout == 1) || !return_others)
     {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
+        for (int k = 0; k < (nout - 1); ++k)
+            Py_XDECREF(res[k]);
+        return (PyObject *)res[nout - 1];
     }
 
-    PyArrayObject *rsd   = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rmean = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rskew = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-
-    if ((!rmean) || (!rsd) || (!rskew))
+    PyObject *ret = PyTuple_New(nout);
+    if (!ret)
     {
-        free(rdims);  /* make sure it gets freed */
-        Py_XDECREF(data);
-        Py_XDECREF(rskew);
-        Py_XDECREF(rsd);
-        Py_XDECREF(rmean);
+        for (int k = 0; k < nout; ++k)
+            Py_XDECREF(res[k]);
         return NULL;
     }
+    for (int k = 0; k < nout; ++k)
+        PyTuple_SET_ITEM(ret, k, (PyObject *)res[nout - 1 - k]);  /* steals the reference */
 
-    // data pointers
-    double *dptr      = (double *)PyArray_DATA(data);
-    double *rmean_ptr = (double *)PyArray_DATA(rmean);
-    double *rsd_ptr   = (double *)PyArray_DATA(rsd);
-    double *rskew_ptr = (double *)PyArray_DATA(rskew);
-    // for iterating over the data
-    long stride = ddims[ndim-1];  // stride to get to the next computation "column"
-    long res_stride = rdims[ndim-1];  // stride to get to the next results "column"
-    int nrepeats = PyArray_SIZE(data) / stride;  // number of repetitions to cover all the data
-    // has to be freed down here since its used by res_stride
-    free(rdims);
-
-    for (int i = 0; i < nrepeats; ++i)
-    {
-        // splitting up so we are accessing contiguous memory each time
-        for (int j = trim_pts; j < res_stride; ++j)
-        {
-            rmean_ptr[j] = NPY_NAN;
-            rsd_ptr[j] = NPY_NAN;
-            rskew_ptr[j] = NPY_NAN;
-        }
-        moving_moments_3(&stride, dptr, &wlen, &skip, rmean_ptr, rsd_ptr, rskew_ptr);
-        dptr += stride;
-        rmean_ptr += res_stride;
-        rsd_ptr += res_stride;
-        rskew_ptr += res_stride;
-    }
-    
-    Py_XDECREF(data);
-
-    if (return_others)
-    {
-        return Py_BuildValue(
-            "NNN",  /* dont want to increase ref count */
-            (PyObject *)rskew,
-            (PyObject *)rsd,
-            (PyObject *)rmean
-        );
-    }
-    else
-    {
-        Py_XDECREF(rmean);
-        Py_XDECREF(rsd);
-        return (PyObject *)rskew;
-    }
+    return ret;
 }
 
 
-PyObject * moving_kurtosis(PyObject *NPY_UNUSED(self), PyObject *args){
+PyObject * moving_mean(PyObject *NPY_UNUSED(self), PyObject *args){
     PyObject *x_;
     long wlen, skip;
-    int trim, return_others;
+    int trim, axis, n_threads = 1;
 
-    if (!PyArg_ParseTuple(args, "Ollpp:moving_kurtosis", &x_, &wlen, &skip, &trim, &return_others))
+    if (!PyArg_ParseTuple(args, "Ollpi|i:moving_mean", &x_, &wlen, &skip, &trim, &axis, &n_threads))
         return NULL;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-        x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
-        1,
-        0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-        NULL
-    );
-    if (!data) return NULL;
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 1, 0, 0, kernel_mean);
+}
 
-    // get the number of dimensions, and the shape
-    int ndim = PyArray_NDIM(data);
-    npy_intp *ddims = PyArray_DIMS(data);
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(ddims));
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    if (!rdims)
-    {
-        Py_XDECREF(data);
-        return NULL;
-    }
-    // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
-    {
-        rdims[i] = ddims[i];
-    }
-    // dimension of the roll
-    if (trim)
-    {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
-    }
 
-    PyArrayObject *rsd   = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rmean = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rskew = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    PyArrayObject *rkurt = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
+PyObject * moving_sd(PyObject *NPY_UNUSED(self), PyObject *args){
+    PyObject *x_;
+    long wlen, skip;
+    int trim, axis, return_others, n_threads = 1;
 
-    if (!rmean || !rsd || !rskew || !rkurt)
-    {
-        free(rdims);  /* make sure it gets freed */
-        Py_XDECREF(data);
-        Py_XDECREF(rkurt);
-        Py_XDECREF(rskew);
-        Py_XDECREF(rsd);
-        Py_XDECREF(rmean);
+    if (!PyArg_ParseTuple(args, "Ollpip|i:moving_sd", &x_, &wlen, &skip, &trim, &axis, &return_others, &n_threads))
         return NULL;
-    }
 
-    // data pointers
-    double *dptr      = (double *)PyArray_DATA(data);
-    double *rmean_ptr = (double *)PyArray_DATA(rmean);
-    double *rsd_ptr   = (double *)PyArray_DATA(rsd);
-    double *rskew_ptr = (double *)PyArray_DATA(rskew);
-    double *rkurt_ptr = (double *)PyArray_DATA(rkurt);
-    // for iterating over the data
-    long stride = ddims[ndim-1];  // stride to get to the next computation "column"
-    long res_stride = rdims[ndim-1];  // stride to get to the next results "column"
-    int nrepeats = PyArray_SIZE(data) / stride;  // number of repetitions to cover all the data
-    // has to be freed down here since its used by res_stride
-    free(rdims);
-
-    for (int i = 0; i < nrepeats; ++i)
-    {
-        for (int j = trim_pts; j < res_stride; ++j)
-        {
-            rmean_ptr[j] = NPY_NAN;
-            rsd_ptr[j] = NPY_NAN;
-            rskew_ptr[j] = NPY_NAN;
-            rkurt_ptr[j] = NPY_NAN;
-        }
-        moving_moments_4(&stride, dptr, &wlen, &skip, rmean_ptr, rsd_ptr, rskew_ptr, rkurt_ptr);
-        dptr += stride;
-        rmean_ptr += res_stride;
-        rsd_ptr += res_stride;
-        rskew_ptr += res_stride;
-        rkurt_ptr += res_stride;
-    }
-    
-    Py_XDECREF(data);
-
-    if (return_others)
-    {
-        return Py_BuildValue(
-            "NNNN",  /* dont want to increase ref count */
-            (PyObject *)rkurt,
-            (PyObject *)rskew,
-            (PyObject *)rsd,
-            (PyObject *)rmean
-        );
-    }
-    else
-    {
-        Py_XDECREF(rmean);
-        Py_XDECREF(rsd);
-        Py_XDECREF(rskew);
-        return (PyObject *)rkurt;
-    }
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 2, return_others, 0, kernel_sd);
 }
 
 
-PyObject * moving_median(PyObject *NPY_UNUSED(self), PyObject *args)
-{
+PyObject * moving_skewness(PyObject *NPY_UNUSED(self), PyObject *args){
     PyObject *x_;
     long wlen, skip;
-    int trim;
+    int trim, axis, return_others, n_threads = 1;
 
-    if (!PyArg_ParseTuple(args, "Ollp:moving_median", &x_, &wlen, &skip, &trim)) return NULL;
+    if (!PyArg_ParseTuple(args, "Ollpip|i:moving_skewness", &x_, &wlen, &skip, &trim, &axis, &return_others, &n_threads))
+        return NULL;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-      x_,
-      PyArray_DescrFromType(NPY_DOUBLE),
-      1,
-      0,
-      NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-      NULL
-    );
-    if (!data) return NULL;
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 3, return_others, 0, kernel_skewness);
+}
 
-    // get the number of dimensions and the shape
-    int ndim = PyArray_NDIM(data);
-    const npy_intp *ddims = PyArray_DIMS(data);
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(npy_intp));
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
 
-    // create the return shape
-    for (int i = 0; i < (ndim - 1); ++i)
-    {
-        rdims[i] = ddims[i];
-    }
-    // dimension of the roll
-    if (trim)
-    {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
-    }
+PyObject * moving_kurtosis(PyObject *NPY_UNUSED(self), PyObject *args){
+    PyObject *x_;
+    long wlen, skip;
+    int trim, axis, return_others, n_threads = 1;
 
-    // allocate the return
-    PyArrayObject *rmed = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    free(rdims);  // free the return dimensions array
-    if (!rmed)
-    {
-        Py_XDECREF(data);
-        Py_XDECREF(rmed);
+    if (!PyArg_ParseTuple(args, "Ollpip|i:moving_kurtosis", &x_, &wlen, &skip, &trim, &axis, &return_others, &n_threads))
         return NULL;
-    }
 
-    // data pointers
-    double *dptr = (double *)PyArray_DATA(data);
-    double *rptr = (double *)PyArray_DATA(rmed);
-    // for iterating over the data
-    long res_stride = PyArray_DIM(rmed, ndim - 1);  // stride to get to the next results column
-    int nrepeats = PyArray_SIZE(data) / npts;  // number of "columns"
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 4, return_others, 0, kernel_kurtosis);
+}
 
-    // iterate
-    for (int i = 0; i < nrepeats; ++i)
-    {
-        for (int j = trim_pts; j < res_stride; ++j)
-        {
-            rptr[j] = NPY_NAN;
-        }
-        fmoving_median(&npts, dptr, &wlen, &skip, rptr);
-        dptr += npts;  // increment by number of points in the last dimension
-        rptr += res_stride;
-    }
 
-    Py_XDECREF(data);
+PyObject * moving_median(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    PyObject *x_;
+    long wlen, skip;
+    int trim, axis, n_threads = 1;
+
+    if (!PyArg_ParseTuple(args, "Ollpi|i:moving_median", &x_, &wlen, &skip, &trim, &axis, &n_threads))
+        return NULL;
 
-    return (PyObject *)rmed;
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 1, 0, 1, kernel_median);
 }
 
 
@@ -491,191 +487,199 @@ PyObject * moving_max(PyObject *NPY_UNUSED(self), PyObject *args)
 {
     PyObject *x_;
     long wlen, skip;
-    int trim;
+    int trim, axis, n_threads = 1;
 
-    if (!PyArg_ParseTuple(args, "Ollp:moving_max", &x_, &wlen, &skip, &trim))
+    if (!PyArg_ParseTuple(args, "Ollpi|i:moving_max", &x_, &wlen, &skip, &trim, &axis, &n_threads))
         return NULL;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-        x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
-        1,
-        0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-        NULL
-    );
-    if (!data)
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 1, 0, 1, kernel_max);
+}
+
+
+PyObject * moving_min(PyObject *NPY_UNUSED(self), PyObject *args)
+{
+    PyObject *x_;
+    long wlen, skip;
+    int trim, axis, n_threads = 1;
+
+    if (!PyArg_ParseTuple(args, "Ollpi|i:moving_min", &x_, &wlen, &skip, &trim, &axis, &n_threads))
         return NULL;
 
-    // get the number of dimensions, and the shape
-    int ndim = PyArray_NDIM(data);
-    const npy_intp *ddims = PyArray_DIMS(data);
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(npy_intp));
-    if (!rdims)
-    {
-        Py_XDECREF(data);
+    return moving_statistic(x_, wlen, skip, trim, axis, n_threads, 1, 0, 1, kernel_min);
+}
+
+
+/* result slots of the fused statistics, with the moments first */
+enum {STAT_MEAN, STAT_SD, STAT_SKEWNESS, STAT_KURTOSIS, STAT_MEDIAN, STAT_MAX, STAT_MIN};
+
+
+PyObject * moving_stats(PyObject *NPY_UNUSED(self), PyObject *args){
+    PyObject *x_;
+    long wlen, skip;
+    int trim, axis, stats, n_threads = 1;
+
+    if (!PyArg_ParseTuple(args, "Ollpii|i:moving_stats", &x_, &wlen, &skip, &trim, &axis, &stats, &n_threads))
         return NULL;
-    }
-    // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
+
+    moving_kernel_t kernels[MOVING_MAX_OUT];
+    int offsets[MOVING_MAX_OUT], kouts[MOVING_MAX_OUT];
+    int nkernels = 0;
+
+    // the highest moment requested gives all the lower moments as well
+    static const moving_kernel_t moments[4] = {kernel_mean, kernel_sd, kernel_skewness, kernel_kurtosis};
+    for (int k = STAT_KURTOSIS; k >= STAT_MEAN; --k)
     {
-        rdims[i] = ddims[i];
+        if (stats & (1 << k))
+        {
+            kernels[nkernels] = moments[k];
+            offsets[nkernels] = STAT_MEAN;
+            kouts[nkernels++] = k + 1;
+            break;
+        }
     }
-    // dimension of the roll
-    if (trim)
+    // the extrema and median results do not depend on the previous windows
+    int exact = nkernels == 0;
+
+    static const moving_kernel_t others[3] = {kernel_median, kernel_max, kernel_min};
+    for (int k = STAT_MEDIAN; k <= STAT_MIN; ++k)
     {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
+        if (stats & (1 << k))
+        {
+            kernels[nkernels] = others[k - STAT_MEDIAN];
+            offsets[nkernels] = k;
+            kouts[nkernels++] = 1;
+        }
     }
 
-    PyArrayObject *rmax = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    free(rdims);
+    PyArrayObject *res[MOVING_MAX_OUT];
+    if (moving_compute(x_, wlen, skip, trim, axis, n_threads, nkernels, kernels, offsets, kouts, exact, res))
+        return NULL;
 
-    if (!rmax)
+    PyObject *ret = PyTuple_New(MOVING_MAX_OUT);
+    if (!ret)
     {
-        Py_XDECREF(data);
-        Py_XDECREF(rmax);
+        for (int k = 0; k < MOVING_MAX_OUT; ++k)
+            Py_XDECREF(res[k]);
         return NULL;
     }
-
-    // data pointers
-    double *dptr = (double *)PyArray_DATA(data);
-    double *rmax_ptr = (double *)PyArray_DATA(rmax);
-    // for iterating over the data
-    long res_stride = PyArray_DIM(rmax, ndim - 1);  // stride to get to the next results column
-    int nrepeats = PyArray_SIZE(data) / npts;  // # of repetitions to cover all the data
-
-    for (int i = 0; i < nrepeats; ++i)
+    for (int k = 0; k < MOVING_MAX_OUT; ++k)
     {
-        for (int j = trim_pts; j < res_stride; ++j)
+        // lower moments are computed either way, but only requested statistics are returned
+        if (res[k] && (stats & (1 << k)))
         {
-            rmax_ptr[j] = NPY_NAN;
+            PyTuple_SET_ITEM(ret, k, (PyObject *)res[k]);  /* steals the reference */
+        } else {
+            Py_XDECREF(res[k]);
+            Py_INCREF(Py_None);
+            PyTuple_SET_ITEM(ret, k, Py_None);
         }
-        moving_max_c(&npts, dptr, &wlen, &skip, rmax_ptr);
-        dptr += npts; // increment by number of points in last dimension
-        rmax_ptr += res_stride;
     }
 
-    Py_XDECREF(data);
-
-    return (PyObject *)rmax;
+    return ret;
 }
 
 
-PyObject * moving_min(PyObject *NPY_UNUSED(self), PyObject *args)
-{
+PyObject * moving_moments_update(PyObject *NPY_UNUSED(self), PyObject *args){
     PyObject *x_;
-    long wlen, skip;
-    int trim;
+    PyArrayObject *m;
+    long wlen, skip, g, nw, order;
 
-    if (!PyArg_ParseTuple(args, "Ollp:moving_min", &x_, &wlen, &skip, &trim))
+    if (!PyArg_ParseTuple(args, "OO!lllll:moving_moments_update", &x_, &PyArray_Type, &m, &wlen, &skip, &g, &nw, &order))
         return NULL;
 
-    PyArrayObject *data = (PyArrayObject *)PyArray_FromAny(
-        x_,
-        PyArray_DescrFromType(NPY_DOUBLE),
-        1,
-        0,
-        NPY_ARRAY_ENSUREARRAY | NPY_ARRAY_CARRAY_RO,
-        NULL
-    );
+    PyArrayObject *data = (PyArrayObject *)PyArray_FROMANY(x_, NPY_DOUBLE, 2, 2, NPY_ARRAY_IN_ARRAY);
     if (!data)
         return NULL;
 
-    // get the number of dimensions, and the shape
-    int ndim = PyArray_NDIM(data);
-    const npy_intp *ddims = PyArray_DIMS(data);
-    long npts = ddims[ndim - 1];
-    long trim_pts = (npts - wlen) / skip + 1;
-    npy_intp *rdims = (npy_intp *)malloc(ndim * sizeof(npy_intp));
-    if (!rdims)
+    npy_intp nlanes = PyArray_DIM(data, 0);
+    long n = PyArray_DIM(data, 1);
+
+    if ((order < 1) || (order > 4) || (wlen < 1) || (skip < 1))
     {
-        Py_XDECREF(data);
+        Py_DECREF(data);
+        PyErr_SetString(PyExc_ValueError, "Invalid moment order, window length, or skip.");
         return NULL;
     }
-    // create return shape
-    for (int i = 0; i < (ndim - 1); ++i)
+    // the running sums are updated in place
+    if ((PyArray_TYPE(m) != NPY_DOUBLE) || !PyArray_ISCARRAY(m) || (PyArray_NDIM(m) != 3)
+        || (PyArray_DIM(m, 0) != nlanes) || (PyArray_DIM(m, 1) != order) || (PyArray_DIM(m, 2) != wlen))
     {
-        rdims[i] = ddims[i];
-    }
-    // dimension of the roll
-    if (trim)
-    {
-        rdims[ndim - 1] = trim_pts;
-    } else {
-        rdims[ndim - 1] = (npts - 1) / skip + 1;
+        Py_DECREF(data);
+        PyErr_SetString(PyExc_ValueError, "Running sums must be a writeable C-contiguous float64 array of shape (lanes, order, wlen).");
+        return NULL;
     }
 
-    PyArrayObject *rmin = (PyArrayObject *)PyArray_EMPTY(ndim, rdims, NPY_DOUBLE, 0);
-    free(rdims);
+    // windows completed by the new samples
+    long nres = (g + n) >= wlen ? (g + n - wlen) / skip + 1 - nw : 0;
+    if (nres < 0)
+        nres = 0;
 
-    if (!rmin)
+    npy_intp rdims[3] = {nlanes, order, nres};
+    PyArrayObject *res = (PyArrayObject *)PyArray_EMPTY(3, rdims, NPY_DOUBLE, 0);
+    if (!res)
     {
-        Py_XDECREF(data);
-        Py_XDECREF(rmin);
+        Py_DECREF(data);
         return NULL;
     }
 
-    // data pointers
-    double *dptr = (double *)PyArray_DATA(data);
-    double *rmin_ptr = (double *)PyArray_DATA(rmin);
-    // for iterating over the data
-    long res_stride = PyArray_DIM(rmin, ndim - 1);  // stride to get to the next results column
-    int nrepeats = PyArray_SIZE(data) / npts;  // # of repetitions to cover all the data
+    double *x = (double *)PyArray_DATA(data);
+    double *msum = (double *)PyArray_DATA(m);
+    double *rptr = (double *)PyArray_DATA(res);
 
-    for (int i = 0; i < nrepeats; ++i)
+    Py_BEGIN_ALLOW_THREADS
+    for (npy_intp k = 0; k < nlanes; ++k)
     {
-        for (int j = trim_pts; j < res_stride; ++j)
-        {
-            rmin_ptr[j] = NPY_NAN;
-        }
-        moving_min_c(&npts, dptr, &wlen, &skip, rmin_ptr);
-        dptr += npts; // increment by number of points in last dimension
-        rmin_ptr += res_stride;
+        stream_moments(&n, x + k * n, &wlen, &skip, &g, &nw, &order, &nres,
+            msum + k * order * wlen, rptr + k * order * nres);
     }
+    Py_END_ALLOW_THREADS
 
-    Py_XDECREF(data);
-
-    return (PyObject *)rmin;
+    Py_DECREF(data);
+    return (PyObject *)res;
 }
 
 
-static const char rmean_doc[] = "moving_mean(a, wlen, skip)\n\n"
+static const char rmean_doc[] = "moving_mean(a, wlen, skip, trim, axis, n_threads=1)\n\n"
 "Compute the rolling mean over windows of length `wlen` with `skip` samples between window starts.\n\n"
 "Paramters\n"
 "---------\n"
 "a : array-like\n"
-"    Array of data to compute the rolling mean for. Computation axis is the last axis.\n"
+"    Array of data to compute the rolling mean for. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
 "trim : bool\n"
-"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rmean : numpy.ndarray\n"
 "    Rolling mean.";
 
-static const char rsd_doc[] = "moving_sd(a, wlen, skip, return_previous)\n\n"
+static const char rsd_doc[] = "moving_sd(a, wlen, skip, trim, axis, return_previous, n_threads=1)\n\n"
 "Compute the rolling standard deviation over windows of length `wlen` with `skip` samples "
 "between window starts.  Because previous rolling moments have to be computed as part of "
 "the process, they are availble to return as well.\n\n"
 "Paramters\n"
 "---------\n"
 "a : array-like\n"
-"    Array of data to compute the rolling standar deviation for. Computation axis is the last axis.\n"
+"    Array of data to compute the rolling standar deviation for. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
 "trim : bool\n"
-"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
 "return_previous : bool\n"
-"    Return the previous rolling moments."
+"    Return the previous rolling moments.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rsd : numpy.ndarray\n"
@@ -683,22 +687,26 @@ static const char rsd_doc[] = "moving_sd(a, wlen, skip, return_previous)\n\n"
 "rmean : numpy.ndarray, optional\n"
 "    Rolling mean. Only returned if `return_previous` is `True`.";
 
-static const char rskew_doc[] = "moving_skewness(a, wlen, skip, return_previous)\n\n"
+static const char rskew_doc[] = "moving_skewness(a, wlen, skip, trim, axis, return_previous, n_threads=1)\n\n"
 "Compute the rolling skewness over windows of length `wlen` with `skip` samples "
 "between window starts.  Because previous rolling moments have to be computed as part of "
 "the process, they are availble to return as well.\n\n"
 "Paramters\n"
 "---------\n"
 "a : array-like\n"
-"    Array of data to compute the rolling skewness for. Computation axis is the last axis.\n"
+"    Array of data to compute the rolling skewness for. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
 "trim : bool\n"
-"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
 "return_previous : bool\n"
-"    Return the previous rolling moments."
+"    Return the previous rolling moments.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rskew : numpy.ndarray\n"
@@ -708,22 +716,26 @@ static const char rskew_doc[] = "moving_skewness(a, wlen, skip, return_previous)
 "rmean : numpy.ndarray, optional\n"
 "    Rolling mean. Only returned if `return_previous` is `True`.";
 
-static const char rkurt_doc[] = "moving_kurtosis(a, wlen, skip, return_previous)\n\n"
+static const char rkurt_doc[] = "moving_kurtosis(a, wlen, skip, trim, axis, return_previous, n_threads=1)\n\n"
 "Compute the rolling kurtosis over windows of length `wlen` with `skip` samples "
 "between window starts.  Because previous rolling moments have to be computed as part of "
 "the process, they are availble to return as well.\n\n"
 "Parameters\n"
 "---------\n"
 "a : array-like\n"
-"    Array of data to compute the rolling kurtosis for. Computation axis is the last axis.\n"
+"    Array of data to compute the rolling kurtosis for. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
 "trim : bool\n"
-"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
 "return_previous : bool\n"
-"    Return the previous rolling moments."
+"    Return the previous rolling moments.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rkurt : numpy.ndarray\n"
@@ -735,56 +747,122 @@ static const char rkurt_doc[] = "moving_kurtosis(a, wlen, skip, return_previous)
 "rmean : numpy.ndarray, optional\n"
 "    Rolling mean. Only returned if `return_previous` is `True`.";
 
-static const char rmed_doc[] = "moving_median(a, wlen, skip)\n\n"
+static const char rmed_doc[] = "moving_median(a, wlen, skip, trim, axis, n_threads=1)\n\n"
 "Compute the rolling median over windows of length `wlen` with `skip` samples "
 "between window starts.\n\n"
 "Parameters\n"
 "----------\n"
 "a : array-like\n"
-"    Array of data to compute rolling median on. Computation axis is the last axis.\n"
+"    Array of data to compute rolling median on. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
 "trim : bool\n"
-"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rmed : numpy.ndarray\n"
 "    Rolling median.";
 
-static const char rmax_doc[] = "moving_max(a, wlen, skip)\n\n"
+static const char rmax_doc[] = "moving_max(a, wlen, skip, trim, axis, n_threads=1)\n\n"
 "Compute the rolling maximum over windows of length `wlen` with `skip` samples "
 "between window starts.\n\n"
 "Parameters\n"
 "----------\n"
 "a : array-like\n"
-"    Array of data to compute rolling max on. Computation axis is the last axis.\n"
+"    Array of data to compute rolling max on. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
+"trim : bool\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rmax : numpy.ndarray\n"
 "    Rolling max.";
 
-static const char rmin_doc[] = "moving_min(a, wlen, skip)\n\n"
+static const char rmin_doc[] = "moving_min(a, wlen, skip, trim, axis, n_threads=1)\n\n"
 "Compute the rolling minimum over windows of length `wlen` with `skip` samples "
 "between window starts.\n\n"
 "Parameters\n"
 "----------\n"
 "a : array-like\n"
-"    Array of data to compute rolling min on. Computation axis is the last axis.\n"
+"    Array of data to compute rolling min on. Computed along `axis`.\n"
 "wlen : int\n"
 "    Window size in samples.\n"
 "skip : int\n"
 "    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
+"trim : bool\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistic along. Results are C-contiguous.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
 "Returns\n"
 "-------\n"
 "rmin : numpy.ndarray\n"
 "    Rolling min.";
 
+static const char rstats_doc[] = "moving_stats(a, wlen, skip, trim, axis, stats, n_threads=1)\n\n"
+"Compute multiple rolling statistics over windows of length `wlen` with `skip` samples "
+"between window starts, with one pass over each lane of the data.\n\n"
+"Parameters\n"
+"----------\n"
+"a : array-like\n"
+"    Array of data to compute the rolling statistics for. Computed along `axis`.\n"
+"wlen : int\n"
+"    Window size in samples.\n"
+"skip : int\n"
+"    Samples between window starts. `skip=wlen` would result in non-overlapping sequential windows.\n"
+"trim : bool\n"
+"    Trim the ends of the result, where a value cannot be calculated. If False, these values will be set to NaN. Default is True.\n"
+"axis : int\n"
+"    Axis to compute the statistics along. Results are C-contiguous.\n"
+"stats : int\n"
+"    Bit flags of the statistics to compute, with bits 0-6 for the mean, sd, skewness, kurtosis, median, max, and min.\n"
+"n_threads : int, optional\n"
+"    Number of threads to compute with, without the GIL. Default is 1.\n\n"
+"Returns\n"
+"-------\n"
+"rstats : tuple\n"
+"    Rolling mean, sd, skewness, kurtosis, median, max, and min. Statistics that were not requested are None.";
+
+static const char rupdate_doc[] = "moving_moments_update(x, m, wlen, skip, g, nw, order)\n\n"
+"Continue the rolling moments over a new block of samples, with the same results as computing "
+"on all the samples at once.\n\n"
+"Parameters\n"
+"----------\n"
+"x : numpy.ndarray\n"
+"    (lanes, n) array of new samples.\n"
+"m : numpy.ndarray\n"
+"    (lanes, order, wlen) float64 array of the running sums of the last `wlen` samples before `x`. "
+"Updated in place.\n"
+"wlen : int\n"
+"    Window size in samples.\n"
+"skip : int\n"
+"    Samples between window starts.\n"
+"g : int\n"
+"    Number of samples before `x`.\n"
+"nw : int\n"
+"    Number of windows already computed.\n"
+"order : int\n"
+"    Highest moment to compute, from 1 (mean) to 4 (kurtosis).\n\n"
+"Returns\n"
+"-------\n"
+"rmoments : numpy.ndarray\n"
+"    (lanes, order, nres) array of the rolling mean, sd, skewness, and kurtosis for the windows "
+"completed by `x`.";
+
 static struct PyMethodDef methods[] = {
     {"moving_mean",   moving_mean,   1, rmean_doc},  // last is the docstring
     {"moving_sd",   moving_sd,   1, rsd_doc},  // last is the docstring
@@ -793,6 +871,8 @@ static struct PyMethodDef methods[] = {
     {"moving_median", moving_median, 1, rmed_doc},
     {"moving_max", moving_max, 1, rmax_doc},
     {"moving_min", moving_min, 1, rmin_doc},
+    {"moving_stats", moving_stats, 1, rstats_doc},
+    {"moving_moments_update", moving_moments_update, 1, rupdate_doc},
     {NULL, NULL, 0, NULL}          /* sentinel */
 };
 
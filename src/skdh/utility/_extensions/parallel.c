@@ -0,0 +1,46 @@
+// Copyright (c) 2021. Pfizer Inc. All rights reserved.
+#include "parallel.h"
+
+#ifndef _WIN32
+#include <pthread.h>
+#define MOVING_THREADS
+#endif
+
+
+/*
+Run `fn` on each of the `n_jobs` jobs, each on its own thread. `jobs` is an array of job
+structures of `job_size` bytes. The last job runs on the calling thread, as do any jobs that a
+thread could not be started for. Jobs run serially on platforms without pthreads.
+*/
+void run_parallel(void *(*fn)(void *), void *jobs, size_t job_size, int n_jobs)
+{
+    char *job = (char *)jobs;
+
+    if (n_jobs < 1)
+        return;
+#ifdef MOVING_THREADS
+    pthread_t *threads = (pthread_t *)malloc(n_jobs * sizeof(pthread_t));
+    int *started = (int *)calloc(n_jobs, sizeof(int));
+    if (threads && started)
+    {
+        for (int k = 0; k < n_jobs - 1; ++k)
+            started[k] = pthread_create(&threads[k], NULL, fn, job + k * job_size) == 0;
+    }
+    for (int k = 0; k < n_jobs - 1; ++k)
+    {
+        if (!threads || !started || !started[k])
+            fn(job + k * job_size);
+    }
+    fn(job + (n_jobs - 1) * job_size);
+    for (int k = 0; k < n_jobs - 1; ++k)
+    {
+        if (threads && started && started[k])
+            pthread_join(threads[k], NULL);
+    }
+    free(threads);
+    free(started);
+#else
+    for (int k = 0; k < n_jobs; ++k)
+        fn(job + k * job_size);
+#endif
+}
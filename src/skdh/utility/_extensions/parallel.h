@@ -0,0 +1,9 @@
+#ifndef PARALLEL_H_  // guard
+#define PARALLEL_H_
+
+#include <stdlib.h>
+
+// run each job on its own thread
+void run_parallel(void *(*fn)(void *), void *jobs, size_t job_size, int n_jobs);
+
+#endif  // PARALLEL_H_
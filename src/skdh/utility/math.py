@@ -6,7 +6,20 @@ Copyright (c) 2021. Pfizer Inc. All rights reserved.
 """
 from warnings import warn
 
-from numpy import moveaxis, ascontiguousarray, full, nan, isnan
+from numpy import (
+    moveaxis,
+    ascontiguousarray,
+    asarray,
+    concatenate,
+    zeros,
+    empty,
+    prod,
+    full,
+    nan,
+    isnan,
+    float32,
+    float64,
+)
 
 from skdh.utility import _extensions
 from skdh.utility.windowing import get_windowed_view
@@ -20,10 +33,21 @@ __all__ = [
     "moving_median",
     "moving_max",
     "moving_min",
+    "moving_stats",
+    "moving_median_block_mean",
+    "MovingStats",
 ]
 
+# order of the statistics returned by the fused extension
+_STATS = ("mean", "sd", "skewness", "kurtosis", "median", "max", "min")
 
-def moving_mean(a, w_len, skip, trim=True, axis=-1):
+
+def _float_type(a):
+    # float32 data is kept as float32, everything else is computed as float64
+    return float32 if a.dtype == float32 else float64
+
+
+def moving_mean(a, w_len, skip, trim=True, axis=-1, n_threads=1):
     r"""
     Compute the moving mean.
 
@@ -40,12 +64,14 @@ def moving_mean(a, w_len, skip, trim=True, axis=-1):
         these values will be set to NaN. Default is True.
     axis : int, optional
         Axis to compute the moving mean along. Default is -1.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Default is 1.
 
     Returns
     -------
     mmean : numpy.ndarray
-        Moving mean. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous.
+        Moving mean. The result is C-contiguous.
 
     Notes
     -----
@@ -103,10 +129,10 @@ def moving_mean(a, w_len, skip, trim=True, axis=-1):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_mean(z, 3, 3, axis=0).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_mean(z, 3, 3, axis=1).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_mean(z, 3, 3, axis=2).flags['C_CONTIGUOUS']
     True
@@ -114,20 +140,10 @@ def moving_mean(a, w_len, skip, trim=True, axis=-1):
     if w_len <= 0 or skip <= 0:
         raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
 
-    # move computation axis to end
-    x = moveaxis(a, axis, -1)
-
-    # check that there are enough samples
-    if w_len > x.shape[-1]:
-        raise ValueError("Window length is larger than the computation axis.")
-
-    rmean = _extensions.moving_mean(x, w_len, skip, trim)
-
-    # move computation axis back to original place and return
-    return moveaxis(rmean, -1, axis)
+    return _extensions.moving_mean(a, w_len, skip, trim, axis, n_threads)
 
 
-def moving_sd(a, w_len, skip, trim=True, axis=-1, return_previous=True):
+def moving_sd(a, w_len, skip, trim=True, axis=-1, return_previous=True, n_threads=1):
     r"""
     Compute the moving sample standard deviation.
 
@@ -147,15 +163,16 @@ def moving_sd(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     return_previous : bool, optional
         Return previous moments. These are computed either way, and are therefore optional returns.
         Default is True.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Default is 1.
 
     Returns
     -------
     msd : numpy.ndarray
-        Moving sample standard deviation. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous.
+        Moving sample standard deviation. The result is C-contiguous.
     mmean : numpy.ndarray, optional.
-        Moving mean. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving mean. Only returned if `return_previous=True`.
 
     Notes
     -----
@@ -216,10 +233,10 @@ def moving_sd(a, w_len, skip, trim=True, axis=-1, return_previous=True):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_sd(z, 3, 3, axis=0, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_sd(z, 3, 3, axis=1, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_sd(z, 3, 3, axis=2, return_previous=False).flags['C_CONTIGUOUS']
     True
@@ -227,25 +244,12 @@ def moving_sd(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     if w_len <= 0 or skip <= 0:
         raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
 
-    # move computation axis to end
-    x = moveaxis(a, axis, -1)
+    return _extensions.moving_sd(a, w_len, skip, trim, axis, return_previous, n_threads)
 
-    # check that there are enough samples
-    if w_len > x.shape[-1]:
-        raise ValueError(
-            "Cannot have a window length larger than the computation axis."
-        )
 
-    res = _extensions.moving_sd(x, w_len, skip, trim, return_previous)
-
-    # move computation axis back to original place and return
-    if return_previous:
-        return moveaxis(res[0], -1, axis), moveaxis(res[1], -1, axis)
-    else:
-        return moveaxis(res, -1, axis)
-
-
-def moving_skewness(a, w_len, skip, trim=True, axis=-1, return_previous=True):
+def moving_skewness(
+    a, w_len, skip, trim=True, axis=-1, return_previous=True, n_threads=1
+):
     r"""
     Compute the moving sample skewness.
 
@@ -265,18 +269,18 @@ def moving_skewness(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     return_previous : bool, optional
         Return previous moments. These are computed either way, and are therefore optional returns.
         Default is True.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Default is 1.
 
     Returns
     -------
     mskew : numpy.ndarray
-        Moving skewness. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous.
+        Moving skewness. The result is C-contiguous.
     msd : numpy.ndarray, optional
-        Moving sample standard deviation. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving sample standard deviation. Only returned if `return_previous=True`.
     mmean : numpy.ndarray, optional.
-        Moving mean. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving mean. Only returned if `return_previous=True`.
 
     Notes
     -----
@@ -334,10 +338,10 @@ def moving_skewness(a, w_len, skip, trim=True, axis=-1, return_previous=True):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_skewness(z, 3, 3, axis=0, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_skewness(z, 3, 3, axis=1, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_skewness(z, 3, 3, axis=2, return_previous=False).flags['C_CONTIGUOUS']
     True
@@ -345,28 +349,19 @@ def moving_skewness(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     if w_len <= 0 or skip <= 0:
         raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
 
-    # move computation axis to end
-    x = moveaxis(a, axis, -1)
-
-    # check that there are enough samples
-    if w_len > x.shape[-1]:
-        raise ValueError(
-            "Cannot have a window length larger than the computation axis."
-        )
-
-    res = _extensions.moving_skewness(x, w_len, skip, trim, return_previous)
+    res = _extensions.moving_skewness(
+        a, w_len, skip, trim, axis, return_previous, n_threads
+    )
 
     if isnan(res).any():
         warn("NaN values present in output, possibly due to catastrophic cancellation.")
 
-    # move computation axis back to original place and return
-    if return_previous:
-        return tuple(moveaxis(i, -1, axis) for i in res)
-    else:
-        return moveaxis(res, -1, axis)
+    return res
 
 
-def moving_kurtosis(a, w_len, skip, trim=True, axis=-1, return_previous=True):
+def moving_kurtosis(
+    a, w_len, skip, trim=True, axis=-1, return_previous=True, n_threads=1
+):
     r"""
     Compute the moving sample kurtosis.
 
@@ -386,21 +381,20 @@ def moving_kurtosis(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     return_previous : bool, optional
         Return previous moments. These are computed either way, and are therefore optional returns.
         Default is True.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Default is 1.
 
     Returns
     -------
     mkurt : numpy.ndarray
-        Moving kurtosis. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous.
+        Moving kurtosis. The result is C-contiguous.
     mskew : numpy.ndarray, optional
-        Moving skewness. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving skewness. Only returned if `return_previous=True`.
     msd : numpy.ndarray, optional
-        Moving sample standard deviation. Note that if the moving axis is not the last axis,
-        then the result will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving sample standard deviation. Only returned if `return_previous=True`.
     mmean : numpy.ndarray, optional.
-        Moving mean. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous. Only returned if `return_previous=True`.
+        Moving mean. Only returned if `return_previous=True`.
 
     Notes
     -----
@@ -457,10 +451,10 @@ def moving_kurtosis(a, w_len, skip, trim=True, axis=-1, return_previous=True):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_kurtosis(z, 3, 3, axis=0, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_kurtosis(z, 3, 3, axis=1, return_previous=False).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_kurtosis(z, 3, 3, axis=2, return_previous=False).flags['C_CONTIGUOUS']
     True
@@ -468,28 +462,17 @@ def moving_kurtosis(a, w_len, skip, trim=True, axis=-1, return_previous=True):
     if w_len <= 0 or skip <= 0:
         raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
 
-    # move computation axis to end
-    x = moveaxis(a, axis, -1)
-
-    # check that there are enough samples
-    if w_len > x.shape[-1]:
-        raise ValueError(
-            "Cannot have a window length larger than the computation axis."
-        )
-
-    res = _extensions.moving_kurtosis(x, w_len, skip, trim, return_previous)
+    res = _extensions.moving_kurtosis(
+        a, w_len, skip, trim, axis, return_previous, n_threads
+    )
 
     if isnan(res).any():
         warn("NaN values present in output, possibly due to catastrophic cancellation.")
 
-    # move computation axis back to original place and return
-    if return_previous:
-        return tuple(moveaxis(i, -1, axis) for i in res)
-    else:
-        return moveaxis(res, -1, axis)
+    return res
 
 
-def moving_median(a, w_len, skip=1, trim=True, axis=-1):
+def moving_median(a, w_len, skip=1, trim=True, axis=-1, n_threads=1):
     r"""
     Compute the moving mean.
 
@@ -506,12 +489,16 @@ def moving_median(a, w_len, skip=1, trim=True, axis=-1):
         these values will be set to NaN. Default is True.
     axis : int, optional
         Axis to compute the moving mean along. Default is -1.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Lanes along `axis` are split between the threads, and if there are fewer
+        lanes than threads, each lane is split into overlapping segments. The result
+        does not depend on the number of threads. Default is 1.
 
     Returns
     -------
     mmed : numpy.ndarray
-        Moving median. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous.
+        Moving median. The result is C-contiguous.
 
     Notes
     -----
@@ -559,10 +546,10 @@ def moving_median(a, w_len, skip=1, trim=True, axis=-1):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_median(z, 3, 3, axis=0).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_median(z, 3, 3, axis=1).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_median(z, 3, 3, axis=2).flags['C_CONTIGUOUS']
     True
@@ -570,22 +557,10 @@ def moving_median(a, w_len, skip=1, trim=True, axis=-1):
     if w_len <= 0 or skip <= 0:
         raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
 
-    # move computation axis to end
-    x = moveaxis(a, axis, -1)
-
-    # check that there are enough samples
-    if w_len > x.shape[-1]:
-        raise ValueError(
-            "Cannot have a window length larger than the computation axis."
-        )
-
-    rmed = _extensions.moving_median(x, w_len, skip, trim)
+    return _extensions.moving_median(a, w_len, skip, trim, axis, n_threads)
 
-    # move computation axis back to original place and return
-    return moveaxis(rmed, -1, axis)
 
-
-def moving_max(a, w_len, skip, trim=True, axis=-1):
+def moving_max(a, w_len, skip, trim=True, axis=-1, n_threads=1):
     r"""
     Compute the moving maximum value.
 
@@ -602,12 +577,16 @@ def moving_max(a, w_len, skip, trim=True, axis=-1):
         these values will be set to NaN. Default is True.
     axis : int, optional
         Axis to compute the moving max along. Default is -1.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Lanes along `axis` are split between the threads, and if there are fewer
+        lanes than threads, each lane is split into overlapping segments. The result
+        does not depend on the number of threads. Default is 1.
 
     Returns
     -------
     mmax : numpy.ndarray
-        Moving max. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous.
+        Moving max. The result is C-contiguous.
 
     Notes
     -----
@@ -655,10 +634,10 @@ def moving_max(a, w_len, skip, trim=True, axis=-1):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_max(z, 3, 3, axis=0).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_max(z, 3, 3, axis=1).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_max(z, 3, 3, axis=2).flags['C_CONTIGUOUS']
     True
@@ -671,18 +650,8 @@ def moving_max(a, w_len, skip, trim=True, axis=-1):
     cond1 = a.ndim == 1 and (skip / w_len) < 0.005
     cond2 = a.ndim > 1 and (skip / w_len) < 0.3  # due to c-contiguity?
     cond3 = a.ndim > 2  # windowing doesnt handle more than 2 dimensions currently
-    if any([cond1, cond2, cond3]):
-        # move computation axis to end
-        x = moveaxis(a, axis, -1)
-
-        # check that there are enough samples
-        if w_len > x.shape[-1]:
-            raise ValueError("Window length is larger than the computation axis.")
-
-        rmax = _extensions.moving_max(x, w_len, skip, trim)
-
-        # move computation axis back to original place and return
-        return moveaxis(rmax, -1, axis)
+    if any([cond1, cond2, cond3]) or n_threads > 1:
+        return _extensions.moving_max(a, w_len, skip, trim, axis, n_threads)
     else:
         x = ascontiguousarray(
             moveaxis(a, axis, 0)
@@ -694,13 +663,13 @@ def moving_max(a, w_len, skip, trim=True, axis=-1):
             nfill = (x.shape[0] - w_len) // skip + 1
             rshape = list(x.shape)
             rshape[0] = (x.shape[0] - 1) // skip + 1
-            res = full(rshape, nan)
+            res = full(rshape, nan, dtype=_float_type(xw))
             res[:nfill] = xw.max(axis=1)
 
-        return moveaxis(res, 0, axis)
+        return ascontiguousarray(moveaxis(res, 0, axis))
 
 
-def moving_min(a, w_len, skip, trim=True, axis=-1):
+def moving_min(a, w_len, skip, trim=True, axis=-1, n_threads=1):
     r"""
     Compute the moving maximum value.
 
@@ -717,12 +686,16 @@ def moving_min(a, w_len, skip, trim=True, axis=-1):
         these values will be set to NaN. Default is True.
     axis : int, optional
         Axis to compute the moving max along. Default is -1.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Lanes along `axis` are split between the threads, and if there are fewer
+        lanes than threads, each lane is split into overlapping segments. The result
+        does not depend on the number of threads. Default is 1.
 
     Returns
     -------
     mmax : numpy.ndarray
-        Moving max. Note that if the moving axis is not the last axis, then the result
-        will *not* be c-contiguous.
+        Moving max. The result is C-contiguous.
 
     Notes
     -----
@@ -771,10 +744,10 @@ def moving_min(a, w_len, skip, trim=True, axis=-1):
 
     >>> z = np.random.random((10, 10, 10))
     >>> moving_min(z, 3, 3, axis=0).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_min(z, 3, 3, axis=1).flags['C_CONTIGUOUS']
-    False
+    True
 
     >>> moving_min(z, 3, 3, axis=2).flags['C_CONTIGUOUS']
     True
@@ -787,18 +760,8 @@ def moving_min(a, w_len, skip, trim=True, axis=-1):
     cond1 = a.ndim == 1 and (skip / w_len) < 0.005
     cond2 = a.ndim > 1 and (skip / w_len) < 0.3  # due to c-contiguity?
     cond3 = a.ndim > 2  # windowing doesnt handle more than 2 dimensions currently
-    if any([cond1, cond2, cond3]):
-        # move computation axis to end
-        x = moveaxis(a, axis, -1)
-
-        # check that there are enough samples
-        if w_len > x.shape[-1]:
-            raise ValueError("Window length is larger than the computation axis.")
-
-        rmin = _extensions.moving_min(x, w_len, skip, trim)
-
-        # move computation axis back to original place and return
-        return moveaxis(rmin, -1, axis)
+    if any([cond1, cond2, cond3]) or n_threads > 1:
+        return _extensions.moving_min(a, w_len, skip, trim, axis, n_threads)
     else:
         x = ascontiguousarray(
             moveaxis(a, axis, 0)
@@ -810,7 +773,332 @@ def moving_min(a, w_len, skip, trim=True, axis=-1):
             nfill = (x.shape[0] - w_len) // skip + 1
             rshape = list(x.shape)
             rshape[0] = (x.shape[0] - 1) // skip + 1
-            res = full(rshape, nan)
+            res = full(rshape, nan, dtype=_float_type(xw))
             res[:nfill] = xw.min(axis=1)
 
-        return moveaxis(res, 0, axis)
+        return ascontiguousarray(moveaxis(res, 0, axis))
+
+
+def _get_stat_flags(stats):
+    """
+    Get the requested statistics, and their bit flags for the extension.
+    """
+    if isinstance(stats, str):
+        stats = (stats,)
+    stats = tuple(stats)
+    if len(stats) == 0:
+        raise ValueError("At least one statistic must be requested.")
+
+    flags = 0
+    for stat in stats:
+        if stat not in _STATS:
+            raise ValueError(
+                f"Statistic [{stat}] not recognized. Must be one of {_STATS}."
+            )
+        flags |= 1 << _STATS.index(stat)
+
+    return stats, flags
+
+
+def moving_stats(
+    a,
+    w_len,
+    skip,
+    stats=("mean", "sd", "min", "max", "median"),
+    trim=True,
+    axis=0,
+    n_threads=1,
+):
+    r"""
+    Compute multiple moving statistics over the same windows, with one pass over
+    the data.
+
+    Parameters
+    ----------
+    a : array-like
+        Signal to compute moving statistics for.
+    w_len : int
+        Window length in number of samples.
+    skip : int
+        Window start location skip in number of samples.
+    stats : {str, iterable of str}, optional
+        Statistics to compute. Any of "mean", "sd", "skewness", "kurtosis",
+        "median", "max", and "min". Default is ("mean", "sd", "min", "max", "median").
+    trim : bool, optional
+        Trim the ends of the result, where a value cannot be calculated. If False,
+        these values will be set to NaN. Default is True.
+    axis : int, optional
+        Axis to compute the moving statistics along. Default is 0.
+    n_threads : int, optional
+        Number of threads to compute with. The GIL is released during the computation.
+        Default is 1.
+
+    Returns
+    -------
+    mstats : tuple of numpy.ndarray
+        Moving statistics, in the order of `stats`. The results are C-contiguous.
+
+    Notes
+    -----
+    Each lane of `a` along `axis` is read once, and all the statistics are
+    computed from it. The moments share their running sums, so requesting
+    "mean" with "sd" (or higher moments) costs the same as "sd" alone. The
+    results are identical to those of the individual moving statistic functions.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> x = np.arange(10)
+    >>> mean, mx = moving_stats(x, 3, 3, stats=("mean", "max"))
+    >>> mean
+    array([1., 4., 7.])
+    >>> mx
+    array([2., 5., 8.])
+
+    Compute the statistics for each axis of an acceleration signal:
+
+    >>> accel = np.random.random((500, 3))
+    >>> sd, mn, mx = moving_stats(accel, 100, 50, stats=("sd", "min", "max"))
+    >>> sd.shape
+    (9, 3)
+    """
+    if w_len <= 0 or skip <= 0:
+        raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
+
+    stats, flags = _get_stat_flags(stats)
+
+    res = _extensions.moving_stats(a, w_len, skip, trim, axis, flags, n_threads)
+
+    for stat in ("skewness", "kurtosis"):
+        if stat in stats and isnan(res[_STATS.index(stat)]).any():
+            warn(
+                "NaN values present in output, possibly due to catastrophic cancellation."
+            )
+
+    return tuple(res[_STATS.index(stat)] for stat in stats)
+
+
+def moving_median_block_mean(a, w_len, block, fns=None, tile=256):
+    r"""
+    Compute the mean over non-overlapping blocks of a moving median (with a skip of 1),
+    without computing the full moving median at once.
+
+    Parameters
+    ----------
+    a : array-like
+        Signal to compute the moving median for. Computed along the first axis.
+    w_len : int
+        Moving median window length in number of samples.
+    block : int
+        Number of moving median values in each block.
+    fns : {None, callable, iterable}, optional
+        Function(s) applied to the moving median before the block means. Each
+        function must act on each sample (row) independently. If an iterable,
+        the block mean is computed for each function, with None for the moving
+        median itself. Default is None, for the block mean of the moving median.
+    tile : int, optional
+        Number of blocks to compute at a time. Default is 256.
+
+    Returns
+    -------
+    bmean : {numpy.ndarray, tuple}
+        Block mean of the moving median, with `fns` applied. A tuple if `fns` is
+        an iterable.
+
+    Notes
+    -----
+    The result is identical to
+
+    .. code-block:: python
+
+        moving_mean(fn(moving_median(a, w_len, 1, axis=0)), block, block, axis=0)
+
+    for each `fn` in `fns`. The moving median is computed in tiles of `tile`
+    blocks with :class:`MovingStats`, so only one tile of the moving median is
+    kept in memory.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> x = np.random.random((30000, 3))
+    >>> res = moving_median_block_mean(x, 250, 250)
+    >>> np.array_equal(res, moving_mean(moving_median(x, 250, 1, axis=0), 250, 250, axis=0))
+    True
+    """
+    a = asarray(a)
+    if w_len <= 0 or block <= 0:
+        raise ValueError("`wlen` and `block` cannot be less than or equal to 0.")
+    if w_len > a.shape[0] or block > (a.shape[0] - w_len + 1):
+        raise ValueError("Window length is larger than the computation axis.")
+
+    multiple = fns is not None and not callable(fns)
+    fns = tuple(fns) if multiple else (fns,)
+
+    rmed = MovingStats(w_len, 1, stats="median", axis=0)
+    bmeans = [MovingStats(block, block, stats="mean", axis=0) for _ in fns]
+    res = [[] for _ in fns]
+
+    n_tile = max(tile, 1) * block
+    for i in range(0, a.shape[0], n_tile):
+        (med,) = rmed.update(a[i : i + n_tile])
+        for fn, bmean, r in zip(fns, bmeans, res):
+            r.append(bmean.update(med if fn is None else fn(med))[0])
+
+    res = tuple(concatenate(r, axis=0) for r in res)
+
+    return res if multiple else res[0]
+
+
+class MovingStats:
+    r"""
+    Compute moving statistics on a stream of data, one chunk at a time.
+
+    Parameters
+    ----------
+    w_len : int
+        Window length in number of samples.
+    skip : int
+        Window start location skip in number of samples.
+    stats : {str, iterable of str}, optional
+        Statistics to compute. Any of "mean", "sd", "skewness", "kurtosis",
+        "median", "max", and "min". Default is ("mean", "sd", "min", "max", "median").
+    axis : int, optional
+        Axis of the chunks to compute the moving statistics along. Default is 0.
+
+    Attributes
+    ----------
+    n_samples : int
+        Number of samples along `axis` received so far.
+    n_windows : int
+        Number of windows computed so far.
+
+    Notes
+    -----
+    The results of all the updates, concatenated along `axis`, are identical to
+    the results of :func:`moving_stats` (with `trim=True`) on all the chunks
+    concatenated along `axis`.
+
+    The moments keep their running sums for the last `w_len` samples between
+    updates. The median, maximum, and minimum of a window do not depend on the
+    previous windows, so the samples after the start of the next window (less
+    than `w_len` samples) are kept instead, and computed with the next chunk.
+    The memory used does not grow with the length of the stream.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> x = np.random.random((10000, 3))
+    >>> ms = MovingStats(250, 125, stats=("mean", "max"))
+    >>> res = [ms.update(chunk) for chunk in np.array_split(x, 7)]
+    >>> mean = np.concatenate([r[0] for r in res], axis=0)
+    >>> np.array_equal(mean, moving_mean(x, 250, 125, axis=0))
+    True
+    """
+
+    def __init__(
+        self, w_len, skip, stats=("mean", "sd", "min", "max", "median"), axis=0
+    ):
+        if w_len <= 0 or skip <= 0:
+            raise ValueError("`wlen` and `skip` cannot be less than or equal to 0.")
+
+        self.w_len = int(w_len)
+        self.skip = int(skip)
+        self.stats, flags = _get_stat_flags(stats)
+        self.axis = axis
+
+        # highest moment to compute, and flags for the median/max/min
+        self._order = max(
+            [i + 1 for i in range(4) if flags & (1 << i)],
+            default=0,
+        )
+        self._flags = flags & ~0b1111
+
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the stream, removing any data from previous updates.
+        """
+        self.n_samples = 0
+        self.n_windows = 0
+
+        self._lanes = None
+        self._sums = None  # running sums of the moments
+        self._tail = None  # samples from the start of the next window
+
+    def update(self, chunk):
+        """
+        Add a chunk of data to the stream, and compute the newly completed windows.
+
+        Parameters
+        ----------
+        chunk : array-like
+            Next chunk of data. Must have the same shape as the previous chunks,
+            apart from along `axis`.
+
+        Returns
+        -------
+        mstats : tuple of numpy.ndarray
+            Moving statistics of the windows completed by `chunk`, in the order of
+            `stats`. The results are C-contiguous, and can be empty along `axis`.
+        """
+        x = asarray(chunk)
+        dtype = _float_type(x)
+        x = moveaxis(x, self.axis, -1)
+
+        if self._lanes is None:
+            self._lanes = x.shape[:-1]
+            nlanes = int(prod(self._lanes))
+            self._sums = zeros((nlanes, self._order, self.w_len), dtype=float64)
+            self._tail = empty((nlanes, 0), dtype=float64)
+        elif x.shape[:-1] != self._lanes:
+            raise ValueError(
+                f"Chunk shape {x.shape[:-1]} (excluding `axis`) does not match the "
+                f"previous chunks {self._lanes}."
+            )
+        # lanes on the last axis, as in the batch computation
+        x = ascontiguousarray(x.reshape((self._sums.shape[0], -1)), dtype=float64)
+
+        g, nw, n = self.n_samples, self.n_windows, x.shape[1]
+        n_total = (g + n - self.w_len) // self.skip + 1 if g + n >= self.w_len else 0
+        nres = max(n_total - nw, 0)
+
+        res = [None] * len(_STATS)
+        if self._order > 0:
+            moments = _extensions.moving_moments_update(
+                x, self._sums, self.w_len, self.skip, g, nw, self._order
+            )
+            for k in range(self._order):
+                res[k] = moments[:, k]
+
+        if self._flags:
+            # samples from the start of the next window
+            buf = concatenate((self._tail, x), axis=1)
+            buf = buf[:, max(nw * self.skip - (g + n - buf.shape[1]), 0) :]
+
+            if nres > 0:
+                others = _extensions.moving_stats(
+                    buf, self.w_len, self.skip, True, -1, self._flags, 1
+                )
+                for k in range(4, len(_STATS)):
+                    res[k] = others[k]
+            else:
+                res[4:] = [empty((x.shape[0], 0))] * (len(_STATS) - 4)
+
+            self._tail = buf[:, nres * self.skip :].copy()
+
+        self.n_samples += n
+        self.n_windows += nres
+
+        out = []
+        for stat in self.stats:
+            r = res[_STATS.index(stat)].reshape(self._lanes + (nres,))
+            out.append(ascontiguousarray(moveaxis(r, -1, self.axis), dtype=dtype))
+
+        for stat in ("skewness", "kurtosis"):
+            if stat in self.stats and isnan(res[_STATS.index(stat)]).any():
+                warn(
+                    "NaN values present in output, possibly due to catastrophic cancellation."
+                )
+
+        return tuple(out)
@@ -1,7 +1,7 @@
 import datetime as dt
 
 import pytest
-from numpy import array, allclose, zeros, arange
+from numpy import array, allclose, zeros, arange, array_equal
 from numpy.random import default_rng
 
 from skdh.activity.cutpoints import _base_cutpoints
@@ -148,3 +148,35 @@ class TestActivityLevelClassification:
 
         for k in activity_res:
             assert allclose(res[k], activity_res[k], equal_nan=True)
+
+    @pytest.mark.parametrize("executor", ("thread", "process"))
+    def test_n_workers(self, executor):
+        kw = dict(
+            short_wlen=5,
+            max_accel_lens=(10,),
+            bout_lens=(10,),
+            min_wear_time=0,
+            cutpoints="migueles_wrist_adult",
+        )
+
+        rng = default_rng(seed=5)
+        x = zeros((240000, 3))
+        x[:, 2] += rng.normal(loc=1, scale=1, size=x.shape[0])
+        t = arange(1.6e9, 1.6e9 + x.shape[0] * 0.02, 0.02)
+
+        sleep = array([[int(0.8 * t.size), t.size - 1]])
+        days = {(0, 24): array([[0, 80000], [80000, 160000], [160000, 240000]])}
+
+        res = ActivityLevelClassification(**kw).predict(
+            t, x, fs=50.0, sleep=sleep, day_ends=days
+        )
+        res_par = ActivityLevelClassification(
+            **kw, n_workers=2, executor=executor
+        ).predict(t, x, fs=50.0, sleep=sleep, day_ends=days)
+
+        assert res["Day N"].tolist() == [1, 2, 3]
+        for k in res:
+            if res[k].dtype.kind == "U":
+                assert array_equal(res_par[k], res[k]), k
+            else:
+                assert allclose(res_par[k], res[k], equal_nan=True), k
@@ -1,9 +1,34 @@
 from tempfile import TemporaryDirectory
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import pickle
 
-from numpy import array, allclose
+import pytest
+from numpy import array, allclose, arange
 
-from skdh.base import BaseProcess
+from skdh.base import BaseProcess, SharedArray, share_arrays, release_arrays
+
+
+class DayProcess(BaseProcess):
+    def __init__(self, n_workers=1, executor="process"):
+        super().__init__(n_workers=n_workers, executor=executor)
+        self._set_day_workers(n_workers, executor)
+        self.n_days = 0
+
+    def _predict_day(self, iday, start, stop, *, x, y, scale):
+        self.n_days += 1
+        return iday, x[start:stop].sum() * scale, y
+
+
+class SumProcess(BaseProcess):
+    def predict(self, time=None, accel=None, **kwargs):
+        super().predict(expect_days=True, expect_wear=False, accel=accel, **kwargs)
+        res = {"sum": accel.sum(), "days": self.day_idx[0].tolist()}
+        return (kwargs, res) if self._in_pipeline else res
+
+
+def _sum_shared(handle):
+    return float(handle.asarray().sum())
 
 
 class TestBaseProcess:
@@ -94,3 +119,127 @@ class TestBaseProcess:
             files = [i.name for i in tdir.glob("*")]
 
         assert "test_file__BaseProcess.out" in files
+
+    @pytest.mark.parametrize(
+        ("n_workers", "executor"), ((1, "process"), (2, "thread"), (3, "process"))
+    )
+    def test__map_days(self, n_workers, executor):
+        bp = DayProcess(n_workers=n_workers, executor=executor)
+        x = arange(100.0)
+
+        res = bp._map_days(
+            "_predict_day",
+            [0, 10, 50, 60],
+            [10, 50, 60, 100],
+            {"x": x, "y": None},
+            scale=2,
+        )
+
+        assert res == [
+            (0, 90.0, None),
+            (1, 2 * x[10:50].sum(), None),
+            (2, 2 * x[50:60].sum(), None),
+            (3, 2 * x[60:].sum(), None),
+        ]
+        # days in parallel work on copies of the process
+        assert bp.n_days == (4 if n_workers == 1 else 0)
+
+    def test__stitch_results(self):
+        bp = BaseProcess()
+        bp._day_key = "Day N"
+
+        res = bp._stitch_results(
+            [
+                {"Day N": array([1]), "a": array([1.0]), "b": [1, 2], "c": "x"},
+                None,
+                {"Day N": array([1, 1]), "a": array([2.0, 3.0]), "b": [3], "c": "y"},
+            ]
+        )
+
+        assert allclose(res["Day N"], [1, 3, 3])
+        assert allclose(res["a"], [1.0, 2.0, 3.0])
+        assert res["b"] == [1, 2, 3]
+        assert res["c"] == ["x", "y"]
+
+        assert bp._stitch_results([None, None]) is None
+
+    def test__set_day_workers(self):
+        bp = DayProcess(n_workers=0, executor="thread")
+        assert bp.n_workers == 1
+        assert bp.executor == "thread"
+
+        with pytest.raises(ValueError):
+            DayProcess(n_workers=2, executor="test")
+
+
+class TestSharedArray:
+    def test_share_arrays(self):
+        data = {
+            "time": arange(10.0),
+            "accel": arange(30.0).reshape((10, 3)),
+            "day_ends": {(0, 24): array([[0, 9]])},
+            "names": array(["a", None], dtype=object),
+            "fs": 1.0,
+        }
+        shared = share_arrays(data)
+        try:
+            assert isinstance(shared["time"], SharedArray)
+            assert isinstance(shared["day_ends"][(0, 24)], SharedArray)
+            assert shared["names"] is data["names"]
+            assert shared["fs"] == 1.0
+
+            assert shared["accel"].shape == (10, 3)
+            assert shared["accel"].nbytes == data["accel"].nbytes
+            assert allclose(shared["accel"].asarray(), data["accel"])
+            assert allclose(array(shared["time"]), data["time"])
+
+            # handles are small when pickled, and attach to the same memory
+            handle = pickle.loads(pickle.dumps(shared["accel"]))
+            assert len(pickle.dumps(shared["accel"])) < 200
+            handle.asarray()[0, 0] = 5.0
+            assert shared["accel"].asarray()[0, 0] == 5.0
+            handle.close()
+        finally:
+            release_arrays(shared)
+
+    def test_processes(self):
+        shared = share_arrays({"x": arange(1000.0)})
+        try:
+            with ProcessPoolExecutor(2) as pool:
+                res = list(pool.map(_sum_shared, [shared["x"]] * 2))
+        finally:
+            release_arrays(shared)
+
+        assert res == [499500.0] * 2
+
+    def test_predict(self):
+        data = {
+            "time": arange(10.0),
+            "accel": arange(30.0).reshape((10, 3)),
+            "day_ends": {(-1, -1): array([[0, 4], [5, 9]])},
+        }
+        shared = share_arrays(data)
+        try:
+            res = SumProcess().predict(**shared)
+            assert res["sum"] == data["accel"].sum()
+            assert res["days"] == [0, 5]
+
+            # positional arguments
+            res = SumProcess().predict(shared["time"], shared["accel"])
+            assert res["sum"] == data["accel"].sum()
+        finally:
+            release_arrays(shared)
+
+    def test_close_unlink(self):
+        from multiprocessing.shared_memory import SharedMemory
+
+        handle = SharedArray.from_array(arange(10.0))
+        handle.close()
+        handle.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=handle.name)
+
+    def test_from_array_error(self):
+        with pytest.raises(TypeError):
+            SharedArray.from_array(array(["a", None], dtype=object))
@@ -0,0 +1,68 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_time():
+    res = run_python("import skdh")
+
+    # cumulative import time of skdh in microseconds
+    times = {
+        line.split("|")[2].strip(): int(line.split("|")[1])
+        for line in res.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+    assert times["skdh"] < 500_000
+
+    # subpackages are only imported when used
+    assert "skdh.pipeline" not in times
+    assert "skdh.activity" not in times
+
+
+@pytest.mark.parametrize(
+    "module",
+    (
+        "skdh",
+        "skdh.io",
+        "skdh.pipeline",
+        "skdh.activity",
+        "skdh.sleep",
+        "skdh.gait",
+        "skdh.preprocessing",
+        "skdh.sit2stand",
+        "skdh.features",
+    ),
+)
+def test_heavy_dependencies_not_imported(module):
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('matplotlib', 'lightgbm', 'sklearn', 'h5py', "
+        "'pandas') if m in sys.modules))"
+    )
+    res = run_python(code)
+    assert res.stdout.strip() == ""
+
+
+def test_lazy_attributes():
+    import skdh
+
+    assert skdh.Pipeline is skdh.pipeline.Pipeline
+    assert skdh.BaseProcess is skdh.base.BaseProcess
+    assert skdh.io.FileCache is skdh.io.cache.FileCache
+    assert "activity" in dir(skdh)
+    assert "ReadCwa" in dir(skdh.io)
+
+    with pytest.raises(AttributeError):
+        skdh.not_a_module
+    with pytest.raises(AttributeError):
+        skdh.io.not_a_reader
@@ -1,14 +1,113 @@
 from tempfile import TemporaryDirectory
 from pathlib import Path
+from threading import Barrier
+import weakref
 
 # DEPRECATED
 import json
 
 import pytest
 import yaml
+from numpy import array, arange
 
+from skdh.base import BaseProcess
+from skdh.io import FileCache, HDFSink
+from skdh.io.base import check_input_file
 from skdh.pipeline import Pipeline, NotAProcessError, ProcessNotFoundError, VersionError
 from skdh.gait import Gait
+
+
+class KeyProcess(BaseProcess):
+    """
+    Process that adds the sum of its inputs to a new key.
+    """
+
+    def __init__(self, consumes, produces, barrier=None):
+        super().__init__(consumes=consumes, produces=produces)
+        self._consumes = consumes
+        self._produces = produces
+        self.barrier = barrier
+        self.inputs = None
+
+    def predict(self, **kwargs):
+        self.inputs = dict(kwargs)
+        if self.barrier is not None:
+            # both branches have to be running at the same time to pass
+            self.barrier.wait()
+        total = sum(kwargs[k] for k in self._consumes if k in kwargs)
+        kwargs.update({k: total for k in self._produces})
+        return kwargs, {"total": total}
+
+
+class WindowProcess(BaseProcess):
+    """
+    Process that can run on day windows, counting the samples of each day.
+    """
+
+    _consumes = ("time", "wear", "day_ends")
+    _produces = ("wear",)
+    _chunkable = True
+    _day_key = "Day N"
+
+    def __init__(self):
+        super().__init__()
+        self.sizes = []
+
+    def predict(self, time=None, **kwargs):
+        kwargs.update({"time": time})
+        self.sizes.append(time.size)
+        days = kwargs["day_ends"][(0, 24)]
+        res = {
+            "Day N": [i + 1 for i in range(days.shape[0])],
+            "samples": [stop - start for start, stop in days],
+            "wear": [kwargs["wear"].shape[0]],
+        }
+        # wear for the whole time passed in
+        kwargs["wear"] = array([[0, time.size]])
+        return kwargs, res
+
+
+class RangeReader(BaseProcess):
+    """
+    Reader of a recording with a sample every minute, that can read time ranges.
+    """
+
+    _chunkable = True
+
+    def __init__(self, t0, days, start=None, stop=None, windows_only=False, cache=None):
+        super().__init__(
+            t0=t0, days=days, start=start, stop=stop, windows_only=windows_only
+        )
+        self.t0 = t0
+        self.days = days
+        self.start = start
+        self.stop = stop
+        self.windows_only = windows_only
+        self.cache = cache
+        self.ext_error = "raise"
+
+    def _get_time_range(self, file):
+        # approximate bounds, as from the block timestamps of a file
+        return self.t0 - 60.0, self.t0 + self.days * 86400 + 60.0
+
+    @check_input_file(".abc", check_size=False)
+    def predict(self, file=None, **kwargs):
+        time = self.t0 + arange(0, self.days * 86400, 60.0)
+        time = time[(time >= self.start) & (time < self.stop)]
+        kwargs.update({"file": file, "time": time})
+        return (kwargs, None) if self._in_pipeline else kwargs
+
+
+class DataProcess(BaseProcess):
+    """
+    Process that stores the data it is given.
+    """
+
+    def predict(self, **kwargs):
+        self.data = kwargs
+        return kwargs, None
+
+
 from skdh import __version__ as skdh_vers
 
 
@@ -43,6 +142,275 @@ class TestPipeline:
 
         assert res == exp_res
 
+    @pytest.mark.parametrize("n_workers", (1, 3))
+    def test_run_graph(self, testprocess, n_workers):
+        barrier = Barrier(2, timeout=10) if n_workers > 1 else None
+
+        p = Pipeline(n_workers=n_workers)
+        p.add(KeyProcess(("x",), ("y",), barrier=barrier))
+        p.add(KeyProcess(("x",), ("z",), barrier=barrier))
+        p.add(KeyProcess(("y", "z"), ("x",)))
+        p.add(KeyProcess(("x", "y"), ()))
+        p.add(testprocess(kw1=2))
+
+        res = p.run(x=1, w=5)
+
+        assert [s.inputs for s in p._steps[:4]] == [
+            {"x": 1},
+            {"x": 1},
+            {"y": 1, "z": 1},
+            {"x": 2, "y": 1},
+        ]
+        assert res == {"KeyProcess": {"total": 3}, "TestProcess": {"kw1": 2}}
+
+    def test_run_undeclared_step(self, testprocess2):
+        class AllProcess(testprocess2):
+            def predict(self, **kwargs):
+                self.inputs = dict(kwargs)
+                return {"x": kwargs["x"] + 10}, None
+
+        p = Pipeline()
+        p.add(KeyProcess(("x",), ("y",)))
+        p.add(AllProcess())
+        p.add(KeyProcess(("x", "y"), ()))
+
+        p.run(x=1, w=5)
+
+        # undeclared steps get all the data, and replace all of it
+        assert p._steps[1].inputs == {"x": 1, "y": 1, "w": 5}
+        assert p._steps[2].inputs == {"x": 11}
+
+    def test_run_drops_data(self):
+        from numpy import ones
+
+        refs = {}
+
+        class Producer(KeyProcess):
+            def predict(self, **kwargs):
+                big = ones(100)
+                refs["big"] = weakref.ref(big)
+                return {"big": big, "small": 1}, None
+
+        class User(KeyProcess):
+            def predict(self, **kwargs):
+                return kwargs, None
+
+        class Checker(KeyProcess):
+            def predict(self, **kwargs):
+                self.inputs = refs["big"]() is None
+                return kwargs, None
+
+        p = Pipeline()
+        p.add(Producer((), ("big", "small")))
+        p.add(User(("big",), ()))
+        p.add(Checker(("small",), ()))
+
+        p.run()
+        assert p._steps[2].inputs
+
+    def test_run_cache(self, tmp_path):
+        from numpy import arange, array_equal
+
+        calls = []
+
+        class CountProcess(KeyProcess):
+            def __init__(self, consumes, produces, offset=0):
+                super().__init__(consumes, produces)
+                self._kw["offset"] = offset
+                self.offset = offset
+
+            def predict(self, **kwargs):
+                calls.append(self._kw["produces"])
+                kwargs, res = super().predict(**kwargs)
+                kwargs.update({k: kwargs[k] + self.offset for k in self._produces})
+                return kwargs, {"total": res["total"], "arr": arange(3) + self.offset}
+
+        def get_pipeline(offset):
+            p = Pipeline(cache=tmp_path / "cache")
+            p.add(CountProcess(("x",), ("y",)))
+            p.add(CountProcess(("y", "w"), ("z",)))
+            p.add(CountProcess(("z",), (), offset=offset))
+            return p
+
+        res = get_pipeline(0).run(x=1, w=arange(5))
+        assert len(calls) == 3
+
+        # nothing changed
+        calls.clear()
+        res2 = get_pipeline(0).run(x=1, w=arange(5))
+        assert calls == []
+        assert array_equal(res2["CountProcess"]["total"], res["CountProcess"]["total"])
+        assert array_equal(res2["CountProcess"]["arr"], res["CountProcess"]["arr"])
+
+        # only the last step changed
+        calls.clear()
+        res3 = get_pipeline(2).run(x=1, w=arange(5))
+        assert calls == [()]
+        assert array_equal(res3["CountProcess"]["arr"], arange(3) + 2)
+
+        # the input to the second step changed
+        calls.clear()
+        get_pipeline(0).run(x=1, w=arange(5) + 1)
+        assert calls == [("z",), ()]
+
+    def test_run_cache_file(self, testprocess, tmp_path):
+        calls = []
+
+        class FileProcess(testprocess):
+            def predict(self, *args, file=None, **kwargs):
+                calls.append(file)
+                with open(file) as f:
+                    return {"file": file}, {"text": f.read()}
+
+        file = tmp_path / "data.txt"
+        file.write_text("first")
+
+        p = Pipeline(cache=tmp_path / "cache")
+        p.add(FileProcess())
+
+        assert p.run(file=str(file)) == {"FileProcess": {"text": "first"}}
+        assert p.run(file=str(file)) == {"FileProcess": {"text": "first"}}
+        assert len(calls) == 1
+
+        # the cache key uses the contents of the file
+        file.write_text("second")
+        assert p.run(file=str(file)) == {"FileProcess": {"text": "second"}}
+        assert len(calls) == 2
+
+    def test_run_report(self, tmp_path):
+        import json
+        from numpy import arange
+
+        hooked = []
+        p = Pipeline(
+            report_file=str(tmp_path / "{file}_{name}_report.json"),
+            report_hook=hooked.append,
+        )
+        p.add(KeyProcess(("time",), ("x",)))
+        p.add(KeyProcess(("x",), ()))
+
+        p.run(time=arange(100.0), file="test.cwa")
+
+        assert p.report["file"] == "test.cwa"
+        assert p.report["wall time"] > 0
+        assert len(p.report["steps"]) == 2
+        # called as each step finishes
+        assert hooked == p.report["steps"]
+
+        for step in p.report["steps"]:
+            assert step["process"] == "KeyProcess"
+            assert not step["cached"]
+            assert step["wall time"] > 0
+            assert step["cpu time"] >= 0
+            assert step["peak rss increase"] is None or step["peak rss increase"] >= 0
+        assert p.report["steps"][0]["samples"] == 100
+        assert p.report["steps"][0]["samples per second"] > 0
+        # no time or acceleration data
+        assert p.report["steps"][1]["samples"] is None
+        assert p.report["steps"][1]["samples per second"] is None
+
+        with open(tmp_path / "test_Pipeline_report.json") as f:
+            assert json.load(f) == p.report
+
+    @pytest.mark.parametrize("padding", (0, 1800))
+    def test_run_windowed(self, padding):
+        from numpy import arange, array_equal, unique, floor, concatenate, vstack
+
+        # 3.5 days, starting at 6 AM
+        time = 1609480800.0 + arange(0, 3.5 * 86400, 60.0)
+        wear = array([[0, time.size]])
+
+        p = Pipeline()
+        p.add(WindowProcess())
+        p.add(WindowProcess())
+        p.add(DataProcess())
+        res = p.run_windowed(base=0, period=24, padding=padding, time=time, wear=wear)
+
+        _, counts = unique(floor(time / 86400), return_counts=True)
+        assert res["WindowProcess"]["Day N"] == [1, 2, 3, 4]
+        # the last day ends at the last sample
+        assert res["WindowProcess"]["samples"] == (counts - [0, 0, 0, 1]).tolist()
+        # wear clipped to each window
+        assert res["WindowProcess"]["wear"] == [1, 1, 1, 1]
+        assert p.report["windows"] == 4
+
+        # padding is given to the windowed steps
+        # plus the first sample of the next window, read after each window
+        n_padded = counts.sum() + 3 + padding // 60 * 6
+        assert p.report["steps"][0]["samples"] == n_padded
+
+        # last step is given the data of all the windows
+        data = p._steps[2].data
+        assert array_equal(data["time"], time)
+        starts = concatenate(([0], counts.cumsum()[:-1]))
+        assert array_equal(data["wear"], vstack((starts, counts.cumsum())).T)
+        assert array_equal(data["day_ends"][(0, 24)][:, 0], starts)
+        assert array_equal(
+            data["day_ends"][(0, 24)][:, 1], counts.cumsum() - [0, 0, 0, 1]
+        )
+
+    @pytest.mark.parametrize("cache", (False, True))
+    def test_run_windowed_reader(self, cache, tmp_path):
+        from numpy import array_equal
+
+        file = tmp_path / "recording.abc"
+        file.write_bytes(b"")
+        # 2.5 days, starting at the window base
+        t0 = 1609459200.0
+        time = t0 + arange(0, 2.5 * 86400, 60.0)
+
+        for _ in range(2):
+            p = Pipeline()
+            p.add(
+                RangeReader(
+                    t0, 2.5, cache=FileCache(tmp_path / "cache") if cache else None
+                )
+            )
+            p.add(WindowProcess())
+            p.add(DataProcess())
+            res = p.run_windowed(
+                base=0, period=24, file=file, wear=array([[0, time.size]])
+            )
+
+            # no empty window before the recording starts
+            assert p.report["windows"] == 3
+            assert res["WindowProcess"]["Day N"] == [1, 2, 3]
+            # each window has its own data, also when loaded from the cache
+            assert res["WindowProcess"]["samples"] == [1440, 1440, 719]
+            assert array_equal(p._steps[2].data["time"], time)
+
+    def test_run_windowed_errors(self, testprocess):
+        p = Pipeline()
+        p.add(testprocess())
+        with pytest.raises(ValueError):
+            p.run_windowed(time=array([0.0, 1.0]))
+
+        p = Pipeline()
+        p.add(WindowProcess())
+        with pytest.raises(ValueError):
+            p.run_windowed(base=24, time=array([0.0, 1.0]))
+        with pytest.raises(ValueError):
+            p.run_windowed(padding=-1, time=array([0.0, 1.0]))
+
+    def test_run_sink(self, tmp_path):
+        from skdh.io import CsvSink
+
+        written = []
+
+        class Sink(CsvSink):
+            def _write(self, table, file_name, name, source, header):
+                super()._write(table, file_name, name, source, header)
+                written.append((file_name, name, source))
+
+        p = Pipeline(sink=Sink())
+        p.add(KeyProcess(("x",), ()), save_file=str(tmp_path / "{name}.csv"))
+        p.run(x=array([1, 2]), file="test.txt")
+
+        # all results are written when run returns
+        file = str(tmp_path / "KeyProcess.csv")
+        assert written == [(file, "KeyProcess", "")]
+        assert Path(file).exists()
+
     def test_str_repr(self, testprocess):
         p = Pipeline()
 
@@ -215,3 +583,80 @@ class TestPipeline:
                 UserWarning, match="Pipeline was created by an older version of skdh"
             ):
                 p.load(str(fname))
+
+    def test_run_many_thread(self, testprocess, tmp_path):
+        class FileProcess(testprocess):
+            def predict(self, *args, file=None, **kwargs):
+                if "bad" in file:
+                    raise ValueError("bad file")
+                return kwargs, {"file": file, "kw1": self.kw1}
+
+        p = Pipeline()
+        p.add(FileProcess(kw1=3))
+
+        files = [f"file{i}" for i in range(10)] + ["bad_file"]
+        resume = tmp_path / "batch.log"
+
+        res = {
+            f: (r, e)
+            for f, r, e in p.run_many(
+                files, n_workers=3, executor="thread", resume_file=resume
+            )
+        }
+
+        assert set(res) == set(files)
+        for f in files[:-1]:
+            assert res[f] == ({"FileProcess": {"file": f, "kw1": 3}}, None)
+        assert res["bad_file"][0] is None
+        assert "ValueError: bad file" in res["bad_file"][1]
+
+        # only the failed file is run again
+        res = list(
+            p.run_many(files, n_workers=2, executor="thread", resume_file=resume)
+        )
+        assert [r[0] for r in res] == ["bad_file"]
+
+    def test_run_many_process(self, tmp_path):
+        from numpy import arange, savez
+        from skdh.io import ReadNumpyFile, write_numpy_file
+
+        files = []
+        for i in range(3):
+            files.append(str(tmp_path / f"data{i}.npz"))
+            write_numpy_file(
+                files[-1], {"time": arange(500.0), "accel": arange(1500.0)}
+            )
+        files.append(str(tmp_path / "missing_accel.npz"))
+        savez(files[-1], time=arange(500.0))
+
+        p = Pipeline()
+        p.add(ReadNumpyFile())
+
+        res = {f: (r, e) for f, r, e in p.run_many(files, n_workers=2)}
+
+        assert set(res) == set(files)
+        for f in files[:-1]:
+            assert res[f] == ({}, None)
+        assert "Missing `time` or `accel`" in res[files[-1]][1]
+
+    def test_run_many_errors(self, testprocess):
+        p = Pipeline()
+        p.add(testprocess())
+
+        with pytest.raises(ValueError):
+            p.run_many([], executor="other")
+        # cannot be loaded by the worker processes
+        with pytest.raises(ProcessNotFoundError):
+            p.run_many([], executor="process")
+
+    def test_run_many_process_unsafe_sink(self, tmp_path):
+        pytest.importorskip("tables")
+        from skdh.io import ReadNumpyFile
+
+        p = Pipeline(sink=HDFSink(tmp_path / "results.h5"))
+        p.add(ReadNumpyFile())
+
+        with pytest.raises(ValueError, match="more than one process"):
+            p.run_many([], executor="process")
+        # threads share the one sink, which writes on a single thread
+        assert list(p.run_many([], executor="thread")) == []
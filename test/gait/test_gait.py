@@ -54,6 +54,21 @@ class TestGait:
         for key in gait_res_gyro.files:
             assert allclose(res[key], gait_res_gyro[key], equal_nan=True), key
 
+    @pytest.mark.parametrize("executor", ("thread", "process"))
+    def test_n_workers(self, gait_input_50, executor):
+        t, acc = gait_input_50
+        n = t.size // 3
+        days = {(0, 24): array([[0, n], [n, 2 * n], [2 * n, t.size]])}
+
+        res = Gait().predict(time=t, accel=acc, fs=50.0, height=1.88, day_ends=days)
+        res_par = Gait(n_workers=2, executor=executor).predict(
+            time=t, accel=acc, fs=50.0, height=1.88, day_ends=days
+        )
+
+        assert res["Day N"].size > 0
+        for key in res:
+            assert allclose(res_par[key], res[key], equal_nan=True), key
+
     def test_add_metrics(self):
         g = Gait()
         g._params = []  # reset for easy testing
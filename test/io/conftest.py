@@ -1,8 +1,9 @@
 from pathlib import Path
 
 from pytest import fixture
-from numpy import load, random, arange, repeat
+from numpy import load, random, arange, repeat, bytes_
 import pandas as pd
+import h5py
 
 from skdh import BaseProcess
 from skdh.io.base import check_input_file
@@ -169,6 +170,26 @@ def apdm_file():
         return Path("test/io/data/apdm_sample.h5")
 
 
+@fixture
+def apdm_synthetic_file(tmp_path):
+    file = tmp_path / "apdm_synthetic.h5"
+    rng = random.default_rng(5781)
+    n = 12800  # 100 seconds at 128hz
+
+    with h5py.File(file, "w") as f:
+        for i, label in enumerate(["Lumbar", "Left Foot", "Right Foot"]):
+            grp = f.create_group(f"Sensors/XI-{i:06d}")
+            grp.create_group("Configuration").attrs["Label 0"] = bytes_(label)
+            grp["Time"] = 1600000000_000000 + arange(n, dtype="uint64") * 7812 + i
+            grp["Accelerometer"] = rng.normal(size=(n, 3))
+            grp["Gyroscope"] = rng.normal(size=(n, 3))
+            grp["Temperature"] = rng.normal(size=n)
+        # a sensor without a configuration should be skipped
+        f.create_group("Sensors/XI-999999")
+
+    return file
+
+
 @fixture
 def dummy_csv_contents():
     def fn(drop=True):
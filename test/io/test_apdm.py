@@ -2,10 +2,10 @@ import pytest
 import h5py
 from tempfile import NamedTemporaryFile
 
-from numpy import allclose
+from numpy import allclose, array_equal, asarray, float32, float64
 
 from skdh.io import ReadApdmH5
-from skdh.io.apdm import SensorNotFoundError
+from skdh.io.apdm import SensorNotFoundError, LazyDataset
 
 
 class TestReadBin:
@@ -33,3 +33,69 @@ class TestReadBin:
     def test_bad_sensor(self, apdm_file):
         with pytest.raises(SensorNotFoundError):
             ReadApdmH5("badSensor", gravity_acceleration=9.81).predict(apdm_file)
+
+    def test_multiple_sensors(self, apdm_synthetic_file):
+        locs = ["Left Foot", "Lumbar", "Right Foot"]
+        res = ReadApdmH5(locs).predict(apdm_synthetic_file)
+
+        assert list(res["sensors"]) == locs
+        for loc in locs:
+            single = ReadApdmH5(loc).predict(apdm_synthetic_file)
+            for k in ["time", "accel", "gyro", "temperature"]:
+                assert array_equal(res["sensors"][loc][k], single[k])
+        assert res["accel"] is res["sensors"]["Left Foot"]["accel"]
+
+        with pytest.raises(SensorNotFoundError):
+            ReadApdmH5(["Lumbar", "badSensor"]).predict(apdm_synthetic_file)
+
+    def test_time_range(self, apdm_synthetic_file):
+        full = ReadApdmH5("Lumbar").predict(apdm_synthetic_file)
+        t0 = full["time"][0]
+
+        res = ReadApdmH5("Lumbar", start=t0 + 10, stop=t0 + 20).predict(
+            apdm_synthetic_file
+        )
+        mask = (full["time"] >= t0 + 10) & (full["time"] < t0 + 20)
+
+        for k in ["time", "accel", "gyro", "temperature"]:
+            assert array_equal(res[k], full[k][mask])
+
+        res = ReadApdmH5("Lumbar", start=t0 + 500).predict(apdm_synthetic_file)
+        assert res["accel"].shape == (0, 3)
+
+    def test_lazy(self, apdm_synthetic_file):
+        full = ReadApdmH5("Lumbar").predict(apdm_synthetic_file)
+        t0 = full["time"][0]
+        mask = full["time"] >= t0 + 50
+
+        res = ReadApdmH5("Lumbar", start=t0 + 50, lazy=True).predict(
+            apdm_synthetic_file
+        )
+        acc = res["accel"]
+
+        assert isinstance(acc, LazyDataset)
+        assert acc.shape == (mask.sum(), 3)
+        assert len(acc) == mask.sum()
+        assert array_equal(asarray(acc), full["accel"][mask])
+        assert array_equal(acc[10:20], full["accel"][mask][10:20])
+        assert array_equal(acc[::-3, 1], full["accel"][mask][::-3, 1])
+        assert array_equal(acc[-1], full["accel"][mask][-1])
+        assert array_equal(acc[[0, 5, 7]], full["accel"][mask][[0, 5, 7]])
+        assert array_equal(res["time"][:5], full["time"][mask][:5])
+
+        with pytest.raises(IndexError):
+            acc[len(acc)]
+
+    @pytest.mark.parametrize("lazy", (False, True))
+    def test_dtype(self, apdm_synthetic_file, lazy):
+        full = ReadApdmH5("Lumbar").predict(apdm_synthetic_file)
+        res = ReadApdmH5("Lumbar", dtype="float32", lazy=lazy).predict(
+            apdm_synthetic_file
+        )
+
+        assert asarray(res["time"]).dtype == float64
+        assert array_equal(asarray(res["time"]), full["time"])
+        for k in ["accel", "gyro", "temperature"]:
+            assert res[k].dtype == float32
+            assert asarray(res[k]).dtype == float32
+            assert array_equal(asarray(res[k]), full[k].astype(float32))
@@ -1,7 +1,16 @@
 from tempfile import NamedTemporaryFile
 
 import pytest
-from numpy import allclose, ndarray
+from numpy import (
+    allclose,
+    ndarray,
+    array_equal,
+    concatenate,
+    empty,
+    float32,
+    float64,
+    inf,
+)
 
 from skdh.io import ReadCwa, FileSizeError
 
@@ -43,6 +52,144 @@ class TestReadCwa:
         assert all([i in res["day_ends"] for i in ax6_truth["day_ends"]])
         assert allclose(res["day_ends"][(8, 12)], ax6_truth["day_ends"][(8, 12)])
 
+    @pytest.mark.parametrize("chunk_seconds", (1, 7.3, 1e6))
+    def test_iter_chunks(self, ax6_file, chunk_seconds):
+        rdr = ReadCwa(bases=8, periods=12)
+        full = rdr.predict(ax6_file)
+
+        chunks = list(rdr.iter_chunks(ax6_file, chunk_seconds=chunk_seconds))
+
+        for k in ["time", "accel", "gyro", "temperature"]:
+            assert array_equal(concatenate([c[k] for c in chunks]), full[k])
+
+        # windows are relative to the chunk, and clipped to the chunk
+        n = 0
+        for c in chunks:
+            assert c["chunk_start"] == n
+            assert allclose(c["day_ends"][(8, 12)], [[0, c["time"].size - 1]])
+            n += c["time"].size
+
+    @pytest.mark.parametrize("file", ("ax3_file", "ax6_file"))
+    @pytest.mark.parametrize("use_mmap", (False, True))
+    def test_n_threads(self, file, use_mmap, request):
+        file = request.getfixturevalue(file)
+        full = ReadCwa(bases=8, periods=12).predict(file)
+        res = ReadCwa(bases=8, periods=12, use_mmap=use_mmap, n_threads=4).predict(file)
+
+        for k in ["time", "accel", "gyro", "temperature"]:
+            if k in full:
+                assert array_equal(res[k], full[k])
+        assert array_equal(res["day_ends"][(8, 12)], full["day_ends"][(8, 12)])
+
+    @pytest.mark.parametrize("file", ("ax3_file", "ax6_file"))
+    def test_use_mmap(self, file, request):
+        file = request.getfixturevalue(file)
+        full = ReadCwa(bases=8, periods=12).predict(file)
+        res = ReadCwa(bases=8, periods=12, use_mmap=True).predict(file)
+
+        for k in ["time", "accel", "gyro", "temperature"]:
+            if k in full:
+                assert res[k].flags["C_CONTIGUOUS"]
+                assert array_equal(res[k], full[k])
+        assert res["fs"] == full["fs"]
+        assert array_equal(res["day_ends"][(8, 12)], full["day_ends"][(8, 12)])
+
+    @pytest.mark.parametrize("file", ("ax3_file", "ax6_file"))
+    @pytest.mark.parametrize("bounds", ((60, None), (None, 100), (30.5, 200.25)))
+    def test_start_stop(self, file, bounds, request):
+        file = request.getfixturevalue(file)
+        full = ReadCwa().predict(file)
+        t = full["time"]
+
+        start = None if bounds[0] is None else t[0] + bounds[0]
+        stop = None if bounds[1] is None else t[0] + bounds[1]
+        res = ReadCwa(start=start, stop=stop).predict(file)
+
+        mask = (t >= (start or -inf)) & (t < (stop or inf))
+        for k in ["time", "accel", "gyro", "temperature"]:
+            if k in full:
+                assert array_equal(res[k], full[k][mask])
+
+    @pytest.mark.parametrize("file", ("ax3_file", "ax6_file"))
+    def test__get_time_range(self, file, request):
+        file = request.getfixturevalue(file)
+        t = ReadCwa().predict(file)["time"]
+
+        t_first, t_last = ReadCwa()._get_time_range(file)
+        assert t_first <= t[0]
+        assert t_last > t[-1]
+
+    def test_windows_only(self, ax6_file):
+        full = ReadCwa().predict(ax6_file)
+        hour = int(full["time"][0] % 86400 // 3600)
+
+        res = ReadCwa(bases=hour, periods=1, windows_only=True).predict(ax6_file)
+        in_window = full["time"] < (full["time"][0] // 3600 + 1) * 3600
+        assert array_equal(res["time"], full["time"][in_window])
+        assert array_equal(res["day_ends"][(hour, 1)], [[0, in_window.sum() - 1]])
+
+        res = ReadCwa(bases=(hour + 2) % 24, periods=1, windows_only=True).predict(
+            ax6_file
+        )
+        assert res["time"].size == 0
+        assert res["day_ends"][((hour + 2) % 24, 1)].shape == (0, 2)
+
+    @pytest.mark.parametrize("file", ("ax3_file", "ax6_file"))
+    def test_dtype(self, file, request):
+        file = request.getfixturevalue(file)
+        full = ReadCwa(bases=8, periods=12).predict(file)
+        res = ReadCwa(bases=8, periods=12, dtype="float32").predict(file)
+
+        assert res["time"].dtype == float64
+        assert array_equal(res["time"], full["time"])
+        for k in ["accel", "gyro", "temperature"]:
+            if k in full:
+                assert res[k].dtype == float32
+                assert array_equal(res[k], full[k].astype(float32))
+        assert array_equal(res["day_ends"][(8, 12)], full["day_ends"][(8, 12)])
+
+        res = ReadCwa(start=full["time"][500], dtype="float32").predict(file)
+        assert array_equal(res["accel"], full["accel"][500:].astype(float32))
+
+        with pytest.raises(ValueError):
+            ReadCwa(dtype="int16")
+
+    def test_read_into_float32(self, ax6_file):
+        rdr = ReadCwa()
+        full = rdr.predict(ax6_file)
+
+        shapes = rdr.get_output_shapes(ax6_file)
+        out = {k: empty(s, dtype=float32) for k, s in shapes.items()}
+        out["time"] = empty(shapes["time"])
+        res = rdr.read_into(ax6_file, out)
+
+        assert res["accel"] is out["accel"]
+        assert array_equal(res["time"], full["time"])
+        for k in ["accel", "gyro", "temperature"]:
+            assert array_equal(res[k], full[k].astype(float32))
+
+    def test_read_into_errors(self, ax6_file):
+        rdr = ReadCwa()
+        shapes = rdr.get_output_shapes(ax6_file)
+        out = {k: empty(s) for k, s in shapes.items()}
+
+        with pytest.raises(ValueError):
+            rdr.read_into(ax6_file, {**out, "accel": empty((10, 3))})
+        with pytest.raises(ValueError):
+            rdr.read_into(ax6_file, {**out, "time": empty(shapes["time"], float32)})
+        with pytest.raises(ValueError):
+            rdr.read_into(ax6_file, {**out, "gyro": None})
+        with pytest.raises(ValueError):
+            rdr.read_into(None, out)
+
+    def test_iter_chunks_errors(self, ax3_file):
+        with pytest.raises(ValueError):
+            next(ReadCwa().iter_chunks(None))
+        with pytest.raises(ValueError):
+            next(ReadCwa().iter_chunks(ax3_file, chunk_seconds=0))
+        with pytest.raises(FileNotFoundError):
+            next(ReadCwa().iter_chunks("test.cwa"))
+
     def test_window_inputs(self):
         r = ReadCwa(bases=None, periods=None)
         assert not r.window
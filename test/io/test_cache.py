@@ -0,0 +1,82 @@
+import pytest
+from numpy import memmap, array_equal, arange
+
+from skdh.io import ReadCwa, ReadBin, FileCache
+
+
+class TestFileCache:
+    def test_hit(self, ax6_file, tmp_path):
+        cache = FileCache(tmp_path / "cache")
+        rdr = ReadCwa(bases=8, periods=12, cache=cache)
+
+        res = rdr.predict(ax6_file)
+        assert not isinstance(res["accel"], memmap)
+        assert len(list(cache.directory.glob("*/manifest.json"))) == 1
+
+        res2 = rdr.predict(ax6_file)
+        for k in ["time", "accel", "gyro", "temperature"]:
+            assert isinstance(res2[k], memmap)
+            assert array_equal(res2[k], res[k])
+        assert res2["fs"] == res["fs"]
+        assert res2["file"] == res["file"]
+        assert array_equal(res2["day_ends"][(8, 12)], res["day_ends"][(8, 12)])
+
+    def test_directory(self, gnactv_file, tmp_path):
+        rdr = ReadBin(cache=str(tmp_path))
+        assert isinstance(rdr.cache, FileCache)
+        # the directory is stored so that pipelines can still be saved
+        assert rdr._kw["cache"] == str(tmp_path)
+
+        res = rdr.predict(gnactv_file)
+        res2 = ReadBin(cache=tmp_path).predict(gnactv_file)
+        assert isinstance(res2["accel"], memmap)
+        assert array_equal(res2["light"], res["light"])
+
+    def test_key(self, ax3_file, tmp_path):
+        cache = FileCache(tmp_path)
+
+        k1 = cache.get_key(ax3_file, ReadCwa())
+        assert k1 == cache.get_key(ax3_file, ReadCwa(n_threads=2, use_mmap=True))
+        assert k1 != cache.get_key(ax3_file, ReadCwa(bases=8, periods=12))
+        assert k1 != cache.get_key(ax3_file, ReadBin())
+
+    def test_unsupported(self, tmp_path):
+        cache = FileCache(tmp_path)
+
+        assert not cache.store("a", {"x": arange(5).astype(object)})
+        assert not cache.store("b", {"x": object()})
+        assert cache.load("a") is None
+        assert cache.load("b") is None
+
+    def test_evict(self, tmp_path):
+        cache = FileCache(tmp_path, max_size=8000)
+
+        assert cache.store("a", {"x": arange(400)})
+        assert cache.store("b", {"x": arange(400)})
+        cache.load("a")  # a is now the most recently used
+        assert cache.store("c", {"x": arange(400)})
+
+        assert cache.load("b") is None
+        assert array_equal(cache.load("a")["x"], arange(400))
+        assert array_equal(cache.load("c")["x"], arange(400))
+
+        # larger than the entire cache
+        assert not cache.store("d", {"x": arange(2000)})
+
+    def test_clear(self, tmp_path):
+        cache = FileCache(tmp_path)
+        cache.store("a", {"x": arange(5), "fs": 50.0})
+
+        assert cache.load("a")["fs"] == 50.0
+        cache.clear()
+        assert cache.load("a") is None
+
+    def test_nested(self, tmp_path):
+        cache = FileCache(tmp_path)
+        data = {"sensors": {"a": {"x": arange(3)}, "b": {"x": arange(4)}}, "y": {}}
+
+        assert cache.store("a", data)
+        res = cache.load("a")
+        assert array_equal(res["sensors"]["a"]["x"], arange(3))
+        assert array_equal(res["sensors"]["b"]["x"], arange(4))
+        assert res["y"] == {}
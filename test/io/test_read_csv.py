@@ -1,5 +1,7 @@
 import pytest
-from numpy import isclose, allclose, array
+from numpy import isclose, allclose, array, array_equal, arange, repeat, random
+from numpy import float32, float64
+import pandas as pd
 
 from skdh.io import ReadCSV
 from skdh.io.csv import handle_timestamp_inconsistency, handle_accel, handle_windows
@@ -90,3 +92,79 @@ class TestHandleWindows:
         assert len(out) == 2
         assert allclose(out[(14, 3)], truth_14_3)
         assert allclose(out[(10, 8)], truth_10_8)
+
+
+class TestReadCSV:
+    @staticmethod
+    def write_csv(path, block, drop):
+        fs, n_sec = 32, 3 * 3600
+        rng = random.default_rng(9175)
+
+        if block:
+            tdelta = pd.to_timedelta(repeat(arange(n_sec), fs), unit="s")
+        else:
+            tdelta = pd.to_timedelta(arange(n_sec * fs) / fs, unit="s")
+        df = pd.DataFrame(rng.normal(size=(n_sec * fs, 3)), columns=["ax", "ay", "az"])
+        df["ts"] = pd.to_datetime("2020-06-06 12:00:00") + tdelta
+
+        # drop a gap and a partial block at the end
+        df = df.drop(index=range(int(1.3 * 3600 * fs), int(1.9 * 3600 * fs)))
+        df = df.iloc[:-drop]
+        df.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S.%f")
+
+    @pytest.mark.filterwarnings("ignore:Non integer number of blocks")
+    @pytest.mark.parametrize(
+        ("block", "accel_in_g"), ((True, True), (True, False), (False, True))
+    )
+    def test_chunksize(self, tmp_path, block, accel_in_g):
+        file = tmp_path / "data.csv"
+        self.write_csv(file, block, 5)
+
+        kw = dict(
+            time_col_name="ts",
+            accel_col_names=["ax", "ay", "az"],
+            to_datetime_kwargs={"format": "%Y-%m-%d %H:%M:%S.%f"},
+            accel_in_g=accel_in_g,
+            bases=[8, 13],
+            periods=[12, 2],
+        )
+
+        full = ReadCSV(**kw).predict(file)
+        for chunksize in [1000, 77777]:
+            res = ReadCSV(chunksize=chunksize, **kw).predict(file)
+
+            assert array_equal(res["time"], full["time"])
+            assert array_equal(res["accel"], full["accel"])
+            assert res["fs"] == full["fs"]
+            for k in full["day_ends"]:
+                assert array_equal(res["day_ends"][k], full["day_ends"][k])
+
+    @pytest.mark.filterwarnings("ignore:Non integer number of blocks")
+    @pytest.mark.parametrize("chunksize", (None, 10000))
+    def test_dtype(self, tmp_path, chunksize):
+        file = tmp_path / "data.csv"
+        self.write_csv(file, True, 5)
+
+        kw = dict(
+            time_col_name="ts",
+            accel_col_names=["ax", "ay", "az"],
+            to_datetime_kwargs={"format": "%Y-%m-%d %H:%M:%S.%f"},
+            accel_in_g=False,
+            chunksize=chunksize,
+        )
+
+        full = ReadCSV(**kw).predict(file)
+        res = ReadCSV(dtype="float32", **kw).predict(file)
+
+        assert res["time"].dtype == float64
+        assert array_equal(res["time"], full["time"])
+        assert res["accel"].dtype == float32
+        assert array_equal(res["accel"], full["accel"].astype(float32))
+
+    def test_chunksize_errors(self, tmp_path):
+        file = tmp_path / "data.csv"
+        self.write_csv(file, False, 1)
+
+        rdr = ReadCSV("ts", ["ax", "ay", "az"], fill_gaps=False, chunksize=5000)
+        with pytest.raises(ValueError, match="data gaps"):
+            rdr.predict(file)
@@ -1,7 +1,7 @@
 from tempfile import NamedTemporaryFile
 
 import pytest
-from numpy import allclose, ndarray
+from numpy import allclose, ndarray, array_equal, inf, float32, float64
 
 from skdh.io import ReadBin, FileSizeError
 
@@ -24,6 +24,63 @@ class TestReadBin:
         assert all([i in res["day_ends"] for i in gnactv_truth["day_ends"]])
         assert allclose(res["day_ends"][(8, 12)], gnactv_truth["day_ends"][(8, 12)])
 
+    def test_n_threads(self, gnactv_file):
+        full = ReadBin(bases=8, periods=12).predict(gnactv_file)
+        res = ReadBin(bases=8, periods=12, n_threads=3).predict(gnactv_file)
+
+        for k in ["time", "accel", "temperature", "light"]:
+            assert array_equal(res[k], full[k])
+        assert res["fs"] == full["fs"]
+        assert array_equal(res["day_ends"][(8, 12)], full["day_ends"][(8, 12)])
+
+    @pytest.mark.parametrize("bounds", ((7, None), (None, 11), (5.001, 12.5)))
+    def test_start_stop(self, gnactv_file, bounds):
+        full = ReadBin().predict(gnactv_file)
+        t = full["time"]
+
+        start = None if bounds[0] is None else t[0] + bounds[0]
+        stop = None if bounds[1] is None else t[0] + bounds[1]
+        res = ReadBin(start=start, stop=stop).predict(gnactv_file)
+
+        mask = (t >= (start or -inf)) & (t < (stop or inf))
+        for k in ["time", "accel", "temperature", "light"]:
+            assert array_equal(res[k], full[k][mask])
+
+    def test__get_time_range(self, gnactv_file):
+        t = ReadBin().predict(gnactv_file)["time"]
+
+        t_first, t_last = ReadBin()._get_time_range(gnactv_file)
+        assert t_first <= t[0]
+        assert t_last > t[-1]
+
+    def test_windows_only(self, gnactv_file):
+        full = ReadBin().predict(gnactv_file)
+        hour = int(full["time"][0] % 86400 // 3600)
+
+        res = ReadBin(bases=hour, periods=1, windows_only=True).predict(gnactv_file)
+        assert array_equal(res["time"], full["time"])
+        assert array_equal(res["day_ends"][(hour, 1)], [[0, full["time"].size - 1]])
+
+        res = ReadBin(bases=(hour + 2) % 24, periods=1, windows_only=True).predict(
+            gnactv_file
+        )
+        assert res["time"].size == 0
+        assert res["day_ends"][((hour + 2) % 24, 1)].shape == (0, 2)
+
+    def test_dtype(self, gnactv_file):
+        full = ReadBin(bases=8, periods=12).predict(gnactv_file)
+        res = ReadBin(bases=8, periods=12, dtype="float32").predict(gnactv_file)
+
+        assert res["time"].dtype == float64
+        assert array_equal(res["time"], full["time"])
+        for k in ["accel", "temperature", "light"]:
+            assert res[k].dtype == float32
+            assert array_equal(res[k], full[k].astype(float32))
+        assert array_equal(res["day_ends"][(8, 12)], full["day_ends"][(8, 12)])
+
+        with pytest.raises(ValueError):
+            ReadBin(dtype="float16")
+
     def test_window_inputs(self):
         r = ReadBin(bases=None, periods=None)
         assert not r.window
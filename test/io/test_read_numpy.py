@@ -0,0 +1,108 @@
+import pytest
+from numpy import (
+    arange,
+    random,
+    array_equal,
+    memmap,
+    asfortranarray,
+    float32,
+    savez,
+    savez_compressed,
+    load,
+)
+
+from skdh.io import ReadNumpyFile, write_numpy_file
+
+
+@pytest.fixture
+def numpy_data():
+    rng = random.default_rng(2197)
+    return {
+        "time": arange(5000) / 50.0,
+        "accel": rng.normal(size=(5000, 3)),
+        "fs": 50.0,
+        "temperature": asfortranarray(rng.normal(size=(500, 4))).astype(float32),
+    }
+
+
+class TestReadNumpyFile:
+    def test(self, numpy_data, tmp_path):
+        savez_compressed(tmp_path / "data.npz", **numpy_data)
+
+        res = ReadNumpyFile().predict(tmp_path / "data.npz")
+
+        for k in ["time", "accel", "temperature"]:
+            assert array_equal(res[k], numpy_data[k])
+        assert res["fs"] == 50.0
+
+    def test_missing_keys(self, numpy_data, tmp_path):
+        savez(tmp_path / "data.npz", time=numpy_data["time"])
+
+        with pytest.raises(ValueError, match="Missing `time` or `accel`"):
+            ReadNumpyFile().predict(tmp_path / "data.npz")
+
+    def test_write_mmap(self, numpy_data, tmp_path):
+        file = tmp_path / "data.npz"
+        write_numpy_file(file, numpy_data)
+
+        # readable as a standard npz file
+        with load(file) as data:
+            for k in numpy_data:
+                assert array_equal(data[k], numpy_data[k])
+
+        res = ReadNumpyFile(mmap_mode="r").predict(file)
+
+        for k in ["time", "accel", "temperature"]:
+            assert isinstance(res[k], memmap)
+            assert res[k].flags.aligned
+            assert res[k].offset % 64 == 0
+            assert array_equal(res[k], numpy_data[k])
+        assert res["temperature"].flags.f_contiguous
+        assert res["fs"] == 50.0
+
+    @pytest.mark.parametrize("compressed", (True, False))
+    def test_mmap_numpy_files(self, numpy_data, tmp_path, compressed):
+        file = tmp_path / "data.npz"
+        (savez_compressed if compressed else savez)(file, **numpy_data)
+
+        res = ReadNumpyFile(mmap_mode="c").predict(file)
+
+        for k in ["time", "accel", "temperature"]:
+            # compressed arrays cannot be memory-mapped
+            assert isinstance(res[k], memmap) != compressed
+            assert array_equal(res[k], numpy_data[k])
+        assert res["fs"] == 50.0
+
+    def test_write_keys(self, numpy_data, tmp_path):
+        file = tmp_path / "data.npz"
+        numpy_data["day_ends"] = {(8, 12): arange(4)}
+
+        with pytest.raises(ValueError, match="`day_ends` cannot be written"):
+            write_numpy_file(file, numpy_data)
+
+        write_numpy_file(file, numpy_data, keys=["time", "accel"])
+        with load(file) as data:
+            assert sorted(data.files) == ["accel", "time"]
+
+    @pytest.mark.parametrize("mmap_mode", (None, "r"))
+    def test_dtype(self, numpy_data, tmp_path, mmap_mode):
+        file = tmp_path / "data.npz"
+        write_numpy_file(file, numpy_data)
+
+        res = ReadNumpyFile(mmap_mode=mmap_mode, dtype="float32").predict(file)
+
+        assert array_equal(res["time"], numpy_data["time"])
+        assert res["time"].dtype == numpy_data["time"].dtype
+        for k in ["accel", "temperature"]:
+            assert res[k].dtype == float32
+            assert array_equal(res[k], numpy_data[k].astype(float32))
+        # already float32, so not copied
+        if mmap_mode is not None:
+            assert isinstance(res["temperature"], memmap)
+
+        with pytest.raises(ValueError):
+            ReadNumpyFile(dtype="int32")
+
+    def test_mmap_mode_error(self):
+        with pytest.raises(ValueError):
+            ReadNumpyFile(mmap_mode="w")
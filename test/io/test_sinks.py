@@ -0,0 +1,97 @@
+from copy import deepcopy
+import pickle
+
+import pytest
+from numpy import arange
+from pandas import DataFrame, read_csv, read_hdf
+
+from skdh.base import BaseProcess
+from skdh.io import CsvSink, ParquetSink, ParquetDatasetSink, HDFSink
+
+
+class ResultsProcess(BaseProcess):
+    def predict(self, *, file=None, **kwargs):
+        super().predict(expect_days=False, expect_wear=False, file=file, **kwargs)
+        res = {"a": arange(3) + len(self._file_name), "b": ["x", "y", "z"]}
+        return (kwargs, res) if self._in_pipeline else res
+
+
+class TestCsvSink:
+    @pytest.mark.parametrize("background", (True, False))
+    def test(self, tmp_path, background):
+        proc = ResultsProcess()
+        res = proc.predict(file="test.txt")
+
+        # same file as saving without a sink
+        sync_file = proc.save_results(res, str(tmp_path / "sync.csv"))
+
+        proc._sink = CsvSink(background=background)
+        sink_file = proc.save_results(res, str(tmp_path / "sink.csv"))
+        proc._sink.close()
+
+        with open(sync_file) as f1, open(sink_file) as f2:
+            assert f1.read() == f2.read()
+
+    def test_error(self, tmp_path):
+        sink = CsvSink()
+        sink.write(DataFrame({"a": [1]}), str(tmp_path / "missing" / "a.csv"))
+
+        with pytest.raises(OSError):
+            sink.flush()
+
+        # the error is only raised once
+        sink.write(DataFrame({"a": [1]}), str(tmp_path / "a.csv"))
+        sink.close()
+        assert read_csv(tmp_path / "a.csv")["a"].tolist() == [1]
+
+    def test_copy(self, tmp_path):
+        sink = CsvSink()
+        sink.write(DataFrame({"a": [1]}), str(tmp_path / "a.csv"))
+
+        assert deepcopy(sink) is sink
+
+        sink2 = pickle.loads(pickle.dumps(sink))
+        assert sink2._thread is None
+        sink2.write(DataFrame({"a": [2]}), str(tmp_path / "b.csv"))
+        sink2.close()
+        sink.close()
+
+        assert read_csv(tmp_path / "b.csv")["a"].tolist() == [2]
+
+
+class TestHDFSink:
+    def test(self, tmp_path):
+        pytest.importorskip("tables")
+
+        with HDFSink(tmp_path / "results.h5") as sink:
+            for file in ["a.cwa", "subject_b.cwa"]:
+                proc = ResultsProcess()
+                proc._sink = sink
+                proc.save_results(proc.predict(file=file), "unused.csv")
+
+        res = read_hdf(tmp_path / "results.h5", "ResultsProcess")
+        assert res["file"].tolist() == ["a"] * 3 + ["subject_b"] * 3
+        assert res["a"].tolist() == [1, 2, 3, 9, 10, 11]
+        assert res["b"].tolist() == ["x", "y", "z"] * 2
+
+
+class TestParquetSinks:
+    def test_parquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from pandas import read_parquet
+
+        with ParquetSink() as sink:
+            sink.write(DataFrame({"a": [1, 2]}), str(tmp_path / "a.csv"))
+
+        assert read_parquet(tmp_path / "a.parquet")["a"].tolist() == [1, 2]
+
+    def test_dataset(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        from pandas import read_parquet
+
+        with ParquetDatasetSink(tmp_path / "dataset") as sink:
+            sink.write(DataFrame({"a": [1, 2]}), "", name="Test", source="f1")
+            sink.write(DataFrame({"a": [3]}), "", name="Test", source="f2")
+
+        res = read_parquet(tmp_path / "dataset" / "name=Test")
+        assert sorted(zip(res["file"], res["a"])) == [("f1", 1), ("f1", 2), ("f2", 3)]
@@ -1,5 +1,5 @@
 import pytest
-from numpy import isclose, allclose
+from numpy import isclose, allclose, array, array_equal
 
 from skdh.sit2stand import Sit2Stand
 
@@ -69,3 +69,18 @@ class TestSit2Stand:
 
         for k in displacement_truth:
             assert allclose(res[k], displacement_truth[k])
+
+    @pytest.mark.parametrize("executor", ("thread", "process"))
+    def test_n_workers(self, s2s_input, executor):
+        t, acc = s2s_input["time"], s2s_input["accel"]
+        days = {(0, 24): array([[0, 6000], [6000, t.size]])}
+        kw = dict(power_peak_kw={"distance": 128}, power_std_height=True)
+
+        res = Sit2Stand(**kw).predict(time=t, accel=acc, day_ends=days)
+        res_par = Sit2Stand(**kw, n_workers=2, executor=executor).predict(
+            time=t, accel=acc, day_ends=days
+        )
+
+        assert set(res["Day Number"]) == {1, 2}
+        for k in res:
+            assert array_equal(res_par[k], res[k]), k
@@ -1,7 +1,9 @@
 from collections.abc import Iterable
 
 import pytest
-from numpy import allclose, mean, std, median, max, min, nan, full
+from numpy import allclose, array_equal, mean, std, median, max, min, nan, full
+from numpy import float32, float64, moveaxis, ascontiguousarray, asfortranarray
+from numpy import array_split, concatenate
 from scipy.stats import skew, kurtosis
 
 from skdh.utility.windowing import get_windowed_view
@@ -13,6 +15,9 @@ from skdh.utility.math import (
     moving_median,
     moving_max,
     moving_min,
+    moving_stats,
+    moving_median_block_mean,
+    MovingStats,
 )
 
 
@@ -128,6 +133,64 @@ class BaseMovingStatsTester:
             self.function(x, 150, 3)
             self.function(x, 150, 151)
 
+    @pytest.mark.parametrize("trim", (True, False))
+    @pytest.mark.parametrize("skip", (1, 7, 150))
+    def test_float32(self, skip, trim, np_rng):
+        x = np_rng.random((2000, 3)).astype(float32)
+
+        pred = self.function(x, 150, skip, trim=trim, axis=0)
+        # computed in double precision, and then returned as float32
+        truth = self.function(x.astype(float64), 150, skip, trim=trim, axis=0)
+
+        if not isinstance(pred, tuple):
+            pred, truth = (pred,), (truth,)
+        for p, t in zip(pred, truth):
+            assert p.dtype == float32
+            assert array_equal(p, t.astype(float32), equal_nan=True)
+
+    @pytest.mark.parametrize("order", ("C", "F", "strided"))
+    @pytest.mark.parametrize(
+        ("shape", "axis"), (((2000, 3), 0), ((3, 2000), -1), ((2, 1000, 3), 1))
+    )
+    def test_axis(self, shape, axis, order, np_rng):
+        x = np_rng.random(shape)
+        if order == "F":
+            x = asfortranarray(x)
+        elif order == "strided":
+            x = np_rng.random([2 * i for i in shape])[
+                tuple(slice(None, None, 2) for _ in shape)
+            ]
+
+        pred = self.function(x, 150, 7, trim=False, axis=axis)
+        # computed on the last axis of a contiguous copy
+        truth = self.function(
+            ascontiguousarray(moveaxis(x, axis, -1)), 150, 7, trim=False, axis=-1
+        )
+
+        if not isinstance(pred, tuple):
+            pred, truth = (pred,), (truth,)
+        for p, t in zip(pred, truth):
+            assert p.flags["C_CONTIGUOUS"]
+            assert array_equal(p, moveaxis(t, -1, axis), equal_nan=True)
+
+    def test_axis_error(self, np_rng):
+        with pytest.raises(ValueError):
+            self.function(np_rng.random((100, 3)), 10, 1, axis=2)
+
+    @pytest.mark.parametrize("n_threads", (2, 3, 8))
+    @pytest.mark.parametrize("skip", (1, 7, 150))
+    @pytest.mark.parametrize("shape, axis", (((5000,), 0), ((5000, 3), 0)))
+    def test_n_threads(self, shape, axis, skip, n_threads, np_rng):
+        x = np_rng.random(shape)
+
+        pred = self.function(x, 150, skip, trim=False, axis=axis, n_threads=n_threads)
+        truth = self.function(x, 150, skip, trim=False, axis=axis, n_threads=1)
+
+        if not isinstance(pred, tuple):
+            pred, truth = (pred,), (truth,)
+        for p, t in zip(pred, truth):
+            assert array_equal(p, t, equal_nan=True)
+
     @pytest.mark.parametrize("trim", (True, False))
     @pytest.mark.parametrize("skip", (1, 2, 7, 150, 300))
     def test_constant(self, skip, trim, np_rng):
@@ -199,3 +262,165 @@ class TestMovingMin(BaseMovingStatsTester):
     function = staticmethod(moving_min)
     truth_function = staticmethod(min)
     truth_kw = {}
+
+
+class TestMovingStats:
+    functions = {
+        "mean": lambda *a, **k: moving_mean(*a, **k),
+        "sd": lambda *a, **k: moving_sd(*a, return_previous=False, **k),
+        "skewness": lambda *a, **k: moving_skewness(*a, return_previous=False, **k),
+        "kurtosis": lambda *a, **k: moving_kurtosis(*a, return_previous=False, **k),
+        "median": lambda *a, **k: moving_median(*a, **k),
+        "max": lambda *a, **k: moving_max(*a, **k),
+        "min": lambda *a, **k: moving_min(*a, **k),
+    }
+
+    @pytest.mark.parametrize(
+        "stats",
+        (
+            ("mean", "sd", "min", "max", "median"),
+            ("sd", "max", "min"),
+            ("median", "mean"),
+            ("kurtosis", "mean", "skewness"),
+            ("max",),
+        ),
+    )
+    @pytest.mark.parametrize("trim", (True, False))
+    @pytest.mark.parametrize("skip", (1, 7, 150))
+    def test(self, stats, skip, trim, np_rng):
+        x = np_rng.random((2000, 3))
+
+        pred = moving_stats(x, 150, skip, stats=stats, trim=trim, axis=0)
+
+        assert len(pred) == len(stats)
+        for p, stat in zip(pred, stats):
+            truth = self.functions[stat](x, 150, skip, trim=trim, axis=0)
+            assert p.flags["C_CONTIGUOUS"]
+            assert array_equal(p, truth, equal_nan=True)
+
+    @pytest.mark.parametrize("dtype", (float32, float64))
+    @pytest.mark.parametrize("n_threads", (1, 3))
+    @pytest.mark.parametrize("shape, axis", (((5000,), 0), ((3, 2000), -1)))
+    def test_threads_dtype(self, shape, axis, n_threads, dtype, np_rng):
+        x = np_rng.random(shape).astype(dtype)
+        stats = ("median", "max", "min")
+
+        pred = moving_stats(x, 150, 3, stats=stats, axis=axis, n_threads=n_threads)
+
+        for p, stat in zip(pred, stats):
+            assert p.dtype == dtype
+            assert array_equal(p, self.functions[stat](x, 150, 3, axis=axis))
+
+    def test_single_stat(self, np_rng):
+        x = np_rng.random(500)
+
+        (pred,) = moving_stats(x, 50, 50, stats="mean")
+        assert array_equal(pred, moving_mean(x, 50, 50))
+
+    @pytest.mark.parametrize("stats", (("mean", "range"), ()))
+    def test_stats_error(self, stats, np_rng):
+        with pytest.raises(ValueError):
+            moving_stats(np_rng.random(500), 50, 50, stats=stats)
+
+    def test_negative_error(self, np_rng):
+        with pytest.raises(ValueError):
+            moving_stats(np_rng.random(500), -5, 50)
+
+
+class TestMovingStatsStream:
+    all_stats = ("mean", "sd", "skewness", "kurtosis", "median", "max", "min")
+
+    @pytest.mark.parametrize("stats", (all_stats, ("sd", "max", "min"), ("median",)))
+    @pytest.mark.parametrize("wlen, skip", ((150, 1), (150, 75), (150, 150), (50, 200)))
+    @pytest.mark.parametrize(
+        "shape, axis", (((5000,), 0), ((5000, 3), 0), ((3, 5000), -1))
+    )
+    def test(self, shape, axis, wlen, skip, stats, np_rng):
+        x = np_rng.random(shape)
+        # uneven chunks, including chunks smaller than the window
+        cuts = [0, 10, 11, 120, 1000, 1001, 2500, 4990]
+        chunks = [x.take(range(i1, i2), axis=axis) for i1, i2 in zip(cuts, cuts[1:])]
+        chunks.append(x.take(range(cuts[-1], shape[axis]), axis=axis))
+
+        ms = MovingStats(wlen, skip, stats=stats, axis=axis)
+        res = [ms.update(chunk) for chunk in chunks]
+        truth = moving_stats(x, wlen, skip, stats=stats, axis=axis)
+
+        assert ms.n_samples == shape[axis]
+        assert ms.n_windows == truth[0].shape[axis]
+        for k, t in enumerate(truth):
+            pred = concatenate([r[k] for r in res], axis=axis)
+            assert all(r[k].flags["C_CONTIGUOUS"] for r in res)
+            # identical to the batch computation
+            assert array_equal(pred, t, equal_nan=True)
+
+    def test_float32(self, np_rng):
+        x = np_rng.random((2000, 3)).astype(float32)
+
+        ms = MovingStats(150, 7, stats=("mean", "median"))
+        res = [ms.update(chunk) for chunk in array_split(x, 9)]
+        truth = moving_stats(x, 150, 7, stats=("mean", "median"))
+
+        for k, t in enumerate(truth):
+            pred = concatenate([r[k] for r in res], axis=0)
+            assert pred.dtype == float32
+            assert array_equal(pred, t)
+
+    def test_reset(self, np_rng):
+        x = np_rng.random(1000)
+
+        ms = MovingStats(100, 50, stats=("sd", "min"))
+        res1 = ms.update(x)
+        ms.reset()
+        res2 = ms.update(x)
+
+        assert ms.n_samples == 1000
+        for r1, r2 in zip(res1, res2):
+            assert array_equal(r1, r2)
+
+    def test_shape_error(self, np_rng):
+        ms = MovingStats(100, 50, axis=0)
+        ms.update(np_rng.random((500, 3)))
+
+        with pytest.raises(ValueError):
+            ms.update(np_rng.random((500, 2)))
+
+    @pytest.mark.parametrize(
+        "args, kwargs", (((0, 10), {}), ((10, -1), {}), ((10, 10), {"stats": "range"}))
+    )
+    def test_init_error(self, args, kwargs):
+        with pytest.raises(ValueError):
+            MovingStats(*args, **kwargs)
+
+
+class TestMovingMedianBlockMean:
+    @staticmethod
+    def fn(x):
+        return x[:, 0] - 2 * x[:, 1]
+
+    @pytest.mark.parametrize("tile", (1, 3, 256))
+    @pytest.mark.parametrize("wlen, block", ((100, 100), (101, 100), (250, 40)))
+    def test(self, wlen, block, tile, np_rng):
+        x = np_rng.random((10000, 3))
+        rmd = moving_median(x, wlen, 1, axis=0)
+
+        pred = moving_median_block_mean(x, wlen, block, tile=tile)
+        assert array_equal(pred, moving_mean(rmd, block, block, axis=0))
+
+        pred_fn, pred_none = moving_median_block_mean(
+            x, wlen, block, fns=(self.fn, None), tile=tile
+        )
+        assert array_equal(pred_fn, moving_mean(self.fn(rmd), block, block))
+        assert array_equal(pred_none, moving_mean(rmd, block, block, axis=0))
+
+    def test_callable(self, np_rng):
+        x = np_rng.random((2000, 3))
+
+        pred = moving_median_block_mean(x, 50, 50, fns=self.fn)
+        truth = moving_mean(self.fn(moving_median(x, 50, 1, axis=0)), 50, 50)
+        assert array_equal(pred, truth)
+
+    @pytest.mark.parametrize("args", ((0, 10), (10, -1), (2001, 10), (1000, 1002)))
+    def test_error(self, args, np_rng):
+        with pytest.raises(ValueError):
+            moving_median_block_mean(np_rng.random(2000), *args)